@@ -17,15 +17,19 @@ SQLite-based storage for reports, journals, analysis data, and insights.
 Provides intelligent redundancy control, date-wise organization, and task management.
 """
 
+import hashlib
 import os
 import json
 import logging
+import re
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Database path
 DB_DIR = Path(__file__).resolve().parent / "data"
@@ -36,6 +40,171 @@ if _env_db:
 else:
     DB_PATH = DB_DIR / "syndicate.db"
 
+# In-process listeners told when an action becomes pending: fn(action_id, scheduled_for or None)
+_action_listeners: List[Callable[[str, Optional[str]], None]] = []
+
+
+def add_action_listener(listener: Callable[[str, Optional[str]], None]) -> None:
+    """Register a callback for new and rescheduled pending actions (e.g. to wake a scheduler)."""
+    if listener not in _action_listeners:
+        _action_listeners.append(listener)
+
+
+def remove_action_listener(listener: Callable[[str, Optional[str]], None]) -> None:
+    if listener in _action_listeners:
+        _action_listeners.remove(listener)
+
+
+def _notify_action_listeners(action_id: str, scheduled_for: Optional[str]) -> None:
+    for listener in list(_action_listeners):
+        try:
+            listener(action_id, scheduled_for)
+        except Exception:
+            logging.getLogger("DatabaseManager").debug("Action listener failed", exc_info=True)
+
+
+# ==========================================
+# ACTION FINGERPRINTS
+# ==========================================
+
+# A new action merges into one with the same fingerprint that is open, or was created or
+# last seen within this many hours before it (a sliding window; see save_action_insight)
+ACTION_DEDUPE_WINDOW_HOURS = float(os.getenv("ACTION_DEDUPE_WINDOW_HOURS", "24"))
+_PRIORITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+# get_ready_actions promotes waiting actions one priority level per period (never above high)
+ACTION_AGING_HOURS = float(os.getenv("ACTION_AGING_HOURS", "6"))
+_FINGERPRINT_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it its of on or our should that the this to we will with "
+    "need needs check look review consider watch track closely further more next".split()
+)
+# Title prefixes added by InsightsExtractor._generate_action_title
+_TITLE_PREFIX_RE = re.compile(r"^\s*(?:research|fetch data|scan news|calculate|monitor|code task|task)\s*:\s*")
+_NUMBER_RE = re.compile(r"\$?(\d[\d,]*)(?:\.(\d+))?")
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.=^-][a-z0-9]+)*")
+
+
+def _canonical_number(match: "re.Match") -> str:
+    whole, frac = match.group(1).replace(",", ""), (match.group(2) or "").rstrip("0")
+    return f"{whole}.{frac}" if frac else whole
+
+
+def action_fingerprint(action_type: str, title: str) -> str:
+    """
+    Normalized identity of an action: its type plus the canonicalized target.
+
+    "Monitor: Gold $2,650.00 resistance" and "monitor: resistance at gold 2650"
+    share a fingerprint (case, "Type:" prefix, stopwords, number formatting
+    and word order are ignored).
+    """
+    text = _TITLE_PREFIX_RE.sub("", (title or "").lower(), count=1)
+    text = _NUMBER_RE.sub(_canonical_number, text)
+    tokens = sorted({t for t in _TOKEN_RE.findall(text) if t not in _FINGERPRINT_STOPWORDS})
+    canonical = f"{(action_type or '').strip().lower()}|{' '.join(tokens)}"
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+# Rows a new pending action with the same fingerprint merges into (params: window start twice)
+_DUPLICATE_ACTION_MATCH = (
+    "(status IN ('pending', 'in_progress') OR julianday(created_at) >= julianday(?)"
+    " OR julianday(last_seen_at) >= julianday(?))"
+)
+
+
+def _dedupe_window_start(created: str) -> str:
+    """Start of the sliding dedupe window ending at `created`."""
+    try:
+        end = datetime.fromisoformat(created)
+    except (TypeError, ValueError):
+        end = datetime.now()
+    return (end - timedelta(hours=ACTION_DEDUPE_WINDOW_HOURS)).isoformat()
+
+
+def _dedupe_key(fingerprint: str, created: str) -> str:
+    """
+    Fingerprint plus its fixed time bucket; unique in action_insights.
+
+    Only a guard against two connections inserting the same action at once:
+    two actions in one bucket are less than a window apart, so the sliding
+    window match (_DUPLICATE_ACTION_MATCH) always merges them first.
+    """
+    try:
+        ts = datetime.fromisoformat(created).timestamp()
+    except (TypeError, ValueError):
+        ts = time.time()
+    return f"{fingerprint}:{int(ts // (ACTION_DEDUPE_WINDOW_HOURS * 3600))}"
+
+
+# ==========================================
+# FULL-TEXT SEARCH
+# ==========================================
+
+_SEARCH_TOKEN_RE = re.compile(r"\w+")
+_SEARCH_STOPWORDS = frozenset(
+    "a about an and any are as at be but by can could did do does for from had has have how i if in is it its "
+    "me my no not of on or our should so than that the their them then there these they this to was we were "
+    "what when where which who why will with would you your".split()
+)
+# bm25() column weights (title, body): a title hit counts like several body hits
+_SEARCH_WEIGHTS = (4.0, 1.0)
+# Registered files larger than this are not read into the index
+_INDEX_MAX_FILE_BYTES = 2 * 1024 * 1024
+_INDEX_SUFFIXES = (".md", ".txt")
+_DOC_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
+def fts_query(text: str, max_terms: int = 16) -> str:
+    """
+    Turn free text (a Discord question, a digest topic) into an FTS5 MATCH expression.
+
+    Every word is quoted, so punctuation and FTS5 operators in user text
+    cannot break the query. Stopwords are dropped and the remaining terms are
+    OR'ed; BM25 ranks documents matching more (and rarer) terms first.
+    Returns "" when nothing searchable is left.
+    """
+    terms: List[str] = []
+    for token in _SEARCH_TOKEN_RE.findall((text or "").lower()):
+        if token in _SEARCH_STOPWORDS or (len(token) < 2 and not token.isdigit()) or token in terms:
+            continue
+        terms.append(token)
+    return " OR ".join(f'"{t}"' for t in terms[:max_terms])
+
+
+def _read_indexable_file(path: Path) -> Optional[tuple]:
+    """(title, body) of a text document for the search index, or None if it should not be indexed."""
+    if path.suffix.lower() not in _INDEX_SUFFIXES:
+        return None
+    try:
+        if path.stat().st_size > _INDEX_MAX_FILE_BYTES:
+            return None
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    if text.startswith("---"):
+        end = text.find("\n---", 3)
+        if end != -1:
+            text = text[end + 4 :]
+    title = path.stem
+    for line in text.splitlines():
+        if line.startswith("# "):
+            title = line[2:].strip() or title
+            break
+    return title, text
+
+
+def _report_date(period: str) -> Optional[str]:
+    """First day of a report period ('YYYY-Www', 'YYYY-MM' or 'YYYY') as YYYY-MM-DD."""
+    try:
+        if "-W" in period:
+            year, week = period.split("-W")
+            return date.fromisocalendar(int(year), int(week), 1).isoformat()
+        if len(period) == 7:
+            return f"{period}-01"
+        if len(period) == 4:
+            return f"{int(period):04d}-01-01"
+    except ValueError:
+        pass
+    return None
+
 
 @dataclass
 class JournalEntry:
@@ -95,11 +264,30 @@ class DatabaseManager:
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Duplicate actions merged at insert time by this instance (see save_action_insight)
+        self.action_merges = 0
+        # Connection of the transaction() block open on each thread, if any
+        self._local = threading.local()
+        # Set by _init_database: False when this SQLite build lacks FTS5 (search returns nothing)
+        self.fts_enabled = False
         self._init_database()
 
     @contextmanager
     def _get_connection(self):
         """Context manager for database connections."""
+        batch = getattr(self._local, "conn", None)
+        if batch is not None:
+            # Inside transaction(): share its connection; a savepoint keeps failures local to this call
+            batch.execute("SAVEPOINT nested")
+            try:
+                yield batch
+            except Exception:
+                batch.execute("ROLLBACK TO nested")
+                batch.execute("RELEASE nested")
+                raise
+            batch.execute("RELEASE nested")
+            return
+
         conn = sqlite3.connect(str(self.db_path))
         conn.row_factory = sqlite3.Row
         try:
@@ -111,6 +299,54 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Run every write made on this thread inside the block as one transaction.
+
+        Bulk writers (save_entity_insights, save_action_insights, backfills)
+        use this to commit once instead of once per row. The write lock is
+        taken up front; a failing call inside the block is rolled back to its
+        own savepoint without undoing the others. Nested blocks join the
+        outer one. Action listeners are told about rows written in the block
+        once it commits; a rolled-back block notifies nobody.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        conn = sqlite3.connect(str(self.db_path))
+        conn.row_factory = sqlite3.Row
+        notifications: List[Tuple[str, Optional[str]]] = []
+        self._local.conn = conn
+        self._local.notifications = notifications
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._local.notifications = None
+            conn.close()
+        for action_id, scheduled_for in notifications:
+            _notify_action_listeners(action_id, scheduled_for)
+
+    def _notify_pending(self, action_id: str, scheduled_for: Optional[str]) -> None:
+        """Tell action listeners about a pending action now, or when this thread's transaction() commits."""
+        queued = getattr(self._local, "notifications", None)
+        if queued is not None:
+            queued.append((action_id, scheduled_for))
+            return
+        _notify_action_listeners(action_id, scheduled_for)
+
+    @staticmethod
+    def _begin_write(cursor) -> None:
+        """Take the write lock before reading (already held inside transaction())."""
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
     def _init_database(self):
         """Initialize database schema."""
         with self._get_connection() as conn:
@@ -440,6 +676,42 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_entity_insights_name ON entity_insights(entity_name)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_insights_status ON action_insights(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_action_insights_priority ON action_insights(priority)")
+            # Migration: renewable execution leases (claimed_by holds the lease until lease_expires_at)
+            for column in ("claimed_by", "lease_expires_at"):
+                try:
+                    cursor.execute(f"ALTER TABLE action_insights ADD COLUMN {column} TEXT")
+                except sqlite3.OperationalError:
+                    pass  # Column likely already exists
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_action_insights_lease ON action_insights(status, lease_expires_at)"
+            )
+            # Migration: insert-time deduplication (fingerprint + time-window bucket is unique)
+            for column, ddl in (
+                ("fingerprint", "TEXT"),
+                ("dedupe_key", "TEXT"),
+                ("dedupe_hits", "INTEGER DEFAULT 0"),
+                ("last_seen_at", "TEXT"),
+            ):
+                try:
+                    cursor.execute(f"ALTER TABLE action_insights ADD COLUMN {column} {ddl}")
+                except sqlite3.OperationalError:
+                    pass  # Column likely already exists
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_action_insights_fingerprint ON action_insights(fingerprint, status)"
+            )
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_action_insights_dedupe ON action_insights(dedupe_key)"
+            )
+            # Fingerprint open actions queued before the migration so new duplicates merge into them
+            cursor.execute(
+                """
+                SELECT action_id, action_type, title FROM action_insights
+                WHERE fingerprint IS NULL AND status IN ('pending', 'in_progress')
+                """
+            )
+            backfill = [(action_fingerprint(r["action_type"], r["title"]), r["action_id"]) for r in cursor.fetchall()]
+            if backfill:
+                cursor.executemany("UPDATE action_insights SET fingerprint = ? WHERE action_id = ?", backfill)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_task_log_action ON task_execution_log(action_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_notion_sync_path ON notion_sync(file_path)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_schedule_task ON schedule_tracker(task_name)")
@@ -467,6 +739,153 @@ class DatabaseManager:
                     recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            # Migration: routing outcome columns used by the adaptive LLM router
+            for column, ddl in (
+                ("task_type", "TEXT"),
+                ("latency_ms", "REAL"),
+                ("outcome", "TEXT"),
+                ("route", "TEXT"),
+                ("hedged", "INTEGER DEFAULT 0"),
+            ):
+                try:
+                    cursor.execute(f"ALTER TABLE llm_usage ADD COLUMN {column} {ddl}")
+                except sqlite3.OperationalError:
+                    pass  # Column likely already exists
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_llm_usage_recorded ON llm_usage(recorded_at)")
+
+            # Shared token buckets (API quotas coordinated across processes)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    capacity REAL NOT NULL,
+                    refill_per_sec REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    blocked_until REAL DEFAULT 0
+                )
+            """)
+
+            # Named leases (leader election, singleton jobs); token is a monotonically increasing fencing token
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT,
+                    token INTEGER NOT NULL DEFAULT 0,
+                    expires_at REAL NOT NULL DEFAULT 0,
+                    acquired_at REAL,
+                    renewed_at REAL,
+                    metadata TEXT
+                )
+            """)
+
+            # Processed-document ledger: what each consumer (e.g. insights) last extracted from a file
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS processed_documents (
+                    consumer TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    section_hashes TEXT,
+                    processed_at TEXT,
+                    PRIMARY KEY (consumer, path)
+                )
+            """)
+
+            # Per-block hashes of published Notion pages, for block-level revision diffs (see get_page_blocks)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notion_page_blocks (
+                    page_id TEXT PRIMARY KEY,
+                    blocks TEXT NOT NULL,
+                    properties_hash TEXT,
+                    updated_at TEXT
+                )
+            """)
+
+            # Stat fingerprints of output files whose Notion sync outcome is settled (see get_sync_manifest)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notion_sync_manifest (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    content_hash TEXT NOT NULL,
+                    notion_page_id TEXT,
+                    outcome TEXT,
+                    checked_at TEXT
+                )
+            """)
+
+            # Frontmatter status fields of markdown files, keyed by absolute path (see get_frontmatter_index)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS frontmatter_index (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    has_frontmatter INTEGER NOT NULL DEFAULT 0,
+                    status TEXT,
+                    ai_processed INTEGER,
+                    sync_status TEXT,
+                    notion_page_id TEXT,
+                    pending_reason TEXT,
+                    pending_since TEXT,
+                    indexed_at TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_frontmatter_index_status ON frontmatter_index(status)")
+
+            # Catalog of files placed by scripts/file_organizer.FileOrganizer, per output root (see get_organizer_files)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS organizer_files (
+                    path TEXT PRIMARY KEY,
+                    root TEXT NOT NULL,
+                    original_name TEXT,
+                    category TEXT,
+                    file_date TEXT,
+                    size_bytes INTEGER,
+                    content_hash TEXT,
+                    archived INTEGER NOT NULL DEFAULT 0,
+                    archive_path TEXT,
+                    organized_at TEXT
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_organizer_files_date ON organizer_files(root, archived, file_date)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_organizer_files_category "
+                "ON organizer_files(root, category, archived, file_date)"
+            )
+
+            # Full-text search index over journals, reports and registered documents (see index_document).
+            # document_fts rows share their rowid with document_index.id.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS document_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    doc_key TEXT UNIQUE NOT NULL,
+                    doc_type TEXT,
+                    doc_date TEXT,
+                    title TEXT,
+                    path TEXT,
+                    content_hash TEXT,
+                    indexed_at TEXT
+                )
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_document_index_type_date ON document_index(doc_type, doc_date)"
+            )
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'document_fts'")
+            fts_created = cursor.fetchone() is None
+            try:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS document_fts USING fts5(title, body, tokenize = 'porter unicode61')"
+                )
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                logging.getLogger("DatabaseManager").warning("FTS5 unavailable, document search disabled: %s", e)
+            if self.fts_enabled and fts_created:
+                self._index_existing_documents(cursor)
 
             # Initialize default schedules if not present
             self._init_default_schedules(cursor)
@@ -691,6 +1110,43 @@ class DatabaseManager:
             else:
                 return True  # Unknown frequency, allow
 
+    def get_next_schedule_runs(self) -> Dict[str, datetime]:
+        """
+        When each enabled, previously-run scheduled task next becomes due
+        (the time should_run_task() flips to True).
+
+        Tasks that never ran are due now and left to the caller's next cycle.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT task_name, last_run, frequency FROM schedule_tracker WHERE enabled = 1")
+            rows = cursor.fetchall()
+
+        next_runs = {}
+        for row in rows:
+            if not row["last_run"]:
+                continue
+            try:
+                last_run = datetime.fromisoformat(row["last_run"])
+            except ValueError:
+                continue
+            midnight = datetime.combine(last_run.date(), datetime.min.time())
+            frequency = row["frequency"]
+            if frequency == "daily":
+                due = midnight + timedelta(days=1)
+            elif frequency == "weekly":
+                due = last_run + timedelta(days=7)
+            elif frequency == "monthly":
+                due = datetime(last_run.year + last_run.month // 12, last_run.month % 12 + 1, 1)
+            elif frequency == "yearly":
+                due = datetime(last_run.year + 1, 1, 1)
+            elif frequency == "hourly":
+                due = last_run + timedelta(hours=1)
+            else:
+                continue
+            next_runs[row["task_name"]] = due
+        return next_runs
+
     def mark_task_run(self, task_name: str) -> bool:
         """Mark a scheduled task as having just run."""
         with self._get_connection() as conn:
@@ -804,7 +1260,6 @@ class DatabaseManager:
                         """,
                         (doc_type, status, content_hash, now, file_path),
                     )
-                return True
             else:
                 # New document
                 cursor.execute(
@@ -815,7 +1270,8 @@ class DatabaseManager:
                     """,
                     (file_path, doc_type, status, content_hash, now, now),
                 )
-                return True
+            self._index_file(cursor, file_path, doc_type)
+            return True
 
     def update_document_status(self, file_path: str, status: str, notion_page_id: str = None) -> bool:
         """
@@ -1050,14 +1506,357 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM notion_sync WHERE file_path = ?", (normalized_path,))
-            return cursor.rowcount > 0
+            removed = cursor.rowcount > 0
+            cursor.execute("DELETE FROM notion_sync_manifest WHERE path = ?", (normalized_path,))
+            return removed
 
     def clear_all_sync_records(self) -> int:
         """Clear all sync records (forces full re-sync)."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM notion_sync")
-            return cursor.rowcount
+            removed = cursor.rowcount
+            cursor.execute("DELETE FROM notion_sync_manifest")
+            return removed
+
+    def get_page_blocks(self, page_id: str) -> Optional[Dict[str, Any]]:
+        """Stored block map of a published Notion page (blocks decoded to a list), or None.
+
+        Each block entry is {"id", "hash", "type", "nested"} in page order; "id"
+        is None where the Notion block id is not known yet.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM notion_page_blocks WHERE page_id = ?", (page_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            entry = dict(row)
+            try:
+                entry["blocks"] = json.loads(entry["blocks"] or "[]")
+            except ValueError:
+                return None
+            return entry
+
+    def save_page_blocks(self, page_id: str, blocks: List[Dict[str, Any]], properties_hash: str = None) -> bool:
+        """Store the block map of a published Notion page, replacing the previous one."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO notion_page_blocks (page_id, blocks, properties_hash, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(page_id) DO UPDATE SET
+                    blocks = excluded.blocks,
+                    properties_hash = excluded.properties_hash,
+                    updated_at = excluded.updated_at
+                """,
+                (page_id, json.dumps(blocks), properties_hash, datetime.now().isoformat()),
+            )
+            return True
+
+    def delete_page_blocks(self, page_id: str) -> bool:
+        """Forget a page's block map (its next revision is published as a new page)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM notion_page_blocks WHERE page_id = ?", (page_id,))
+            return cursor.rowcount > 0
+
+    def get_sync_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Notion sync manifest keyed by path.
+
+        Each entry holds the (inode, size, mtime_ns) and content hash a file had
+        when its sync outcome was last settled (published, or skipped for a
+        reason that depends only on its content), so sync_all_outputs can skip
+        it without opening it while that stat fingerprint holds.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM notion_sync_manifest")
+            return {row["path"]: dict(row) for row in cursor.fetchall()}
+
+    def record_sync_manifest(self, entries: List[Dict[str, Any]]) -> int:
+        """Upsert manifest entries (path, stat fingerprint, content_hash, notion_page_id, outcome) in one transaction."""
+        if not entries:
+            return 0
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO notion_sync_manifest
+                    (path, inode, size, mtime_ns, content_hash, notion_page_id, outcome, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    inode = excluded.inode,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    content_hash = excluded.content_hash,
+                    notion_page_id = excluded.notion_page_id,
+                    outcome = excluded.outcome,
+                    checked_at = excluded.checked_at
+                """,
+                [
+                    (
+                        e["path"],
+                        e.get("inode"),
+                        e.get("size"),
+                        e.get("mtime_ns"),
+                        e["content_hash"],
+                        e.get("notion_page_id"),
+                        e.get("outcome"),
+                        now,
+                    )
+                    for e in entries
+                ],
+            )
+            return len(entries)
+
+    def delete_sync_manifest(self, paths: List[str]) -> int:
+        """Drop manifest entries (e.g. for files that no longer exist)."""
+        if not paths:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("DELETE FROM notion_sync_manifest WHERE path = ?", [(p,) for p in paths])
+            return len(paths)
+
+    def get_frontmatter_index(self, root: str = None) -> Dict[str, Dict[str, Any]]:
+        """Frontmatter status index keyed by path, optionally limited to files under `root`.
+
+        Each entry holds the status fields of a markdown file's frontmatter with
+        the (inode, size, mtime_ns) the file had when they were read; see
+        scripts.frontmatter.DocumentStatusIndex.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if root is None:
+                cursor.execute("SELECT * FROM frontmatter_index")
+            else:
+                prefix = os.path.join(root, "")
+                cursor.execute(
+                    "SELECT * FROM frontmatter_index WHERE substr(path, 1, ?) = ?",
+                    (len(prefix), prefix),
+                )
+            return {row["path"]: dict(row) for row in cursor.fetchall()}
+
+    def get_frontmatter_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """Frontmatter status index entry of one file, or None."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM frontmatter_index WHERE path = ?", (path,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def record_frontmatter_index(self, entries: List[Dict[str, Any]]) -> int:
+        """Upsert frontmatter status index entries in one transaction."""
+        if not entries:
+            return 0
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO frontmatter_index
+                    (path, inode, size, mtime_ns, has_frontmatter, status, ai_processed,
+                     sync_status, notion_page_id, pending_reason, pending_since, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    inode = excluded.inode,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    has_frontmatter = excluded.has_frontmatter,
+                    status = excluded.status,
+                    ai_processed = excluded.ai_processed,
+                    sync_status = excluded.sync_status,
+                    notion_page_id = excluded.notion_page_id,
+                    pending_reason = excluded.pending_reason,
+                    pending_since = excluded.pending_since,
+                    indexed_at = excluded.indexed_at
+                """,
+                [
+                    (
+                        e["path"],
+                        e.get("inode"),
+                        e.get("size"),
+                        e.get("mtime_ns"),
+                        int(bool(e.get("has_frontmatter"))),
+                        e.get("status"),
+                        e.get("ai_processed"),
+                        e.get("sync_status"),
+                        e.get("notion_page_id"),
+                        e.get("pending_reason"),
+                        e.get("pending_since"),
+                        now,
+                    )
+                    for e in entries
+                ],
+            )
+            return len(entries)
+
+    def delete_frontmatter_index(self, paths: List[str]) -> int:
+        """Drop frontmatter status index entries (e.g. for files that no longer exist)."""
+        if not paths:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("DELETE FROM frontmatter_index WHERE path = ?", [(p,) for p in paths])
+            return len(paths)
+
+    # ==========================================
+    # FILE ORGANIZER CATALOG
+    # ==========================================
+
+    def upsert_organizer_files(self, root: str, entries: List[Dict[str, Any]]) -> int:
+        """Insert or replace catalog entries of files organized under `root`, in one transaction.
+
+        Entries carry path, original_name, category, file_date, size_bytes,
+        content_hash, organized_at and optionally archived/archive_path.
+        """
+        if not entries:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO organizer_files
+                    (path, root, original_name, category, file_date, size_bytes,
+                     content_hash, archived, archive_path, organized_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    root = excluded.root,
+                    original_name = excluded.original_name,
+                    category = excluded.category,
+                    file_date = excluded.file_date,
+                    size_bytes = excluded.size_bytes,
+                    content_hash = excluded.content_hash,
+                    archived = excluded.archived,
+                    archive_path = excluded.archive_path,
+                    organized_at = excluded.organized_at
+                """,
+                [
+                    (
+                        e["path"],
+                        root,
+                        e.get("original_name"),
+                        e.get("category"),
+                        e.get("file_date"),
+                        e.get("size_bytes"),
+                        e.get("content_hash"),
+                        int(bool(e.get("archived"))),
+                        e.get("archive_path"),
+                        e.get("organized_at"),
+                    )
+                    for e in entries
+                ],
+            )
+            return len(entries)
+
+    def archive_organizer_files(self, root: str, entries: List[Dict[str, Any]]) -> int:
+        """Mark files as archived (entries carry path and archive_path).
+
+        Archived rows are re-keyed by their archive_path, so a file organized
+        later at the same path gets a row of its own instead of overwriting
+        the archived one. Files not in the catalog yet are added with the
+        other fields of their entry, so archived files are always counted.
+        """
+        if not entries:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for e in entries:
+                cursor.execute(
+                    """
+                    INSERT INTO organizer_files
+                        (path, root, original_name, category, file_date, size_bytes,
+                         content_hash, archived, archive_path, organized_at)
+                    SELECT ?, ?, original_name, category, file_date, size_bytes, content_hash, 1, ?, organized_at
+                    FROM organizer_files WHERE path = ?
+                    ON CONFLICT(path) DO UPDATE SET archived = 1, archive_path = excluded.archive_path
+                    """,
+                    (e["archive_path"], root, e["archive_path"], e["path"]),
+                )
+                if cursor.rowcount == 0:
+                    cursor.execute(
+                        """
+                        INSERT INTO organizer_files
+                            (path, root, original_name, category, file_date, size_bytes,
+                             archived, archive_path, organized_at)
+                        VALUES (?, ?, ?, ?, ?, ?, 1, ?, ?)
+                        ON CONFLICT(path) DO UPDATE SET archived = 1, archive_path = excluded.archive_path
+                        """,
+                        (
+                            e["archive_path"],
+                            root,
+                            e.get("original_name"),
+                            e.get("category"),
+                            e.get("file_date"),
+                            e.get("size_bytes"),
+                            e["archive_path"],
+                            e.get("organized_at"),
+                        ),
+                    )
+                if e["path"] != e["archive_path"]:
+                    cursor.execute("DELETE FROM organizer_files WHERE path = ?", (e["path"],))
+            return len(entries)
+
+    def get_organizer_files(
+        self,
+        root: str,
+        category: str = None,
+        since: str = None,
+        until: str = None,
+        archived: Optional[bool] = False,
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """Catalog entries under `root`, newest file_date first.
+
+        Args:
+            category: Only this category
+            since, until: Inclusive ISO date bounds on file_date
+            archived: False = live files only, True = archived only, None = both
+            limit: Maximum entries returned
+        """
+        query = "SELECT * FROM organizer_files WHERE root = ?"
+        params: List[Any] = [root]
+        if archived is not None:
+            query += " AND archived = ?"
+            params.append(int(archived))
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        if since:
+            query += " AND file_date >= ?"
+            params.append(since)
+        if until:
+            query += " AND file_date <= ?"
+            params.append(until)
+        query += " ORDER BY file_date DESC, organized_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_organizer_statistics(self, root: str) -> Dict[str, Any]:
+        """Catalog counts under `root`: total_files, total_archived and by_category."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT category, COUNT(*) AS total, SUM(archived) AS archived
+                FROM organizer_files WHERE root = ? GROUP BY category ORDER BY category
+                """,
+                (root,),
+            )
+            rows = cursor.fetchall()
+        return {
+            "total_files": sum(row["total"] for row in rows),
+            "total_archived": sum(row["archived"] or 0 for row in rows),
+            "by_category": {row["category"]: row["total"] for row in rows},
+        }
 
     # ==========================================
     # JOURNAL METHODS
@@ -1117,6 +1916,9 @@ class DatabaseManager:
                     now,
                 ),
             )
+            self._index_document(
+                cursor, f"journal:{entry.date}", "journal", f"Journal {entry.date}", entry.content, doc_date=entry.date
+            )
 
             return True
 
@@ -1223,7 +2025,9 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM journals WHERE date = ?", (date_str,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+            self._unindex_document(cursor, f"journal:{date_str}")
+            return deleted
 
     # ==========================================
     # REPORT METHODS (with redundancy control)
@@ -1280,6 +2084,14 @@ class DatabaseManager:
             """,
                 (report.report_type, report.period, report.content, report.summary, report.ai_enabled, now),
             )
+            self._index_document(
+                cursor,
+                f"report:{report.report_type}:{report.period}",
+                report.report_type,
+                f"{report.report_type.title()} report {report.period}",
+                "\n\n".join(part for part in (report.summary, report.content) if part),
+                doc_date=_report_date(report.period),
+            )
 
             return True
 
@@ -1327,16 +2139,243 @@ class DatabaseManager:
             ]
 
     # ==========================================
-    # LLM TASK QUEUE METHODS
+    # DOCUMENT SEARCH METHODS (FTS5)
     # ==========================================
 
-    def add_llm_task(self, document_path: str, prompt: str, provider_hint: Optional[str] = None, priority: str = "normal", task_type: str = "generate") -> int:
-        """Enqueue a new LLM task and return the new task id.
+    def _index_document(
+        self,
+        cursor,
+        doc_key: str,
+        doc_type: str,
+        title: str,
+        body: str,
+        doc_date: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> bool:
+        """
+        Add or refresh one document in the search index, on the caller's connection.
 
-        task_type: 'generate'|'insights' etc - worker will decide behavior based on this.
+        Called by save_journal, save_report and register_document in the same
+        transaction as the row they write. Unchanged content is skipped; an
+        indexing failure is logged and never fails the save.
         """
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        if not self.fts_enabled or not body:
+            return False
+        digest = hashlib.sha1(f"{title}\n{body}".encode("utf-8")).hexdigest()
+        cursor.execute("SELECT id, content_hash FROM document_index WHERE doc_key = ?", (doc_key,))
+        row = cursor.fetchone()
+        if row and row[1] == digest:
+            return False
+
+        now = datetime.now().isoformat()
+        cursor.execute("SAVEPOINT document_index")
+        try:
+            if row:
+                doc_id = row[0]
+                cursor.execute("DELETE FROM document_fts WHERE rowid = ?", (doc_id,))
+                cursor.execute(
+                    """
+                    UPDATE document_index
+                    SET doc_type = ?, doc_date = ?, title = ?, path = ?, content_hash = ?, indexed_at = ?
+                    WHERE id = ?
+                    """,
+                    (doc_type, doc_date, title, path, digest, now, doc_id),
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT INTO document_index (doc_key, doc_type, doc_date, title, path, content_hash, indexed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (doc_key, doc_type, doc_date, title, path, digest, now),
+                )
+                doc_id = cursor.lastrowid
+            cursor.execute("INSERT INTO document_fts (rowid, title, body) VALUES (?, ?, ?)", (doc_id, title, body))
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO document_index")
+            cursor.execute("RELEASE document_index")
+            logging.getLogger("DatabaseManager").warning("Failed to index %s", doc_key, exc_info=True)
+            return False
+        cursor.execute("RELEASE document_index")
+        return True
+
+    def _index_file(self, cursor, file_path: str, doc_type: str) -> bool:
+        """Index a registered markdown/text file under the key file:<path>."""
+        if not self.fts_enabled:
+            return False
+        path = Path(file_path)
+        document = _read_indexable_file(path)
+        if document is None:
+            return False
+        match = _DOC_DATE_RE.search(path.name)
+        title, body = document
+        return self._index_document(
+            cursor,
+            f"file:{file_path}",
+            doc_type,
+            title,
+            body,
+            doc_date=match.group(1) if match else None,
+            path=file_path,
+        )
+
+    def _unindex_document(self, cursor, doc_key: str) -> None:
+        if not self.fts_enabled:
+            return
+        cursor.execute("SELECT id FROM document_index WHERE doc_key = ?", (doc_key,))
+        row = cursor.fetchone()
+        if row:
+            cursor.execute("DELETE FROM document_fts WHERE rowid = ?", (row[0],))
+            cursor.execute("DELETE FROM document_index WHERE id = ?", (row[0],))
+
+    def _index_existing_documents(self, cursor) -> None:
+        """Fill a newly created index from the journals, reports and registered files already stored."""
+        cursor.execute("SELECT date, content FROM journals")
+        for row in cursor.fetchall():
+            self._index_document(cursor, f"journal:{row[0]}", "journal", f"Journal {row[0]}", row[1], doc_date=row[0])
+        cursor.execute("SELECT report_type, period, content, summary FROM reports")
+        for row in cursor.fetchall():
+            body = "\n\n".join(part for part in (row[3], row[2]) if part)
+            title = f"{row[0].title()} report {row[1]}"
+            self._index_document(
+                cursor, f"report:{row[0]}:{row[1]}", row[0], title, body, doc_date=_report_date(row[1])
+            )
+        cursor.execute("SELECT file_path, doc_type FROM document_lifecycle")
+        for row in cursor.fetchall():
+            self._index_file(cursor, row[0], row[1])
+
+    def index_document(
+        self,
+        doc_key: str,
+        doc_type: str,
+        title: str,
+        body: str,
+        doc_date: Optional[str] = None,
+        path: Optional[str] = None,
+    ) -> bool:
+        """
+        Add or refresh a document in the full-text index.
+
+        Journals, reports and registered files are indexed automatically; use
+        this for other content (research notes, digests). Returns True if the
+        index changed, False if the content was already indexed.
+        """
+        with self._get_connection() as conn:
+            return self._index_document(conn.cursor(), doc_key, doc_type, title, body, doc_date, path)
+
+    def search_documents(
+        self,
+        query: str,
+        limit: int = 5,
+        doc_type: Optional[str] = None,
+        since: Optional[str] = None,
+        snippet_tokens: int = 24,
+        highlight: tuple = ("**", "**"),
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25-ranked full-text search over indexed documents.
+
+        Args:
+            query: Free text; words are matched with stemming, stopwords ignored
+            limit: Maximum results
+            doc_type: Only this document type (e.g. 'journal', 'weekly', 'research')
+            since: Only documents dated on or after YYYY-MM-DD
+            snippet_tokens: Approximate length of each snippet in tokens (max 64)
+            highlight: Markers placed around matched terms in the snippet
+
+        Returns:
+            Dicts with doc_key, doc_type, doc_date, title, path, score (higher
+            is better) and snippet, best match first
+        """
+        match = fts_query(query)
+        if not match or not self.fts_enabled:
+            return []
+
+        filters, params = "", [highlight[0], highlight[1], max(1, min(snippet_tokens, 64)), match]
+        if doc_type:
+            filters += " AND d.doc_type = ?"
+            params.append(doc_type)
+        if since:
+            filters += " AND d.doc_date >= ?"
+            params.append(since)
+        params.append(limit)
+
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT d.doc_key, d.doc_type, d.doc_date, d.title, d.path,
+                       -bm25(document_fts, {_SEARCH_WEIGHTS[0]}, {_SEARCH_WEIGHTS[1]}) AS score,
+                       snippet(document_fts, 1, ?, ?, ' … ', ?) AS snippet
+                FROM document_fts
+                JOIN document_index d ON d.id = document_fts.rowid
+                WHERE document_fts MATCH ?{filters}
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_document_context(
+        self,
+        query: str,
+        max_chars: int = 1500,
+        limit: int = 5,
+        doc_type: Optional[str] = None,
+        since: Optional[str] = None,
+        exclude_keys: tuple = (),
+    ) -> str:
+        """
+        Prompt-ready excerpts of the documents most relevant to `query`.
+
+        One line per hit ("[type date] title: snippet"), best first, cut off at
+        max_chars. Returns "" when nothing matches.
+        """
+        lines: List[str] = []
+        used = 0
+        for hit in self.search_documents(
+            query, limit=limit + len(exclude_keys), doc_type=doc_type, since=since, highlight=("", "")
+        ):
+            if hit["doc_key"] in exclude_keys:
+                continue
+            label = " ".join(part for part in (hit["doc_type"], hit["doc_date"]) if part)
+            line = f"[{label}] {hit['title']}: {' '.join(hit['snippet'].split())}"
+            if used + len(line) > max_chars:
+                if not lines:
+                    lines.append(line[:max_chars])
+                break
+            lines.append(line)
+            used += len(line) + 1
+            if len(lines) >= limit:
+                break
+        return "\n".join(lines)
+
+    # ==========================================
+    # LLM TASK QUEUE METHODS
+    # ==========================================
+
+    def add_llm_task(self, document_path: str, prompt: str, provider_hint: Optional[str] = None, priority: str = "normal", task_type: str = "generate") -> int:
+        """Enqueue a new LLM task and return the new task id.
+
+        task_type: 'generate'|'insights' etc - worker will decide behavior based on this.
+
+        An identical task (same document, prompt and type) that is still pending
+        is reused instead of queueing the work twice; its id is returned.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            self._begin_write(cursor)
+            cursor.execute(
+                """
+                SELECT id FROM llm_tasks
+                WHERE status = 'pending' AND document_path = ? AND prompt = ? AND task_type = ?
+                ORDER BY id LIMIT 1
+                """,
+                (document_path, prompt, task_type),
+            )
+            existing = cursor.fetchone()
+            if existing is not None:
+                return existing["id"]
             cursor.execute(
                 """
                 INSERT INTO llm_tasks (document_path, prompt, provider_hint, priority, task_type)
@@ -1354,7 +2393,11 @@ class DatabaseManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT id FROM llm_tasks WHERE status = 'pending' ORDER BY created_at ASC LIMIT ?",
+                """
+                SELECT id FROM llm_tasks WHERE status = 'pending'
+                ORDER BY CASE priority WHEN 'high' THEN 0 WHEN 'normal' THEN 1 ELSE 2 END, created_at ASC
+                LIMIT ?
+                """,
                 (limit,),
             )
             ids = [row["id"] for row in cursor.fetchall()]
@@ -1794,25 +2837,26 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
 
     def save_entity_insights(self, entities: list) -> int:
-        """Save multiple entity insights (batch operation)."""
+        """Save multiple entity insights (batch operation, one transaction)."""
         saved = 0
-        for entity in entities:
-            try:
-                # Support both dataclass and dict
-                if hasattr(entity, "entity_name"):
-                    self.save_entity_insight(
-                        entity_name=entity.entity_name,
-                        entity_type=entity.entity_type,
-                        context=entity.context,
-                        relevance_score=entity.relevance_score,
-                        source_report=entity.source_report,
-                        metadata=str(entity.metadata) if entity.metadata else None,
-                    )
-                else:
-                    self.save_entity_insight(**entity)
-                saved += 1
-            except Exception:
-                continue
+        with self.transaction():
+            for entity in entities:
+                try:
+                    # Support both dataclass and dict
+                    if hasattr(entity, "entity_name"):
+                        self.save_entity_insight(
+                            entity_name=entity.entity_name,
+                            entity_type=entity.entity_type,
+                            context=entity.context,
+                            relevance_score=entity.relevance_score,
+                            source_report=entity.source_report,
+                            metadata=str(entity.metadata) if entity.metadata else None,
+                        )
+                    else:
+                        self.save_entity_insight(**entity)
+                    saved += 1
+                except Exception:
+                    continue
         return saved
 
     # ==========================================
@@ -1820,58 +2864,64 @@ class DatabaseManager:
     # ==========================================
 
     def save_action_insights(self, actions: list) -> int:
-        """Save multiple action insights (batch operation)."""
+        """Save multiple action insights (batch operation, one transaction); duplicates count as saved (merged)."""
         saved = 0
+        merges_before = self.action_merges
         logger = logging.getLogger("DatabaseManager")
-        for action in actions:
-            try:
-                # Support both dataclass and dict
-                if hasattr(action, "action_id"):
-                    self.save_action_insight(
-                        action_id=action.action_id,
-                        action_type=action.action_type,
-                        title=action.title,
-                        description=action.description,
-                        priority=action.priority,
-                        status=action.status,
-                        source_report=action.source_report,
-                        source_context=action.source_context,
-                        deadline=action.deadline,
-                        scheduled_for=getattr(action, "scheduled_for", None),
-                        metadata=str(action.metadata) if action.metadata else None,
-                    )
-                else:
-                    # Filter dict keys to only those accepted by save_action_insight to avoid
-                    # TypeError when external dicts include extra fields.
-                    allowed = {
-                        "action_id",
-                        "action_type",
-                        "title",
-                        "description",
-                        "priority",
-                        "status",
-                        "source_report",
-                        "source_context",
-                        "deadline",
-                        "scheduled_for",
-                        "result",
-                        "created_at",
-                        "completed_at",
-                        "retry_count",
-                        "last_error",
-                        "metadata",
-                    }
-                    filtered = {k: v for k, v in action.items() if k in allowed}
-                    # Normalize metadata to string for DB binding
-                    if filtered.get("metadata") is not None and not isinstance(filtered.get("metadata"), str):
-                        filtered["metadata"] = str(filtered["metadata"])
-                    self.save_action_insight(**filtered)
-                saved += 1
-            except Exception:  # pragma: no cover - defensive logging
-                # Log the exception so callers can diagnose failures
-                logger.exception("Failed to save action insight: %s", getattr(action, "action_id", action))
-                continue
-
+        with self.transaction():
+            for action in actions:
+                try:
+                    # Support both dataclass and dict
+                    if hasattr(action, "action_id"):
+                        self.save_action_insight(
+                            action_id=action.action_id,
+                            action_type=action.action_type,
+                            title=action.title,
+                            description=action.description,
+                            priority=action.priority,
+                            status=action.status,
+                            source_report=action.source_report,
+                            source_context=action.source_context,
+                            deadline=action.deadline,
+                            scheduled_for=getattr(action, "scheduled_for", None),
+                            created_at=getattr(action, "created_at", None),
+                            metadata=str(action.metadata) if action.metadata else None,
+                        )
+                    else:
+                        # Filter dict keys to only those accepted by save_action_insight to avoid
+                        # TypeError when external dicts include extra fields.
+                        allowed = {
+                            "action_id",
+                            "action_type",
+                            "title",
+                            "description",
+                            "priority",
+                            "status",
+                            "source_report",
+                            "source_context",
+                            "deadline",
+                            "scheduled_for",
+                            "result",
+                            "created_at",
+                            "completed_at",
+                            "retry_count",
+                            "last_error",
+                            "metadata",
+                        }
+                        filtered = {k: v for k, v in action.items() if k in allowed}
+                        # Normalize metadata to string for DB binding
+                        if filtered.get("metadata") is not None and not isinstance(filtered.get("metadata"), str):
+                            filtered["metadata"] = str(filtered["metadata"])
+                        self.save_action_insight(**filtered)
+                    saved += 1
+                except Exception:  # pragma: no cover - defensive logging
+                    # Log the exception so callers can diagnose failures
+                    logger.exception("Failed to save action insight: %s", getattr(action, "action_id", action))
+                    continue
+
+        merged = self.action_merges - merges_before
+        if merged:
+            logger.info("Merged %d of %d actions into existing duplicates", merged, len(actions))
         return saved
 
     def save_action_insight(
@@ -1896,10 +2946,18 @@ class DatabaseManager:
         """
         Save an action insight.
 
+        New pending actions are deduplicated by fingerprint (see action_fingerprint):
+        if the same action is already open, or was created or last merged within
+        ACTION_DEDUPE_WINDOW_HOURS before this one (a sliding window), it is
+        merged into the existing row instead of being queued again.
+
         Args:
             scheduled_for: ISO timestamp when task should execute.
                           If None, task executes immediately.
         """
+        fingerprint = action_fingerprint(action_type, title) if status == "pending" else None
+        dedupe_key = None
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
@@ -1908,12 +2966,25 @@ class DatabaseManager:
             created = created_at or now
 
             try:
+                if fingerprint:
+                    # Write lock first so concurrent extractors cannot both insert the same action
+                    self._begin_write(cursor)
+                    cursor.execute("SELECT 1 FROM action_insights WHERE action_id = ?", (action_id,))
+                    if cursor.fetchone() is None:
+                        dedupe_key = _dedupe_key(fingerprint, created)
+                        since = _dedupe_window_start(created)
+                        if self._merge_duplicate_action(cursor, fingerprint, since, priority, now):
+                            return True
+                    else:
+                        fingerprint = None  # Updating an existing action keeps its identity
+
                 cursor.execute(
                     """
                     INSERT INTO action_insights
                     (action_id, action_type, title, description, priority, status,
-                     source_report, source_context, deadline, scheduled_for, result, created_at, completed_at, retry_count, last_error, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     source_report, source_context, deadline, scheduled_for, result, created_at, completed_at, retry_count, last_error, metadata,
+                     fingerprint, dedupe_key)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ON CONFLICT(action_id) DO UPDATE SET
                         status = excluded.status,
                         description = excluded.description,
@@ -1940,6 +3011,8 @@ class DatabaseManager:
                         retry_count,
                         last_error,
                         metadata,
+                        fingerprint,
+                        dedupe_key,
                     ),
                 )
             except sqlite3.OperationalError as oe:
@@ -2006,7 +3079,42 @@ class DatabaseManager:
                 else:
                     raise
 
-            return True
+        # Notify after commit so listeners that query the DB see the row
+        if status == "pending":
+            self._notify_pending(action_id, scheduled_for)
+        return True
+
+    def _merge_duplicate_action(
+        self, cursor, fingerprint: str, since: str, priority: Optional[str], now: str
+    ) -> Optional[str]:
+        """Fold a new action into an open or recent duplicate; returns the surviving action_id."""
+        cursor.execute(
+            f"""
+            SELECT action_id, priority FROM action_insights
+            WHERE fingerprint = ? AND {_DUPLICATE_ACTION_MATCH}
+            ORDER BY id LIMIT 1
+            """,
+            (fingerprint, since, since),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        # Merge policy: keep the existing row, count the hit, and escalate to the higher priority
+        merged_priority = row["priority"]
+        if _PRIORITY_RANK.get(priority, -1) > _PRIORITY_RANK.get(merged_priority, -1):
+            merged_priority = priority
+        cursor.execute(
+            """
+            UPDATE action_insights
+            SET dedupe_hits = COALESCE(dedupe_hits, 0) + 1, last_seen_at = ?, priority = ?
+            WHERE action_id = ?
+            """,
+            (now, merged_priority, row["action_id"]),
+        )
+        self.action_merges += 1
+        logging.getLogger("DatabaseManager").debug("Merged duplicate action into %s", row["action_id"])
+        return row["action_id"]
 
     def get_pending_actions(self, priority: str = None, limit: int = None) -> List[Dict]:
         """
@@ -2045,7 +3153,9 @@ class DatabaseManager:
 
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_ready_actions(self, limit: int = None) -> List[Dict]:
+    def get_ready_actions(
+        self, limit: int = None, budget: Optional[Dict[str, int]] = None, aging_hours: float = None
+    ) -> List[Dict]:
         """
         Get actions that are ready to execute NOW.
 
@@ -2055,33 +3165,128 @@ class DatabaseManager:
 
         Tasks without scheduled_for execute immediately.
         Tasks with scheduled_for execute when that time arrives.
+
+        Args:
+            limit: Max actions to return
+            budget: Max medium/low actions per action_type in this batch (see
+                    scripts/admission.py); critical and high actions are never held back
+            aging_hours: Promote waiting actions one priority level per this many
+                    hours (up to high) so old low-priority work cannot starve. Aging
+                    changes dispatch order only: an aged medium/low action still counts
+                    against the budget
         """
+        aging_hours = ACTION_AGING_HOURS if aging_hours is None else aging_hours
         with self._get_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
+            # dispatch_rank: 1 = critical ... 4 = low, lowered by one per aging period but never to critical
             query = """
-                SELECT * FROM action_insights
-                WHERE status = 'pending'
-                  AND (scheduled_for IS NULL OR scheduled_for <= ?)
-                ORDER BY
-                    CASE priority
+                SELECT *, MIN(base_rank, MAX(2, base_rank - CAST(
+                    MAX(0, julianday(?) - julianday(created_at)) * 24 / ? AS INTEGER))) AS dispatch_rank
+                FROM (
+                    SELECT *, CASE priority
                         WHEN 'critical' THEN 1
                         WHEN 'high' THEN 2
                         WHEN 'medium' THEN 3
                         ELSE 4
-                    END,
+                    END AS base_rank
+                    FROM action_insights
+                    WHERE status = 'pending'
+                      AND (scheduled_for IS NULL OR scheduled_for <= ?)
+                )
+                ORDER BY
+                    dispatch_rank,
                     scheduled_for ASC NULLS FIRST,
                     created_at ASC
             """
+            params = (now, max(aging_hours, 1e-6), now)
 
-            if limit:
-                cursor.execute(query + " LIMIT ?", (now, limit))
+            if limit and budget is None:
+                cursor.execute(query + " LIMIT ?", params + (limit,))
             else:
-                cursor.execute(query, (now,))
-
+                cursor.execute(query, params)
+
+            if budget is None:
+                return [dict(row) for row in cursor.fetchall()]
+
+            ready, taken = [], {}
+            for row in cursor:
+                action_type = row["action_type"]
+                if row["base_rank"] > 2:  # Aging only reorders; the budget follows the priority itself
+                    if taken.get(action_type, 0) >= budget.get(action_type, float("inf")):
+                        continue
+                    taken[action_type] = taken.get(action_type, 0) + 1
+                ready.append(dict(row))
+                if limit and len(ready) >= limit:
+                    break
+            return ready
+
+    def get_action_queue_depths(self) -> List[Dict[str, Any]]:
+        """Pending actions per (action_type, priority) with the oldest creation time of each group."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT action_type, priority, COUNT(*) AS count, MIN(created_at) AS oldest_created_at
+                FROM action_insights
+                WHERE status = 'pending'
+                GROUP BY action_type, priority
+                """
+            )
             return [dict(row) for row in cursor.fetchall()]
 
+    def get_duplicate_fingerprints(self, fingerprints: List[str], created: str = None) -> set:
+        """Fingerprints a new pending action would be merged on (see save_action_insight), not queued."""
+        fingerprints = sorted(set(fingerprints))
+        if not fingerprints:
+            return set()
+        since = _dedupe_window_start(created or datetime.now().isoformat())
+        found = set()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            for fingerprint in fingerprints:
+                cursor.execute(
+                    f"SELECT 1 FROM action_insights WHERE fingerprint = ? AND {_DUPLICATE_ACTION_MATCH} LIMIT 1",
+                    (fingerprint, since, since),
+                )
+                if cursor.fetchone() is not None:
+                    found.add(fingerprint)
+        return found
+
+    def get_sheddable_actions(self, action_type: str = None, limit: int = 1) -> List[str]:
+        """Unclaimed medium/low pending actions to drop first: lowest priority, then newest."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            query = """
+                SELECT action_id FROM action_insights
+                WHERE status = 'pending' AND priority IN ('low', 'medium') AND claimed_by IS NULL
+            """
+            params: list = []
+            if action_type:
+                query += " AND action_type = ?"
+                params.append(action_type)
+            query += " ORDER BY CASE priority WHEN 'low' THEN 0 ELSE 1 END, created_at DESC LIMIT ?"
+            cursor.execute(query, params + [limit])
+            return [row["action_id"] for row in cursor.fetchall()]
+
+    def shed_actions(self, action_ids: List[str], reason: str) -> int:
+        """Drop still-pending actions under backpressure (kept as 'skipped' with the reason)."""
+        if not action_ids:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            q = ",".join("?" for _ in action_ids)
+            cursor.execute(
+                f"""
+                UPDATE action_insights
+                SET status = 'skipped', last_error = ?, completed_at = ?
+                WHERE status = 'pending' AND action_id IN ({q})
+                """,
+                [reason, datetime.now().isoformat()] + list(action_ids),
+            )
+            return cursor.rowcount
+
     def get_scheduled_actions(self) -> List[Dict]:
         """
         Get actions that are scheduled for the future.
@@ -2130,6 +3335,8 @@ class DatabaseManager:
         """
         Reset actions that got stuck in 'in_progress' status.
         Called on daemon startup to recover from crashes.
+
+        Leased claims are left to recover_expired_leases().
         """
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -2140,6 +3347,7 @@ class DatabaseManager:
                 UPDATE action_insights
                 SET status = 'pending'
                 WHERE status = 'in_progress'
+                  AND lease_expires_at IS NULL
                   AND created_at < ?
             """,
                 (cutoff,),
@@ -2153,13 +3361,15 @@ class DatabaseManager:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
+            terminal = status in ("completed", "failed")
             cursor.execute(
                 """
                 UPDATE action_insights
-                SET status = ?, result = ?, completed_at = ?
+                SET status = ?, result = ?, completed_at = ?,
+                    lease_expires_at = CASE WHEN ? THEN NULL ELSE lease_expires_at END
                 WHERE action_id = ?
             """,
-                (status, result, now if status in ("completed", "failed") else None, action_id),
+                (status, result, now if terminal else None, terminal, action_id),
             )
 
             return cursor.rowcount > 0
@@ -2182,6 +3392,15 @@ class DatabaseManager:
             stats["total"] = sum(stats.values())
             stats["completion_rate"] = (stats["completed"] / stats["total"] * 100) if stats["total"] > 0 else 0
 
+            # Insert-time deduplication: how many duplicate actions were merged instead of queued
+            cursor.execute(
+                "SELECT COALESCE(SUM(dedupe_hits), 0) AS hits, COUNT(*) AS merged_into"
+                " FROM action_insights WHERE dedupe_hits > 0"
+            )
+            row = cursor.fetchone()
+            stats["duplicates_merged"] = row["hits"]
+            stats["actions_with_duplicates"] = row["merged_into"]
+
             return stats
 
     # ==========================================
@@ -2357,16 +3576,355 @@ class DatabaseManager:
             )
             return True
 
-    def log_llm_usage(self, provider: str, tokens_used: int, cost: float = 0.0) -> bool:
-        """Record LLM usage metrics for billing and rate tracking."""
+    def log_llm_usage(
+        self,
+        provider: str,
+        tokens_used: int,
+        cost: float = 0.0,
+        task_type: str = None,
+        latency_ms: float = None,
+        outcome: str = None,
+        route: str = None,
+        hedged: bool = False,
+    ) -> bool:
+        """Record LLM usage metrics for billing and rate tracking.
+
+        The optional routing fields (task type, latency, outcome, routing decision
+        and whether the call was part of a hedged pair) are filled in by the
+        adaptive LLM router.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO llm_usage (provider, tokens_used, cost, recorded_at) VALUES (?, ?, ?, ?)",
-                (provider, tokens_used, cost, datetime.now().isoformat()),
+                """
+                INSERT INTO llm_usage
+                    (provider, tokens_used, cost, recorded_at, task_type, latency_ms, outcome, route, hedged)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    provider,
+                    tokens_used,
+                    cost,
+                    datetime.now().isoformat(),
+                    task_type,
+                    latency_ms,
+                    outcome,
+                    route,
+                    1 if hedged else 0,
+                ),
             )
             return True
 
+    # ==========================================
+    # SHARED RATE LIMIT BUCKETS
+    # ==========================================
+
+    def acquire_rate_tokens(self, requests: Dict[str, tuple], reserve: float = 0.0) -> float:
+        """Atomically take tokens from one or more token buckets.
+
+        Args:
+            requests: {bucket_name: (capacity, refill_per_sec, cost)}
+            reserve: Fraction of each bucket's capacity that must remain after
+                taking `cost` (headroom kept for higher-priority callers); a cost
+                too large to leave it free only needs a full bucket
+
+        Returns:
+            0.0 if every bucket was charged, otherwise the number of seconds
+            until the request could succeed (nothing is charged).
+        """
+        now = time.time()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Take the write lock before reading so concurrent processes serialize here
+            self._begin_write(cursor)
+            levels = {}
+            wait = 0.0
+            for name, (capacity, rate, cost) in requests.items():
+                cursor.execute("SELECT tokens, updated_at, blocked_until FROM rate_limit_buckets WHERE name = ?", (name,))
+                row = cursor.fetchone()
+                if row is None:
+                    tokens, blocked_until = float(capacity), 0.0
+                else:
+                    elapsed = max(0.0, now - row["updated_at"])
+                    tokens = min(float(capacity), row["tokens"] + elapsed * rate)
+                    blocked_until = row["blocked_until"] or 0.0
+                levels[name] = (tokens, blocked_until)
+
+                # Never more than a full bucket, or a large request could wait forever: a cost that
+                # leaves less than the reserve free is admitted once the bucket is full
+                need = min(min(cost, capacity) + reserve * capacity, capacity)
+                if blocked_until > now:
+                    wait = max(wait, blocked_until - now)
+                if tokens < need:
+                    wait = max(wait, (need - tokens) / rate if rate > 0 else 60.0)
+
+            for name, (capacity, rate, cost) in requests.items():
+                tokens, blocked_until = levels[name]
+                if wait == 0.0:
+                    tokens -= min(cost, capacity)
+                cursor.execute(
+                    """
+                    INSERT INTO rate_limit_buckets (name, tokens, capacity, refill_per_sec, updated_at, blocked_until)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        tokens = excluded.tokens,
+                        capacity = excluded.capacity,
+                        refill_per_sec = excluded.refill_per_sec,
+                        updated_at = excluded.updated_at
+                    """,
+                    (name, tokens, capacity, rate, now, blocked_until),
+                )
+            return wait
+
+    def adjust_rate_tokens(self, name: str, delta: float) -> None:
+        """Return (positive) or charge (negative) tokens after the real cost is known."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE rate_limit_buckets
+                SET tokens = MAX(-capacity, MIN(capacity, tokens + ?))
+                WHERE name = ?
+                """,
+                (delta, name),
+            )
+
+    def block_rate_bucket(self, name: str, seconds: float) -> None:
+        """Empty a bucket and block it for `seconds` (e.g. after a 429 from the API)."""
+        until = time.time() + seconds
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE rate_limit_buckets
+                SET tokens = MIN(tokens, 0), blocked_until = MAX(COALESCE(blocked_until, 0), ?)
+                WHERE name = ?
+                """,
+                (until, name),
+            )
+
+    def get_rate_buckets(self) -> List[Dict[str, Any]]:
+        """Current state of all shared rate limit buckets."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM rate_limit_buckets ORDER BY name")
+            return [dict(row) for row in cursor.fetchall()]
+
+    # ==========================================
+    # NAMED LEASES
+    # ==========================================
+
+    def acquire_lease(self, name: str, holder: str, ttl_seconds: float, metadata: str = None) -> Optional[int]:
+        """Atomically take a named lease if it is free, expired or already held by `holder`.
+
+        Every change of holder increments the lease's fencing token, so work
+        started under an older token can be recognised as stale.
+
+        Returns:
+            The fencing token if `holder` now holds the lease, otherwise None
+        """
+        now = time.time()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Take the write lock before reading so the compare-and-swap is atomic across processes
+            self._begin_write(cursor)
+            cursor.execute("SELECT holder, token, expires_at FROM leases WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            if row is not None and row["expires_at"] > now and row["holder"] != holder:
+                return None
+
+            if row is not None and row["expires_at"] > now:
+                token = row["token"]  # Re-acquired by the current holder
+            else:
+                token = (row["token"] if row is not None else 0) + 1
+            cursor.execute(
+                """
+                INSERT INTO leases (name, holder, token, expires_at, acquired_at, renewed_at, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    holder = excluded.holder,
+                    token = excluded.token,
+                    expires_at = excluded.expires_at,
+                    acquired_at = CASE WHEN leases.token = excluded.token THEN leases.acquired_at
+                                       ELSE excluded.acquired_at END,
+                    renewed_at = excluded.renewed_at,
+                    metadata = COALESCE(excluded.metadata, leases.metadata)
+                """,
+                (name, holder, token, now + ttl_seconds, now, now, metadata),
+            )
+            return token
+
+    def renew_lease(self, name: str, holder: str, token: int, ttl_seconds: float, metadata: str = None) -> bool:
+        """Extend a lease; fails if another holder has taken it since `token` was issued."""
+        now = time.time()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE leases
+                SET expires_at = ?, renewed_at = ?, metadata = COALESCE(?, metadata)
+                WHERE name = ? AND holder = ? AND token = ?
+                """,
+                (now + ttl_seconds, now, metadata, name, holder, token),
+            )
+            return cursor.rowcount > 0
+
+    def release_lease(self, name: str, holder: str, token: int) -> bool:
+        """Give a lease up early so another instance can take it without waiting for the TTL."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE leases SET expires_at = 0 WHERE name = ? AND holder = ? AND token = ?",
+                (name, holder, token),
+            )
+            return cursor.rowcount > 0
+
+    def check_lease_token(self, name: str, token: int) -> bool:
+        """True if `token` is still the current, unexpired token of the lease (fencing check)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT token, expires_at FROM leases WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return row is not None and row["token"] == token and row["expires_at"] > time.time()
+
+    def get_lease(self, name: str) -> Optional[Dict[str, Any]]:
+        """Current state of a lease (including expired ones), or None if never taken."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM leases WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def get_leases(self, prefix: str = "", live_only: bool = True) -> List[Dict[str, Any]]:
+        """Leases whose name starts with `prefix` (only unexpired ones unless live_only=False)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            query = "SELECT * FROM leases WHERE substr(name, 1, ?) = ?"
+            params: list = [len(prefix), prefix]
+            if live_only:
+                query += " AND expires_at > ?"
+                params.append(time.time())
+            cursor.execute(query + " ORDER BY name", params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    # ==========================================
+    # PROCESSED DOCUMENT LEDGER
+    # ==========================================
+
+    def get_processed_documents(self, consumer: str) -> Dict[str, Dict[str, Any]]:
+        """Ledger entries of one consumer keyed by path (section_hashes decoded to a list)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM processed_documents WHERE consumer = ?", (consumer,))
+            entries = {}
+            for row in cursor.fetchall():
+                entry = dict(row)
+                try:
+                    entry["section_hashes"] = json.loads(entry["section_hashes"] or "[]")
+                except ValueError:
+                    entry["section_hashes"] = []
+                entries[entry["path"]] = entry
+            return entries
+
+    def record_processed_documents(self, consumer: str, entries: List[Dict[str, Any]]) -> int:
+        """Upsert ledger entries (path, content_hash, size, mtime_ns, section_hashes) in one transaction."""
+        if not entries:
+            return 0
+        now = datetime.now().isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                """
+                INSERT INTO processed_documents
+                    (consumer, path, content_hash, size, mtime_ns, section_hashes, processed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(consumer, path) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    section_hashes = excluded.section_hashes,
+                    processed_at = excluded.processed_at
+                """,
+                [
+                    (
+                        consumer,
+                        e["path"],
+                        e["content_hash"],
+                        e.get("size"),
+                        e.get("mtime_ns"),
+                        json.dumps(e.get("section_hashes") or []),
+                        now,
+                    )
+                    for e in entries
+                ],
+            )
+            return len(entries)
+
+    def get_llm_outcomes(self, hours: int = 24, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Return recent routed LLM calls (oldest first) for warming router statistics."""
+        cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM (
+                    SELECT provider, task_type, latency_ms, outcome, cost, tokens_used, hedged, recorded_at
+                    FROM llm_usage
+                    WHERE latency_ms IS NOT NULL AND recorded_at >= ?
+                    ORDER BY recorded_at DESC LIMIT ?
+                ) ORDER BY recorded_at ASC
+                """,
+                (cutoff, limit),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_llm_latency_summary(self, days: int = 7) -> List[Dict[str, Any]]:
+        """Latency percentiles of routed LLM calls per provider, task type and hedging.
+
+        Latency of a hedged call is what the caller observed (from the primary
+        request's start); losing hedge requests are excluded. Compare the
+        `hedged` rows with the unhedged ones to measure the tail-latency
+        reduction from request hedging.
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT provider, COALESCE(task_type, 'default') AS task_type, hedged, outcome, latency_ms
+                FROM llm_usage
+                WHERE latency_ms IS NOT NULL AND recorded_at >= ? AND COALESCE(outcome, '') != 'hedge_lost'
+                """,
+                (cutoff,),
+            )
+            groups: Dict[tuple, Dict[str, Any]] = {}
+            for row in cursor.fetchall():
+                key = (row["provider"], row["task_type"], row["hedged"] or 0)
+                group = groups.setdefault(key, {"latencies": [], "errors": 0})
+                group["latencies"].append(row["latency_ms"])
+                if row["outcome"] == "error":
+                    group["errors"] += 1
+
+        def _pct(values: List[float], q: float) -> float:
+            return values[min(len(values) - 1, int(q * len(values)))]
+
+        summary = []
+        for (provider, task_type, hedged), group in sorted(groups.items()):
+            lat = sorted(group["latencies"])
+            summary.append(
+                {
+                    "provider": provider,
+                    "task_type": task_type,
+                    "hedged": bool(hedged),
+                    "calls": len(lat),
+                    "error_rate": round(group["errors"] / len(lat), 3),
+                    "p50_ms": round(_pct(lat, 0.50), 1),
+                    "p95_ms": round(_pct(lat, 0.95), 1),
+                    "p99_ms": round(_pct(lat, 0.99), 1),
+                }
+            )
+        return summary
+
     def set_config(self, key: str, value: str, description: str = None) -> bool:
         """Set a system configuration value."""
         with self._get_connection() as conn:
@@ -2454,7 +4012,7 @@ class DatabaseManager:
     #
     # ==========================================
 
-    def claim_action(self, action_id: str, worker_id: str = None) -> bool:
+    def claim_action(self, action_id: str, worker_id: str = None, lease_seconds: int = None) -> bool:
         """
         Atomically claim an action for execution.
 
@@ -2466,6 +4024,8 @@ class DatabaseManager:
         Args:
             action_id: The action to claim
             worker_id: Optional worker identifier for debugging
+            lease_seconds: Hold the claim only this long unless renewed
+                (renew_action_leases); None = no lease, age-based recovery only
 
         Returns:
             True if claim succeeded, False if action was already claimed
@@ -2474,12 +4034,17 @@ class DatabaseManager:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
             worker = worker_id or f"worker_{now}"
+            lease_expires_at = (
+                (datetime.now() + timedelta(seconds=lease_seconds)).isoformat() if lease_seconds else None
+            )
 
             # Atomic claim: only succeeds if status is still 'pending'
             cursor.execute(
                 """
                 UPDATE action_insights
                 SET status = 'in_progress',
+                    claimed_by = ?,
+                    lease_expires_at = ?,
                     metadata = json_set(
                         COALESCE(metadata, '{}'),
                         '$.claimed_at', ?,
@@ -2488,11 +4053,81 @@ class DatabaseManager:
                 WHERE action_id = ?
                   AND status = 'pending'
             """,
-                (now, worker, action_id),
+                (worker, lease_expires_at, now, worker, action_id),
             )
 
             return cursor.rowcount > 0
 
+    def renew_action_leases(self, worker_id: str, action_ids: List[str], lease_seconds: int) -> int:
+        """
+        Extend the leases a worker holds on in-progress actions.
+
+        Only rows still claimed by `worker_id` are renewed, so a worker whose
+        lease already expired (and whose action was re-queued) cannot take it back.
+
+        Returns:
+            Number of leases renewed
+        """
+        if not action_ids:
+            return 0
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            expires = (datetime.now() + timedelta(seconds=lease_seconds)).isoformat()
+            placeholders = ",".join("?" for _ in action_ids)
+            cursor.execute(
+                f"""
+                UPDATE action_insights
+                SET lease_expires_at = ?
+                WHERE status = 'in_progress'
+                  AND claimed_by = ?
+                  AND action_id IN ({placeholders})
+            """,
+                (expires, worker_id, *action_ids),
+            )
+            return cursor.rowcount
+
+    def recover_expired_leases(self) -> List[str]:
+        """
+        Return in-progress actions whose lease ran out (crashed or hung worker) to pending.
+
+        Returns:
+            IDs of the recovered actions
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            now = datetime.now().isoformat()
+            cursor.execute(
+                """
+                SELECT action_id FROM action_insights
+                WHERE status = 'in_progress'
+                  AND lease_expires_at IS NOT NULL
+                  AND lease_expires_at < ?
+            """,
+                (now,),
+            )
+            expired = [row["action_id"] for row in cursor.fetchall()]
+            if not expired:
+                return []
+            placeholders = ",".join("?" for _ in expired)
+            cursor.execute(
+                f"""
+                UPDATE action_insights
+                SET status = 'pending',
+                    claimed_by = NULL,
+                    lease_expires_at = NULL,
+                    metadata = json_set(
+                        COALESCE(metadata, '{{}}'),
+                        '$.released_at', ?,
+                        '$.release_reason', 'lease_expired'
+                    )
+                WHERE status = 'in_progress'
+                  AND lease_expires_at < ?
+                  AND action_id IN ({placeholders})
+            """,
+                (now, now, *expired),
+            )
+            return expired
+
     def release_action(self, action_id: str, reason: str = "released", delay_seconds: int = 0) -> bool:
         """
         Release a claimed action back to pending state.
@@ -2505,10 +4140,13 @@ class DatabaseManager:
         Args:
             action_id: The action to release
             reason: Why the action was released
+            delay_seconds: Reschedule this far in the future. A still-pending
+                action (e.g. run inline without a claim) is rescheduled too.
 
         Returns:
             True if release succeeded
         """
+        scheduled_for = None
         with self._get_connection() as conn:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
@@ -2520,13 +4158,15 @@ class DatabaseManager:
                     UPDATE action_insights
                     SET status = 'pending',
                         scheduled_for = ?,
+                        claimed_by = NULL,
+                        lease_expires_at = NULL,
                         metadata = json_set(
                             COALESCE(metadata, '{}'),
                             '$.released_at', ?,
                             '$.release_reason', ?
                         )
                     WHERE action_id = ?
-                      AND status = 'in_progress'
+                      AND status IN ('in_progress', 'pending')
                 """,
                     (scheduled_for, now, reason, action_id),
                 )
@@ -2535,6 +4175,8 @@ class DatabaseManager:
                     """
                     UPDATE action_insights
                     SET status = 'pending',
+                        claimed_by = NULL,
+                        lease_expires_at = NULL,
                         metadata = json_set(
                             COALESCE(metadata, '{}'),
                             '$.released_at', ?,
@@ -2546,7 +4188,11 @@ class DatabaseManager:
                     (now, reason, action_id),
                 )
 
-            return cursor.rowcount > 0
+            released = cursor.rowcount > 0
+
+        if released:
+            self._notify_pending(action_id, scheduled_for)
+        return released
 
     def get_execution_context(self, action_id: str) -> Optional[Dict]:
         """
@@ -19,6 +19,7 @@ import os
 import re
 import signal
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
@@ -146,14 +147,26 @@ except Exception:
 class LLMProvider:
     """Abstract interface for LLM providers (Gemini, Local, etc.)"""
 
+    # Whether generate_content() may run on several threads at once (see scripts/llm_router.py)
+    concurrent_safe = True
+
     def generate_content(self, prompt: str) -> Any:
         raise NotImplementedError
 
+    def health_check(self) -> bool:
+        """Cheap liveness probe used by long-lived provider sets (scripts/provider_manager.py)."""
+        return bool(getattr(self, "is_available", True))
+
 
 class GeminiProvider(LLMProvider):
-    """Google Gemini API provider."""
+    """Google Gemini API provider.
+
+    Calls draw from the Gemini quota shared by all local processes
+    (scripts/rate_limiter.py); `priority` overrides the process default.
+    """
 
-    def __init__(self, model_name: str = "models/gemini-pro-latest"):
+    def __init__(self, model_name: str = "models/gemini-pro-latest", priority: Optional[str] = None):
+        self.priority = priority
         # Import the Google GenAI client only when the provider is instantiated.
         # Try the legacy `google.generativeai` package first, then the compat shim.
         try:
@@ -183,7 +196,25 @@ class GeminiProvider(LLMProvider):
                 )
 
     def generate_content(self, prompt: str) -> Any:
-        return self.model.generate_content(prompt)
+        try:
+            from scripts.rate_limiter import estimate_tokens, get_gemini_limiter, is_quota_error
+
+            limiter = get_gemini_limiter()
+        except Exception:
+            limiter = None
+        if limiter is None:
+            return self.model.generate_content(prompt)
+
+        estimate = estimate_tokens(prompt)
+        limiter.acquire(estimate, priority=self.priority)
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception as e:
+            if is_quota_error(e):
+                limiter.report_quota_error()
+            raise
+        limiter.settle(estimate, _extract_usage_from_response(response)[0])
+        return response
 
 
 class OllamaProvider(LLMProvider):
@@ -216,6 +247,18 @@ class OllamaProvider(LLMProvider):
     def is_available(self) -> bool:
         return self._available
 
+    def health_check(self) -> bool:
+        """Re-ping the Ollama server; the chain only uses us while it answers."""
+        if self._llm is None:
+            return False
+        try:
+            from scripts.local_llm import is_ollama_reachable
+
+            self._available = is_ollama_reachable(self._llm._host, timeout_s=2)
+        except Exception:
+            self._available = False
+        return self._available
+
     def generate_content(self, prompt: str) -> Any:
         if not self._available:
             raise RuntimeError("Ollama not available")
@@ -232,6 +275,9 @@ class LocalLLMProvider(LLMProvider):
     - LOCAL_LLM_AUTO_DOWNLOAD: Auto-download model if none found
     """
 
+    # A single in-process llama.cpp context cannot serve overlapping requests
+    concurrent_safe = False
+
     def __init__(self, model_path: str = None, auto_find: bool = True):
         self.name = "Local"
         self._llm = None
@@ -294,6 +340,10 @@ class FallbackLLMProvider(LLMProvider):
     Set LLM_PROVIDER=ollama|local|gemini to force a specific provider.
 
     Switches to next provider after just 1 failure for fast recovery.
+
+    Set LLM_ROUTER=adaptive to route each call by observed latency, error
+    rate and cost instead of the fixed order (see scripts/llm_router.py).
+    `task_type` tags calls so statistics are kept per kind of work.
     """
 
     def __init__(self, config: "Config", logger: logging.Logger):
@@ -308,6 +358,10 @@ class FallbackLLMProvider(LLMProvider):
         self._primary_failures = 0
         self._max_failures = 1  # Switch to next after 1 failure
         self._switched = False
+        self._router = None
+        self.task_type = "default"
+        # Guards _current/_switched when worker threads share the chain
+        self._state_lock = threading.RLock()
 
         # Determine provider priority
         prefer_local = config.PREFER_LOCAL_LLM
@@ -327,6 +381,15 @@ class FallbackLLMProvider(LLMProvider):
 
         if not self._current:
             logger.warning("[LLM] ⚠ No LLM providers available! AI features disabled.")
+        elif getattr(config, "LLM_ROUTER", "fallback") == "adaptive" and len(self._providers) > 1:
+            try:
+                from scripts.llm_router import get_llm_router
+
+                self._router = get_llm_router()
+                self.name = f"Adaptive({'|'.join(p.name.split()[0] for p in self._providers)})"
+                logger.info(f"[LLM] ✓ Adaptive routing across {len(self._providers)} providers")
+            except Exception as e:
+                logger.warning(f"[LLM] Adaptive router unavailable, using fixed fallback order: {e}")
 
     def _init_gemini_first(self, config, logger):
         """Default: Gemini → Ollama → Local"""
@@ -494,6 +557,31 @@ class FallbackLLMProvider(LLMProvider):
     def is_available(self) -> bool:
         return self._current is not None
 
+    def health_check(self) -> bool:
+        """Probe every provider in the chain; True if at least one can serve calls."""
+        healthy = False
+        for provider in self._providers:
+            try:
+                healthy = provider.health_check() or healthy
+            except Exception as e:
+                self.logger.debug(f"[LLM] Health check failed for {provider.name}: {e}")
+        return healthy
+
+    def restore_primary(self) -> bool:
+        """Return to the primary provider after a fallback switch, once it is healthy again."""
+        with self._state_lock:
+            if not self._switched or not self._providers:
+                return False
+            primary = self._providers[0]
+            if primary is self._current or not primary.is_available:
+                return False
+            self._current = primary
+            self._switched = False
+            self._primary_failures = 0
+            self._update_name()
+        self.logger.info(f"[LLM] ✓ {primary.name} restored as primary")
+        return True
+
     def _is_quota_error(self, error: Exception) -> bool:
         """Check if error is a quota/rate limit error."""
         error_str = str(error).lower()
@@ -523,7 +611,7 @@ class FallbackLLMProvider(LLMProvider):
         self.logger.error("[LLM] ✗ No more fallback providers available")
         return False
 
-    def generate_content(self, prompt: str) -> Any:
+    def generate_content(self, prompt: str, task_type: Optional[str] = None) -> Any:
         """
         Generate content with automatic fallback through provider chain.
 
@@ -562,13 +650,37 @@ class FallbackLLMProvider(LLMProvider):
             # Cache unavailable - continue
             pass
 
+        if self._router is not None:
+            result, provider = self._router.call(
+                self._providers, prompt, task_type or self.task_type, is_quota_error=self._is_quota_error
+            )
+            self._current = provider
+            # Usage and latency were recorded by the router; only the response cache remains
+            try:
+                import hashlib
+
+                from db_manager import get_db
+
+                prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+                get_db().set_llm_cache(prompt_hash, prompt, getattr(result, "text", str(result)))
+            except Exception:
+                pass
+            return result
+
+        from scripts.provider_manager import serialized
+
         # Track attempts through provider chain
         attempted = set()
 
-        while self._current and self._current not in attempted:
-            attempted.add(self._current)
+        while True:
+            current = self._current
+            if not current or current in attempted:
+                break
+            attempted.add(current)
             try:
-                result = self._current.generate_content(prompt)
+                # An in-process model serves one call at a time
+                with serialized(current):
+                    result = current.generate_content(prompt)
 
                 # Best-effort: store in cache and log usage
                 try:
@@ -581,7 +693,7 @@ class FallbackLLMProvider(LLMProvider):
                     resp_text = getattr(result, "text", str(result))
                     db.set_llm_cache(prompt_hash, prompt, resp_text)
                     # Extract tokens/cost if provider reports them
-                    provider_name = getattr(self._current, "name", "unknown")
+                    provider_name = getattr(current, "name", "unknown")
                     tokens_used, cost = _extract_usage_from_response(result)
                     db.log_llm_usage(provider_name, tokens_used=tokens_used, cost=cost)
                 except Exception:
@@ -589,13 +701,14 @@ class FallbackLLMProvider(LLMProvider):
 
                 return result
             except Exception as e:
-                self._primary_failures += 1
                 error_type = "quota" if self._is_quota_error(e) else "error"
-                self.logger.warning(f"[LLM] {self._current.name} {error_type}: {str(e)[:60]}")
+                self.logger.warning(f"[LLM] {current.name} {error_type}: {str(e)[:60]}")
 
-                # Try to switch to next provider
-                if not self._switch_to_next(f"{error_type}: {str(e)[:40]}"):
-                    raise RuntimeError(f"All LLM providers failed. Last error: {e}")
+                with self._state_lock:
+                    self._primary_failures += 1
+                    # Another thread may already have moved the chain past this provider
+                    if self._current is current and not self._switch_to_next(f"{error_type}: {str(e)[:40]}"):
+                        raise RuntimeError(f"All LLM providers failed. Last error: {e}")
 
         raise RuntimeError("All LLM providers exhausted")
 
@@ -688,6 +801,9 @@ class Config:
         default_factory=lambda: os.environ.get("LOCAL_LLM_AUTO_DOWNLOAD", "").lower() in ("1", "true", "yes")
     )
 
+    # LLM_ROUTER: "fallback" (fixed provider order) or "adaptive" (latency/cost-aware routing)
+    LLM_ROUTER: str = field(default_factory=lambda: os.environ.get("LLM_ROUTER", "fallback").lower())
+
     # Ollama Configuration
     # OLLAMA_HOST: Ollama server URL
     OLLAMA_HOST: str = field(default_factory=lambda: os.environ.get("OLLAMA_HOST", "http://localhost:11434"))
@@ -1304,6 +1420,14 @@ class QuantEngine:
         snapshot: Dict[str, Any] = {}
         self.news = []
 
+        # Start a new market data cycle: frames fetched below are shared with task handlers
+        try:
+            from scripts.market_data import get_market_data
+
+            get_market_data().new_cycle()
+        except Exception:
+            self.logger.debug("Market data service unavailable", exc_info=True)
+
         # Ensure charts directory exists
         os.makedirs(self.config.CHARTS_DIR, exist_ok=True)
 
@@ -1800,6 +1924,7 @@ class QuantEngine:
                     df_clean = df.dropna(subset=[c for c in ["Open", "High", "Low", "Close"] if c in df.columns])
 
                 if not df_clean.empty:
+                    self._publish_market_data(ticker, df_clean)
                     return df_clean
 
             except Exception as e:
@@ -1808,6 +1933,15 @@ class QuantEngine:
 
         return None
 
+    def _publish_market_data(self, ticker: str, df: pd.DataFrame) -> None:
+        """Share a fetched frame with the task handlers' market data service (best-effort)."""
+        try:
+            from scripts.market_data import get_market_data
+
+            get_market_data().publish_history(ticker, df, self.config.DATA_PERIOD, self.config.DATA_INTERVAL)
+        except Exception:
+            self.logger.debug(f"Could not publish {ticker} to the market data service", exc_info=True)
+
     def _fetch_news(self, asset_key: str, ticker: str) -> None:
         """Fetch latest news headline for an asset."""
         try:
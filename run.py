@@ -21,6 +21,7 @@ Use --once for single execution, or --interactive for menu.
 """
 
 import argparse
+import functools
 import os
 import signal
 import sys
@@ -38,6 +39,9 @@ MAX_RETRIES = 3  # Max retries before marking task as failed
 # Use GOST_DETACHED_EXECUTOR=0 to force inline executor for testing.
 USE_DETACHED_EXECUTOR = os.environ.get("GOST_DETACHED_EXECUTOR", "1") != "0"
 
+# Seconds a report/publishing lease survives without renewal (renewed every third while the job runs)
+REPORT_LEASE_TTL = int(os.environ.get("REPORT_LEASE_TTL", "600"))
+
 
 def spawn_executor_daemon() -> bool:
     """
@@ -151,8 +155,6 @@ def get_python_executable() -> str:
     return sys.executable
 
 
-import schedule  # noqa: E402
-
 from db_manager import get_db  # noqa: E402
 
 # Banner
@@ -255,6 +257,46 @@ def run_premarket(no_ai: bool = False) -> bool:
     return os.system(" ".join(cmd_parts)) == 0
 
 
+def _run_report_once(lease_name: str, runner, no_ai: bool = False, already_done=None) -> bool:
+    """
+    Run a report generator while holding a named lease.
+
+    Concurrent daemons (or a daemon and a manual run) skip a report another
+    instance is generating instead of producing it twice. `already_done` is
+    re-checked after the lease is taken, since the previous holder may have
+    just finished it.
+    """
+    from scripts.leases import Lease
+
+    with Lease(lease_name, ttl=REPORT_LEASE_TTL) as lease:
+        if not lease.held:
+            print(f"  [SKIP] {lease_name} is being generated by another instance")
+            return True
+        if already_done is not None and already_done():
+            print(f"  [SKIP] {lease_name} was completed by another instance")
+            return True
+        return runner(no_ai=no_ai)
+
+
+def _with_lease(lease_name: str, busy_result):
+    """Decorator: run the function only while holding `lease_name`, else return `busy_result`."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            from scripts.leases import Lease
+
+            with Lease(lease_name, ttl=REPORT_LEASE_TTL) as lease:
+                if not lease.held:
+                    print(f"[DAEMON] {lease_name} is running in another instance, skipping")
+                    return busy_result
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def run_all(no_ai: bool = False, force: bool = False):
     """
     Run complete analysis with intelligent redundancy control.
@@ -289,17 +331,22 @@ def run_all(no_ai: bool = False, force: bool = False):
                 print("  [SKIP] Daily journal recently updated (within 4 hours)")
                 results["daily"] = True
             else:
-                results["daily"] = run_daily(no_ai=no_ai)
+                results["daily"] = _run_report_once(f"report:daily:{today.isoformat()}", run_daily, no_ai)
         else:
-            results["daily"] = run_daily(no_ai=no_ai)
+            results["daily"] = _run_report_once(f"report:daily:{today.isoformat()}", run_daily, no_ai)
     else:
-        results["daily"] = run_daily(no_ai=no_ai)
+        results["daily"] = _run_report_once(f"report:daily:{today.isoformat()}", run_daily, no_ai)
 
     # 2. Pre-market plan (if not already done today)
     print("\n[2/5] PRE-MARKET PLAN")
     print("-" * 40)
     if not db.has_premarket_for_date(today.isoformat()) or force:
-        results["premarket"] = run_premarket(no_ai=no_ai)
+        results["premarket"] = _run_report_once(
+            f"report:premarket:{today.isoformat()}",
+            run_premarket,
+            no_ai,
+            already_done=None if force else lambda: db.has_premarket_for_date(today.isoformat()),
+        )
     else:
         print("  [SKIP] Pre-market plan already exists for today")
         results["premarket"] = True
@@ -309,7 +356,12 @@ def run_all(no_ai: bool = False, force: bool = False):
     print("-" * 40)
     is_weekend = iso_cal[2] >= 6  # Saturday = 6, Sunday = 7
     if not db.has_weekly_report(today.year, iso_cal[1]) and (is_weekend or force):
-        results["weekly"] = run_weekly(no_ai=no_ai)
+        results["weekly"] = _run_report_once(
+            f"report:weekly:{today.year}-W{iso_cal[1]:02d}",
+            run_weekly,
+            no_ai,
+            already_done=lambda: db.has_weekly_report(today.year, iso_cal[1]),
+        )
     elif db.has_weekly_report(today.year, iso_cal[1]):
         print(f"  [SKIP] Weekly report for Week {iso_cal[1]} already exists")
         results["weekly"] = True
@@ -322,7 +374,12 @@ def run_all(no_ai: bool = False, force: bool = False):
     print("-" * 40)
     if not db.has_monthly_report(today.year, today.month) or force:
         print(f"  Generating report for {today.year}-{today.month:02d}...")
-        results["monthly"] = run_monthly(no_ai=no_ai)
+        results["monthly"] = _run_report_once(
+            f"report:monthly:{today.year}-{today.month:02d}",
+            run_monthly,
+            no_ai,
+            already_done=None if force else lambda: db.has_monthly_report(today.year, today.month),
+        )
     else:
         print(f"  [SKIP] Monthly report for {today.year}-{today.month:02d} already exists")
         results["monthly"] = True
@@ -332,7 +389,12 @@ def run_all(no_ai: bool = False, force: bool = False):
     print("-" * 40)
     if not db.has_yearly_report(today.year) or force:
         print(f"  Generating report for {today.year}...")
-        results["yearly"] = run_yearly(no_ai=no_ai)
+        results["yearly"] = _run_report_once(
+            f"report:yearly:{today.year}",
+            run_yearly,
+            no_ai,
+            already_done=None if force else lambda: db.has_yearly_report(today.year),
+        )
     else:
         print(f"  [SKIP] Yearly report for {today.year} already exists")
         results["yearly"] = True
@@ -351,6 +413,8 @@ def run_all(no_ai: bool = False, force: bool = False):
 
 # Global flag for graceful shutdown
 _shutdown_requested = False
+# Daemon scheduler (scripts/scheduler.py), woken by the signal handler
+_scheduler = None
 
 
 def _signal_handler(signum, frame):
@@ -358,6 +422,20 @@ def _signal_handler(signum, frame):
     global _shutdown_requested
     print("\n\n  [SHUTDOWN] Signal received, stopping gracefully...")
     _shutdown_requested = True
+    if _scheduler is not None:
+        _scheduler.stop()
+
+
+def _arm_schedule_tracker(cycle) -> None:
+    """Run an extra cycle when the next schedule_tracker task falls due before the regular interval."""
+    try:
+        dues = [due.timestamp() for due in get_db().get_next_schedule_runs().values()]
+    except Exception as e:
+        print(f"[DAEMON] Schedule tracker unavailable: {e}")
+        return
+    future = [due for due in dues if due > time.time()]
+    if future:
+        _scheduler.call_at(min(future), cycle, key="schedule_tracker")
 
 
 def run_daemon(no_ai: bool = False, interval_hours: int = 0, interval_minutes: int = 1):
@@ -370,7 +448,7 @@ def run_daemon(no_ai: bool = False, interval_hours: int = 0, interval_minutes: i
         interval_hours: Hours between analysis runs (legacy, use 0 with interval_minutes)
         interval_minutes: Minutes between analysis runs (default: 1 for real-time)
     """
-    global _shutdown_requested
+    global _shutdown_requested, _scheduler
 
     # Register signal handlers
     signal.signal(signal.SIGINT, _signal_handler)
@@ -445,24 +523,26 @@ def run_daemon(no_ai: bool = False, interval_hours: int = 0, interval_minutes: i
         _run_post_analysis_tasks()
 
     # Schedule recurring runs
-    if use_minutes:
-        schedule.every(interval_value).minutes.do(
-            _daemon_cycle, no_ai=no_ai, run_tasks=insights_available and not no_ai
-        )
-    else:
-        schedule.every(interval_value).hours.do(_daemon_cycle, no_ai=no_ai, run_tasks=insights_available and not no_ai)
+    from scripts.scheduler import Scheduler
 
-    print(f"\n[DAEMON] Next run scheduled in {interval_display}")
-    print("[DAEMON] System is now running autonomously...\n")
+    _scheduler = Scheduler()
+    interval_seconds = interval_value * (60 if use_minutes else 3600)
 
-    # Main loop
-    while not _shutdown_requested:
+    def cycle():
         try:
-            schedule.run_pending()
-            time.sleep(1)
+            _daemon_cycle(no_ai=no_ai, run_tasks=insights_available and not no_ai)
         except Exception as e:
             print(f"[DAEMON] Error in main loop: {e}")
-            time.sleep(5)
+        _arm_schedule_tracker(cycle)
+
+    _scheduler.every(interval_seconds, cycle, key="cycle")
+    _arm_schedule_tracker(cycle)
+
+    print(f"\n[DAEMON] Next run scheduled in {interval_display}")
+    print("[DAEMON] System is now running autonomously...\n")
+
+    # Main loop: sleeps until the next due job (no per-second polling)
+    _scheduler.run(should_stop=lambda: _shutdown_requested)
 
     print("\n[DAEMON] Shutdown complete. Goodbye!\n")
 
@@ -566,6 +646,9 @@ def _run_post_analysis_tasks(
             success_count = 0
             fail_count = 0
             for result in results:
+                if getattr(result, "deferred", False):
+                    # Quota-limited: already rescheduled with a backoff by the executor
+                    continue
                 db.log_task_execution(
                     result.action_id,
                     result.success,
@@ -595,6 +678,7 @@ def _run_post_analysis_tasks(
         # ------------------------------------------------------------------
         # HELPER: Run Publishing
         # ------------------------------------------------------------------
+        @_with_lease("notion_sync", (0, 0, 0))
         def run_publishing_once():
             """
             Run Notion publishing for all unsynced documents.
@@ -738,24 +822,21 @@ def _run_post_analysis_tasks(
                         str(entity.metadata),
                     )
 
-                for action in actions:
-                    db.save_action_insight(
-                        action.action_id,
-                        action.action_type,
-                        action.title,
-                        action.description,
-                        action.priority,
-                        action.status,
-                        action.source_report,
-                        action.source_context,
-                        action.deadline,
-                        getattr(action, "scheduled_for", None),
-                        str(action.metadata),
-                    )
+                # Bounded admission: duplicates merge, medium/low work is shed when the queue is full
+                from scripts.admission import AdmissionController
 
-                print(f"[DAEMON] Extracted {len(entities)} entities, {len(actions)} actions")
-                # Mark the daily task run if not forced-ignoring schedule
-                if not ignore_schedule:
+                admission = AdmissionController(db).enqueue(actions)
+                extractor.commit_report_ledger()
+
+                print(
+                    f"[DAEMON] Extracted {len(entities)} entities, {len(actions)} actions"
+                    f" ({admission['merged']} merged into existing duplicates, {admission['shed']} shed;"
+                    f" {extractor.report_stats['unchanged']} unchanged reports skipped,"
+                    f" {extractor.report_stats['deferred']} deferred while the LLM queue is full)"
+                )
+                # Mark the daily task run if not forced-ignoring schedule; with reports deferred
+                # it stays due, so the next cycle picks them up while they are still today's
+                if not ignore_schedule and not extractor.report_stats["deferred"]:
                     db.mark_task_run("insights_extraction")
                 return len(actions)
             except Exception as e:
@@ -915,23 +996,24 @@ def _run_post_analysis_tasks(
         # 4. Apply frontmatter to all output files (runs every cycle - lightweight)
         print("[DAEMON] Applying frontmatter tags...")
         try:
-            from scripts.frontmatter import add_frontmatter, has_frontmatter
+            from scripts.frontmatter import add_frontmatter, status_index, write_document
 
             output_path = Path(config.OUTPUT_DIR)
             reports_path = output_path / "reports"
             frontmatter_count = 0
+            index = status_index()
 
             # Process all markdown files in output directory
             for md_file in (
                 list(output_path.glob("*.md")) + list(reports_path.glob("*.md")) + list(reports_path.glob("**/*.md"))
             ):
                 try:
-                    content = md_file.read_text(encoding="utf-8")
-
-                    # Skip if already has frontmatter
-                    if has_frontmatter(content):
+                    # Skip if already has frontmatter (from the status index, without reading the file)
+                    if index.lookup(md_file)["has_frontmatter"]:
                         continue
 
+                    content = md_file.read_text(encoding="utf-8")
+
                     # Detect if AI was used by checking content patterns
                     # AI-generated content typically has these markers
                     ai_markers = [
@@ -969,7 +1051,7 @@ def _run_post_analysis_tasks(
 
                     # Add frontmatter allowing generator to auto-promote when appropriate (e.g., Pre-Market/journal)
                     updated = add_frontmatter(content, md_file.name, status=None, ai_processed=ai_processed)
-                    md_file.write_text(updated, encoding="utf-8")
+                    write_document(md_file, updated)
                     frontmatter_count += 1
 
                     # Register in lifecycle database with actual status from the written file
@@ -998,6 +1080,7 @@ def _run_post_analysis_tasks(
         # - weekly reports: WEEKLY
         # - monthly reports: MONTHLY
         # - yearly reports: YEARLY
+        @_with_lease("notion_sync", (0, 0, 0))
         def run_publishing_once():
             if not db.is_notion_publishing_enabled():
                 print("[DAEMON] ⏸️  Notion publishing DISABLED via toggle")
@@ -1099,12 +1182,11 @@ def _run_post_analysis_tasks(
 
                 for filepath in md_files:
                     try:
-                        content = filepath.read_text(encoding="utf-8")
-
                         # Check if document is ready for sync (has proper frontmatter status)
                         # Documents without frontmatter or with status != published/complete should NOT sync
+                        # (answered from the status index; only changed files have their header read)
                         try:
-                            if not is_ready_for_sync(content):
+                            if not is_ready_for_sync(filepath):
                                 skipped_status += 1
                                 continue
                         except Exception as e:
@@ -1253,6 +1335,8 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
         is_published,
         promote_status,
         set_document_status,
+        status_index,
+        write_document,
     )
 
     project_root = Path(PROJECT_ROOT)
@@ -1263,17 +1347,16 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
         status_filter = filter_status or "all"
         print(f"\n[DOC] Documents by status: {status_filter}\n")
 
-        md_files = list(output_dir.glob("**/*.md"))
-        md_files = [f for f in md_files if "archive" not in str(f).lower()]
+        entries = status_index().scan(output_dir)
+        entries = [e for e in entries if "archive" not in e["path"].lower()]
 
         by_status = {}
-        for filepath in md_files:
-            content = filepath.read_text(encoding="utf-8")
-            status = get_document_status(content)
+        for entry in entries:
+            status = entry["status"] if entry["status"] is not None else "draft"
             if status_filter == "all" or status == status_filter:
                 if status not in by_status:
                     by_status[status] = []
-                by_status[status].append(filepath.relative_to(PROJECT_ROOT))
+                by_status[status].append(Path(entry["path"]).relative_to(PROJECT_ROOT))
 
         for status in VALID_STATUSES:
             if status in by_status:
@@ -1293,9 +1376,8 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
             print(f"[ERROR] File not found: {filepath}")
             return
 
-        content = filepath.read_text(encoding="utf-8")
-        status = get_document_status(content)
-        published = is_published(content)
+        status = get_document_status(filepath)
+        published = is_published(filepath)
         print(f"\n[DOC] {filepath.name}")
         print(f"   Status: {status}")
         print(f"   Notion sync: {'[OK] Eligible' if published else '[X] Not eligible (requires published status)'}")
@@ -1316,7 +1398,7 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
         new_status = get_document_status(new_content)
 
         if old_status != new_status:
-            filepath.write_text(new_content, encoding="utf-8")
+            write_document(filepath, new_content)
             print(f"[OK] {filepath.name}: {old_status} -> {new_status}")
 
             # Update database
@@ -1337,7 +1419,7 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
 
         content = filepath.read_text(encoding="utf-8")
         new_content = set_document_status(content, "published", filepath.name)
-        filepath.write_text(new_content, encoding="utf-8")
+        write_document(filepath, new_content)
         print(f"[OK] {filepath.name}: published")
 
         # Update database
@@ -1356,7 +1438,7 @@ def handle_lifecycle_command(action: str, target_file: str = None, filter_status
 
         content = filepath.read_text(encoding="utf-8")
         new_content = set_document_status(content, "draft", filepath.name)
-        filepath.write_text(new_content, encoding="utf-8")
+        write_document(filepath, new_content)
         print(f"[OK] {filepath.name}: reset to draft")
 
         # Update database
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""Admission control and backpressure for the action queue.
+
+Without bounds, every extraction cycle adds actions and every report adds
+LLM tasks; when Gemini is rate-limited the backlog only grows and the
+executor drains it in creation order. The AdmissionController keeps the
+queue bounded and keeps urgent work moving:
+
+- Admission: new actions are checked against per-type and per-priority
+  depth limits (and a total cap). Critical and high actions are always
+  admitted and evict the lowest-priority unclaimed pending action if the
+  queue is full; medium and low actions are shed while over capacity.
+  Duplicates of queued or recent actions (db_manager.action_fingerprint)
+  are recognized first: they merge into the existing row, take no room and
+  never evict anything.
+- Dispatch budget: each executor batch may take at most half its slots per
+  action type for medium/low work, and none for LLM-bound types while the
+  shared Gemini quota is exhausted. Critical and high actions ignore the
+  budget, so their latency stays bounded under overload.
+- Aging: get_ready_actions promotes waiting actions one priority level per
+  ACTION_AGING_HOURS (up to high), so nothing starves.
+- Gauges: pressure() reports depth, limit and utilization per type and
+  priority, the oldest wait, the LLM task backlog and quota pressure.
+
+Environment:
+    ADMISSION_MAX_PENDING=300        Total pending actions
+    ADMISSION_TYPE_LIMITS=           e.g. "research=100,news_scan=30" (overrides defaults)
+    ADMISSION_PRIORITY_LIMITS=       e.g. "low=50,medium=200"
+    LLM_TASK_MAX_PENDING=100         Queued LLM tasks before new reports are deferred
+"""
+
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+LOG = logging.getLogger("admission")
+
+DEFAULT_TYPE_LIMITS = {
+    "research": 100,
+    "news_scan": 30,
+    "data_fetch": 60,
+    "calculation": 60,
+    "monitoring": 60,
+    "code_task": 20,
+}
+# Critical and high are never limited by priority depth
+DEFAULT_PRIORITY_LIMITS = {"medium": 200, "low": 50}
+PRIORITY_ORDER = ["critical", "high", "medium", "low"]
+URGENT_PRIORITIES = ("critical", "high")
+
+# Action types whose handlers use the "llm" resource (see TaskExecutor handlers)
+LLM_ACTION_TYPES = frozenset({"research", "news_scan", "code_task"})
+# Share of an executor batch one action type may take (medium/low work)
+TYPE_SHARE = 0.5
+
+MAX_PENDING = int(os.getenv("ADMISSION_MAX_PENDING", "300"))
+LLM_TASK_MAX_PENDING = int(os.getenv("LLM_TASK_MAX_PENDING", "100"))
+
+
+def parse_limits(spec: Optional[str], defaults: Dict[str, int]) -> Dict[str, int]:
+    """Merge "name=limit,name=limit" overrides into a copy of `defaults`."""
+    limits = dict(defaults)
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip():
+            try:
+                limits[name.strip()] = int(value)
+            except ValueError:
+                LOG.warning("Ignoring invalid admission limit %r", part)
+    return limits
+
+
+def _field(action: Any, name: str, default: Any = None) -> Any:
+    if isinstance(action, dict):
+        return action.get(name, default)
+    return getattr(action, name, default)
+
+
+class AdmissionController:
+    """
+    Bounded admission and dispatch budgets for action_insights.
+
+    Args:
+        db: DatabaseManager (default: get_db())
+        type_limits / priority_limits / max_pending: Override the configured limits
+    """
+
+    def __init__(
+        self,
+        db=None,
+        type_limits: Optional[Dict[str, int]] = None,
+        priority_limits: Optional[Dict[str, int]] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self._db = db
+        self.type_limits = type_limits or parse_limits(os.getenv("ADMISSION_TYPE_LIMITS"), DEFAULT_TYPE_LIMITS)
+        self.priority_limits = priority_limits or parse_limits(
+            os.getenv("ADMISSION_PRIORITY_LIMITS"), DEFAULT_PRIORITY_LIMITS
+        )
+        self.max_pending = max_pending or MAX_PENDING
+        self.stats = {"admitted": 0, "shed": 0, "evicted": 0, "merged": 0}
+
+    @property
+    def db(self):
+        if self._db is None:
+            from db_manager import get_db
+
+            self._db = get_db()
+        return self._db
+
+    # ==========================================================================
+    # Admission
+    # ==========================================================================
+
+    def enqueue(self, actions: Iterable[Any]) -> Dict[str, int]:
+        """
+        Admit what fits and save it; shed the rest.
+
+        Returns:
+            Counts for this call: admitted, shed, evicted, merged
+        """
+        from db_manager import action_fingerprint
+
+        actions = list(actions)
+        fingerprints = [
+            action_fingerprint(_field(a, "action_type", "research"), _field(a, "title", "")) for a in actions
+        ]
+        existing = self.db.get_duplicate_fingerprints(fingerprints)
+        by_type: Dict[str, int] = {}
+        by_priority: Dict[str, int] = {}
+        for row in self.db.get_action_queue_depths():
+            by_type[row["action_type"]] = by_type.get(row["action_type"], 0) + row["count"]
+            by_priority[row["priority"]] = by_priority.get(row["priority"], 0) + row["count"]
+        total = sum(by_type.values())
+
+        # Most important first, so urgent work takes the remaining room
+        rank = {p: i for i, p in enumerate(PRIORITY_ORDER)}
+        ordered = sorted(
+            zip(actions, fingerprints), key=lambda pair: rank.get(_field(pair[0], "priority", "medium"), len(rank))
+        )
+
+        admitted, duplicates, shed, evict = [], [], [], []
+        queued = set(existing)
+        for action, fingerprint in ordered:
+            if fingerprint in queued:
+                # Merged into the queued row on save: no room needed, nothing evicted
+                duplicates.append(action)
+                continue
+            action_type = _field(action, "action_type", "research")
+            priority = _field(action, "priority", "medium")
+            full = (
+                total >= self.max_pending
+                or by_type.get(action_type, 0) >= self.type_limits.get(action_type, self.max_pending)
+                or by_priority.get(priority, 0) >= self.priority_limits.get(priority, self.max_pending)
+            )
+            if full and priority not in URGENT_PRIORITIES:
+                shed.append(action)
+                continue
+            if full:
+                victim = self._pick_victim(action_type, evict)
+                if victim is not None:
+                    evict.append(victim)
+                    total -= 1
+            admitted.append(action)
+            queued.add(fingerprint)
+            total += 1
+            by_type[action_type] = by_type.get(action_type, 0) + 1
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+
+        evicted = self.db.shed_actions(evict, reason="shed: queue over capacity") if evict else 0
+        merges_before = getattr(self.db, "action_merges", 0)
+        if admitted or duplicates:
+            self.db.save_action_insights(admitted + duplicates)
+        merged = getattr(self.db, "action_merges", 0) - merges_before
+
+        result = {
+            "admitted": len(admitted) + len(duplicates) - merged,
+            "shed": len(shed),
+            "evicted": evicted,
+            "merged": merged,
+        }
+        for key, value in result.items():
+            self.stats[key] += value
+        if shed or evicted:
+            LOG.warning(
+                "[ADMISSION] Queue over capacity: shed %d new and evicted %d queued medium/low actions",
+                len(shed),
+                evicted,
+            )
+        return result
+
+    def _pick_victim(self, action_type: str, taken: List[str]) -> Optional[str]:
+        """Lowest-priority unclaimed pending action, preferring the same type."""
+        for scope in (action_type, None):
+            for action_id in self.db.get_sheddable_actions(scope, limit=len(taken) + 1):
+                if action_id not in taken:
+                    return action_id
+        return None
+
+    def llm_queue_full(self) -> bool:
+        """Whether the LLM task queue is at its cap (callers should not enqueue more)."""
+        try:
+            return self.db.get_llm_queue_length() >= LLM_TASK_MAX_PENDING
+        except Exception:
+            return False
+
+    # ==========================================================================
+    # Dispatch
+    # ==========================================================================
+
+    def llm_pressure(self) -> bool:
+        """True while the shared Gemini quota is blocked or empty (see scripts/rate_limiter.py)."""
+        now = time.time()
+        try:
+            buckets = self.db.get_rate_buckets()
+        except Exception:
+            return False
+        for bucket in buckets:
+            if not str(bucket.get("name", "")).startswith("gemini:"):
+                continue
+            if (bucket.get("blocked_until") or 0) > now:
+                return True
+            refilled = bucket["tokens"] + max(0.0, now - bucket["updated_at"]) * bucket["refill_per_sec"]
+            if bucket["name"].endswith(":rpm") and min(bucket["capacity"], refilled) < 1:
+                return True
+        return False
+
+    def dispatch_budget(self, slots: int) -> Dict[str, int]:
+        """Max medium/low actions per type for a batch of `slots` (for get_ready_actions)."""
+        share = max(1, math.ceil(slots * TYPE_SHARE))
+        budget = {action_type: share for action_type in self.type_limits}
+        if self.llm_pressure():
+            for action_type in LLM_ACTION_TYPES:
+                budget[action_type] = 0
+        return budget
+
+    # ==========================================================================
+    # Gauges
+    # ==========================================================================
+
+    def pressure(self) -> Dict[str, Any]:
+        """Queue-pressure gauges for health checks and dashboards."""
+        now = datetime.now()
+        by_type: Dict[str, Dict[str, Any]] = {}
+        by_priority: Dict[str, Dict[str, Any]] = {}
+        total = 0
+        for row in self.db.get_action_queue_depths():
+            total += row["count"]
+            t = by_type.setdefault(row["action_type"], {"pending": 0})
+            t["pending"] += row["count"]
+            p = by_priority.setdefault(row["priority"], {"pending": 0, "oldest_wait_s": 0})
+            p["pending"] += row["count"]
+            try:
+                wait = (now - datetime.fromisoformat(row["oldest_created_at"])).total_seconds()
+                p["oldest_wait_s"] = max(p["oldest_wait_s"], round(wait))
+            except (TypeError, ValueError):
+                pass
+
+        for name, gauge in by_type.items():
+            gauge["limit"] = self.type_limits.get(name, self.max_pending)
+            gauge["utilization"] = round(gauge["pending"] / max(gauge["limit"], 1), 3)
+        for name, gauge in by_priority.items():
+            gauge["limit"] = self.priority_limits.get(name)
+            if gauge["limit"]:
+                gauge["utilization"] = round(gauge["pending"] / gauge["limit"], 3)
+
+        try:
+            llm_tasks = self.db.get_llm_queue_length()
+        except Exception:
+            llm_tasks = None
+        return {
+            "pending": total,
+            "max_pending": self.max_pending,
+            "utilization": round(total / max(self.max_pending, 1), 3),
+            "by_type": by_type,
+            "by_priority": by_priority,
+            "llm_tasks": llm_tasks,
+            "llm_task_limit": LLM_TASK_MAX_PENDING,
+            "llm_pressure": self.llm_pressure(),
+            "stats": dict(self.stats),
+        }
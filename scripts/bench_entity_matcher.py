@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Benchmark entity extraction on large (backfilled) reports.
+
+Compares:
+  legacy   - the former InsightsExtractor.extract_entities: one re.search per
+             known entity per sentence, plus three whole-document regex scans
+             for every sentence hit to score relevance
+  matcher  - scripts/entity_matcher.EntityMatcher: one Aho-Corasick pass over
+             the report collects sentences, mentions and header/bold context
+
+Reports are synthetic daily analyses concatenated into a backfill of the
+requested size (or the markdown files under --reports, repeated to size).
+Both implementations must return identical entities (name, type, context,
+relevance, mention count); the run fails otherwise.
+
+    python scripts/bench_entity_matcher.py --kb 10,50,100
+    python scripts/bench_entity_matcher.py --reports output/reports --kb 200
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.insights_engine import KNOWN_ENTITIES, EntityInsight, InsightsExtractor
+
+TEMPLATE = """
+## {day}: Market Context
+
+The {inst} meeting is critical for {asset}. Recent comments from {person} suggest a hawkish stance.
+Monitor the {ind} print closely - consensus sits near {num}%. **{asset} remains the key hedge.**
+
+## Key Levels to Watch
+
+- Support at ${level:,} is important while {inst2} flows stay positive
+- Watch for breakout above ${level2:,} as {event} approaches!
+Analysts at {inst2} expect {ind} to soften. Positioning in {asset} is stretched? Maybe not.
+"""
+
+
+def make_backfill(kb: int, reports_dir: str = None) -> str:
+    if reports_dir:
+        texts = [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(Path(reports_dir).rglob("*.md"))]
+        if not texts:
+            raise SystemExit(f"No markdown reports under {reports_dir}")
+        parts, size, i = [], 0, 0
+        while size < kb * 1024:
+            parts.append(texts[i % len(texts)])
+            size += len(parts[-1])
+            i += 1
+        return "\n".join(parts)
+
+    rng = random.Random(kb)
+    pools = {k: list(v) for k, v in KNOWN_ENTITIES.items()}
+    parts, size, day = [], 0, 0
+    while size < kb * 1024:
+        day += 1
+        parts.append(
+            TEMPLATE.format(
+                day=f"Day {day}",
+                inst=rng.choice(pools["institutions"]),
+                inst2=rng.choice(pools["institutions"]),
+                asset=rng.choice(pools["assets"]),
+                person=rng.choice(pools["persons"]),
+                ind=rng.choice(pools["indicators"]),
+                event=rng.choice(pools["events"]),
+                num=round(rng.uniform(1, 5), 2),
+                level=rng.randrange(3000, 5000),
+                level2=rng.randrange(3000, 5000),
+            )
+        )
+        size += len(parts[-1])
+    return "".join(parts)
+
+
+def legacy_extract_entities(report_content: str, report_name: str) -> list:
+    """The per-entity, per-sentence extraction previously in InsightsExtractor."""
+    entities, cache = [], {}
+
+    def relevance(entity, sentence, full_content):
+        score = 0.5
+        if re.search(rf"(?:##.*{re.escape(entity)}|{re.escape(entity)}.*##)", full_content, re.IGNORECASE):
+            score += 0.2
+        if re.search(rf"\*\*.*{re.escape(entity)}.*\*\*", full_content, re.IGNORECASE):
+            score += 0.1
+        action_keywords = ["watch", "monitor", "key", "critical", "important", "catalyst", "trigger"]
+        if any(kw in sentence.lower() for kw in action_keywords):
+            score += 0.15
+        mentions = len(re.findall(rf"\b{re.escape(entity)}\b", full_content, re.IGNORECASE))
+        score += min(mentions * 0.05, 0.2)
+        return min(score, 1.0)
+
+    sentences = re.split(r"[.!?]\s+", report_content)
+    for entity_type, entity_list in KNOWN_ENTITIES.items():
+        for entity in entity_list:
+            pattern = rf"\b{re.escape(entity)}\b"
+            for sentence in sentences:
+                if re.search(pattern, sentence, re.IGNORECASE):
+                    score = relevance(entity, sentence, report_content)
+                    key = f"{entity}:{report_name}"
+                    if key not in cache:
+                        insight = EntityInsight(
+                            entity_name=entity,
+                            entity_type=entity_type.rstrip("s"),
+                            context=sentence.strip()[:500],
+                            relevance_score=score,
+                            source_report=report_name,
+                            metadata={"mentions": 1},
+                        )
+                        entities.append(insight)
+                        cache[key] = insight
+                    else:
+                        cache[key].metadata["mentions"] += 1
+    return entities
+
+
+def matcher_extract_entities(report_content: str, report_name: str) -> list:
+    extractor = InsightsExtractor(None, logging.getLogger("bench"))
+    return extractor.extract_entities(report_content, report_name)
+
+
+def _signature(entities: list) -> list:
+    return [
+        (e.entity_name, e.entity_type, e.context, round(e.relevance_score, 6), e.metadata["mentions"]) for e in entities
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs single-pass entity extraction")
+    parser.add_argument("--kb", default="10,50,100", help="Comma-separated backfill sizes in KB")
+    parser.add_argument("--reports", help="Directory of markdown reports to build the backfill from")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best time is reported)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    logging.getLogger("bench").setLevel(logging.WARNING)
+
+    results = []
+    for kb in [int(x) for x in args.kb.split(",") if x.strip()]:
+        doc = make_backfill(kb, args.reports)
+        expected = _signature(legacy_extract_entities(doc, "backfill"))
+        actual = _signature(matcher_extract_entities(doc, "backfill"))
+        if expected != actual:
+            print(f"MISMATCH at {kb} KB: legacy {len(expected)} entities, matcher {len(actual)}", file=sys.stderr)
+            return 1
+
+        legacy = _time(lambda: legacy_extract_entities(doc, "backfill"), args.repeat)
+        matcher = _time(lambda: matcher_extract_entities(doc, "backfill"), args.repeat)
+        results.append(
+            {
+                "kb": round(len(doc) / 1024, 1),
+                "sentences": len(re.split(r"[.!?]\s+", doc)),
+                "entities": len(actual),
+                "legacy_ms": round(legacy * 1000, 2),
+                "matcher_ms": round(matcher * 1000, 2),
+                "matcher_us_per_kb": round(matcher * 1e6 / max(len(doc) / 1024, 0.001), 1),
+                "speedup": round(legacy / matcher, 1) if matcher > 0 else 0.0,
+            }
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'KB':>7} {'sentences':>9} {'entities':>8} {'legacy ms':>10} {'matcher ms':>10} {'us/KB':>7} {'speedup':>8}"
+        )
+        for r in results:
+            print(
+                f"{r['kb']:>7} {r['sentences']:>9} {r['entities']:>8} {r['legacy_ms']:>10} {r['matcher_ms']:>10} "
+                f"{r['matcher_us_per_kb']:>7} {r['speedup']:>7}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
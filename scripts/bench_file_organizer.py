@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Benchmark the FileOrganizer catalog as the output tree grows.
+
+Compares:
+  legacy   - the former file_index.json: parsed in full on startup,
+             rewritten in full (indent=2) after each organize pass,
+             scanned linearly by get_recent_files
+  catalog  - the organizer_files table (scripts/file_organizer): each pass
+             upserts only the files it placed, queries use the indexes
+
+For each --entries size the catalog is pre-filled with that many entries
+spread over three years. Then one maintenance-sized pass is timed:
+startup, an organize pass of --new files, get_recent_files and the
+FILE_INDEX.md report. Both must return the same recent files; the run
+fails otherwise.
+
+    python scripts/bench_file_organizer.py
+    python scripts/bench_file_organizer.py --entries 10000,50000 --new 100
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_manager import DatabaseManager  # noqa: E402
+from scripts.file_organizer import FileOrganizer  # noqa: E402
+
+CATEGORIES = ["journals", "premarket", "weekly", "research", "charts", "economic"]
+
+
+class LegacyIndex:
+    """The JSON index handling previously in FileOrganizer."""
+
+    def __init__(self, index_file: Path):
+        self.index_file = index_file
+        with open(index_file, "r", encoding="utf-8") as f:
+            self.file_index = json.load(f)
+
+    def add(self, path: str, info: dict):
+        self.file_index["files"][path] = info
+        self.file_index["categories"].setdefault(info["category"], []).append(path)
+
+    def save(self):
+        self.file_index["last_updated"] = datetime.now().isoformat()
+        stats = self.file_index["statistics"]
+        stats["total_files"] = len(self.file_index["files"])
+        stats["by_category"] = {c: len(files) for c, files in self.file_index["categories"].items()}
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            json.dump(self.file_index, f, indent=2)
+
+    def get_recent_files(self, category=None, days=7):
+        cutoff = (date.today() - timedelta(days=days)).isoformat()
+        recent = []
+        for file_path, info in self.file_index["files"].items():
+            if info.get("archived"):
+                continue
+            if category and info.get("category") != category:
+                continue
+            if info.get("date", "") >= cutoff:
+                recent.append({"path": file_path, **info})
+        recent.sort(key=lambda x: x.get("date", ""), reverse=True)
+        return recent
+
+
+def make_entries(root: Path, count: int, offset: int = 0, days: int = 3 * 365) -> list:
+    rng = random.Random(count + offset)
+    today = date.today()
+    entries = []
+    for i in range(offset, offset + count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        file_date = (today - timedelta(days=rng.randrange(days))).isoformat()
+        entries.append(
+            {
+                "path": str(root / "reports" / category / f"{category}_{i:06d}_{file_date}.md"),
+                "original_name": f"{category}_{i}.md",
+                "category": category,
+                "file_date": file_date,
+                "organized_at": f"{file_date}T06:00:{i % 60:02d}",
+                "size_bytes": 20000 + i % 5000,
+                "content_hash": f"{i:064x}",
+                "archived": i % 5 == 0,
+            }
+        )
+    return entries
+
+
+def _legacy_info(entry: dict) -> dict:
+    info = {k: entry[k] for k in ("original_name", "category", "organized_at", "size_bytes")}
+    info["date"] = entry["file_date"]
+    if entry["archived"]:
+        info["archived"] = True
+    return info
+
+
+def _recent_key(files: list) -> list:
+    return sorted((f["path"], f["date"]) for f in files)
+
+
+def run_case(entries: int, new: int, days: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "output"
+        root.mkdir()
+        existing = make_entries(root, entries)
+        incoming = make_entries(root, new, offset=entries, days=1)
+
+        # Legacy: JSON file with the existing entries
+        index_file = Path(tmp) / "file_index.json"
+        legacy_data = {"files": {}, "categories": {c: [] for c in CATEGORIES}, "last_updated": None}
+        legacy_data["statistics"] = {"total_files": 0, "total_archived": 0, "by_category": {}}
+        index_file.write_text(json.dumps(legacy_data))
+        legacy = LegacyIndex(index_file)
+        for e in existing:
+            legacy.add(e["path"], _legacy_info(e))
+        legacy.save()
+
+        timings = {}
+        start = time.perf_counter()
+        legacy = LegacyIndex(index_file)
+        timings["legacy_load_ms"] = time.perf_counter() - start
+        start = time.perf_counter()
+        for e in incoming:
+            legacy.add(e["path"], _legacy_info(e))
+        legacy.save()
+        timings["legacy_save_ms"] = time.perf_counter() - start
+        start = time.perf_counter()
+        legacy_recent = legacy.get_recent_files(days=days)
+        timings["legacy_recent_ms"] = time.perf_counter() - start
+
+        # Catalog: table with the same entries
+        db = DatabaseManager(db_path=Path(tmp) / "catalog.db")
+        config = type("Config", (), {"OUTPUT_DIR": str(root)})()
+        FileOrganizer(config, logging.getLogger("bench"), db=db)
+        db.upsert_organizer_files(str(root), existing)
+
+        start = time.perf_counter()
+        organizer = FileOrganizer(config, logging.getLogger("bench"), db=db)
+        timings["catalog_load_ms"] = time.perf_counter() - start
+        start = time.perf_counter()
+        organizer._pending.extend(incoming)
+        organizer._save_index()
+        timings["catalog_save_ms"] = time.perf_counter() - start
+        start = time.perf_counter()
+        catalog_recent = organizer.get_recent_files(days=days)
+        timings["catalog_recent_ms"] = time.perf_counter() - start
+        start = time.perf_counter()
+        organizer.generate_index_report()
+        timings["catalog_report_ms"] = time.perf_counter() - start
+
+        if _recent_key(legacy_recent) != _recent_key(catalog_recent):
+            raise SystemExit(f"MISMATCH at {entries} entries: recent files differ")
+
+        return {
+            "entries": entries,
+            "json_kb": round(index_file.stat().st_size / 1024),
+            "recent": len(catalog_recent),
+            **{k: round(v * 1000, 2) for k, v in timings.items()},
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON file index vs the organizer_files table")
+    parser.add_argument("--entries", default="1000,10000,50000", help="Comma-separated catalog sizes")
+    parser.add_argument("--new", type=int, default=50, help="Files placed by the timed organize pass")
+    parser.add_argument("--days", type=int, default=7, help="get_recent_files window")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+    logging.getLogger("bench").setLevel(logging.WARNING)
+
+    results = [run_case(int(n), args.new, args.days) for n in args.entries.split(",") if n.strip()]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'entries':>8} {'json KB':>8} | {'load':>15} | {'save':>15} | {'recent':>15} | {'report':>7}  (ms)")
+    print(f"{'':>8} {'':>8} | {'legacy  catalog':>15} | {'legacy  catalog':>15} | {'legacy  catalog':>15} |")
+    for r in results:
+        print(
+            f"{r['entries']:>8} {r['json_kb']:>8} | {r['legacy_load_ms']:>7} {r['catalog_load_ms']:>7} | "
+            f"{r['legacy_save_ms']:>7} {r['catalog_save_ms']:>7} | "
+            f"{r['legacy_recent_ms']:>7} {r['catalog_recent_ms']:>7} | {r['catalog_report_ms']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Benchmark frontmatter status queries over an output tree.
+
+Compares, for "which documents are pending AI" and "which are ready to sync":
+  legacy  - the former get_pending_documents / publish loop: read every file
+            in full and split the whole content on '---'
+  header  - scripts/frontmatter.read_frontmatter: read each file only up to
+            the closing '---'
+  index   - scripts/frontmatter.DocumentStatusIndex.scan: one query, a stat
+            per file, and a header read for files changed since the last
+            scan (cold = empty index, warm = unchanged tree, touched = --touch
+            percent of the files rewritten)
+
+The tree is synthetic (--files documents of --kb KB each, mixed statuses) in
+a temporary directory, indexed in a temporary database. All three must
+select the same documents; the run fails otherwise.
+
+    python scripts/bench_frontmatter_index.py
+    python scripts/bench_frontmatter_index.py --files 20000 --kb 40 --touch 2
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from db_manager import DatabaseManager  # noqa: E402
+from scripts.frontmatter import DocumentStatusIndex, read_frontmatter  # noqa: E402
+
+STATUSES = ["draft", "draft", "in_progress", "review", "published", "published", "published"]
+BODY_LINE = "Gold held support at $4,012 while the dollar softened; **bias: bullish** into the Fed.\n"
+
+
+def legacy_parse_frontmatter(content: str) -> dict:
+    """The frontmatter keys of the former parse_frontmatter (whole-content split)."""
+    if not content.strip().startswith("---"):
+        return {}
+    parts = content.split("---", 2)
+    if len(parts) < 3:
+        return {}
+    frontmatter = {}
+    for line in parts[1].strip().split("\n"):
+        if ":" in line:
+            key, value = line.split(":", 1)
+            value = value.strip()
+            if value.lower() in ("true", "false"):
+                value = value.lower() == "true"
+            frontmatter[key.strip()] = value
+    return frontmatter
+
+
+def make_tree(root: Path, files: int, kb: int) -> list:
+    rng = random.Random(files)
+    body = BODY_LINE * max(1, kb * 1024 // len(BODY_LINE))
+    paths = []
+    for i in range(files):
+        folder = root / ("reports" if i % 3 else "journals") / f"2026-{i % 12 + 1:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        status = rng.choice(STATUSES)
+        header = f"---\ntitle: Report {i}\ntype: reports\nstatus: {status}\nai_processed: {str(i % 4 != 0).lower()}\n"
+        if status == "published" and i % 2:
+            header += f"notion_page_id: page-{i}\nsync_status: synced\n"
+        path = folder / f"report_{i:06d}.md"
+        path.write_text(header + "---\n\n# Report\n\n" + body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _select(records) -> tuple:
+    pending, ready = set(), set()
+    for path, fm in records:
+        status = fm.get("status", "draft")
+        if status == "draft" and (not fm.get("ai_processed", False) or fm.get("pending_reason")):
+            pending.add(path)
+        if status in ("published", "complete"):
+            ready.add(path)
+    return pending, ready
+
+
+def legacy_query(root: Path) -> tuple:
+    return _select(
+        (os.path.abspath(p), legacy_parse_frontmatter(p.read_text(encoding="utf-8"))) for p in root.glob("**/*.md")
+    )
+
+
+def header_query(root: Path) -> tuple:
+    return _select((os.path.abspath(p), read_frontmatter(p)) for p in root.glob("**/*.md"))
+
+
+def index_query(index: DocumentStatusIndex, root: Path) -> tuple:
+    records = []
+    for entry in index.scan(root):
+        fm = {k: entry[k] for k in ("status", "ai_processed", "pending_reason") if entry[k] is not None}
+        records.append((entry["path"], fm))
+    return _select(records)
+
+
+def _time(fn, repeat: int = 1) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark full reads vs header reads vs the status index")
+    parser.add_argument("--files", type=int, default=5000, help="Documents in the synthetic tree")
+    parser.add_argument("--kb", type=int, default=20, help="Body size of each document in KB")
+    parser.add_argument("--touch", type=float, default=1.0, help="Percent of files rewritten before the last scan")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of the read-only queries (best time is reported)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "output"
+        paths = make_tree(root, args.files, args.kb)
+        index = DocumentStatusIndex(DatabaseManager(db_path=Path(tmp) / "bench.db"))
+
+        timings = {}
+        timings["legacy"], expected = _time(lambda: legacy_query(root), args.repeat)
+        timings["header"], header = _time(lambda: header_query(root), args.repeat)
+        timings["index_cold"], cold = _time(lambda: index_query(index, root))
+        timings["index_warm"], warm = _time(lambda: index_query(index, root), args.repeat)
+
+        touched = paths[:: max(1, int(100 / args.touch))] if args.touch > 0 else []
+        for path in touched:
+            content = path.read_text(encoding="utf-8").replace("status: draft", "status: review", 1)
+            path.write_text(content, encoding="utf-8")
+        timings["legacy_touched"], expected_touched = _time(lambda: legacy_query(root), args.repeat)
+        timings["index_touched"], touched_result = _time(lambda: index_query(index, root))
+
+        if not (expected == header == cold == warm) or touched_result != expected_touched:
+            print("MISMATCH: the status queries selected different documents", file=sys.stderr)
+            return 1
+
+    result = {
+        "files": args.files,
+        "kb_per_file": args.kb,
+        "touched": len(touched),
+        "pending": len(expected_touched[0]),
+        "ready": len(expected_touched[1]),
+        **{f"{k}_ms": round(v * 1000, 1) for k, v in timings.items()},
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{result['files']} files x {result['kb_per_file']} KB, {result['touched']} touched")
+        for name in ("legacy", "header", "index_cold", "index_warm", "legacy_touched", "index_touched"):
+            print(f"  {name:<15} {result[name + '_ms']:>10} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for continuous batching on the local llama.cpp backend.
+
+Submits the same workload at several batch sizes (concurrent sequence slots)
+and reports generated tokens/sec for each. Run on CPU with e.g.:
+
+    LOCAL_LLM_GPU_LAYERS=0 python scripts/bench_llm_batching.py \\
+        --model ~/.cache/syndicate/models/Phi-3-mini-4k-instruct-q4.gguf \\
+        --batch-sizes 1,4,8 --requests 16 --max-tokens 64
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.local_llm import LLMConfig, LocalLLM
+from scripts.local_llm_batch import ContinuousBatcher, LlamaCppBatchEngine
+
+PROMPTS = [
+    "Summarize today's gold price action in two sentences.",
+    "List three drivers of silver demand.",
+    "Explain what a rising DXY usually means for gold.",
+    "Describe the gold/silver ratio in one paragraph.",
+    "What does an inverted yield curve signal?",
+    "Give a short definition of real interest rates.",
+    "Why do central banks buy gold?",
+    "Explain how VIX spikes affect precious metals.",
+]
+
+
+def run_batch_size(llm: LocalLLM, n_slots: int, n_requests: int, max_tokens: int, n_ctx_per_seq: int) -> dict:
+    engine = LlamaCppBatchEngine(llm._llama, n_slots=n_slots, n_ctx_per_seq=n_ctx_per_seq)
+    batcher = ContinuousBatcher(engine, n_slots=n_slots, seed=0)
+    try:
+        start = time.perf_counter()
+        futures = [
+            batcher.submit(PROMPTS[i % len(PROMPTS)], max_tokens=max_tokens, temperature=0.0)
+            for i in range(n_requests)
+        ]
+        completions = [f.result() for f in futures]
+        elapsed = time.perf_counter() - start
+    finally:
+        batcher.close()
+        engine.close()
+
+    tokens = sum(c.completion_tokens for c in completions)
+    latencies = sorted(c.queue_time_ms + c.generation_time_ms for c in completions)
+    return {
+        "batch_size": n_slots,
+        "requests": n_requests,
+        "completion_tokens": tokens,
+        "elapsed_s": round(elapsed, 3),
+        "tokens_per_sec": round(tokens / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_latency_ms": round(latencies[len(latencies) // 2], 1),
+        "decode_calls": batcher.stats["decode_calls"],
+        "avg_tokens_per_decode": round(batcher.stats["batched_tokens"] / max(1, batcher.stats["decode_calls"]), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark continuous batching throughput (tokens/sec)")
+    parser.add_argument("--model", default=os.environ.get("LOCAL_LLM_MODEL", ""), help="Path to GGUF model")
+    parser.add_argument("--batch-sizes", default="1,4,8", help="Comma-separated slot counts")
+    parser.add_argument("--requests", type=int, default=16, help="Requests per batch size")
+    parser.add_argument("--max-tokens", type=int, default=64, help="Tokens generated per request")
+    parser.add_argument("--ctx", type=int, default=1024, help="Context window per sequence")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    if not args.model:
+        print("No model given. Use --model or set LOCAL_LLM_MODEL.")
+        return 2
+
+    llm = LocalLLM(config=LLMConfig(n_ctx=args.ctx, n_gpu_layers=0))
+    if not llm.load_model(args.model) or llm.backend != "llama-cpp-python":
+        print("Benchmark requires llama-cpp-python and a loadable GGUF model.")
+        return 2
+
+    results = []
+    for size in [int(s) for s in args.batch_sizes.split(",") if s.strip()]:
+        results.append(run_batch_size(llm, size, args.requests, args.max_tokens, args.ctx))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"\nModel: {llm.model_name}  requests={args.requests}  max_tokens={args.max_tokens}")
+        print(f"{'batch':>6} {'tokens':>8} {'secs':>8} {'tok/s':>9} {'p50 ms':>9} {'tok/decode':>11}")
+        for r in results:
+            print(
+                f"{r['batch_size']:>6} {r['completion_tokens']:>8} {r['elapsed_s']:>8} "
+                f"{r['tokens_per_sec']:>9} {r['p50_latency_ms']:>9} {r['avg_tokens_per_decode']:>11}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
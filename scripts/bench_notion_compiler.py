@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""Benchmark Markdown -> Notion block compilation on the largest reports.
+
+Compares:
+  legacy    - the former converters: NotionPublisher.markdown_to_blocks and
+              NotionFormatter._process_lines, each a chain of re.match calls
+              per line, re-run for every conversion
+  compiler  - scripts/notion_formatter: one tokenizer pass with a single
+              line regex (cold: cache cleared before each conversion)
+  cached    - the same document version converted again (dry-run validation
+              followed by the publish): a content-hash cache hit
+
+Documents are the largest markdown files under --dirs (default: output/ and
+docs/), or --files. Both block styles must be identical to the legacy
+output for every document; the run fails otherwise.
+
+    python scripts/bench_notion_compiler.py
+    python scripts/bench_notion_compiler.py --files output/reports/weekly.md --repeat 50
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.notion_formatter import (  # noqa: E402
+    NotionFormatter,
+    bulleted_list_item,
+    callout_block,
+    clear_compile_cache,
+    code_block,
+    color_for_bias,
+    compile_markdown,
+    detect_bias_in_text,
+    divider_block,
+    format_for_notion,
+    get_section_emoji,
+    heading_block,
+    numbered_list_item,
+    paragraph_block,
+    parse_markdown_table,
+    quote_block,
+    table_block,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def legacy_markdown_to_blocks(content: str) -> list:
+    """The former NotionPublisher.markdown_to_blocks."""
+    blocks = []
+    lines = content.split("\n")
+    i = 0
+
+    def parse_rich_text(text: str) -> list:
+        """Parse inline markdown to rich text annotations."""
+        rich_texts = []
+
+        # Simple approach: split by bold/italic markers
+        # For now, just detect **bold** and *italic*
+        parts = re.split(r"(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)", text)
+
+        for part in parts:
+            if not part:
+                continue
+
+            if part.startswith("**") and part.endswith("**"):
+                rich_texts.append({"type": "text", "text": {"content": part[2:-2]}, "annotations": {"bold": True}})
+            elif part.startswith("*") and part.endswith("*") and not part.startswith("**"):
+                rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"italic": True}})
+            elif part.startswith("`") and part.endswith("`"):
+                rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"code": True}})
+            else:
+                rich_texts.append({"type": "text", "text": {"content": part}})
+
+        return rich_texts if rich_texts else [{"type": "text", "text": {"content": text}}]
+
+    while i < len(lines):
+        line = lines[i]
+
+        # Skip frontmatter (YAML between ---)
+        if line.strip() == "---" and i == 0:
+            i += 1
+            while i < len(lines) and lines[i].strip() != "---":
+                i += 1
+            i += 1  # Skip closing ---
+            continue
+
+        # Skip empty lines
+        if not line.strip():
+            i += 1
+            continue
+
+        # Headers
+        header_match = re.match(r"^(#{1,3})\s+(.+)$", line)
+        if header_match:
+            level = len(header_match.group(1))
+            text = header_match.group(2)
+            block_type = f"heading_{level}"
+
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": block_type,
+                    block_type: {"rich_text": parse_rich_text(text)},
+                }
+            )
+            i += 1
+            continue
+
+        # Tables (convert to code block for better display)
+        if line.startswith("|") and i + 1 < len(lines) and lines[i + 1].startswith("|"):
+            table_lines = []
+            while i < len(lines) and lines[i].startswith("|"):
+                # Skip separator rows (|---|---|)
+                if not re.match(r"^\|[-:\s|]+\|$", lines[i]):
+                    table_lines.append(lines[i])
+                i += 1
+
+            if table_lines:
+                # Create a simple formatted table
+                blocks.append(
+                    {
+                        "object": "block",
+                        "type": "code",
+                        "code": {
+                            "rich_text": [{"type": "text", "text": {"content": "\n".join(table_lines)}}],
+                            "language": "plain text",
+                        },
+                    }
+                )
+            continue
+
+        # Code blocks
+        if line.startswith("```"):
+            language = line[3:].strip() or "plain text"
+            code_lines = []
+            i += 1
+
+            while i < len(lines) and not lines[i].startswith("```"):
+                code_lines.append(lines[i])
+                i += 1
+            i += 1  # Skip closing ```
+
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "code",
+                    "code": {
+                        "rich_text": [{"type": "text", "text": {"content": "\n".join(code_lines)}}],
+                        "language": language.lower()
+                        if language.lower() in ["python", "javascript", "json", "markdown", "sql", "bash"]
+                        else "plain text",
+                    },
+                }
+            )
+            continue
+
+        # Callout (> **text** format often used for metadata)
+        if line.startswith("> **"):
+            # Collect all blockquote lines
+            quote_lines = []
+            while i < len(lines) and lines[i].startswith(">"):
+                quote_lines.append(re.sub(r"^>\s*", "", lines[i]))
+                i += 1
+
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "callout",
+                    "callout": {
+                        "rich_text": parse_rich_text("\n".join(quote_lines)),
+                        "icon": {"emoji": "📊"},
+                        "color": "gray_background",
+                    },
+                }
+            )
+            continue
+
+        # Regular blockquote
+        if line.startswith(">"):
+            text = re.sub(r"^>\s*", "", line)
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "quote",
+                    "quote": {"rich_text": parse_rich_text(text)},
+                }
+            )
+            i += 1
+            continue
+
+        # Bullet list
+        if re.match(r"^[-*]\s+", line):
+            text = re.sub(r"^[-*]\s+", "", line)
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "bulleted_list_item",
+                    "bulleted_list_item": {"rich_text": parse_rich_text(text)},
+                }
+            )
+            i += 1
+            continue
+
+        # Numbered list
+        num_match = re.match(r"^\d+\.\s+(.+)$", line)
+        if num_match:
+            blocks.append(
+                {
+                    "object": "block",
+                    "type": "numbered_list_item",
+                    "numbered_list_item": {"rich_text": parse_rich_text(num_match.group(1))},
+                }
+            )
+            i += 1
+            continue
+
+        # Horizontal rule
+        if re.match(r"^---+$", line) or re.match(r"^\*\*\*+$", line):
+            blocks.append({"object": "block", "type": "divider", "divider": {}})
+            i += 1
+            continue
+
+        # Default: paragraph with rich text
+        blocks.append(
+            {
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {"rich_text": parse_rich_text(line)},
+            }
+        )
+        i += 1
+
+    return blocks
+
+
+class LegacyFormatter(NotionFormatter):
+    """NotionFormatter with the former line-by-line _process_lines."""
+
+    def _process_lines(self, lines: list):
+        """Process markdown lines into blocks."""
+        i = 0
+        _current_section = []  # Reserved for future section grouping
+
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            # Skip empty lines between sections
+            if not stripped:
+                i += 1
+                continue
+
+            # Headers
+            header_match = re.match(r"^(#{1,3})\s+(.+)$", stripped)
+            if header_match:
+                level = len(header_match.group(1))
+                text = header_match.group(2)
+
+                # Style headers based on content
+                color = "default"
+                bias = detect_bias_in_text(text)
+                if bias:
+                    color = color_for_bias(bias)
+
+                # Add emoji for H2 sections
+                if level == 2:
+                    emoji = get_section_emoji(text)
+                    text = f"{emoji} {text}"
+
+                self.blocks.append(heading_block(level, text, color=color))
+                i += 1
+                continue
+
+            # Horizontal rule / divider
+            if re.match(r"^---+$", stripped) or re.match(r"^\*\*\*+$", stripped):
+                self.blocks.append(divider_block())
+                i += 1
+                continue
+
+            # Code blocks
+            if stripped.startswith("```"):
+                language = stripped[3:].strip() or "plain text"
+                code_lines = []
+                i += 1
+
+                while i < len(lines) and not lines[i].strip().startswith("```"):
+                    code_lines.append(lines[i])
+                    i += 1
+                i += 1  # Skip closing ```
+
+                self.blocks.append(code_block("\n".join(code_lines), language))
+                continue
+
+            # Tables
+            if stripped.startswith("|"):
+                rows, i = parse_markdown_table(lines, i)
+                if rows:
+                    self.blocks.extend(table_block(rows))
+                continue
+
+            # Blockquotes - convert to callouts
+            if stripped.startswith(">"):
+                quote_text = re.sub(r"^>\s*", "", stripped)
+
+                # Detect if it's a special callout
+                if any(word in quote_text.lower() for word in ["warning", "caution", "alert"]):
+                    self.blocks.append(callout_block(quote_text, emoji="⚠️", color="yellow_background"))
+                elif any(word in quote_text.lower() for word in ["note", "info", "tip"]):
+                    self.blocks.append(callout_block(quote_text, emoji="💡", color="blue_background"))
+                elif any(word in quote_text.lower() for word in ["important", "key"]):
+                    self.blocks.append(callout_block(quote_text, emoji="🔑", color="orange_background"))
+                else:
+                    self.blocks.append(quote_block(quote_text))
+
+                i += 1
+                continue
+
+            # Bullet lists with special handling
+            bullet_match = re.match(r"^[-*]\s+(.+)$", stripped)
+            if bullet_match:
+                text = bullet_match.group(1)
+                color = "default"
+
+                # Color based on content
+                if any(word in text.lower() for word in ["bullish", "positive", "support", "strength"]):
+                    color = "green"
+                elif any(word in text.lower() for word in ["bearish", "negative", "resistance", "weakness"]):
+                    color = "red"
+                elif any(word in text.lower() for word in ["neutral", "consolidat"]):
+                    color = "yellow"
+
+                self.blocks.append(bulleted_list_item(text, color=color))
+                i += 1
+                continue
+
+            # Numbered lists
+            num_match = re.match(r"^\d+\.\s+(.+)$", stripped)
+            if num_match:
+                self.blocks.append(numbered_list_item(num_match.group(1)))
+                i += 1
+                continue
+
+            # Regular paragraphs - detect and color special content
+            color = "default"
+            bias = detect_bias_in_text(stripped)
+            if bias:
+                color = color_for_bias(bias)
+
+            # Highlight key metrics
+            if re.search(r"\b(RSI|ADX|ATR|SMA|EMA|MACD)\b", stripped):
+                color = "blue"
+            elif re.search(r"\$[\d,]+", stripped):  # Price mentions
+                color = "green"
+
+            self.blocks.append(paragraph_block(stripped, color=color))
+            i += 1
+
+
+def legacy_format_for_notion(content: str, doc_type: str) -> list:
+    return LegacyFormatter().format_document(content, doc_type)
+
+
+def find_documents(dirs: list, count: int) -> list:
+    files = [p for d in dirs for p in Path(d).rglob("*.md") if p.is_file()]
+    return sorted(files, key=lambda p: p.stat().st_size, reverse=True)[:count]
+
+
+def _time(fn, repeat: int, before=None) -> float:
+    total = 0.0
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Markdown -> Notion block compilation")
+    parser.add_argument("--dirs", default="output,docs", help="Comma-separated directories to take documents from")
+    parser.add_argument("--files", nargs="*", help="Markdown files to convert (instead of --dirs)")
+    parser.add_argument("--count", type=int, default=6, help="Largest documents to take from --dirs")
+    parser.add_argument("--repeat", type=int, default=20, help="Conversions timed per document")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    if args.files:
+        docs = [Path(f) for f in args.files]
+    else:
+        docs = find_documents([PROJECT_ROOT / d for d in args.dirs.split(",") if d.strip()], args.count)
+    if not docs:
+        raise SystemExit("No markdown documents found")
+
+    results = []
+    for path in docs:
+        content = path.read_text(encoding="utf-8", errors="ignore")
+        clear_compile_cache()
+        if compile_markdown(content) != legacy_markdown_to_blocks(content):
+            raise SystemExit(f"Basic blocks differ from the legacy converter: {path}")
+        if format_for_notion(content, doc_type="reports") != legacy_format_for_notion(content, "reports"):
+            raise SystemExit(f"Rich blocks differ from the legacy formatter: {path}")
+
+        row = {"file": path.name, "kb": round(len(content.encode("utf-8")) / 1024, 1)}
+        row["blocks"] = len(legacy_format_for_notion(content, "reports"))
+        for style, legacy, compiled in (
+            ("basic", lambda: legacy_markdown_to_blocks(content), lambda: compile_markdown(content)),
+            (
+                "rich",
+                lambda: legacy_format_for_notion(content, "reports"),
+                lambda: format_for_notion(content, doc_type="reports"),
+            ),
+        ):
+            row[f"{style}_legacy_ms"] = round(_time(legacy, args.repeat), 3)
+            row[f"{style}_compiler_ms"] = round(_time(compiled, args.repeat, before=clear_compile_cache), 3)
+            compiled()
+            row[f"{style}_cached_ms"] = round(_time(compiled, args.repeat), 3)
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(
+        f"{'document':<32} {'KB':>6} {'blocks':>6} | {'basic: legacy':>13} {'compiler':>8} {'cached':>7} |"
+        f" {'rich: legacy':>12} {'compiler':>8} {'cached':>7}   (ms per conversion)"
+    )
+    for r in results:
+        print(
+            f"{r['file'][:32]:<32} {r['kb']:>6} {r['blocks']:>6} | {r['basic_legacy_ms']:>13} "
+            f"{r['basic_compiler_ms']:>8} {r['basic_cached_ms']:>7} | {r['rich_legacy_ms']:>12} "
+            f"{r['rich_compiler_ms']:>8} {r['rich_cached_ms']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark revising already-published Notion pages against a local stand-in Notion API.
+
+Publishes --files long research notes, then runs --revisions rounds in which
+one paragraph of every note is edited and the outputs are synced again with
+--force. Uses the stand-in server of scripts/bench_notion_sync.py (rate limit,
+latency per request and per block sent).
+
+Compares:
+  republish  - NOTION_BLOCK_DIFF=0: each revision is published as a new page
+               and every block is sent again
+  diff       - each revision is applied to the existing page as a block diff
+               (the first one also looks up the ids of the page's blocks)
+
+Reports wall time, API requests and blocks sent per revision round, and
+checks that every page ends up with exactly the blocks of its revised file.
+
+    python scripts/bench_notion_revisions.py
+    python scripts/bench_notion_revisions.py --files 6 --sections 60 --revisions 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.bench_notion_sync import StandInNotion  # noqa: E402
+
+
+def make_notes(root: Path, files: int, sections: int) -> None:
+    """Synthetic published research notes of `sections` sections (5 blocks each)."""
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        lines = ["---", "type: research", "status: published", f"date: 2026-01-{i % 28 + 1:02d}", "---", ""]
+        lines.append(f"# Research note {i}")
+        for n in range(sections):
+            lines += ["", f"## Section {n}", "", f"paragraph {n} with observations and context for the note."]
+            lines += [f"- point {n}.a", f"- point {n}.b", f"- point {n}.c"]
+        (root / f"research_note_{i:03d}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def revise(root: Path, round_no: int, sections: int) -> None:
+    """Edit one paragraph of every note."""
+    n = (round_no * 7) % sections
+    for path in root.glob("*.md"):
+        text = path.read_text(encoding="utf-8")
+        start = text.index(f"paragraph {n} with")
+        end = text.index("\n", start)
+        path.write_text(text[:start] + f"paragraph {n} with observations, revised in round {round_no}." + text[end:])
+
+
+def pages_match(server: StandInNotion, root: Path) -> bool:
+    """Every note's current Notion page holds exactly the blocks of the file."""
+    from scripts.frontmatter import get_notion_page_id
+    from scripts.notion_formatter import format_for_notion
+
+    for path in root.glob("*.md"):
+        content = path.read_text(encoding="utf-8")
+        expected = [(b["type"], b[b["type"]]) for b in format_for_notion(content, doc_type="research")]
+        page_id = get_notion_page_id(content)
+        if page_id not in server.pages or server.page_blocks(page_id) != expected:
+            return False
+    return True
+
+
+def run_mode(server: StandInNotion, workdir: Path, name: str, args) -> list:
+    import scripts.cleanup_manager as cleanup_manager
+    from scripts import notion_publisher
+
+    outputs = workdir / name / "output"
+    make_notes(outputs, args.files, args.sections)
+    os.environ["GOLD_STANDARD_TEST_DB"] = str(workdir / name / "bench.db")
+    cleanup_manager.USAGE_FILE = workdir / name / "usage_stats.json"
+    notion_publisher.BLOCK_DIFF_ENABLED = name == "diff"
+    server.reset()
+
+    rows = []
+    for round_no in range(args.revisions + 1):
+        if round_no:
+            revise(outputs, round_no, args.sections)
+        server.reset(pages=False)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = notion_publisher.sync_all_outputs(str(outputs), force=True, workers=args.workers)
+        rows.append(
+            {
+                "mode": name,
+                "round": "publish" if round_no == 0 else f"revision {round_no}",
+                "seconds": round(time.perf_counter() - start, 2),
+                "requests": server.requests,
+                "throttled": server.throttled,
+                "blocks_sent": server.blocks_sent,
+                "failed": len(result["failed"]),
+                "pages_match": pages_match(server, outputs),
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Notion page revisions against a local stand-in API")
+    parser.add_argument("--files", type=int, default=4, help="Notes to publish and revise")
+    parser.add_argument("--sections", type=int, default=40, help="Sections per note (5 blocks each)")
+    parser.add_argument("--revisions", type=int, default=2, help="Revision rounds after the initial publish")
+    parser.add_argument("--workers", type=int, default=4, help="Files synced concurrently")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stand-in request latency in seconds")
+    parser.add_argument("--per-block", type=float, default=0.01, help="Extra latency per block sent (seconds)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    logging.getLogger("notion_client").setLevel(logging.ERROR)
+    logging.getLogger("rate_limiter").setLevel(logging.ERROR)
+    server = StandInNotion(latency=args.latency, per_block=args.per_block)
+    os.environ.update(
+        {
+            "NOTION_BASE_URL": server.url,
+            "NOTION_API_KEY": "bench",
+            "NOTION_DATABASE_ID": f"bench-{uuid.uuid4().hex[:8]}",
+            "DISABLE_NOTION_PUBLISH": "0",
+        }
+    )
+    os.environ.pop("NOTION_DATA_SOURCE_ID", None)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_notion_rev_") as tmp:
+        for name in ("republish", "diff"):
+            results += run_mode(server, Path(tmp), name, args)
+    server.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<10} {'round':<11} {'seconds':>8} {'requests':>8} {'429s':>5} {'blocks':>6} {'match':>6}")
+        for r in results:
+            print(
+                f"{r['mode']:<10} {r['round']:<11} {r['seconds']:>8} {r['requests']:>8} {r['throttled']:>5} "
+                f"{r['blocks_sent']:>6} {str(r['pages_match'] and not r['failed']):>6}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Benchmark full-output Notion syncs against a local stand-in Notion API.
+
+The stand-in server speaks the subset of the Notion REST API the publisher
+uses (database/data source schema, page create and update, block append,
+list, update and delete).
+It enforces Notion's rate limit (3 requests/s, short bursts, 429 with
+Retry-After) and simulates request latency that grows with the number of
+blocks sent.
+
+Compares:
+  legacy     - the former sync: files one after another, one pages.create with
+               children=blocks[:100] per file (longer pages are truncated),
+               429s left to the client library
+  engine     - sync_all_outputs with 1 and N workers: shared rate limit, 429
+               retries with jittered backoff, remaining blocks appended in
+               100-block batches
+
+The output files are synthetic research notes; every third one is long
+(over 100 blocks). Each mode publishes its own copy of the files into its
+own temporary database.
+
+    python scripts/bench_notion_sync.py
+    python scripts/bench_notion_sync.py --files 30 --workers 1,4,8 --latency 0.8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SCHEMA = {
+    "Name": {"type": "title", "title": {}},
+    "Type": {"type": "select", "select": {"options": []}},
+    "Date": {"type": "date", "date": {}},
+    "Tags": {"type": "multi_select", "multi_select": {"options": []}},
+    "Status": {"type": "status", "status": {"options": [{"name": "Published"}, {"name": "published"}]}},
+}
+
+
+class StandInNotion:
+    """Threaded local HTTP server emulating the Notion API's rate limit and latency."""
+
+    def __init__(self, rps: float = 3.0, burst: int = 3, latency: float = 0.5, per_block: float = 0.01):
+        self.rps, self.burst = rps, burst
+        self.latency, self.per_block = latency, per_block
+        self.lock = threading.Lock()
+        self.reset()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, payload: dict, headers: dict = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _handle(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                status, body, headers = server.handle(method, self.path, payload)
+                self._reply(status, body, headers)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def reset(self, pages: bool = True) -> None:
+        """Reset the rate limit and request counters (and, with `pages`, forget all pages)."""
+        with self.lock:
+            self.tokens, self.updated = float(self.burst), time.monotonic()
+            self.requests = self.throttled = self.blocks_sent = 0
+            if not pages:
+                return
+            # page id -> {"title", "blocks": [[block_id, (type, content)], ...]}; block id -> page id
+            self.pages, self.block_pages = {}, {}
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+
+    def _admit(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rps)
+            self.updated = now
+            self.requests += 1
+            if self.tokens < 1:
+                self.throttled += 1
+                return False
+            self.tokens -= 1
+            return True
+
+    def handle(self, method: str, path: str, payload: dict):
+        if not self._admit():
+            error = {"object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited"}
+            return 429, error, {"Retry-After": "1"}
+        children = payload.get("children") or []
+        with self.lock:
+            self.blocks_sent += len(children)
+        time.sleep(self.latency + self.per_block * len(children))
+        parts = path.split("?")[0].strip("/").split("/")
+
+        if method == "GET" and parts[1] == "databases":
+            return (
+                200,
+                {"object": "database", "id": parts[2], "data_sources": [{"id": "ds-bench"}], "properties": SCHEMA},
+                {},
+            )
+        if method == "GET" and parts[1] == "data_sources":
+            return 200, {"object": "data_source", "id": parts[2], "properties": SCHEMA}, {}
+        if len(children) > 100:
+            return 400, {"object": "error", "status": 400, "code": "validation_error", "message": "children"}, {}
+        if method == "POST" and parts[1] == "pages":
+            page_id = str(uuid.uuid4())
+            title = payload.get("properties", {}).get("title", {}).get("title", [{}])[0].get("text", {}).get("content")
+            with self.lock:
+                self.pages[page_id] = {"title": title, "blocks": self._new_blocks(page_id, children)}
+            return 200, {"object": "page", "id": page_id, "url": f"https://notion.so/{page_id.replace('-', '')}"}, {}
+        if parts[1] == "blocks" and len(parts) == 4:
+            with self.lock:
+                blocks = self.pages[parts[2]]["blocks"]
+                if method == "GET":
+                    start = int(path.partition("start_cursor=")[2].split("&")[0] or 0)
+                    page, more = blocks[start : start + 100], start + 100 < len(blocks)
+                    results = [{"object": "block", "id": i, "type": b[0]} for i, b in page]
+                    cursor = str(start + 100) if more else None
+                    return 200, {"object": "list", "results": results, "has_more": more, "next_cursor": cursor}, {}
+                after = payload.get("after")
+                at = [i for i, _ in blocks].index(after) + 1 if after else len(blocks)
+                blocks[at:at] = self._new_blocks(parts[2], children)
+                results = [{"object": "block", "id": i, "type": b[0]} for i, b in blocks[at:]]
+            return 200, {"object": "list", "results": results}, {}
+        if parts[1] == "blocks" and method in ("PATCH", "DELETE"):
+            with self.lock:
+                blocks = self.pages[self.block_pages[parts[2]]]["blocks"]
+                n = [i for i, _ in blocks].index(parts[2])
+                if method == "DELETE":
+                    del blocks[n]
+                else:
+                    block_type = blocks[n][1][0]
+                    blocks[n][1] = (block_type, payload[block_type])
+                    self.blocks_sent += 1
+            return 200, {"object": "block", "id": parts[2]}, {}
+        if method == "PATCH" and parts[1] == "pages":
+            return 200, {"object": "page", "id": parts[2]}, {}
+        return 404, {"object": "error", "status": 404, "code": "object_not_found", "message": path}, {}
+
+    def _new_blocks(self, page_id: str, children: list) -> list:
+        blocks = []
+        for block in children:
+            block_id = str(uuid.uuid4())
+            self.block_pages[block_id] = page_id
+            blocks.append([block_id, (block["type"], block[block["type"]])])
+        return blocks
+
+    def page_blocks(self, page_id: str) -> list:
+        """(type, content) of each top-level block of a page."""
+        return [b for _, b in self.pages[page_id]["blocks"]]
+
+
+def make_outputs(root: Path, files: int) -> None:
+    """Synthetic published research notes; every third one is longer than 100 blocks."""
+    root.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        sections = 40 if i % 3 == 0 else 6
+        lines = ["---", "type: research", "status: published", f"date: 2026-01-{i % 28 + 1:02d}", "---", ""]
+        lines.append(f"# Research note {i}")
+        for n in range(sections):
+            lines += ["", f"## Section {n}", "", f"paragraph {n} with observations and context for the note."]
+            lines += [f"- point {n}.a", f"- point {n}.b", f"- point {n}.c"]
+        (root / f"research_note_{i:03d}.md").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _title(path: Path) -> str:
+    return path.read_text(encoding="utf-8").split("\n# ", 1)[1].split("\n", 1)[0]
+
+
+def expected_blocks(root: Path) -> dict:
+    """Blocks each page should end up with, keyed by page title."""
+    from scripts.notion_formatter import format_for_notion
+
+    return {
+        _title(p): len(format_for_notion(p.read_text(encoding="utf-8"), doc_type="research")) for p in root.glob("*.md")
+    }
+
+
+def legacy_sync(server: StandInNotion, root: Path) -> None:
+    """The former sync loop: sequential, one pages.create per file with the first 100 blocks."""
+    from notion_client import Client
+
+    from scripts.notion_formatter import format_for_notion
+
+    client = Client(auth="bench", base_url=server.url)
+    for path in sorted(root.glob("*.md")):
+        blocks = format_for_notion(path.read_text(encoding="utf-8"), doc_type="research")
+        client.pages.create(
+            parent={"type": "data_source_id", "data_source_id": "ds-bench"},
+            properties={"title": {"title": [{"text": {"content": _title(path)}}]}},
+            children=blocks[:100],
+        )
+
+
+def run_mode(server: StandInNotion, template: Path, workdir: Path, name: str, workers: int) -> dict:
+    import scripts.cleanup_manager as cleanup_manager
+    from scripts import notion_publisher
+
+    outputs = workdir / name / "output"
+    shutil.copytree(template, outputs)
+    os.environ["GOLD_STANDARD_TEST_DB"] = str(workdir / name / "bench.db")
+    # Keep the publisher's usage counters out of the real output directory
+    cleanup_manager.USAGE_FILE = workdir / name / "usage_stats.json"
+    server.reset()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if name == "legacy":
+            legacy_sync(server, outputs)
+            failed = 0
+        else:
+            failed = len(notion_publisher.sync_all_outputs(str(outputs), force=True, workers=workers)["failed"])
+    elapsed = time.perf_counter() - start
+
+    expected = expected_blocks(template)
+    pages = [{"title": page["title"], "blocks": len(page["blocks"])} for page in server.pages.values()]
+    return {
+        "mode": name,
+        "workers": workers,
+        "seconds": round(elapsed, 2),
+        "requests": server.requests,
+        "throttled": server.throttled,
+        "pages": len(pages),
+        "complete_pages": sum(1 for page in pages if page["blocks"] == expected.get(page["title"])),
+        "blocks": sum(page["blocks"] for page in pages),
+        "expected_blocks": sum(expected.values()),
+        "failed": failed,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Notion output sync against a local stand-in API")
+    parser.add_argument("--files", type=int, default=12, help="Output files to publish")
+    parser.add_argument("--workers", default="1,4", help="Comma-separated worker counts for the sync engine")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stand-in request latency in seconds")
+    parser.add_argument("--per-block", type=float, default=0.01, help="Extra latency per block sent (seconds)")
+    parser.add_argument("--rps", type=float, default=3.0, help="Stand-in rate limit (requests/second)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the sync engine")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    # 429s are expected here; keep the client library's per-request warnings out of the table
+    logging.getLogger("notion_client").setLevel(logging.ERROR)
+    logging.getLogger("rate_limiter").setLevel(logging.ERROR)
+    server = StandInNotion(rps=args.rps, latency=args.latency, per_block=args.per_block)
+    os.environ.update(
+        {
+            "NOTION_BASE_URL": server.url,
+            "NOTION_API_KEY": "bench",
+            "NOTION_DATABASE_ID": f"bench-{uuid.uuid4().hex[:8]}",
+            "NOTION_RPS": str(args.rps),
+            "DISABLE_NOTION_PUBLISH": "0",
+        }
+    )
+    os.environ.pop("NOTION_DATA_SOURCE_ID", None)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_notion_") as tmp:
+        workdir = Path(tmp)
+        template = workdir / "template"
+        make_outputs(template, args.files)
+        if not args.skip_legacy:
+            results.append(run_mode(server, template, workdir, "legacy", 1))
+        for workers in [int(x) for x in args.workers.split(",") if x.strip()]:
+            results.append(run_mode(server, template, workdir, f"engine-{workers}", workers))
+    server.close()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'mode':<10} {'workers':>7} {'seconds':>8} {'requests':>8} {'429s':>5} "
+            f"{'pages':>5} {'complete':>8} {'blocks':>12} {'failed':>6}"
+        )
+        for r in results:
+            print(
+                f"{r['mode']:<10} {r['workers']:>7} {r['seconds']:>8} {r['requests']:>8} {r['throttled']:>5} "
+                f"{r['pages']:>5} {r['complete_pages']:>8} {str(r['blocks']) + '/' + str(r['expected_blocks']):>12} "
+                f"{r['failed']:>6}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Benchmark Ollama client strategies against a local mock server.
+
+Compares:
+  per-call   - a new HTTP connection per request (the old OllamaLLM behaviour)
+  session    - one pooled keep-alive requests.Session, sequential
+  async      - AsyncOllamaClient with N concurrent in-flight requests
+
+The mock server answers /api/generate after a fixed latency and serves at most
+--server-parallel requests at once (like OLLAMA_NUM_PARALLEL). It also counts
+TCP connections so the effect of connection pooling is visible.
+
+    python scripts/bench_ollama_client.py --requests 64 --latency-ms 50 --concurrency 1,4,8
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.digest_bot.llm.ollama_async import AsyncOllamaClient
+
+
+class MockOllamaServer:
+    """aiohttp server emulating the parts of the Ollama API the clients use."""
+
+    def __init__(self, latency_ms: float, parallel: int):
+        self.latency = latency_ms / 1000.0
+        self.parallel = parallel
+        self.port = None
+        self.connections = set()
+        self.requests = 0
+        self.keep_alive_requests = 0
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _generate(self, request):
+        from aiohttp import web
+
+        body = await request.json()
+        self.requests += 1
+        self.connections.add(id(request.transport))
+        if body.get("keep_alive"):
+            self.keep_alive_requests += 1
+        async with self._slots:
+            await asyncio.sleep(self.latency)
+        text = f"echo: {body.get('prompt', '')[:20]}"
+        if body.get("stream"):
+            resp = web.StreamResponse()
+            await resp.prepare(request)
+            for word in text.split():
+                await resp.write((json.dumps({"response": word + " ", "done": False}) + "\n").encode())
+            await resp.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+            await resp.write_eof()
+            return resp
+        return web.json_response({"response": text, "done": True, "eval_count": len(text.split())})
+
+    def _run(self):
+        from aiohttp import web
+
+        asyncio.set_event_loop(self._loop)
+        self._slots = asyncio.Semaphore(self.parallel)
+        app = web.Application()
+        app.router.add_post("/api/generate", self._generate)
+        runner = web.AppRunner(app)
+        self._loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        self._thread.start()
+        self._ready.wait(10)
+        return f"http://127.0.0.1:{self.port}"
+
+    def reset(self):
+        self.connections.clear()
+        self.requests = 0
+        self.keep_alive_requests = 0
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _summary(name: str, latencies: list, elapsed: float, server: MockOllamaServer) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "client": name,
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "req_per_sec": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000, 1),
+        "connections": len(server.connections),
+        "keep_alive_sent": f"{server.keep_alive_requests}/{server.requests}",
+    }
+
+
+def bench_per_call(host: str, n: int, server: MockOllamaServer) -> dict:
+    import requests
+
+    server.reset()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        r = requests.post(f"{host}/api/generate", json={"model": "m", "prompt": f"q{i}", "stream": False}, timeout=30)
+        r.json()
+        latencies.append(time.perf_counter() - t0)
+    return _summary("per-call", latencies, time.perf_counter() - start, server)
+
+
+def bench_session(host: str, n: int, server: MockOllamaServer) -> dict:
+    import requests
+
+    server.reset()
+    session = requests.Session()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter()
+        r = session.post(
+            f"{host}/api/generate", json={"model": "m", "prompt": f"q{i}", "stream": False, "keep_alive": "30m"}
+        )
+        r.json()
+        latencies.append(time.perf_counter() - t0)
+    session.close()
+    return _summary("session", latencies, time.perf_counter() - start, server)
+
+
+async def _bench_async(host: str, n: int, concurrency: int, server: MockOllamaServer) -> dict:
+    server.reset()
+    latencies = []
+    async with AsyncOllamaClient(host=host, model="m", max_concurrency=concurrency) as client:
+
+        async def one(i):
+            t0 = time.perf_counter()
+            await client.generate(f"q{i}")
+            latencies.append(time.perf_counter() - t0)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n)))
+        elapsed = time.perf_counter() - start
+    return _summary(f"async x{concurrency}", latencies, elapsed, server)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Ollama client strategies against a mock server")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per client strategy")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated generation latency")
+    parser.add_argument("--server-parallel", type=int, default=4, help="Requests the mock server runs at once")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated async in-flight limits")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    server = MockOllamaServer(args.latency_ms, args.server_parallel)
+    host = server.start()
+    try:
+        results = [bench_per_call(host, args.requests, server), bench_session(host, args.requests, server)]
+        for c in [int(x) for x in args.concurrency.split(",") if x.strip()]:
+            results.append(asyncio.run(_bench_async(host, args.requests, c, server)))
+    finally:
+        server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"\nMock Ollama: latency={args.latency_ms}ms parallel={args.server_parallel} requests={args.requests}")
+        print(f"{'client':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'conns':>6} {'keep_alive':>11}")
+        for r in results:
+            print(
+                f"{r['client']:<12} {r['req_per_sec']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+                f"{r['connections']:>6} {r['keep_alive_sent']:>11}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Benchmark the price sanitizer as the asset universe and documents grow.
+
+Compares:
+  legacy   - the former llm_worker approach: two re.sub passes over the whole
+             text per asset name variant, regexes rebuilt on every call
+  engine   - scripts/price_sanitizer.PriceSanitizer: one cached combined
+             pattern, one pass over the text
+
+Documents are synthetic reports where every sentence cites an asset price,
+a third of them wrong. Time per document should grow with assets x length
+for legacy, and only with length for the engine.
+
+    python scripts/bench_price_sanitizer.py --assets 5,20,80 --sentences 50,200,800
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.price_sanitizer import PriceSanitizer
+
+BASE_ASSETS = ["GOLD", "SILVER", "DXY", "YIELD", "VIX", "SPX", "COPPER", "OIL", "BTC", "ETH"]
+
+
+def make_universe(n: int) -> dict:
+    rng = random.Random(n)
+    names = BASE_ASSETS[:n] + [f"ASSET{i}" for i in range(max(0, n - len(BASE_ASSETS)))]
+    return {name: round(rng.uniform(1, 5000), 2) for name in names}
+
+
+def make_document(canonical: dict, sentences: int) -> str:
+    rng = random.Random(sentences)
+    names = list(canonical)
+    lines = []
+    for i in range(sentences):
+        name = rng.choice(names)
+        price = canonical[name] * (1.5 if i % 3 == 0 else 1.0)
+        lines.append(f"{name.title()} traded near ${price:,.2f} while flows stayed mixed today.")
+    return "\n".join(lines)
+
+
+def legacy_sanitize(text: str, canonical: dict):
+    """The per-variant multi-pass sanitizer previously inlined in llm_worker."""
+    corrected = 0
+
+    def _replace_price(match, canonical_price):
+        nonlocal corrected
+        clean = re.sub(r"[^0-9.\-]", "", match.group(2).replace(",", ""))
+        try:
+            num = float(clean)
+        except Exception:
+            return match.group(0)
+        if abs((num - canonical_price) / canonical_price) > 0.05:
+            corrected += 1
+            return match.group(1) + str(canonical_price)
+        return match.group(0)
+
+    for asset, price in canonical.items():
+        variants = {asset, asset.lower(), asset.title(), asset.capitalize()}
+        if asset.upper() == "YIELD":
+            variants.update({"Yields", "Yield", "YIELD"})
+        for tok in variants:
+            text = re.sub(
+                rf"(\b{re.escape(tok)}\b[^\n]{{0,40}}\$)([0-9\.,]+)",
+                lambda m, p=price: _replace_price(m, p),
+                text,
+                flags=re.IGNORECASE,
+            )
+            text = re.sub(
+                rf"(Current\s+{re.escape(tok)}\s+Price:\s*\$)\s*[0-9\.,]+",
+                lambda m, p=price: m.group(1) + str(p),
+                text,
+                flags=re.IGNORECASE,
+            )
+    return text, corrected
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs single-pass price sanitizer")
+    parser.add_argument("--assets", default="5,20,80", help="Comma-separated asset universe sizes")
+    parser.add_argument("--sentences", default="50,200,800", help="Comma-separated document lengths (lines)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best time is reported)")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for n_assets in [int(x) for x in args.assets.split(",") if x.strip()]:
+        canonical = make_universe(n_assets)
+        for n_sentences in [int(x) for x in args.sentences.split(",") if x.strip()]:
+            doc = make_document(canonical, n_sentences)
+            legacy = _time(lambda: legacy_sanitize(doc, canonical), args.repeat)
+            engine = _time(lambda: PriceSanitizer(canonical).sanitize(doc), args.repeat)
+            results.append(
+                {
+                    "assets": n_assets,
+                    "lines": n_sentences,
+                    "kb": round(len(doc) / 1024, 1),
+                    "legacy_ms": round(legacy * 1000, 2),
+                    "engine_ms": round(engine * 1000, 2),
+                    "engine_us_per_kb": round(engine * 1e6 / max(len(doc) / 1024, 0.001), 1),
+                    "speedup": round(legacy / engine, 1) if engine > 0 else 0.0,
+                    "corrections": PriceSanitizer(canonical).sanitize(doc).count,
+                }
+            )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(
+            f"{'assets':>6} {'lines':>6} {'KB':>6} {'legacy ms':>10} {'engine ms':>10} {'us/KB':>7} {'speedup':>8} {'fixes':>6}"
+        )
+        for r in results:
+            print(
+                f"{r['assets']:>6} {r['lines']:>6} {r['kb']:>6} {r['legacy_ms']:>10} {r['engine_ms']:>10} "
+                f"{r['engine_us_per_kb']:>7} {r['speedup']:>7}x {r['corrections']:>6}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
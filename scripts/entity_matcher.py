@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Single-pass multi-phrase matcher for entity extraction.
+
+InsightsExtractor looks for a fixed list of known entity names (Fed, CPI,
+GLD, ...) in every report. Searching each name in each sentence, and then
+re-scanning the whole report per hit to score it, costs
+entities x sentences x document. The matcher compiles all names into one
+Aho-Corasick automaton and walks the document once. The pass yields:
+
+- the sentences each name occurs in (case-insensitive, whole words only,
+  with the same sentence split as before: `[.!?]` followed by whitespace)
+- the number of whole-word mentions in the document
+- whether the name appears on a line with a `##` header marker or between
+  `**` bold markers (any occurrence, as the relevance score always counted)
+
+Compiled automata are cached per phrase tuple, so extracting from many
+reports against the same entity list builds the automaton once.
+
+Usage:
+    matcher = EntityMatcher.for_phrases(("Fed", "CPI", "Gold"))
+    scan = matcher.scan(text)
+    stats = scan.get("CPI")          # PhraseStats or None
+    scan.sentence(stats.sentences[0])
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+SENTENCE_SPLIT_RE = re.compile(r"[.!?]\s+")
+
+
+def _is_word(ch: str) -> bool:
+    """Same definition of a word character as the re module's \\w for str patterns."""
+    return ch.isalnum() or ch == "_"
+
+
+def fold_case(text: str) -> str:
+    """Lowercase without changing the length, so offsets map back to `text`."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') lowercase to two; keep those as they are
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+@dataclass
+class PhraseStats:
+    """Occurrences of one phrase in a document."""
+
+    sentences: List[int] = field(default_factory=list)  # Sentence indexes with a whole-word match, in order
+    mentions: int = 0  # Non-overlapping whole-word matches
+    in_header: bool = False  # On a line with '##' before or after it
+    in_bold: bool = False  # Between '**' markers on its line
+
+
+@dataclass
+class DocumentScan:
+    text: str
+    sentence_spans: List[Tuple[int, int]]
+    stats: Dict[str, PhraseStats]
+
+    def get(self, phrase: str) -> Optional[PhraseStats]:
+        return self.stats.get(phrase)
+
+    def sentence(self, index: int) -> str:
+        start, end = self.sentence_spans[index]
+        return self.text[start:end]
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over a fixed set of phrases, matched case-insensitively."""
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases: List[str] = list(dict.fromkeys(p for p in phrases if p))
+        self._lengths = [len(p) for p in self.phrases]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._build()
+
+    @classmethod
+    def for_phrases(cls, phrases: Sequence[str]) -> "EntityMatcher":
+        """Shared matcher for a phrase list (compiled once per distinct tuple)."""
+        return _compiled(tuple(phrases))
+
+    def _build(self) -> None:
+        outputs: List[List[int]] = [[]]
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in fold_case(phrase):
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(index)
+
+        # Breadth-first: each state's failure link is the longest proper suffix that is also a prefix
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt].extend(outputs[self._fail[nxt]])
+                queue.append(nxt)
+        self._out = [tuple(o) for o in outputs]
+
+    def occurrences(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Every (start, end, phrase index) substring occurrence, ordered by end offset."""
+        goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(fold_case(text)):
+            if state == 0 and ch not in root:
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for index in out[state]:
+                    yield end - lengths[index], end, index
+
+    def scan(self, text: str) -> DocumentScan:
+        """Sentences, mention counts and header/bold context for every phrase, in one pass."""
+        starts, ends = [0], []
+        for m in SENTENCE_SPLIT_RE.finditer(text):
+            ends.append(m.start())
+            starts.append(m.end())
+        ends.append(len(text))
+
+        line_starts = [0] + [m.end() for m in re.finditer(r"\n", text)]
+        lines: Dict[int, Tuple[int, int, int, int]] = {}  # line -> first/last '##' and '**' offsets
+        last_end: Dict[int, int] = {}
+        stats: Dict[int, PhraseStats] = {}
+        n = len(text)
+
+        for start, end, index in self.occurrences(text):
+            entry = stats.get(index)
+            if entry is None:
+                entry = stats[index] = PhraseStats()
+
+            if not (entry.in_header and entry.in_bold):
+                line = bisect_right(line_starts, start) - 1
+                markers = lines.get(line)
+                if markers is None:
+                    lo = line_starts[line]
+                    hi = line_starts[line + 1] - 1 if line + 1 < len(line_starts) else n
+                    markers = lines[line] = (
+                        text.find("##", lo, hi),
+                        text.rfind("##", lo, hi),
+                        text.find("**", lo, hi),
+                        text.rfind("**", lo, hi),
+                    )
+                first_hash, last_hash, first_bold, last_bold = markers
+                if first_hash != -1 and (first_hash + 2 <= start or last_hash >= end):
+                    entry.in_header = True
+                if first_bold != -1 and first_bold + 2 <= start and last_bold >= end:
+                    entry.in_bold = True
+
+            # Whole words only: \b on both sides, as in rf"\b{name}\b"
+            before = start > 0 and _is_word(text[start - 1])
+            after = end < n and _is_word(text[end])
+            if before == _is_word(text[start]) or after == _is_word(text[end - 1]):
+                continue
+            if start >= last_end.get(index, 0):
+                entry.mentions += 1
+                last_end[index] = end
+            sentence = bisect_right(starts, start) - 1
+            if end <= ends[sentence] and (not entry.sentences or entry.sentences[-1] != sentence):
+                entry.sentences.append(sentence)
+
+        return DocumentScan(
+            text=text,
+            sentence_spans=list(zip(starts, ends)),
+            stats={self.phrases[i]: s for i, s in stats.items()},
+        )
+
+
+@lru_cache(maxsize=8)
+def _compiled(phrases: Tuple[str, ...]) -> EntityMatcher:
+    return EntityMatcher(phrases)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Asyncio execution engine with per-resource concurrency limits.
+
+Task handlers are blocking functions (yfinance, LLM calls, Notion). Instead
+of one fixed thread pool shared by every kind of work, each handler declares
+the resource classes it uses and the engine bounds each class separately:
+
+    local_llm   one in-process / single-GPU model (default 1)
+    gemini      the shared cloud quota (default 2)
+    network     HTTP data sources such as yfinance and Notion (default 8)
+    cpu         local computation (default: CPU count)
+
+A task acquires all of its semaphores (in a fixed order, so tasks never
+deadlock) and only then occupies a thread. Fifty queued research tasks
+therefore wait on the LLM semaphore without blocking data fetches, and
+throughput is bounded by the real bottleneck rather than the thread count.
+
+The limits are enforced per process: `run()` batches and callers driving
+their own threads through `execute()` (e.g. the executor daemon's slots)
+share the same counts.
+
+When a quota is exhausted the caller blocks the resource with `block()`.
+Tasks that reach a blocked resource are handed to the `defer` callback
+(which reschedules them, e.g. via `release_action`) instead of sleeping.
+
+Environment:
+    EXECUTOR_LOCAL_LLM_CONCURRENCY=1
+    EXECUTOR_GEMINI_CONCURRENCY=2
+    EXECUTOR_NETWORK_CONCURRENCY=8
+    EXECUTOR_CPU_CONCURRENCY=<cpu count>
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+LOG = logging.getLogger("execution_engine")
+
+RESOURCES = ("local_llm", "gemini", "network", "cpu")
+DEFAULT_RESOURCES: Tuple[str, ...] = ("cpu",)
+
+
+def default_limits() -> Dict[str, int]:
+    """Per-resource concurrency limits from the environment."""
+    defaults = {"local_llm": 1, "gemini": 2, "network": 8, "cpu": os.cpu_count() or 2}
+    limits = {}
+    for name, default in defaults.items():
+        try:
+            limits[name] = max(1, int(os.environ.get(f"EXECUTOR_{name.upper()}_CONCURRENCY", default)))
+        except ValueError:
+            limits[name] = default
+    return limits
+
+
+def uses_resources(*resources: str):
+    """Declare the resource classes a handler uses (read by the engine)."""
+
+    def decorator(fn):
+        fn.resources = tuple(resources)
+        return fn
+
+    return decorator
+
+
+class ExecutionEngine:
+    """
+    Run blocking task functions on asyncio with per-resource semaphores.
+
+    Args:
+        limits: Resource name -> max concurrent tasks (default: default_limits())
+    """
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(default_limits())
+        if limits:
+            self.limits.update(limits)
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._thread_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.stats: Dict[str, Any] = {
+            "executed": 0,
+            "deferred": 0,
+            "peak_in_flight": {name: 0 for name in self.limits},
+        }
+        self._in_flight: Dict[str, int] = {name: 0 for name in self.limits}
+
+    # ==========================================================================
+    # Quota blocking
+    # ==========================================================================
+
+    def block(self, resource: str, seconds: float) -> None:
+        """Stop starting tasks that need `resource` for `seconds` (thread-safe)."""
+        until = time.monotonic() + max(0.0, seconds)
+        with self._lock:
+            self._blocked_until[resource] = max(self._blocked_until.get(resource, 0.0), until)
+
+    def blocked_for(self, resources: Iterable[str]) -> float:
+        """Seconds until every resource in `resources` is unblocked (0.0 = free now)."""
+        now = time.monotonic()
+        with self._lock:
+            return max([self._blocked_until.get(r, 0.0) - now for r in resources] + [0.0])
+
+    # ==========================================================================
+    # Execution
+    # ==========================================================================
+
+    def _resources(self, resources: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        names = tuple(sorted(set(resources or DEFAULT_RESOURCES)))
+        unknown = [r for r in names if r not in self.limits]
+        if unknown:
+            LOG.warning("Unknown resource(s) %s; treating as cpu", unknown)
+            names = tuple(sorted({r if r in self.limits else "cpu" for r in names}))
+        return names
+
+    def _semaphore(self, name: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._thread_semaphores.get(name)
+            if sem is None:
+                sem = self._thread_semaphores[name] = threading.BoundedSemaphore(self.limits[name])
+            return sem
+
+    def _call(self, item, fn, resources, defer):
+        """Run one item on the current thread while holding its resource slots."""
+        acquired = []
+        try:
+            # Fixed acquisition order: no two tasks can wait on each other
+            for name in resources:
+                self._semaphore(name).acquire()
+                acquired.append(name)
+
+            wait = self.blocked_for(resources)
+            if wait > 0 and defer is not None:
+                with self._lock:
+                    self.stats["deferred"] += 1
+                return defer(item, wait)
+
+            with self._lock:
+                for name in resources:
+                    self._in_flight[name] = self._in_flight.get(name, 0) + 1
+                    peak = self.stats["peak_in_flight"]
+                    peak[name] = max(peak.get(name, 0), self._in_flight[name])
+            try:
+                return fn(item)
+            finally:
+                with self._lock:
+                    for name in resources:
+                        self._in_flight[name] -= 1
+                    self.stats["executed"] += 1
+        finally:
+            for name in reversed(acquired):
+                self._semaphore(name).release()
+
+    def execute(self, item, fn, resources: Optional[Sequence[str]] = None, defer=None):
+        """Run `fn(item)` on the calling thread once its resources are free (blocking)."""
+        return self._call(item, fn, self._resources(resources), defer)
+
+    async def _run_one(self, item, fn, resources, defer, on_result, semaphores, pool):
+        loop = asyncio.get_running_loop()
+        # Queue on the loop first so waiting tasks do not park pool threads
+        acquired = []
+        try:
+            for name in resources:
+                await semaphores[name].acquire()
+                acquired.append(name)
+            result = await loop.run_in_executor(pool, self._call, item, fn, resources, defer)
+        finally:
+            for name in reversed(acquired):
+                semaphores[name].release()
+
+        if on_result is not None:
+            # Book-keeping (DB writes, publishing) runs after the resources are released
+            await loop.run_in_executor(pool, on_result, item, result)
+        return result
+
+    async def run_async(
+        self,
+        items: Sequence[Any],
+        fn: Callable[[Any], Any],
+        resources_for: Callable[[Any], Sequence[str]],
+        defer: Optional[Callable[[Any, float], Any]] = None,
+        on_result: Optional[Callable[[Any, Any], None]] = None,
+    ) -> List[Any]:
+        """
+        Run `fn(item)` for every item; returns results in input order.
+
+        Args:
+            items: Work items
+            fn: Blocking function executed in a worker thread
+            resources_for: Resource classes an item needs
+            defer: Called as defer(item, seconds) instead of fn when a needed
+                resource is blocked; its return value becomes the result
+            on_result: Called as on_result(item, result) once an item finishes
+        """
+        if not items:
+            return []
+        semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.limits.items()}
+        # Threads only ever run tasks that already hold their semaphores
+        threads = max(1, min(len(items), sum(self.limits.values())))
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="executor") as pool:
+            return await asyncio.gather(
+                *(
+                    self._run_one(item, fn, self._resources(resources_for(item)), defer, on_result, semaphores, pool)
+                    for item in items
+                )
+            )
+
+    def run(self, items, fn, resources_for, defer=None, on_result=None) -> List[Any]:
+        """Blocking wrapper around run_async (safe to call from inside a running loop)."""
+        coro = self.run_async(items, fn, resources_for, defer=defer, on_result=on_result)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        # Called from async code (e.g. the Discord bot): use a private loop on a helper thread
+        box: Dict[str, Any] = {}
+
+        def _target():
+            try:
+                box["result"] = asyncio.run(coro)
+            except BaseException as e:  # re-raised in the caller's thread
+                box["error"] = e
+
+        thread = threading.Thread(target=_target, name="execution-engine")
+        thread.start()
+        thread.join()
+        if "error" in box:
+            raise box["error"]
+        return box["result"]
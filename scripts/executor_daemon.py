@@ -15,7 +15,13 @@ EXECUTION MODES:
     3. Direct CLI execution for debugging
 
 FEATURES:
-    - Continuous polling for ready tasks
+    - Event-driven dispatch: sleeps until the next scheduled task, woken
+      early by new/released actions and finished slots (scripts/scheduler.py)
+    - Concurrent task slots (EXECUTOR_SLOTS / --slots)
+    - Renewable per-task leases: a crashed worker's tasks return to the
+      queue once their lease expires (EXECUTOR_LEASE_SECONDS)
+    - Scale-out: any number of daemons share the queue; singleton work
+      (orphan sweeps) runs only on the holder of the `executor_leader` lease
     - Orphan recovery on startup
     - Graceful shutdown with task completion
     - Signal handling (SIGTERM, SIGINT, SIGHUP)
@@ -47,10 +53,11 @@ import socket
 import sys
 import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 # Project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -76,6 +83,17 @@ HEARTBEAT_INTERVAL_SECONDS = 60
 MAX_CONSECUTIVE_ERRORS = 10
 SHUTDOWN_GRACE_PERIOD_SECONDS = 30
 
+# Concurrent task slots per daemon; resource limits (EXECUTOR_*_CONCURRENCY) still apply per handler
+EXECUTOR_SLOTS = max(1, int(os.getenv("EXECUTOR_SLOTS", "4")))
+# Claimed tasks hold a lease renewed by the heartbeat thread every third of its length
+LEASE_SECONDS = max(5, int(os.getenv("EXECUTOR_LEASE_SECONDS", "60")))
+# Named leases (scripts/leases.py): leadership and per-daemon liveness, renewed by the heartbeat
+LEADER_LEASE = "executor_leader"
+LEADER_TTL_SECONDS = 120
+MEMBER_LEASE_PREFIX = "executor:"
+# 1 = only the leader executes tasks (hot standby); 0 = every daemon executes, the leader also runs singleton jobs
+LEADER_ONLY = os.getenv("EXECUTOR_LEADER_ONLY", "0").lower() in ("1", "true", "yes")
+
 # Retry configuration (overridable via env)
 import os
 MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
@@ -146,6 +164,7 @@ class ExecutorDaemon:
 
     Designed for autonomous operation with:
     - Crash recovery and orphan reclamation
+    - A pool of concurrent task slots, each task held by a renewable lease
     - Graceful shutdown with task completion
     - Health monitoring and heartbeat
     - Quota-aware execution
@@ -157,18 +176,38 @@ class ExecutorDaemon:
         poll_interval: int = POLL_INTERVAL_SECONDS,
         worker_id: str = WORKER_ID,
         dry_run: bool = False,
+        slots: int = EXECUTOR_SLOTS,
+        lease_seconds: int = LEASE_SECONDS,
+        sandbox: Optional[bool] = None,
     ):
         self.logger = logger
         self.poll_interval = poll_interval
         self.worker_id = worker_id
         self.dry_run = dry_run
+        self.slots = max(1, slots)
+        self.lease_seconds = lease_seconds
+        # Run handlers in supervised worker processes with hard limits (None: EXECUTOR_SANDBOX)
+        self.sandbox = sandbox
+        self._sandbox_pool = None
 
         # State
         self._running = False
         self._shutdown_requested = False
-        self._current_task_id: Optional[str] = None
+        self._active_tasks: set = set()  # action IDs this worker holds leases on
+        self._busy_slots = 0
+        self._slot_freed = threading.Event()
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._lock = threading.Lock()
         self._heartbeat_thread: Optional[threading.Thread] = None
+        self._is_leader = False
+        self._leader_lease = None
+        self._member_lease = None
+        self._cooldown_until = 0.0
+        self._admission = None
+
+        from scripts.scheduler import Scheduler
+
+        self.scheduler = Scheduler()
 
         # Statistics
         self.stats = {
@@ -178,6 +217,7 @@ class ExecutorDaemon:
             "tasks_failed": 0,
             "tasks_retried": 0,
             "orphans_recovered": 0,
+            "leases_expired": 0,
             "total_execution_time_ms": 0,
             "last_poll_at": None,
             "last_task_at": None,
@@ -208,9 +248,11 @@ class ExecutorDaemon:
         sig_name = signal.Signals(signum).name
         self.logger.info(f"Received {sig_name}, initiating graceful shutdown...")
         self._shutdown_requested = True
+        self.scheduler.wake()
 
-        if self._current_task_id:
-            self.logger.info(f"Waiting for current task to complete: {self._current_task_id}")
+        active = self._active_task_ids()
+        if active:
+            self.logger.info(f"Waiting for {len(active)} running task(s) to complete: {', '.join(active)}")
         else:
             self.logger.info("No task in progress, shutting down immediately")
 
@@ -230,14 +272,28 @@ class ExecutorDaemon:
             self.logger.error(f"Failed to reload configuration: {e}")
 
     def _cleanup(self):
-        """Cleanup on exit - release any claimed tasks."""
-        if self._current_task_id:
-            self.logger.warning(f"Releasing uncompleted task on exit: {self._current_task_id}")
+        """Cleanup on exit - release any claimed tasks and named leases."""
+        for lease in (self._leader_lease, self._member_lease):
+            if lease is not None:
+                lease.release()
+        for action_id in self._active_task_ids():
+            self.logger.warning(f"Releasing uncompleted task on exit: {action_id}")
             try:
                 db = self._get_db()
-                db.release_action(self._current_task_id, reason="daemon_exit")
+                db.release_action(action_id, reason="daemon_exit")
             except Exception as e:
                 self.logger.error(f"Failed to release task: {e}")
+        if self._sandbox_pool is not None:
+            self._sandbox_pool.close()
+
+    def _active_task_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._active_tasks)
+
+    def _bump(self, key: str, amount=1):
+        """Increment a stats counter (slots update stats concurrently)."""
+        with self._lock:
+            self.stats[key] += amount
 
     def _print_status(self, text: str, level: str = "info"):
         """Helper to print status via rich console if available for better UX."""
@@ -270,6 +326,14 @@ class ExecutorDaemon:
             self._db = get_db()
         return self._db
 
+    def _get_admission(self):
+        """Lazy-load the admission controller (dispatch budgets and queue gauges)."""
+        if self._admission is None:
+            from scripts.admission import AdmissionController
+
+            self._admission = AdmissionController(self._get_db())
+        return self._admission
+
     def _get_config(self):
         """Lazy-load configuration."""
         if self._config is None:
@@ -306,12 +370,27 @@ class ExecutorDaemon:
 
                 if model:
                     extractor = InsightsExtractor(config, self.logger, model)
-                    self._task_executor = TaskExecutor(config, self.logger, model, extractor)
+                    self._task_executor = TaskExecutor(
+                        config, self.logger, model, extractor, sandbox=self._get_sandbox_pool()
+                    )
                     self.logger.info("Task executor initialized")
             except Exception as e:
                 self.logger.error(f"Failed to initialize task executor: {e}")
         return self._task_executor
 
+    def _get_sandbox_pool(self):
+        """Worker pool sized to the slots when sandboxing is enabled (False = run handlers in-process)."""
+        from scripts.sandbox import SANDBOX_ENABLED, SandboxPool
+
+        enabled = SANDBOX_ENABLED if self.sandbox is None else self.sandbox
+        if not enabled or self.dry_run:
+            return False
+        if self._sandbox_pool is None:
+            self._sandbox_pool = SandboxPool(size=self.slots)
+            self._sandbox_pool.start()
+            self.logger.info(f"Sandbox enabled: {self.slots} worker processes")
+        return self._sandbox_pool
+
     # ══════════════════════════════════════════════════════════════════════════
     # ORPHAN RECOVERY
     # ══════════════════════════════════════════════════════════════════════════
@@ -333,12 +412,29 @@ class ExecutorDaemon:
             count = db.reset_stuck_actions(max_age_hours=ORPHAN_TIMEOUT_HOURS)
             if count > 0:
                 self.logger.info(f"Recovered {count} orphaned tasks")
-                self.stats["orphans_recovered"] += count
-            return count
+                self._bump("orphans_recovered", count)
+            return count + self.recover_expired_leases()
         except Exception as e:
             self.logger.error(f"Orphan recovery failed: {e}")
             return 0
 
+    def recover_expired_leases(self) -> int:
+        """
+        Return tasks whose lease expired (worker crashed or hung) to the queue.
+
+        Cheap enough to run on every poll, so a dead worker's tasks are
+        retried within about one lease period.
+        """
+        try:
+            expired = self._get_db().recover_expired_leases()
+        except Exception as e:
+            self.logger.error(f"Lease recovery failed: {e}")
+            return 0
+        if expired:
+            self.logger.warning(f"Re-queued {len(expired)} task(s) with expired leases: {', '.join(expired)}")
+            self._bump("leases_expired", len(expired))
+        return len(expired)
+
     # ══════════════════════════════════════════════════════════════════════════
     # TASK EXECUTION
     # ══════════════════════════════════════════════════════════════════════════
@@ -348,16 +444,18 @@ class ExecutorDaemon:
         error_lower = str(error_msg).lower()
         return any(pattern in error_lower for pattern in QUOTA_ERROR_PATTERNS)
 
-    def _wait_for_quota(self, retry_count: int) -> int:
-        """Wait for quota reset with exponential backoff."""
-        backoff = min(INITIAL_BACKOFF_SECONDS * (2**retry_count), MAX_BACKOFF_SECONDS)
-        self.logger.warning(f"Quota limit hit. Waiting {backoff}s before retry {retry_count + 1}/{MAX_RETRIES}...")
-        time.sleep(backoff)
-        return backoff
+    def _claim(self, action_id: str) -> bool:
+        """Atomically claim a task under a lease held by this worker."""
+        if not self._get_db().claim_action(action_id, worker_id=self.worker_id, lease_seconds=self.lease_seconds):
+            self.logger.debug(f"Task already claimed: {action_id}")
+            return False
+        with self._lock:
+            self._active_tasks.add(action_id)
+        return True
 
     def execute_task(self, action_dict: Dict[str, Any]) -> bool:
         """
-        Execute a single task with retry logic.
+        Claim and execute a single task with retry logic.
 
         Args:
             action_dict: Task data from database
@@ -365,16 +463,14 @@ class ExecutorDaemon:
         Returns:
             True if task completed successfully
         """
-        action_id = action_dict["action_id"]
-        db = self._get_db()
-
-        # Claim the task atomically
-        if not db.claim_action(action_id, worker_id=self.worker_id):
-            self.logger.debug(f"Task already claimed: {action_id}")
+        if not self._claim(action_dict["action_id"]):
             return False
+        return self._execute_claimed(action_dict)
 
-        with self._lock:
-            self._current_task_id = action_id
+    def _execute_claimed(self, action_dict: Dict[str, Any]) -> bool:
+        """Execute a task this worker has claimed; the lease is dropped when it finishes."""
+        action_id = action_dict["action_id"]
+        db = self._get_db()
 
         try:
             self.logger.info(f"Executing task: {action_dict.get('title', action_id)[:50]}")
@@ -391,9 +487,9 @@ class ExecutorDaemon:
                 # Release task back to pending (don't mark complete in dry-run)
                 db.release_action(action_id, reason="dry_run")
 
-                self.stats["total_execution_time_ms"] += execution_time_ms
-                self.stats["tasks_executed"] += 1
-                self.stats["tasks_succeeded"] += 1
+                self._bump("total_execution_time_ms", execution_time_ms)
+                self._bump("tasks_executed")
+                self._bump("tasks_succeeded")
                 self.stats["last_task_at"] = datetime.now().isoformat()
 
                 self.logger.info(f"[DRY-RUN] Task simulated: {action_id}")
@@ -412,10 +508,7 @@ class ExecutorDaemon:
                 title=action_dict["title"],
                 description=action_dict.get("description", ""),
                 priority=action_dict.get("priority", "medium"),
-                # Start as 'pending' so the TaskExecutor can pick it up and mark it
-                # in-progress itself. Previously this was set to 'in_progress'
-                # which caused the executor to find zero pending tasks.
-                status="pending",
+                status="in_progress",
                 source_report=action_dict.get("source_report", ""),
                 source_context=action_dict.get("source_context", ""),
                 deadline=action_dict.get("deadline"),
@@ -424,54 +517,29 @@ class ExecutorDaemon:
                 last_error=action_dict.get("last_error"),
             )
 
-            # Add to executor's queue
-            executor.insights_extractor.action_queue = [action]
-
-            # Execute with retry
-            results = executor.execute_all_pending(max_tasks=1)
+            # Runs under the executor's shared resource limits; the executor
+            # records status, the execution log and quota reschedules itself
+            result = executor.execute_action(action)
 
             execution_time_ms = (time.time() - start_time) * 1000
-            self.stats["total_execution_time_ms"] += execution_time_ms
-            self.stats["tasks_executed"] += 1
+            self._bump("total_execution_time_ms", execution_time_ms)
+            self._bump("tasks_executed")
             self.stats["last_task_at"] = datetime.now().isoformat()
 
-            if results and results[0].success:
-                db.update_action_status(action_id, "completed", str(results[0].result_data))
-                db.log_task_execution(
-                    action_id,
-                    success=True,
-                    result_data=str(results[0].result_data),
-                    execution_time_ms=execution_time_ms,
-                    artifacts=str(results[0].artifacts) if results[0].artifacts else None,
-                )
-                self.stats["tasks_succeeded"] += 1
-                self.stats["consecutive_errors"] = 0
+            if result.success:
+                self._bump("tasks_succeeded")
+                with self._lock:
+                    self.stats["consecutive_errors"] = 0
                 self.logger.info(f"Task completed: {action_id}")
                 return True
+            elif result.deferred:
+                self._bump("tasks_retried")
+                self.logger.warning(f"Task quota-limited, rescheduled: {action_id}")
+                return False
             else:
-                error_msg = results[0].error_message if results else "Unknown error"
-
-                # Check if quota error - schedule retry
-                if self._is_quota_error(error_msg):
-                    retry_count = db.increment_retry_count(action_id, error_msg)
-                    if MAX_RETRIES < 0 or retry_count < MAX_RETRIES:
-                        # schedule delayed retry proportional to exponential backoff
-                        backoff = min(INITIAL_BACKOFF_SECONDS * (2 ** max(0, retry_count - 1)), MAX_BACKOFF_SECONDS)
-                        db.release_action(action_id, reason=f"quota_retry_{retry_count}", delay_seconds=backoff)
-                        self.stats["tasks_retried"] += 1
-                        self.logger.warning(f"Task quota-limited, will retry in {backoff}s: {action_id}")
-                        return False
-
-                # Max retries or non-retriable error
-                db.update_action_status(action_id, "failed", error_msg)
-                db.log_task_execution(
-                    action_id,
-                    success=False,
-                    error_message=error_msg,
-                    execution_time_ms=execution_time_ms,
-                )
-                self.stats["tasks_failed"] += 1
-                self.stats["consecutive_errors"] += 1
+                error_msg = result.error_message or "Unknown error"
+                self._bump("tasks_failed")
+                self._bump("consecutive_errors")
                 self.logger.error(f"Task failed: {action_id} - {error_msg[:100]}")
                 return False
 
@@ -484,7 +552,7 @@ class ExecutorDaemon:
                 retry_count = db.increment_retry_count(action_id, error_msg)
                 backoff = min(INITIAL_BACKOFF_SECONDS * (2 ** max(0, retry_count - 1)), MAX_BACKOFF_SECONDS)
                 db.release_action(action_id, reason=f"exception_quota_{retry_count}", delay_seconds=backoff)
-                self.stats["tasks_retried"] += 1
+                self._bump("tasks_retried")
             else:
                 retry_count = db.increment_retry_count(action_id, error_msg)
                 if retry_count >= MAX_RETRIES:
@@ -492,76 +560,142 @@ class ExecutorDaemon:
                 else:
                     db.release_action(action_id, reason=f"exception_retry_{retry_count}")
 
-            self.stats["consecutive_errors"] += 1
+            self._bump("consecutive_errors")
             return False
 
         finally:
             with self._lock:
-                self._current_task_id = None
+                self._active_tasks.discard(action_id)
 
-    def poll_and_execute(self, remaining_limit: int = None) -> int:
+    # ══════════════════════════════════════════════════════════════════════════
+    # TASK SLOTS
+    # ══════════════════════════════════════════════════════════════════════════
+
+    def _free_slots(self) -> int:
+        with self._lock:
+            return self.slots - self._busy_slots
+
+    def _slot_done(self, _future: Future):
+        with self._lock:
+            self._busy_slots -= 1
+        self._slot_freed.set()
+        if self._running:
+            self.scheduler.call_soon(self._poll_job, key="poll")
+
+    def _fill_slots(self, remaining_limit: int = None) -> List[Future]:
         """
-        Poll for ready tasks and execute them.
+        Claim ready tasks for every free slot and start them without waiting.
 
         Args:
-            remaining_limit: Max tasks to execute in this poll cycle
+            remaining_limit: Max tasks to start
 
         Returns:
-            Number of tasks executed
+            Futures resolving to execute results (True = succeeded)
         """
-        try:
-            db = self._get_db()
-            batch_size = min(10, remaining_limit) if remaining_limit else 10
-            ready_tasks = db.get_ready_actions(limit=batch_size)
+        self.recover_expired_leases()
+        free = self._free_slots()
+        if remaining_limit is not None:
+            free = min(free, remaining_limit)
+        if free <= 0 or self._shutdown_requested:
+            return []
 
-            if not ready_tasks:
-                return 0
-
-            self.logger.info(f"Found {len(ready_tasks)} ready tasks")
-            executed = 0
-
-            for task in ready_tasks:
-                if self._shutdown_requested:
-                    self.logger.info("Shutdown requested, stopping execution loop")
-                    break
-
-                if remaining_limit and executed >= remaining_limit:
-                    break
+        db = self._get_db()
+        # Budget holds back medium/low work per type (and LLM work while the quota is exhausted)
+        budget = self._get_admission().dispatch_budget(free)
+        ready_tasks = db.get_ready_actions(limit=free, budget=budget)
+        if not ready_tasks:
+            return []
+        self.logger.info(f"Found {len(ready_tasks)} ready tasks ({free} free slots)")
+
+        if not self.dry_run:
+            # Initialize the shared executor once, before slots race for it
+            self._get_task_executor()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.slots, thread_name_prefix="executor-slot")
+
+        futures = []
+        for task in ready_tasks:
+            if self._shutdown_requested:
+                self.logger.info("Shutdown requested, not starting more tasks")
+                break
+            if not self._claim(task["action_id"]):
+                continue
+            with self._lock:
+                self._busy_slots += 1
+            future = self._pool.submit(self._execute_claimed, task)
+            future.add_done_callback(self._slot_done)
+            futures.append(future)
+        return futures
+
+    def _wait_for_slots(self):
+        """Block until every running task has finished (graceful shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
 
-                if self.execute_task(task):
-                    executed += 1
+    def poll_and_execute(self, remaining_limit: int = None) -> int:
+        """
+        Poll for ready tasks and execute them concurrently in the free slots.
 
-            return executed
+        Args:
+            remaining_limit: Max tasks to execute in this poll cycle
 
+        Returns:
+            Number of tasks executed successfully
+        """
+        try:
+            futures = self._fill_slots(remaining_limit)
+            return sum(1 for f in futures if f.result())
         except Exception as e:
             self.logger.error(f"Poll error: {e}")
-            self.stats["consecutive_errors"] += 1
+            self._bump("consecutive_errors")
             return 0
 
     # ══════════════════════════════════════════════════════════════════════════
     # HEARTBEAT
     # ══════════════════════════════════════════════════════════════════════════
 
+    def renew_leases(self) -> int:
+        """Extend the leases on every task this worker is running."""
+        active = self._active_task_ids()
+        if not active:
+            return 0
+        renewed = self._get_db().renew_action_leases(self.worker_id, active, self.lease_seconds)
+        if renewed < len(active):
+            # Lost leases were re-queued by another worker; their results still land, but may be duplicated
+            self.logger.warning(f"Renewed {renewed}/{len(active)} task leases; some leases already expired")
+        return renewed
+
     def _heartbeat_loop(self):
-        """Background thread for heartbeat updates."""
-        while self._running and not self._shutdown_requested:
+        """Background thread for heartbeat updates and lease renewal."""
+        tick = max(1, min(HEARTBEAT_INTERVAL_SECONDS, self.lease_seconds // 3))
+        last_heartbeat = 0.0
+        # Keep renewing while slots finish up after a shutdown request
+        while self._running and (not self._shutdown_requested or self._active_task_ids()):
             try:
-                db = self._get_db()
-                db.set_config(f"executor_heartbeat_{self.worker_id}", datetime.now().isoformat())
-                db.set_config(f"executor_stats_{self.worker_id}", json.dumps(self.stats))
+                self.renew_leases()
+            except Exception as e:
+                self.logger.debug(f"Lease renewal error: {e}")
+
+            if time.time() - last_heartbeat < HEARTBEAT_INTERVAL_SECONDS:
+                time.sleep(tick)
+                continue
+            last_heartbeat = time.time()
+            try:
+                self._renew_named_leases()
                 # Update Prometheus metrics if available
                 try:
                     from syndicate.metrics import METRICS
 
                     # set heartbeat timestamp and leadership gauge
                     METRICS["executor_heartbeat_timestamp"].labels(worker_id=self.worker_id).set(time.time())
-                    METRICS["executor_is_leader"].labels(worker_id=self.worker_id).set(1 if getattr(self, "_is_leader", False) else 0)
+                    METRICS["executor_is_leader"].labels(worker_id=self.worker_id).set(1 if self._is_leader else 0)
                 except Exception:
                     pass
             except Exception as e:
                 self.logger.debug(f"Heartbeat error: {e}")
 
-            time.sleep(HEARTBEAT_INTERVAL_SECONDS)
+            time.sleep(tick)
 
     def _start_heartbeat(self):
         """
@@ -591,31 +725,44 @@ class ExecutorDaemon:
         except Exception:
             pass
 
-    def _attempt_leader_election(self, ttl_seconds: int = 120) -> bool:
-        """Try to become the leader by writing to system_config if empty or stale."""
+    def _member_metadata(self) -> str:
+        with self._lock:
+            return json.dumps({"stats": self.stats, "active_tasks": sorted(self._active_tasks), "slots": self.slots})
+
+    def _register_member(self):
+        """Take this daemon's liveness lease; its metadata carries the stats for health reports."""
+        from scripts.leases import Lease
+
+        if self._member_lease is None:
+            self._member_lease = Lease(
+                f"{MEMBER_LEASE_PREFIX}{self.worker_id}",
+                ttl=2 * HEARTBEAT_INTERVAL_SECONDS,
+                holder=self.worker_id,
+                renew=False,
+                db=self._get_db(),
+            )
+        self._member_lease.acquire(self._member_metadata())
+
+    def _renew_named_leases(self):
+        """Heartbeat: one row update for liveness + stats, one for leadership."""
+        if self._member_lease is not None and not self._member_lease.renew(self._member_metadata()):
+            self._register_member()
+        if self._is_leader and not self._leader_lease.renew():
+            self._is_leader = False
+            self.logger.warning(f"Lost executor leadership: {self.worker_id}")
+
+    def _attempt_leader_election(self, ttl_seconds: int = LEADER_TTL_SECONDS) -> bool:
+        """Try to become the leader by atomically taking the executor_leader lease."""
         try:
-            db = self._get_db()
-            key = "executor_leader"
-            cur = db.get_config(key, None)
-            now_iso = datetime.now().isoformat()
-            if not cur:
-                db.set_config(key, f"{self.worker_id}|{now_iso}", "Current executor leader")
-                self.logger.info(f"Became executor leader: {self.worker_id}")
+            from scripts.leases import Lease
+
+            if self._leader_lease is None:
+                self._leader_lease = Lease(
+                    LEADER_LEASE, ttl=ttl_seconds, holder=self.worker_id, renew=False, db=self._get_db()
+                )
+            if self._leader_lease.acquire():
+                self.logger.info(f"Became executor leader: {self.worker_id} (token {self._leader_lease.token})")
                 return True
-            else:
-                parts = cur.split("|")
-                if len(parts) >= 2:
-                    leader_ts = parts[1]
-                    try:
-                        leader_dt = datetime.fromisoformat(leader_ts)
-                        if (datetime.now() - leader_dt).total_seconds() > ttl_seconds:
-                            # Steal leadership
-                            db.set_config(key, f"{self.worker_id}|{now_iso}", "Current executor leader")
-                            self.logger.info(f"Stole executor leadership: {self.worker_id}")
-                            return True
-                    except Exception:
-                        db.set_config(key, f"{self.worker_id}|{now_iso}", "Current executor leader")
-                        return True
         except Exception as e:
             self.logger.debug(f"Leader election error: {e}")
         return False
@@ -641,26 +788,41 @@ class ExecutorDaemon:
         if max_tasks:
             self.logger.info(f"Task limit: {max_tasks}")
         self.stats["started_at"] = datetime.now().isoformat()
+        self._running = True
 
         # Recover any orphans first
         self.recover_orphans()
 
-        total_executed = 0
-        while True:
+        # Register and renew leases while draining
+        self._register_member()
+        self._start_heartbeat()
+
+        futures: List[Future] = []
+        while not self._shutdown_requested:
             # Check task limit
-            if max_tasks and total_executed >= max_tasks:
+            if max_tasks and len(futures) >= max_tasks:
                 self.logger.info(f"Reached task limit ({max_tasks})")
                 break
 
-            remaining = (max_tasks - total_executed) if max_tasks else None
-            executed = self.poll_and_execute(remaining_limit=remaining)
-            total_executed += executed
-
-            if executed == 0:
+            remaining = (max_tasks - len(futures)) if max_tasks else None
+            try:
+                started = self._fill_slots(remaining_limit=remaining)
+            except Exception as e:
+                self.logger.error(f"Poll error: {e}")
                 break
+            futures.extend(started)
 
-            if self._shutdown_requested:
-                break
+            if not started:
+                if self._free_slots() == self.slots:
+                    break  # queue drained and nothing running
+                # Wait for a slot to free up, then top up again
+                self._slot_freed.wait(1.0)
+                self._slot_freed.clear()
+
+        self._wait_for_slots()
+        self._running = False
+        self._cleanup()
+        total_executed = sum(1 for f in futures if f.result())
 
         self.logger.info(f"Drain complete. Executed {total_executed} tasks.")
         self._print_stats()
@@ -672,13 +834,13 @@ class ExecutorDaemon:
 
         Polls for tasks at regular intervals until shutdown.
         """
-        self.logger.info(f"Executor daemon starting (continuous) - Worker: {self.worker_id}")
+        self.logger.info(
+            f"Executor daemon starting (continuous) - Worker: {self.worker_id}, "
+            f"{self.slots} slots, {self.lease_seconds}s leases"
+        )
         self.stats["started_at"] = datetime.now().isoformat()
         self._running = True
 
-        # Recover orphans on startup
-        self.recover_orphans()
-
         # Start Prometheus metrics server if available (best-effort)
         try:
             from syndicate.metrics import start_metrics_server
@@ -687,55 +849,106 @@ class ExecutorDaemon:
         except Exception:
             pass
 
-        # Start heartbeat
+        # Register liveness and start heartbeat
+        self._register_member()
         self._start_heartbeat()
 
         # Start HTTP health endpoint (best-effort)
         self._start_http_health()
 
-        # Attempt to become leader; only leader performs work (supports HA)
+        # Attempt to become leader; the leader runs the singleton jobs (and, with
+        # EXECUTOR_LEADER_ONLY=1, is the only daemon executing tasks)
         self._is_leader = self._attempt_leader_election()
-        if not getattr(self, "_is_leader", False):
+        if self._is_leader:
+            self.recover_orphans()
+        elif LEADER_ONLY:
             self.logger.info("Not leader on startup; running as standby and will attempt periodic election")
+        else:
+            self.logger.info("Not leader on startup; executing tasks alongside the leader")
 
-        last_orphan_check = time.time()
-
-        while not self._shutdown_requested:
-            try:
-                # Leader only: poll and execute
-                self.stats["last_poll_at"] = datetime.now().isoformat()
-                if getattr(self, "_is_leader", False):
-                    self.poll_and_execute()
-                else:
-                    # Periodically attempt to become leader
-                    if self._attempt_leader_election():
-                        self._is_leader = True
-                        self.logger.info("Promoted to leader; resuming task execution")
-
-                # Periodic orphan recovery
-                if time.time() - last_orphan_check > ORPHAN_CHECK_INTERVAL_SECONDS:
-                    self.recover_orphans()
-                    last_orphan_check = time.time()
-
-                # Check for too many consecutive errors
-                if self.stats["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
-                    self.logger.error(
-                        f"Too many consecutive errors ({MAX_CONSECUTIVE_ERRORS}), " "pausing for extended cooldown..."
-                    )
-                    time.sleep(MAX_BACKOFF_SECONDS)
-                    self.stats["consecutive_errors"] = 0
-
-                # Sleep between polls
-                time.sleep(self.poll_interval)
+        # Event-driven main loop: block until the next due job; new or released
+        # actions (db_manager listener) and finished slots wake it early
+        from db_manager import add_action_listener, remove_action_listener
 
-            except Exception as e:
-                self.logger.error(f"Daemon loop error: {e}")
-                time.sleep(self.poll_interval)
+        add_action_listener(self._on_action_change)
+        self.scheduler.call_soon(self._resync_job, key="resync-now")
+        # Safety net for actions written by other processes, which cannot call our listener
+        self.scheduler.every(self.poll_interval, self._resync_job, key="resync")
+        self.scheduler.every(ORPHAN_CHECK_INTERVAL_SECONDS, self._orphan_job, key="orphans")
+        try:
+            self.scheduler.run(should_stop=lambda: self._shutdown_requested)
+        finally:
+            remove_action_listener(self._on_action_change)
 
+        active = self._active_task_ids()
+        if active:
+            self.logger.info(f"Waiting for {len(active)} running task(s) before exit")
+        self._wait_for_slots()
         self._running = False
+        self._cleanup()
         self.logger.info("Executor daemon stopped")
         self._print_stats()
 
+    # ══════════════════════════════════════════════════════════════════════════
+    # SCHEDULED JOBS
+    # ══════════════════════════════════════════════════════════════════════════
+
+    @staticmethod
+    def _due_timestamp(scheduled_for: Optional[str]) -> Optional[float]:
+        try:
+            return datetime.fromisoformat(scheduled_for).timestamp() if scheduled_for else None
+        except (TypeError, ValueError):
+            return None
+
+    def _on_action_change(self, action_id: str, scheduled_for: Optional[str]):
+        """db_manager listener: a pending action was saved or released (any thread)."""
+        due = self._due_timestamp(scheduled_for)
+        if due is not None and due > time.time():
+            self.scheduler.call_at(due, self._poll_job, key=f"action:{action_id}")
+        else:
+            self.scheduler.call_soon(self._poll_job, key="poll")
+
+    def _poll_job(self):
+        """Fill free slots with ready tasks."""
+        if time.time() < self._cooldown_until:
+            return
+        self.stats["last_poll_at"] = datetime.now().isoformat()
+        if self._is_leader or not LEADER_ONLY:
+            try:
+                self._fill_slots()
+            except Exception as e:
+                self.logger.error(f"Poll error: {e}")
+                self._bump("consecutive_errors")
+
+        # Check for too many consecutive errors
+        if self.stats["consecutive_errors"] >= MAX_CONSECUTIVE_ERRORS:
+            self.logger.error(
+                f"Too many consecutive errors ({MAX_CONSECUTIVE_ERRORS}), pausing for extended cooldown..."
+            )
+            self._cooldown_until = time.time() + MAX_BACKOFF_SECONDS
+            with self._lock:
+                self.stats["consecutive_errors"] = 0
+            self.scheduler.call_at(self._cooldown_until, self._poll_job, key="cooldown")
+
+    def _resync_job(self):
+        """Reload future scheduled actions into the scheduler, retry leadership and poll once."""
+        if not self._is_leader and self._attempt_leader_election():
+            self._is_leader = True
+            self.logger.info("Promoted to leader; taking over singleton jobs")
+        try:
+            for row in self._get_db().get_scheduled_actions():
+                due = self._due_timestamp(row.get("scheduled_for"))
+                if due is not None:
+                    self.scheduler.call_at(due, self._poll_job, key=f"action:{row['action_id']}")
+        except Exception as e:
+            self.logger.debug(f"Schedule resync failed: {e}")
+        self._poll_job()
+
+    def _orphan_job(self):
+        """Periodic age-based orphan sweep (singleton: leader only)."""
+        if self._is_leader:
+            self.recover_orphans()
+
     def _print_stats(self):
         """Print execution statistics."""
         self.logger.info("=" * 60)
@@ -747,11 +960,27 @@ class ExecutorDaemon:
         self.logger.info(f"  Failed:           {self.stats['tasks_failed']}")
         self.logger.info(f"  Retried:          {self.stats['tasks_retried']}")
         self.logger.info(f"  Orphans Recovered:{self.stats['orphans_recovered']}")
+        self.logger.info(f"  Leases Expired:   {self.stats['leases_expired']}")
         if self.stats["tasks_executed"] > 0:
             avg_time = self.stats["total_execution_time_ms"] / self.stats["tasks_executed"]
             self.logger.info(f"  Avg Exec Time:    {avg_time:.2f}ms")
         self.logger.info("=" * 60)
 
+    @staticmethod
+    def _lease_holder(db, name: str) -> Optional[str]:
+        try:
+            lease = db.get_lease(name)
+            return lease["holder"] if lease and lease["expires_at"] > time.time() else None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _live_members(db) -> List[Dict[str, Any]]:
+        try:
+            return db.get_leases(MEMBER_LEASE_PREFIX)
+        except Exception:
+            return []
+
     def health_check(self) -> Dict[str, Any]:
         """
         Get daemon health status.
@@ -775,11 +1004,25 @@ class ExecutorDaemon:
                 if self.stats["started_at"]
                 else 0
             ),
-            "current_task": self._current_task_id,
+            "current_task": next(iter(self._active_task_ids()), None),
+            "active_tasks": self._active_task_ids(),
+            "slots": self.slots,
+            "is_leader": self._is_leader,
+            "scheduler": dict(self.scheduler.stats, jobs=len(self.scheduler)),
+            "leader": self._lease_holder(db, LEADER_LEASE),
+            "executors": [lease["holder"] for lease in self._live_members(db)],
             "stats": self.stats,
             "queue": task_stats,
+            "queue_pressure": self._queue_pressure(),
+            "sandbox": dict(self._sandbox_pool.stats) if self._sandbox_pool is not None else None,
         }
 
+    def _queue_pressure(self) -> Dict[str, Any]:
+        try:
+            return self._get_admission().pressure()
+        except Exception as e:
+            return {"error": str(e)}
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SUBPROCESS SPAWN INTERFACE
@@ -835,17 +1078,11 @@ def spawn_executor_subprocess(detach: bool = True) -> Optional[int]:
 
 
 def is_executor_running() -> bool:
-    """Check if an executor daemon is already running."""
+    """Check if an executor daemon is already running (any live executor liveness lease)."""
     try:
         from db_manager import get_db
 
-        db = get_db()
-        heartbeat = db.get_config(f"executor_heartbeat_{WORKER_ID}")
-
-        if heartbeat:
-            last_heartbeat = datetime.fromisoformat(heartbeat)
-            if datetime.now() - last_heartbeat < timedelta(minutes=2):
-                return True
+        return bool(get_db().get_leases(MEMBER_LEASE_PREFIX))
     except Exception:
         pass
     return False
@@ -883,6 +1120,18 @@ Examples:
         default=POLL_INTERVAL_SECONDS,
         help=f"Seconds between polls (default: {POLL_INTERVAL_SECONDS})",
     )
+    parser.add_argument(
+        "--slots",
+        type=int,
+        default=EXECUTOR_SLOTS,
+        help=f"Concurrent task slots (default: EXECUTOR_SLOTS or {EXECUTOR_SLOTS})",
+    )
+    parser.add_argument(
+        "--sandbox",
+        action="store_true",
+        default=None,
+        help="Run task handlers in supervised worker processes with hard time/memory limits (EXECUTOR_SANDBOX)",
+    )
     parser.add_argument("--log-file", type=Path, help="Log file path (default: stdout only)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
     parser.add_argument(
@@ -895,6 +1144,15 @@ Examples:
 
     args = parser.parse_args()
 
+    # Background research yields shared Gemini quota to interactive callers
+    if "LLM_PRIORITY" not in os.environ:
+        try:
+            from scripts.rate_limiter import set_default_priority
+
+            set_default_priority("batch")
+        except Exception:
+            pass
+
     # Spawn mode - launch detached and exit
     if args.spawn:
         if is_executor_running():
@@ -944,6 +1202,8 @@ Examples:
         logger=logger,
         poll_interval=args.poll_interval,
         dry_run=getattr(args, "dry_run", False),
+        slots=args.slots,
+        sandbox=args.sandbox,
     )
 
     # Execute based on mode
@@ -15,8 +15,15 @@
 Syndicate File Organizer
 Intelligently organizes, titles, dates, and archives reports and charts.
 Maintains a clean, accessible output structure.
+
+The catalog of organized files lives in the organizer_files table (see
+db_manager), one row per file keyed by path and scoped to the output root.
+Each organize pass writes only the files it placed, and recent-file and
+category queries go through the table's indexes. A file_index.json left by
+earlier versions is imported once and renamed to file_index.json.migrated.
 """
 
+import hashlib
 import json
 import logging
 import re
@@ -31,6 +38,18 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 
+def _file_hash(path: Path) -> Optional[str]:
+    """sha256 of a file's bytes, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
 # ==========================================
 # FILE ORGANIZER
 # ==========================================
@@ -43,7 +62,7 @@ class FileOrganizer:
     - Dates and timestamps all files
     - Categorizes into appropriate folders
     - Archives files older than threshold
-    - Maintains index/catalog of all outputs
+    - Maintains index/catalog of all outputs (organizer_files table)
     """
 
     # File type categories
@@ -64,9 +83,14 @@ class FileOrganizer:
     # Archive threshold in days
     DEFAULT_ARCHIVE_DAYS = 7
 
-    def __init__(self, config, logger: logging.Logger):
+    def __init__(self, config, logger: logging.Logger, db=None):
         self.config = config
         self.logger = logger
+        if db is None:
+            from db_manager import get_db
+
+            db = get_db()
+        self.db = db
 
         # Set up directory structure
         self.base_dir = Path(config.OUTPUT_DIR) if config else PROJECT_ROOT / "output"
@@ -94,8 +118,10 @@ class FileOrganizer:
         # Initialize directory structure
         self._ensure_directories()
 
-        # Load or create index
-        self.file_index = self._load_index()
+        # Catalog rows are scoped to this output root; entries recorded since the last save
+        self.root = str(self.base_dir)
+        self._pending: List[Dict] = []
+        self._migrate_json_index()
 
     def _ensure_directories(self):
         """Create all necessary directories."""
@@ -115,29 +141,50 @@ class FileOrganizer:
         for dir_path in dirs_to_create:
             dir_path.mkdir(parents=True, exist_ok=True)
 
-    def _load_index(self) -> Dict:
-        """Load file index from disk."""
-        if self.index_file.exists():
-            try:
-                with open(self.index_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.warning(f"[ORGANIZER] Could not load index: {e}")
-
-        return {
-            "files": {},
-            "categories": {cat: [] for cat in self.CATEGORIES.keys()},
-            "last_updated": None,
-            "statistics": {"total_files": 0, "total_archived": 0, "by_category": {}},
-        }
+    def _migrate_json_index(self) -> int:
+        """Import a file_index.json written by earlier versions into the catalog (once)."""
+        if not self.index_file.exists():
+            return 0
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                files = json.load(f).get("files", {})
+        except Exception as e:
+            self.logger.warning(f"[ORGANIZER] Could not load index: {e}")
+            return 0
+
+        entries = []
+        for path, info in files.items():
+            archive_path = info.get("archive_path")
+            archived = bool(info.get("archived", False))
+            entries.append(
+                {
+                    # Archived rows are keyed by where the file went (see archive_organizer_files)
+                    "path": archive_path if archived and archive_path else path,
+                    "original_name": info.get("original_name"),
+                    "category": info.get("category"),
+                    "file_date": info.get("date"),
+                    "size_bytes": info.get("size_bytes"),
+                    "content_hash": _file_hash(Path(path)),
+                    "archived": archived,
+                    "archive_path": archive_path,
+                    "organized_at": info.get("organized_at"),
+                }
+            )
+        try:
+            self.db.upsert_organizer_files(self.root, entries)
+        except Exception as e:
+            # Keep the JSON file so the next start retries the import
+            self.logger.error(f"[ORGANIZER] Could not migrate {self.index_file.name}; will retry: {e}")
+            return 0
+        self.index_file.rename(self.index_file.with_name(self.index_file.name + ".migrated"))
+        self.logger.info(f"[ORGANIZER] Migrated {len(entries)} entries from {self.index_file.name}")
+        return len(entries)
 
     def _save_index(self):
-        """Save file index to disk."""
-        self.file_index["last_updated"] = datetime.now().isoformat()
-
+        """Write the catalog entries recorded since the last save, in one transaction."""
+        pending, self._pending = self._pending, []
         try:
-            with open(self.index_file, "w", encoding="utf-8") as f:
-                json.dump(self.file_index, f, indent=2)
+            self.db.upsert_organizer_files(self.root, pending)
         except Exception as e:
             self.logger.error(f"[ORGANIZER] Could not save index: {e}")
 
@@ -238,18 +285,18 @@ class FileOrganizer:
             else:
                 shutil.copy2(str(source_path), str(dest_path))
 
-            # Update index
-            self.file_index["files"][str(dest_path)] = {
-                "original_name": filename,
-                "category": category,
-                "date": file_date.isoformat(),
-                "organized_at": datetime.now().isoformat(),
-                "size_bytes": dest_path.stat().st_size,
-            }
-
-            if category not in self.file_index["categories"]:
-                self.file_index["categories"][category] = []
-            self.file_index["categories"][category].append(str(dest_path))
+            # Update index (written by the next _save_index)
+            self._pending.append(
+                {
+                    "path": str(dest_path),
+                    "original_name": filename,
+                    "category": category,
+                    "file_date": file_date.isoformat(),
+                    "organized_at": datetime.now().isoformat(),
+                    "size_bytes": dest_path.stat().st_size,
+                    "content_hash": _file_hash(dest_path),
+                }
+            )
 
             self.logger.info(f"[ORGANIZER] Organized: {filename} -> {category}/{new_name}")
             return dest_path
@@ -297,7 +344,6 @@ class FileOrganizer:
                     counts["charts"] = counts.get("charts", 0) + 1
 
         self._save_index()
-        self._update_statistics()
 
         self.logger.info(f"[ORGANIZER] Organized {sum(counts.values())} files")
         return counts
@@ -312,6 +358,7 @@ class FileOrganizer:
 
         cutoff_date = date.today() - timedelta(days=days_threshold)
         archived_count = 0
+        archived = []
 
         # Archive from each category directory
         for category, cat_dir in self.category_dirs.items():
@@ -342,53 +389,84 @@ class FileOrganizer:
                     archive_path = year_month_dir / file_path.name
 
                     try:
+                        size_bytes = file_path.stat().st_size
                         shutil.move(str(file_path), str(archive_path))
                         archived_count += 1
 
                         # Update index
-                        if str(file_path) in self.file_index["files"]:
-                            self.file_index["files"][str(file_path)]["archived"] = True
-                            self.file_index["files"][str(file_path)]["archive_path"] = str(archive_path)
+                        archived.append(
+                            {
+                                "path": str(file_path),
+                                "archive_path": str(archive_path),
+                                "original_name": file_path.name,
+                                "category": category,
+                                "file_date": file_date.isoformat(),
+                                "size_bytes": size_bytes,
+                                "organized_at": datetime.now().isoformat(),
+                            }
+                        )
 
                         self.logger.debug(f"[ORGANIZER] Archived: {file_path.name}")
 
                     except Exception as e:
                         self.logger.error(f"[ORGANIZER] Failed to archive {file_path}: {e}")
 
-        self.file_index["statistics"]["total_archived"] += archived_count
         self._save_index()
+        try:
+            self.db.archive_organizer_files(self.root, archived)
+        except Exception as e:
+            self.logger.error(f"[ORGANIZER] Could not save index: {e}")
 
         self.logger.info(f"[ORGANIZER] Archived {archived_count} files older than {days_threshold} days")
         return archived_count
 
-    def _update_statistics(self):
-        """Update statistics in the index."""
-        stats = self.file_index["statistics"]
-        stats["total_files"] = len(self.file_index["files"])
-        stats["by_category"] = {}
-
-        for category, files in self.file_index["categories"].items():
-            stats["by_category"][category] = len(files)
+    def find_files(
+        self,
+        category: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        include_archived: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Catalog entries in a file-date range (inclusive), newest first."""
+        self._save_index()
+        rows = self.db.get_organizer_files(
+            self.root,
+            category=category,
+            since=since.isoformat() if since else None,
+            until=until.isoformat() if until else None,
+            archived=None if include_archived else False,
+            limit=limit,
+        )
+        return [
+            {
+                "path": row["path"],
+                "original_name": row["original_name"],
+                "category": row["category"],
+                "date": row["file_date"],
+                "organized_at": row["organized_at"],
+                "size_bytes": row["size_bytes"],
+                "hash": row["content_hash"],
+                "archived": bool(row["archived"]),
+                "archive_path": row["archive_path"],
+            }
+            for row in rows
+        ]
 
-    def get_recent_files(self, category: Optional[str] = None, days: int = 7) -> List[Dict]:
+    def get_recent_files(
+        self, category: Optional[str] = None, days: int = 7, limit: Optional[int] = None
+    ) -> List[Dict]:
         """Get files from the last N days."""
-        cutoff = (date.today() - timedelta(days=days)).isoformat()
-        recent = []
-
-        for file_path, info in self.file_index["files"].items():
-            if info.get("archived"):
-                continue
-            if category and info.get("category") != category:
-                continue
-            if info.get("date", "") >= cutoff:
-                recent.append({"path": file_path, **info})
+        return self.find_files(category=category, since=date.today() - timedelta(days=days), limit=limit)
 
-        # Sort by date descending
-        recent.sort(key=lambda x: x.get("date", ""), reverse=True)
-        return recent
+    def get_statistics(self) -> Dict:
+        """Catalog counts: total_files, total_archived and by_category."""
+        self._save_index()
+        return self.db.get_organizer_statistics(self.root)
 
     def generate_index_report(self) -> str:
         """Generate a markdown index of all organized files."""
+        stats = self.get_statistics()
         report = f"""# Syndicate File Index
 > Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -396,20 +474,20 @@ class FileOrganizer:
 
 | Metric | Value |
 |--------|-------|
-| Total Files | {self.file_index['statistics'].get('total_files', 0)} |
-| Total Archived | {self.file_index['statistics'].get('total_archived', 0)} |
+| Total Files | {stats['total_files']} |
+| Total Archived | {stats['total_archived']} |
 
 ## Files by Category
 
 """
 
-        for category, count in self.file_index["statistics"].get("by_category", {}).items():
+        for category, count in stats["by_category"].items():
             report += f"- **{category.title()}**: {count} files\n"
 
         report += "\n## Recent Files (Last 7 Days)\n\n"
 
-        recent = self.get_recent_files(days=7)
-        for file_info in recent[:20]:
+        recent = self.get_recent_files(days=7, limit=20)
+        for file_info in recent:
             report += f"- [{Path(file_info['path']).name}]({file_info['path']}) - {file_info['category']} ({file_info['date']})\n"
 
         report += "\n---\n*File index auto-generated by Syndicate File Organizer*\n"
@@ -18,10 +18,15 @@ Adds YAML frontmatter headers to markdown files for MCP publishing.
 Supports automatic type detection and tag extraction.
 """
 
+import logging
 import os
 import re
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from scripts.markdown_files import scan_markdown
+
+LOG = logging.getLogger("frontmatter")
 
 # Mapping of file patterns to Notion types - comprehensive coverage
 FILE_TYPE_PATTERNS = {
@@ -433,19 +438,34 @@ def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     Returns:
         Tuple of (frontmatter dict, remaining content)
     """
-    if not has_frontmatter(content):
+    split = _split_frontmatter(content)
+    if split is None:
         return {}, content
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}, content
+    header, body_start = split
+    return _parse_header(header), content[body_start:].strip()
+
+
+def _split_frontmatter(content: str) -> Optional[Tuple[str, int]]:
+    """
+    Locate the frontmatter block: (text between the first two '---', offset of the body).
+
+    None if content does not start with '---' or has no closing '---'. Only
+    the delimiters are searched for; the body is not copied.
+    """
+    start = content.find("---")
+    if start < 0 or content[:start].strip():
+        return None
+    end = content.find("---", start + 3)
+    if end < 0:
+        return None
+    return content[start + 3 : end], end + 3
 
-    frontmatter_str = parts[1].strip()
-    remaining = parts[2].strip()
 
+def _parse_header(frontmatter_str: str) -> Dict[str, Any]:
     # Simple YAML parsing (for basic key: value pairs)
     frontmatter = {}
-    for line in frontmatter_str.split("\n"):
+    for line in frontmatter_str.strip().split("\n"):
         if ":" in line:
             key, value = line.split(":", 1)
             key = key.strip()
@@ -467,7 +487,187 @@ def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
 
             frontmatter[key] = value
 
-    return frontmatter, remaining
+    return frontmatter
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# HEADER READS AND STATUS INDEX
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Characters read per step while looking for the closing '---', and the most
+# read before falling back to the whole file (a header that long is not expected)
+FRONTMATTER_READ_CHUNK = 4096
+FRONTMATTER_READ_LIMIT = int(os.environ.get("FRONTMATTER_READ_LIMIT", str(64 * 1024)))
+STATUS_INDEX_ENABLED = os.environ.get("FRONTMATTER_STATUS_INDEX", "1").lower() not in ("0", "false", "no")
+
+# Frontmatter keys kept in the status index
+STATUS_FIELDS = ("status", "ai_processed", "sync_status", "notion_page_id", "pending_reason", "pending_since")
+
+
+def _read_header(path: Union[str, os.PathLike]) -> Tuple[bool, Optional[str]]:
+    """(starts with '---', frontmatter block text or None) of a file, read from its start only."""
+    with open(path, encoding="utf-8") as f:
+        head = ""
+        while True:
+            chunk = f.read(FRONTMATTER_READ_CHUNK if len(head) < FRONTMATTER_READ_LIMIT else -1)
+            head += chunk
+            lead = head.lstrip()[:3]
+            if lead != "---"[: len(lead)]:
+                return False, None
+            split = _split_frontmatter(head)
+            if split is not None:
+                return True, split[0]
+            if not chunk:
+                return has_frontmatter(head), None
+
+
+def read_frontmatter(path: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """
+    Frontmatter of a markdown file without reading its body.
+
+    Reads FRONTMATTER_READ_CHUNK characters at a time until the closing
+    '---' is found; gives the same result as parse_frontmatter on the whole
+    file.
+    """
+    _, header = _read_header(path)
+    return _parse_header(header) if header is not None else {}
+
+
+def _index_value(value: Any) -> Any:
+    return value if value is None or isinstance(value, (str, int, float)) else str(value)
+
+
+def _status_entry(key: str, stat: os.stat_result, marker: bool, frontmatter: Dict[str, Any]) -> Dict[str, Any]:
+    entry = {
+        "path": key,
+        "inode": stat.st_ino,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "has_frontmatter": marker,
+    }
+    for field in STATUS_FIELDS:
+        entry[field] = _index_value(frontmatter.get(field))
+    if "ai_processed" in frontmatter:
+        entry["ai_processed"] = frontmatter["ai_processed"] is True
+    return entry
+
+
+def _is_current(entry: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    return entry is not None and (entry["inode"], entry["size"], entry["mtime_ns"]) == (
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+
+
+class DocumentStatusIndex:
+    """
+    Persistent path -> frontmatter status index of markdown documents.
+
+    Entries hold STATUS_FIELDS and whether the file has frontmatter, with
+    the (inode, size, mtime_ns) the file had when they were read. Lookups
+    answer from the entry while that stat holds and re-read only the header
+    of files changed since, so files edited by hand are picked up too.
+    write() saves a document and updates its entry from the written content.
+
+    Args:
+        db: DatabaseManager holding the frontmatter_index table (None = header reads only)
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+
+    @staticmethod
+    def key(path: Union[str, os.PathLike]) -> str:
+        return os.path.abspath(path)
+
+    def _read(self, key: str, stat: os.stat_result) -> Dict[str, Any]:
+        marker, header = _read_header(key)
+        return _status_entry(key, stat, marker, _parse_header(header) if header is not None else {})
+
+    def _record(self, entries: List[Dict[str, Any]], stale: List[str] = ()) -> None:
+        if self.db is None:
+            return
+        try:
+            self.db.record_frontmatter_index(entries)
+            self.db.delete_frontmatter_index(list(stale))
+        except Exception as e:
+            # Entries are checked against the file's stat, so a missed update is only re-read later
+            LOG.warning("Could not update the document status index: %s", e)
+
+    def lookup(self, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """Index entry of one file, refreshed from its header if it changed."""
+        key = self.key(path)
+        stat = os.stat(key)
+        entry = self.db.get_frontmatter_entry(key) if self.db is not None else None
+        if not _is_current(entry, stat):
+            entry = self._read(key, stat)
+            self._record([entry])
+        return entry
+
+    def frontmatter(self, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        """The indexed frontmatter keys a file sets, as parse_frontmatter would return them."""
+        entry = self.lookup(path)
+        frontmatter = {field: entry[field] for field in STATUS_FIELDS if entry[field] is not None}
+        if "ai_processed" in frontmatter:
+            frontmatter["ai_processed"] = bool(frontmatter["ai_processed"])
+        return frontmatter
+
+    def scan(self, directory: Union[str, os.PathLike]) -> List[Dict[str, Any]]:
+        """
+        Index entries of every *.md file under `directory`, sorted by path.
+
+        Unchanged files are answered from one query; changed ones have their
+        header read, and all updates (including entries of deleted files)
+        are written in one transaction.
+        """
+        root = self.key(directory)
+        known = self.db.get_frontmatter_index(root) if self.db is not None else {}
+        entries, updates = [], []
+        for path, stat in scan_markdown(root, skip_dirs=()):
+            entry = known.pop(path, None)
+            if not _is_current(entry, stat):
+                try:
+                    entry = self._read(path, stat)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                updates.append(entry)
+            entries.append(entry)
+        self._record(updates, stale=list(known))
+        return sorted(entries, key=lambda e: e["path"])
+
+    def write(self, path: Union[str, os.PathLike], content: str) -> None:
+        """Write a document and index the status fields of the written content."""
+        key = self.key(path)
+        with open(key, "w", encoding="utf-8") as f:
+            f.write(content)
+        split = _split_frontmatter(content)
+        frontmatter = _parse_header(split[0]) if split is not None else {}
+        self._record([_status_entry(key, os.stat(key), has_frontmatter(content), frontmatter)])
+
+
+def status_index() -> DocumentStatusIndex:
+    """Status index on the shared database (plain header reads if it is unavailable or disabled)."""
+    if STATUS_INDEX_ENABLED:
+        try:
+            from db_manager import get_db
+
+            return DocumentStatusIndex(get_db())
+        except Exception:
+            pass
+    return DocumentStatusIndex(None)
+
+
+def write_document(path: Union[str, os.PathLike], content: str) -> None:
+    """Write a markdown document, keeping the status index in step (see DocumentStatusIndex)."""
+    status_index().write(path, content)
+
+
+def _frontmatter_of(document: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """Frontmatter of document content, or the indexed status keys of a file path."""
+    if isinstance(document, os.PathLike):
+        return status_index().frontmatter(document)
+    return parse_frontmatter(document)[0]
 
 
 # Document lifecycle status constants
@@ -486,14 +686,18 @@ NOTION_SYNC_FIELDS = (
 )
 
 
-def get_document_status(content: str) -> str:
+# The status checks below take document content, or a Path to a document, which
+# is answered from the status index without reading the file (see status_index).
+
+
+def get_document_status(content: Union[str, os.PathLike]) -> str:
     """
     Get the lifecycle status from document frontmatter.
 
     Returns:
         Status string ('draft', 'in_progress', 'published', etc.) or 'draft' if not set.
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     return frontmatter.get("status", "draft")
 
 
@@ -534,18 +738,18 @@ def set_document_status(content: str, status: str, filename: str = "document.md"
         return add_frontmatter(content, filename, status=status)
 
 
-def is_published(content: str) -> bool:
+def is_published(content: Union[str, os.PathLike]) -> bool:
     """Check if document is published (ready for Notion sync)."""
     return get_document_status(content) == "published"
 
 
-def is_ai_processed(content: str) -> bool:
+def is_ai_processed(content: Union[str, os.PathLike]) -> bool:
     """Check if document was processed by AI."""
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     return frontmatter.get("ai_processed", False) is True
 
 
-def is_ready_for_sync(content: str) -> bool:
+def is_ready_for_sync(content: Union[str, os.PathLike]) -> bool:
     """
     Check if document is ready for Notion sync.
 
@@ -555,15 +759,15 @@ def is_ready_for_sync(content: str) -> bool:
     This avoids accidental publication of drafts or in-progress AI outputs. Promotion
     to 'published' should be an explicit action (manual review or a trusted automation).
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     status = frontmatter.get("status", "draft")
 
     return status in ("published", "complete")
 
 
-def is_draft(content: str) -> bool:
+def is_draft(content: Union[str, os.PathLike]) -> bool:
     """Check if document is in draft status (not AI processed)."""
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     status = frontmatter.get("status", "draft")
     return status == "draft"
 
@@ -573,42 +777,42 @@ def is_draft(content: str) -> bool:
 # ══════════════════════════════════════════════════════════════════════════════
 
 
-def is_synced_to_notion(content: str) -> bool:
+def is_synced_to_notion(content: Union[str, os.PathLike]) -> bool:
     """
     Check if document has been successfully synced to Notion.
 
     Returns:
         True if document has a notion_page_id and sync_status is 'synced'
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     page_id = frontmatter.get("notion_page_id")
     sync_status = frontmatter.get("sync_status", "pending")
     return bool(page_id) and sync_status == "synced"
 
 
-def get_notion_page_id(content: str) -> Optional[str]:
+def get_notion_page_id(content: Union[str, os.PathLike]) -> Optional[str]:
     """
     Get the Notion page ID from document frontmatter.
 
     Returns:
         Notion page UUID or None if not synced
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     return frontmatter.get("notion_page_id")
 
 
-def get_sync_status(content: str) -> str:
+def get_sync_status(content: Union[str, os.PathLike]) -> str:
     """
     Get the Notion sync status from document frontmatter.
 
     Returns:
         Sync status (pending|syncing|synced|failed|skipped) or 'pending' if not set
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
     return frontmatter.get("sync_status", "pending")
 
 
-def needs_sync(content: str) -> bool:
+def needs_sync(content: Union[str, os.PathLike]) -> bool:
     """
     Check if document needs to be synced to Notion.
 
@@ -619,7 +823,7 @@ def needs_sync(content: str) -> bool:
     Returns:
         True if document should be synced
     """
-    frontmatter, _ = parse_frontmatter(content)
+    frontmatter = _frontmatter_of(content)
 
     # Must be published to sync
     status = frontmatter.get("status", "draft")
@@ -827,35 +1031,29 @@ def get_pending_documents(directory: str) -> list:
     """
     Find all documents that are pending AI processing.
 
+    Answered from the status index: only files changed since they were
+    last indexed have their frontmatter read.
+
     Args:
         directory: Directory to search for markdown files
 
     Returns:
         List of file paths that need AI processing
     """
-    from pathlib import Path
-
     pending = []
-    for md_file in Path(directory).glob("**/*.md"):
-        try:
-            content = md_file.read_text(encoding="utf-8")
-            frontmatter, _ = parse_frontmatter(content)
-
-            status = frontmatter.get("status", "draft")
-            ai_processed = frontmatter.get("ai_processed", False)
-            pending_reason = frontmatter.get("pending_reason")
-
-            # Document needs AI if it's draft and not processed, or has a pending reason
-            if status == "draft" and (not ai_processed or pending_reason):
-                pending.append(
-                    {
-                        "path": str(md_file),
-                        "reason": pending_reason or "not_processed",
-                        "since": frontmatter.get("pending_since"),
-                    }
-                )
-        except Exception:
-            continue
+    for entry in status_index().scan(directory):
+        status = entry["status"] if entry["status"] is not None else "draft"
+        pending_reason = entry["pending_reason"]
+
+        # Document needs AI if it's draft and not processed, or has a pending reason
+        if status == "draft" and (not entry["ai_processed"] or pending_reason):
+            pending.append(
+                {
+                    "path": entry["path"],
+                    "reason": pending_reason or "not_processed",
+                    "since": entry["pending_since"],
+                }
+            )
 
     return pending
 
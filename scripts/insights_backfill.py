@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Parallel historical backfill of entity and action insights.
+
+process_all_reports only looks at today's reports. After the entity lists
+or action patterns change, archived journals and reports need to be
+re-extracted. This command walks the output archive and fans the documents
+out to a process pool (one InsightsExtractor per document, all cores). It
+then streams the results into the database in bulk transactions.
+
+- Checkpoints: every flushed batch records its documents in the
+  processed-document ledger (consumer "backfill:<run id>") in the same
+  transaction as its insights. An interrupted run resumes where it stopped.
+  The run id defaults to a hash of KNOWN_ENTITIES and ACTION_PATTERNS, so
+  changing the rules starts a fresh pass automatically.
+- Actions from past reports are recorded with status "skipped" and a
+  deterministic ID (re-runs update them in place). They are dated by
+  their report. With --queue-actions they are queued as pending instead,
+  subject to admission control, and dated now so they do not start out
+  fully aged; the report date is kept in their metadata.
+
+Usage:
+    python scripts/insights_backfill.py                      # whole output archive, all cores
+    python scripts/insights_backfill.py --since 2025-01-01 --workers 8
+    python scripts/insights_backfill.py --restart            # ignore checkpoints of this run id
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.insights_engine import ACTION_PATTERNS, KNOWN_ENTITIES, InsightsExtractor, content_hash
+
+LOG = logging.getLogger("insights_backfill")
+# Extractors in pool processes log here (per-document lines are quieted by main())
+WORKER_LOG = logging.getLogger("insights_backfill.worker")
+
+# Documents written to the database per transaction (and per checkpoint)
+BATCH_DOCUMENTS = 50
+# Directories under the output root that never hold text reports
+SKIP_DIRS = {"charts", "__pycache__", ".git"}
+DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+
+
+def rules_version() -> str:
+    """Short hash of the extraction rules; the default run id."""
+    rules = json.dumps({"entities": KNOWN_ENTITIES, "actions": ACTION_PATTERNS}, sort_keys=True)
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()[:12]
+
+
+def document_date(path: Path) -> date:
+    """Date in the file name (reports are named *_YYYY-MM-DD*), else the modification date."""
+    match = DATE_RE.search(path.name)
+    if match:
+        try:
+            return date.fromisoformat(match.group(1))
+        except ValueError:
+            pass
+    return date.fromtimestamp(path.stat().st_mtime)
+
+
+def find_documents(root: Path, since: Optional[date] = None, until: Optional[date] = None) -> Iterator[Path]:
+    """Markdown journals and reports under `root` (backups and chart folders excluded), oldest first."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if not name.endswith(".md") or name.endswith(".backup.md"):
+                continue
+            path = Path(dirpath) / name
+            day = document_date(path)
+            if (since and day < since) or (until and day > until):
+                continue
+            found.append((day, str(path)))
+    for _, path in sorted(found):
+        yield Path(path)
+
+
+def extract_document(path: str, run_id: str, action_status: str = "skipped") -> Dict[str, Any]:
+    """Worker: extract one document (runs in a pool process)."""
+    file = Path(path)
+    stat = file.stat()
+    text = file.read_text(encoding="utf-8", errors="replace")
+    name = file.stem
+
+    extractor = InsightsExtractor(None, WORKER_LOG)
+    entities = extractor.extract_entities(text, name)
+    actions = extractor.extract_actions(text, name)
+
+    day = document_date(file)
+    created = datetime.combine(day, datetime.min.time()).isoformat()
+    for action in actions:
+        key = f"{name}|{action.action_type}|{action.title}"
+        action.action_id = f"BF-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}"
+        # Queued actions keep created_at = now: dispatch aging counts from it (see get_ready_actions)
+        if action_status != "pending":
+            action.created_at = created
+        action.status = action_status
+        action.metadata["backfill"] = run_id
+        action.metadata["report_date"] = day.isoformat()
+
+    return {
+        "path": str(file.resolve()),
+        "content_hash": content_hash(text),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "entities": entities,
+        "actions": actions,
+    }
+
+
+def _extract_safely(job: tuple) -> Dict[str, Any]:
+    """Pool entry point: a failing document is reported instead of stopping the run."""
+    try:
+        return extract_document(*job)
+    except Exception as e:
+        return {"path": job[0], "error": f"{type(e).__name__}: {e}"}
+
+
+class Backfill:
+    """
+    Re-extract insights from archived documents with a process pool.
+
+    Args:
+        db: DatabaseManager (default: get_db())
+        run_id: Checkpoint namespace (default: rules_version())
+        workers: Pool processes (default: CPU count)
+        queue_actions: Queue extracted actions as pending instead of recording them as skipped
+    """
+
+    def __init__(self, db=None, run_id: str = None, workers: int = None, queue_actions: bool = False):
+        if db is None:
+            from db_manager import get_db
+
+            db = get_db()
+        self.db = db
+        self.run_id = run_id or rules_version()
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_actions = queue_actions
+        self.consumer = f"backfill:{self.run_id}"
+        self.stats = {"documents": 0, "skipped": 0, "failed": 0, "entities": 0, "actions": 0}
+
+    def pending(self, documents: List[Path], restart: bool = False) -> List[Path]:
+        """Documents not yet checkpointed by this run (unchanged since their checkpoint)."""
+        if restart:
+            return list(documents)
+        done = self.db.get_processed_documents(self.consumer)
+        todo = []
+        for path in documents:
+            seen = done.get(str(path.resolve()))
+            stat = path.stat()
+            if seen and seen["size"] == stat.st_size and seen["mtime_ns"] == stat.st_mtime_ns:
+                self.stats["skipped"] += 1
+                continue
+            todo.append(path)
+        return todo
+
+    def run(self, documents: List[Path], restart: bool = False, batch_size: int = BATCH_DOCUMENTS) -> Dict[str, int]:
+        todo = self.pending(documents, restart)
+        LOG.info(
+            "[BACKFILL] run %s: %d documents to process (%d already checkpointed), %d workers",
+            self.run_id,
+            len(todo),
+            self.stats["skipped"],
+            self.workers,
+        )
+        start = time.monotonic()
+        status = "pending" if self.queue_actions else "skipped"
+        batch: List[Dict[str, Any]] = []
+
+        jobs = [(str(p), self.run_id, status) for p in todo]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Results stream back in order and are released once their batch is flushed
+            for result in pool.map(_extract_safely, jobs, chunksize=4):
+                if "error" in result:
+                    self.stats["failed"] += 1
+                    LOG.warning("[BACKFILL] %s failed: %s", result["path"], result["error"])
+                else:
+                    batch.append(result)
+                if len(batch) >= batch_size:
+                    self._flush(batch)
+                    batch = []
+                    done = self.stats["documents"]
+                    LOG.info("[BACKFILL] %d/%d documents (%.1f/s)", done, len(todo), done / (time.monotonic() - start))
+        self._flush(batch)
+
+        self.stats["seconds"] = round(time.monotonic() - start, 1)
+        return dict(self.stats)
+
+    def _flush(self, results: List[Dict[str, Any]]) -> None:
+        """Save a batch of extractions and checkpoint it in one transaction."""
+        if not results:
+            return
+        entities = [e for r in results for e in r["entities"]]
+        actions = [a for r in results for a in r["actions"]]
+        with self.db.transaction():
+            self.db.save_entity_insights(entities)
+            if self.queue_actions:
+                from scripts.admission import AdmissionController
+
+                AdmissionController(self.db).enqueue(actions)
+            else:
+                self.db.save_action_insights(actions)
+            self.db.record_processed_documents(self.consumer, results)
+        self.stats["documents"] += len(results)
+        self.stats["entities"] += len(entities)
+        self.stats["actions"] += len(actions)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-extract insights from archived journals and reports")
+    parser.add_argument("--root", type=Path, help="Archive root (default: the configured output directory)")
+    parser.add_argument("--since", type=date.fromisoformat, help="Only documents dated on or after YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="Only documents dated on or before YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=None, help="Pool processes (default: CPU count)")
+    parser.add_argument("--batch", type=int, default=BATCH_DOCUMENTS, help="Documents per DB transaction")
+    parser.add_argument("--run-id", help="Checkpoint namespace (default: hash of the extraction rules)")
+    parser.add_argument("--restart", action="store_true", help="Reprocess documents already checkpointed")
+    parser.add_argument("--queue-actions", action="store_true", help="Queue extracted actions for execution")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(asctime)s %(message)s")
+    WORKER_LOG.setLevel(logging.WARNING)
+    if args.root is None:
+        from main import Config
+
+        args.root = Path(Config().OUTPUT_DIR)
+
+    documents = list(find_documents(args.root, args.since, args.until))
+    backfill = Backfill(run_id=args.run_id, workers=args.workers, queue_actions=args.queue_actions)
+    stats = backfill.run(documents, restart=args.restart, batch_size=args.batch)
+    print(json.dumps(stats, indent=2))
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,9 +20,12 @@ Entity Insights: Named entities of importance (Fed, ECB, CME, central banks, etc
 Action Insights: Research tasks, data to find, news to investigate, code/math to explore
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
+import secrets
 import sys
 from dataclasses import asdict, dataclass, field
 from datetime import date, datetime, timedelta
@@ -34,6 +37,7 @@ import threading
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from scripts.entity_matcher import EntityMatcher, PhraseStats
 
 # ==========================================
 # DATA CLASSES
@@ -289,6 +293,24 @@ ACTION_PATTERNS = {
     ],
 }
 
+# Processed-report ledger (see DatabaseManager.get_processed_documents)
+LEDGER_CONSUMER = "insights"
+# Reports are diffed per markdown section: each heading starts a new one
+SECTION_SPLIT_RE = re.compile(r"^(?=#{1,6}\s)", re.MULTILINE)
+
+
+def split_sections(content: str) -> List[str]:
+    """Split a markdown report at its headings (text before the first heading is a section too).
+
+    Sections are compared by the hash of their stripped text, so blank lines
+    added around a section do not count as a change.
+    """
+    return [section for section in SECTION_SPLIT_RE.split(content) if section]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
 
 # ==========================================
 # INSIGHTS EXTRACTOR
@@ -308,61 +330,64 @@ class InsightsExtractor:
         self.entity_cache: Dict[str, EntityInsight] = {}
         self.action_queue: List[ActionInsight] = []
         self._action_counter = 0
+        self._id_suffix = secrets.token_hex(3)
         self._lock = threading.Lock()
+        # Ledger entries for reports extracted by process_all_reports, written by commit_report_ledger()
+        self._ledger_updates: List[Dict[str, Any]] = []
+        self.report_stats = {"processed": 0, "partial": 0, "unchanged": 0, "deferred": 0}
 
     def _generate_action_id(self) -> str:
-        """Generate unique action ID."""
+        """Generate unique action ID (the random suffix keeps IDs from separate processes apart)."""
         with self._lock:
             self._action_counter += 1
-            return f"ACT-{date.today().strftime('%Y%m%d')}-{self._action_counter:04d}"
+            return f"ACT-{date.today().strftime('%Y%m%d')}-{self._action_counter:04d}-{self._id_suffix}"
 
     def extract_entities(self, report_content: str, report_name: str) -> List[EntityInsight]:
         """Extract named entities from report content."""
         entities = []
 
-        # Split into sentences for context extraction
-        sentences = re.split(r"[.!?]\s+", report_content)
+        # One pass over the report finds every known entity with its sentences and context
+        matcher = EntityMatcher.for_phrases(tuple(e for entity_list in KNOWN_ENTITIES.values() for e in entity_list))
+        scan = matcher.scan(report_content)
 
         for entity_type, entity_list in KNOWN_ENTITIES.items():
             for entity in entity_list:
-                # Case-insensitive search with word boundaries
-                pattern = rf"\b{re.escape(entity)}\b"
-
-                for sentence in sentences:
-                    if re.search(pattern, sentence, re.IGNORECASE):
-                        # Calculate relevance based on context
-                        relevance = self._calculate_entity_relevance(entity, sentence, report_content)
-
-                        # Avoid duplicates
-                        entity_key = f"{entity}:{report_name}"
-                        if entity_key not in self.entity_cache:
-                            insight = EntityInsight(
-                                entity_name=entity,
-                                entity_type=entity_type.rstrip("s"),  # Remove plural
-                                context=sentence.strip()[:500],  # Limit context length
-                                relevance_score=relevance,
-                                source_report=report_name,
-                                metadata={"mentions": 1},
-                            )
-                            entities.append(insight)
-                            self.entity_cache[entity_key] = insight
-                        else:
-                            # Update mention count
-                            self.entity_cache[entity_key].metadata["mentions"] = (
-                                self.entity_cache[entity_key].metadata.get("mentions", 1) + 1
-                            )
+                stats = scan.get(entity)
+                if stats is None:
+                    continue
+
+                for sentence_index in stats.sentences:
+                    # Avoid duplicates
+                    entity_key = f"{entity}:{report_name}"
+                    if entity_key not in self.entity_cache:
+                        sentence = scan.sentence(sentence_index)
+                        insight = EntityInsight(
+                            entity_name=entity,
+                            entity_type=entity_type.rstrip("s"),  # Remove plural
+                            context=sentence.strip()[:500],  # Limit context length
+                            relevance_score=self._calculate_entity_relevance(stats, sentence),
+                            source_report=report_name,
+                            metadata={"mentions": 1},
+                        )
+                        entities.append(insight)
+                        self.entity_cache[entity_key] = insight
+                    else:
+                        # Update mention count
+                        self.entity_cache[entity_key].metadata["mentions"] = (
+                            self.entity_cache[entity_key].metadata.get("mentions", 1) + 1
+                        )
 
         self.logger.info(f"[INSIGHTS] Extracted {len(entities)} entities from {report_name}")
         return entities
 
-    def _calculate_entity_relevance(self, entity: str, sentence: str, full_content: str) -> float:
-        """Calculate relevance score for an entity based on context."""
+    def _calculate_entity_relevance(self, stats: PhraseStats, sentence: str) -> float:
+        """Calculate relevance score for an entity from its document-wide occurrences."""
         score = 0.5  # Base score
 
         # Boost for entities in headers (##, **bold**)
-        if re.search(rf"(?:##.*{re.escape(entity)}|{re.escape(entity)}.*##)", full_content, re.IGNORECASE):
+        if stats.in_header:
             score += 0.2
-        if re.search(rf"\*\*.*{re.escape(entity)}.*\*\*", full_content, re.IGNORECASE):
+        if stats.in_bold:
             score += 0.1
 
         # Boost for action-related context
@@ -371,8 +396,7 @@ class InsightsExtractor:
             score += 0.15
 
         # Boost for multiple mentions
-        mentions = len(re.findall(rf"\b{re.escape(entity)}\b", full_content, re.IGNORECASE))
-        score += min(mentions * 0.05, 0.2)  # Cap at 0.2 boost
+        score += min(stats.mentions * 0.05, 0.2)  # Cap at 0.2 boost
 
         return min(score, 1.0)  # Cap at 1.0
 
@@ -596,16 +620,17 @@ class InsightsExtractor:
         return None  # No date found = execute immediately
 
     def _deduplicate_actions(self, actions: List[ActionInsight]) -> List[ActionInsight]:
-        """Remove duplicate or very similar actions."""
-        seen_titles = set()
+        """Remove duplicate or very similar actions (same type and canonical target)."""
+        from db_manager import action_fingerprint
+
+        seen = set()
         unique_actions = []
 
         for action in actions:
-            # Normalize title for comparison
-            normalized = action.title.lower().strip()
+            fingerprint = action_fingerprint(action.action_type, action.title)
 
-            if normalized not in seen_titles:
-                seen_titles.add(normalized)
+            if fingerprint not in seen:
+                seen.add(fingerprint)
                 unique_actions.append(action)
 
         return unique_actions
@@ -689,8 +714,26 @@ Extract 3-5 most important actionable tasks. Focus on specific, executable tasks
 
         return []
 
-    def process_all_reports(self, reports_dir: Path) -> Tuple[List[EntityInsight], List[ActionInsight]]:
-        """Process all reports in a directory."""
+    def process_all_reports(
+        self, reports_dir: Path, incremental: bool = True
+    ) -> Tuple[List[EntityInsight], List[ActionInsight]]:
+        """
+        Process today's reports in a directory.
+
+        With `incremental`, reports are checked against the processed-report
+        ledger: a report whose size and mtime match is skipped without being
+        read, one whose content hash matches is skipped after reading, and a
+        changed report has actions extracted only from the sections (see
+        split_sections) that were not there last time. Entities are always
+        extracted from the whole report: their mention counts and relevance
+        are document-wide and replace the stored rows for that report. Call
+        commit_report_ledger() once the results are saved.
+
+        With LLM_ASYNC_QUEUE, AI extraction is queued as an LLM task. While
+        that queue is full a new or changed report is deferred: it is left
+        out of this pass and the ledger, so a later cycle picks it up, rather
+        than calling the LLM inline past the backpressure limit.
+        """
         all_entities = []
         all_actions = []
 
@@ -698,18 +741,58 @@ Extract 3-5 most important actionable tasks. Focus on specific, executable tasks
             self.logger.warning(f"[INSIGHTS] Reports directory not found: {reports_dir}")
             return all_entities, all_actions
 
+        ledger = self._load_report_ledger() if incremental else None
+        async_queue = os.getenv("LLM_ASYNC_QUEUE", "").lower() in ("1", "true", "yes")
+
         # Process today's reports
         today = date.today().isoformat()
 
         for report_file in reports_dir.glob(f"*{today}*.md"):
             try:
+                path = str(report_file.resolve())
+                stat = report_file.stat()
+                seen = ledger.get(path) if ledger is not None else None
+                if seen and seen["size"] == stat.st_size and seen["mtime_ns"] == stat.st_mtime_ns:
+                    self.report_stats["unchanged"] += 1
+                    continue
+
                 content = report_file.read_text(encoding="utf-8")
                 report_name = report_file.stem
-
+                sections = split_sections(content)
+                entry = {
+                    "path": path,
+                    "content_hash": content_hash(content),
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "section_hashes": [content_hash(section.strip()) for section in sections],
+                }
+
+                if seen and seen["content_hash"] == entry["content_hash"]:
+                    # Touched but identical; the ledger update lets the next cycle skip it unread
+                    if ledger is not None:
+                        self._ledger_updates.append(entry)
+                    self.report_stats["unchanged"] += 1
+                    continue
+                if async_queue and self._llm_queue_full():
+                    self.report_stats["deferred"] += 1
+                    self.logger.info(f"[INSIGHTS] LLM task queue is full; deferring {report_file.name}")
+                    continue
                 entities = self.extract_entities(content, report_name)
+                if seen:
+                    known = set(seen["section_hashes"])
+                    content = "".join(s for s, h in zip(sections, entry["section_hashes"]) if h not in known)
+                    self.report_stats["partial"] += 1
+                    if not content.strip():
+                        # Only removed or reordered sections: no new actions, but refresh the counts
+                        all_entities.extend(entities)
+                        if ledger is not None:
+                            self._ledger_updates.append(entry)
+                        continue
+                else:
+                    self.report_stats["processed"] += 1
 
                 # Optionally enqueue AI-powered insights extraction to the LLM task queue
-                if os.getenv("LLM_ASYNC_QUEUE", "").lower() in ("1", "true", "yes"):
+                if async_queue:
                     try:
                         from db_manager import get_db
 
@@ -725,12 +808,49 @@ Extract 3-5 most important actionable tasks. Focus on specific, executable tasks
 
                 all_entities.extend(entities)
                 all_actions.extend(actions)
+                # Recorded only once extraction succeeded, so a report that failed is retried next cycle
+                if ledger is not None:
+                    self._ledger_updates.append(entry)
 
             except Exception as e:
                 self.logger.error(f"[INSIGHTS] Error processing {report_file}: {e}")
 
         return all_entities, all_actions
 
+    def _llm_queue_full(self) -> bool:
+        """Whether the LLM task queue is at its admission cap (see scripts/admission.py)."""
+        try:
+            from db_manager import get_db
+            from scripts.admission import AdmissionController
+
+            return AdmissionController(get_db()).llm_queue_full()
+        except Exception as e:
+            self.logger.debug(f"[INSIGHTS] Could not check the LLM task queue: {e}")
+            return False
+
+    def _load_report_ledger(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Processed-report ledger keyed by path (None if the database is unavailable)."""
+        try:
+            from db_manager import get_db
+
+            return get_db().get_processed_documents(LEDGER_CONSUMER)
+        except Exception as e:
+            self.logger.debug(f"[INSIGHTS] Report ledger unavailable, processing all reports: {e}")
+            return None
+
+    def commit_report_ledger(self) -> int:
+        """Record the reports handled by process_all_reports as processed (call after saving results)."""
+        updates, self._ledger_updates = self._ledger_updates, []
+        if not updates:
+            return 0
+        try:
+            from db_manager import get_db
+
+            return get_db().record_processed_documents(LEDGER_CONSUMER, updates)
+        except Exception as e:
+            self.logger.warning(f"[INSIGHTS] Failed to update report ledger: {e}")
+            return 0
+
     def get_pending_actions(self, priority_filter: Optional[str] = None) -> List[ActionInsight]:
         """Get pending actions, optionally filtered by priority."""
         pending = [a for a in self.action_queue if a.status == "pending"]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Named leases for leader election and singleton jobs across processes.
+
+A lease is a row in the `leases` table owned by one holder until it expires.
+Acquire, renew and release are compare-and-swap operations in SQLite
+(db_manager.acquire_lease / renew_lease / release_lease), so two processes
+can never both believe they hold the same lease.
+
+Each change of holder increments the lease's fencing token. Long jobs can
+call `lease.still_held()` before irreversible side effects: if the lease was
+lost (e.g. the process stalled past its TTL and another instance took over),
+the old token no longer matches and the stale holder backs off.
+
+Usage:
+    with Lease("notion_sync", ttl=300) as lease:
+        if lease.held:
+            publish_everything()
+
+    leader = Lease("executor_leader", ttl=120, renew=False)
+    if leader.acquire():
+        ...
+        leader.renew()  # from a heartbeat
+"""
+
+import logging
+import os
+import socket
+import threading
+from typing import Optional
+
+LOG = logging.getLogger("leases")
+
+
+def default_holder() -> str:
+    """Identity of this process: host and PID."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class Lease:
+    """
+    A named, expiring lease with a fencing token.
+
+    Args:
+        name: Lease name shared by all competing instances
+        ttl: Seconds the lease is held without renewal
+        holder: Identity of this instance (default: host-PID)
+        renew: Renew automatically every ttl/3 from a background thread while held
+        db: DatabaseManager (default: get_db())
+    """
+
+    def __init__(self, name: str, ttl: float = 60, holder: Optional[str] = None, renew: bool = True, db=None):
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or default_holder()
+        self.auto_renew = renew
+        self.token: Optional[int] = None
+        self._db = db
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def db(self):
+        if self._db is None:
+            from db_manager import get_db
+
+            self._db = get_db()
+        return self._db
+
+    @property
+    def held(self) -> bool:
+        """Whether this instance believes it holds the lease (see still_held for the DB check)."""
+        return self.token is not None
+
+    def acquire(self, metadata: Optional[str] = None) -> bool:
+        """Try once to take the lease; never blocks."""
+        try:
+            self.token = self.db.acquire_lease(self.name, self.holder, self.ttl, metadata)
+        except Exception as e:
+            LOG.warning("Lease %s: acquire failed: %s", self.name, e)
+            self.token = None
+        if self.token is not None and self.auto_renew and self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._renew_loop, name=f"lease-{self.name}", daemon=True)
+            self._thread.start()
+        return self.held
+
+    def renew(self, metadata: Optional[str] = None) -> bool:
+        """Extend the lease; on failure the lease is considered lost."""
+        if self.token is None:
+            return False
+        try:
+            renewed = self.db.renew_lease(self.name, self.holder, self.token, self.ttl, metadata)
+        except Exception as e:
+            # A transient DB error is not a lost lease; the TTL still covers us until the next attempt
+            LOG.debug("Lease %s: renew error: %s", self.name, e)
+            return True
+        if not renewed:
+            LOG.warning("Lease %s lost (token %s)", self.name, self.token)
+            self.token = None
+        return renewed
+
+    def still_held(self) -> bool:
+        """Fencing check against the DB: False if the lease expired or was taken over."""
+        if self.token is None:
+            return False
+        try:
+            return self.db.check_lease_token(self.name, self.token)
+        except Exception:
+            return False
+
+    def release(self) -> None:
+        """Give the lease up so another instance can take it immediately."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        if self.token is not None:
+            try:
+                self.db.release_lease(self.name, self.holder, self.token)
+            except Exception as e:
+                LOG.debug("Lease %s: release error: %s", self.name, e)
+            self.token = None
+
+    def _renew_loop(self):
+        while not self._stop.wait(max(1.0, self.ttl / 3)):
+            if not self.renew():
+                break
+        if self._thread is threading.current_thread():
+            self._thread = None  # allow a later acquire() to restart renewal
+
+    def __enter__(self) -> "Lease":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
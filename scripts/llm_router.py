@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""Adaptive LLM router.
+
+Replaces the fixed "primary, then fall back on failure" order with a ranking
+driven by observed behaviour. For every provider, and for every
+(provider, task type) pair, the router keeps exponentially weighted moving
+averages of latency, error rate and cost, and routes each call to the
+provider with the lowest expected cost:
+
+    score = (latency_s + cost_weight * cost_usd) / (1 - error_rate)
+
+Each provider is guarded by a `CircuitBreaker` (src/digest_bot/llm/base.py);
+quota errors trip the breaker immediately. With hedging enabled, a call that
+has not finished by the primary's observed p95 latency fires a backup request
+on the next-ranked provider and the first success wins.
+
+Every outcome is written to `llm_usage` (task type, latency, outcome, route,
+hedged) so tail latency can be compared with `db.get_llm_latency_summary()`.
+
+Environment:
+    LLM_ROUTER=adaptive          Enable in FallbackLLMProvider (default: fallback)
+    LLM_HEDGE=1                  Fire a backup request after the p95 deadline
+    LLM_ROUTER_COST_WEIGHT=60    Seconds of latency one USD is worth
+    LLM_ROUTER_HEDGE_MIN_SAMPLES=20  Samples needed before a p95 deadline is trusted
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from scripts.provider_manager import provider_lock, serialized
+from src.digest_bot.llm.base import CircuitBreaker
+
+LOG = logging.getLogger("llm_router")
+
+ALL_TASKS = "*"
+
+
+def provider_key(provider: Any) -> str:
+    """Stable short name for a provider ("Ollama (llama3.2)" -> "Ollama")."""
+    name = getattr(provider, "name", None) or type(provider).__name__
+    return name.split()[0]
+
+
+class ProviderStats:
+    """EWMA latency/error/cost plus a window of recent latencies for percentiles."""
+
+    def __init__(self, alpha: float = 0.2, window: int = 100):
+        self.alpha = alpha
+        self.samples = 0
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.cost = 0.0
+        self._recent = deque(maxlen=window)
+
+    def update(self, latency_s: float, ok: bool, cost: float = 0.0) -> None:
+        err = 0.0 if ok else 1.0
+        if self.samples == 0:
+            self.error_rate = err
+            if ok:
+                self.latency, self.cost = latency_s, cost
+        else:
+            a = self.alpha
+            self.error_rate += a * (err - self.error_rate)
+            if ok:
+                # Failures are often fast (connection refused) and would flatter latency
+                self.latency += a * (latency_s - self.latency)
+                self.cost += a * (cost - self.cost)
+        if ok:
+            self._recent.append(latency_s)
+        self.samples += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._recent:
+            return None
+        values = sorted(self._recent)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def score(self, cost_weight: float) -> float:
+        return (self.latency + cost_weight * self.cost) / max(0.05, 1.0 - self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        p95 = self.percentile(0.95)
+        return {
+            "samples": self.samples,
+            "latency_s": round(self.latency, 3),
+            "error_rate": round(self.error_rate, 3),
+            "cost": round(self.cost, 6),
+            "p95_s": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class AdaptiveLLMRouter:
+    """
+    Routes generate_content() calls across a provider list by expected cost.
+
+    State is process-wide (see get_llm_router()) so statistics survive the
+    per-task FallbackLLMProvider instances created by the worker and pipeline.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        cost_weight: float = 60.0,
+        min_samples: int = 3,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+        explore_rate: float = 0.0,
+        failure_threshold: int = 3,
+        reset_timeout: int = 300,
+        persist: bool = True,
+    ):
+        self.alpha = alpha
+        self.cost_weight = cost_weight
+        self.min_samples = min_samples
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.explore_rate = explore_rate
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.persist = persist
+
+        self._stats: Dict[Tuple[str, str], ProviderStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.counters = {"calls": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0}
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def _get_stats(self, name: str, task_type: str) -> ProviderStats:
+        key = (name, task_type)
+        if key not in self._stats:
+            self._stats[key] = ProviderStats(alpha=self.alpha)
+        return self._stats[key]
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[name]
+
+    def stats_for(self, name: str, task_type: str) -> Optional[ProviderStats]:
+        """Task-specific stats once warm, otherwise the provider-wide stats."""
+        with self._lock:
+            specific = self._stats.get((name, task_type))
+            if specific is not None and specific.samples >= self.min_samples:
+                return specific
+            overall = self._stats.get((name, ALL_TASKS))
+            return overall if overall is not None and overall.samples > 0 else None
+
+    def observe(self, name: str, task_type: str, latency_s: float, ok: bool, cost: float = 0.0) -> None:
+        """Fold one outcome into the EWMA statistics (no breaker or DB side effects)."""
+        with self._lock:
+            self._get_stats(name, task_type).update(latency_s, ok, cost)
+            self._get_stats(name, ALL_TASKS).update(latency_s, ok, cost)
+
+    def load_history(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Warm statistics from past `llm_usage` rows (oldest first)."""
+        loaded = 0
+        for row in rows:
+            if row.get("latency_ms") is None or not row.get("provider"):
+                continue
+            self.observe(
+                row["provider"],
+                row.get("task_type") or "default",
+                float(row["latency_ms"]) / 1000.0,
+                row.get("outcome") != "error",
+                float(row.get("cost") or 0.0),
+            )
+            loaded += 1
+        return loaded
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def rank(self, providers: Sequence[Any], task_type: str = "default") -> List[Any]:
+        """
+        Order available providers by expected cost; open circuits are skipped.
+
+        Providers without statistics keep their configured order after the
+        measured ones, so a cold router behaves like the plain fallback chain.
+        """
+        candidates = []
+        for index, provider in enumerate(providers):
+            if not getattr(provider, "is_available", True):
+                continue
+            name = provider_key(provider)
+            if not self.breaker(name).can_attempt():
+                continue
+            stats = self.stats_for(name, task_type)
+            key = (0, stats.score(self.cost_weight), index) if stats else (1, 0.0, index)
+            candidates.append((key, provider))
+
+        ranked = [p for _, p in sorted(candidates, key=lambda c: c[0])]
+        if len(ranked) > 1 and self.explore_rate > 0 and random.random() < self.explore_rate:
+            # Occasionally promote another provider so its statistics stay fresh
+            pick = random.randrange(1, len(ranked))
+            ranked.insert(0, ranked.pop(pick))
+        return ranked
+
+    def hedge_deadline(self, provider: Any, task_type: str) -> Optional[float]:
+        """p95 latency of `provider` for this task type, once enough samples exist."""
+        stats = self.stats_for(provider_key(provider), task_type)
+        if stats is None or len(stats._recent) < self.hedge_min_samples:
+            return None
+        return stats.percentile(0.95)
+
+    def _record(
+        self,
+        provider: Any,
+        task_type: str,
+        latency_s: float,
+        error: Optional[Exception],
+        result: Any,
+        route: str,
+        is_quota_error: Optional[Callable[[Exception], bool]],
+        race: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        name = provider_key(provider)
+        ok = error is None
+        tokens, cost = _extract_usage(result) if ok else (0, 0.0)
+        self.observe(name, task_type, latency_s, ok, cost)
+
+        breaker = self.breaker(name)
+        outcome = "ok" if ok else "error"
+        observed_s = latency_s
+        with self._lock:
+            if ok:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+                if is_quota_error is not None and is_quota_error(error):
+                    # Quota exhaustion will not clear on retry - open the circuit now
+                    breaker.failures = max(breaker.failures, breaker.failure_threshold)
+                    breaker.state = "OPEN"
+            if race is not None and ok:
+                if race["won"]:
+                    outcome = "hedge_lost"
+                else:
+                    # The caller waited since the primary started, not just for this provider
+                    race["won"] = True
+                    observed_s = time.perf_counter() - race["start"]
+
+        if self.persist:
+            try:
+                from db_manager import get_db
+
+                get_db().log_llm_usage(
+                    name,
+                    tokens_used=tokens,
+                    cost=cost,
+                    task_type=task_type,
+                    latency_ms=round(observed_s * 1000.0, 1),
+                    outcome=outcome,
+                    route=route,
+                    hedged=race is not None,
+                )
+            except Exception as e:
+                LOG.debug("Could not record LLM outcome: %s", e)
+
+    def _invoke(self, provider: Any, prompt: str) -> Any:
+        # Providers that are not safe to call concurrently (in-process llama.cpp)
+        # are serialized so a lingering hedge cannot overlap the next request.
+        # The lock is the provider's own, shared with every other caller.
+        with serialized(provider):
+            return provider.generate_content(prompt)
+
+    def _is_busy(self, provider: Any) -> bool:
+        return not getattr(provider, "concurrent_safe", True) and provider_lock(provider).locked()
+
+    def _timed_call(self, provider, prompt, task_type, route, is_quota_error, race=None) -> Any:
+        start = time.perf_counter()
+        try:
+            result = self._invoke(provider, prompt)
+        except Exception as e:
+            self._record(provider, task_type, time.perf_counter() - start, e, None, route, is_quota_error, race)
+            raise
+        self._record(provider, task_type, time.perf_counter() - start, None, result, route, is_quota_error, race)
+        return result
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-hedge")
+            return self._executor
+
+    def _hedged_call(
+        self, primary, backup, deadline, prompt, task_type, route, is_quota_error, launched
+    ) -> Tuple[Any, Any]:
+        """Run `primary`; if it misses `deadline`, race it against `backup` (appended to `launched`)."""
+        pool = self._pool()
+        race = {"won": False, "start": time.perf_counter()}
+        futures = {pool.submit(self._timed_call, primary, prompt, task_type, route, is_quota_error, race): primary}
+        done, _ = wait(list(futures), timeout=deadline)
+        if not done:
+            self.counters["hedges"] += 1
+            launched.append(backup)
+            LOG.info(
+                "[ROUTER] %s exceeded p95 (%.1fs); hedging with %s",
+                provider_key(primary),
+                deadline,
+                provider_key(backup),
+            )
+            futures[pool.submit(self._timed_call, backup, prompt, task_type, route, is_quota_error, race)] = backup
+
+        last_error: Optional[BaseException] = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    if futures[fut] is backup:
+                        self.counters["hedge_wins"] += 1
+                    return fut.result(), futures[fut]
+                last_error = fut.exception()
+        raise last_error
+
+    def call(
+        self,
+        providers: Sequence[Any],
+        prompt: str,
+        task_type: str = "default",
+        is_quota_error: Optional[Callable[[Exception], bool]] = None,
+    ) -> Tuple[Any, Any]:
+        """
+        Generate with the best provider, failing over (and hedging) as needed.
+
+        Returns:
+            (result, provider) - the response and the provider that produced it
+
+        Raises:
+            RuntimeError: If every provider failed or all circuits are open
+        """
+        self.counters["calls"] += 1
+        ranked = self.rank(providers, task_type)
+        if not ranked:
+            raise RuntimeError("No LLM provider available (all circuits open)")
+
+        route = ">".join(provider_key(p) for p in ranked)
+        last_error: Optional[Exception] = None
+        tried = set()
+        for provider in ranked:
+            if id(provider) in tried:
+                continue
+            tried.add(id(provider))
+            if last_error is not None:
+                self.counters["failovers"] += 1
+
+            backup = None
+            deadline = self.hedge_deadline(provider, task_type) if self.hedge else None
+            if deadline is not None:
+                backup = next((p for p in ranked if id(p) not in tried and not self._is_busy(p)), None)
+
+            launched: List[Any] = []
+            try:
+                if backup is not None:
+                    hedge_route = f"{route};hedge@{deadline:.1f}s"
+                    return self._hedged_call(
+                        provider, backup, deadline, prompt, task_type, hedge_route, is_quota_error, launched
+                    )
+                return self._timed_call(provider, prompt, task_type, route, is_quota_error), provider
+            except Exception as e:
+                tried.update(id(p) for p in launched)
+                last_error = e
+                LOG.warning("[ROUTER] %s failed: %s", provider_key(provider), str(e)[:80])
+
+        raise RuntimeError(f"All LLM providers failed. Last error: {last_error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = {f"{name}/{task}": s.as_dict() for (name, task), s in sorted(self._stats.items())}
+            breakers = {name: b.state for name, b in self._breakers.items()}
+        return {"counters": dict(self.counters), "providers": providers, "breakers": breakers}
+
+
+def _extract_usage(result: Any) -> Tuple[int, float]:
+    try:
+        from main import _extract_usage_from_response
+
+        return _extract_usage_from_response(result)
+    except Exception:
+        return 0, 0.0
+
+
+# ==========================================
+# PROCESS-WIDE ROUTER
+# ==========================================
+
+_router: Optional[AdaptiveLLMRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_llm_router() -> AdaptiveLLMRouter:
+    """Get the process-wide router, configured from the environment and warmed from llm_usage."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = AdaptiveLLMRouter(
+                cost_weight=float(os.environ.get("LLM_ROUTER_COST_WEIGHT", "60")),
+                hedge=os.environ.get("LLM_HEDGE", "0").lower() in ("1", "true", "yes"),
+                hedge_min_samples=int(os.environ.get("LLM_ROUTER_HEDGE_MIN_SAMPLES", "20")),
+            )
+            try:
+                from db_manager import get_db
+
+                loaded = _router.load_history(get_db().get_llm_outcomes(hours=24))
+                if loaded:
+                    LOG.info("[ROUTER] Warmed statistics from %d recent calls", loaded)
+            except Exception as e:
+                LOG.debug("Router history unavailable: %s", e)
+        return _router
+
+
+def reset_llm_router() -> None:
+    """Drop the process-wide router (tests, config reloads)."""
+    global _router
+    with _router_lock:
+        _router = None
@@ -8,13 +8,16 @@ import logging
 import os
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from db_manager import get_db
 from main import Config, create_llm_provider, setup_logging
+from scripts.admission import AdmissionController
 from scripts.frontmatter import add_frontmatter, detect_type
+from scripts.price_sanitizer import PriceSanitizer, parse_canonical
+from scripts.provider_manager import ProviderManager, TaskProvider
 
 # Optional Notion publish
 try:
@@ -32,9 +35,64 @@ POLL_INTERVAL = float(os.environ.get("LLM_WORKER_POLL_INTERVAL", "5"))
 MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
 TASK_BATCH_SIZE = int(os.environ.get("LLM_TASK_BATCH_SIZE", str(WORKER_CONCURRENCY)))
 GOLD_LLM_TIMEOUT = int(os.environ.get("GOLDSTANDARD_LLM_TIMEOUT", "120"))
+# Continuous batching for the local llama.cpp backend (see scripts/local_llm_batch.py)
+BATCHED_MODE = os.environ.get("LLM_WORKER_BATCHED", "0").lower() in ("1", "true", "yes")
+BATCH_SLOTS = int(os.environ.get("LLM_BATCH_SLOTS", "4"))
+# Keep one warm provider chain per process instead of building one per task
+PROVIDER_REUSE = os.environ.get("LLM_PROVIDER_REUSE", "1").lower() in ("1", "true", "yes")
+PROVIDER_STATS_INTERVAL = float(os.environ.get("LLM_PROVIDER_STATS_INTERVAL", "300"))
 
 
-def process_task(task: dict, cfg: Config) -> None:
+def build_batched_provider(cfg: Config):
+    """Load the local GGUF model once and wrap it in a continuous batcher.
+
+    Returns None (and logs why) when batching is unavailable so the worker can
+    fall back to per-task providers.
+    """
+    try:
+        from scripts.local_llm import LLMConfig, LocalLLM
+        from scripts.local_llm_batch import BatchedLocalLLM
+
+        llm = LocalLLM(config=LLMConfig())
+        if not llm.is_loaded and cfg.LOCAL_LLM_MODEL:
+            llm.load_model(cfg.LOCAL_LLM_MODEL)
+        if not llm.is_loaded:
+            LOG.warning("Batched mode requested but no local model is loaded; using per-task providers")
+            return None
+
+        provider = BatchedLocalLLM(llm, n_slots=BATCH_SLOTS)
+        LOG.info("Batched local inference enabled: %s", provider.name)
+        return provider
+    except Exception as e:
+        LOG.warning("Batched mode unavailable (%s); using per-task providers", e)
+        return None
+
+
+def _report_provider_metrics(metrics, stats: dict) -> None:
+    """Publish provider warm-up/reuse counters when the metrics server defines them."""
+    if metrics is None:
+        return
+    for key, metric in (
+        ("warmups", "llm_provider_warmups"),
+        ("reuses", "llm_provider_reuses"),
+        ("last_warmup_seconds", "llm_provider_warmup_seconds"),
+        ("failure_reloads", "llm_provider_failure_reloads"),
+        ("config_reloads", "llm_provider_config_reloads"),
+    ):
+        try:
+            if metric in metrics:
+                metrics[metric].set(stats.get(key, 0))
+        except Exception:
+            pass
+
+
+def process_task(task: dict, cfg: Config, provider=None, providers: ProviderManager = None) -> None:
+    """Run a single claimed task.
+
+    `provider` lets the caller supply a shared (e.g. batched) provider and
+    `providers` a warm per-process chain; with neither, a fresh fallback
+    chain is created for the task.
+    """
     db = get_db()
     task_id = task["id"]
     doc_path = task["document_path"]
@@ -53,84 +111,28 @@ def process_task(task: dict, cfg: Config) -> None:
             # In 'gemini_only' mode, we still use create_llm_provider but
             # we can pass the hint if we really want to restrict it,
             # but here we prefer the robust global fallback.
-            provider = create_llm_provider(cfg, LOG)
+            if provider is None:
+                provider = providers.get() if providers is not None else create_llm_provider(cfg, LOG)
             if not provider:
                 raise RuntimeError("No LLM provider available")
 
-            resp = provider.generate_content(prompt)
+            try:
+                # task_type is passed per call (not set on the shared instance) so the
+                # adaptive router keeps per-task-type statistics without racing other
+                # threads; providers that are not concurrent_safe are called one at a time
+                resp = TaskProvider(provider, task_type).generate_content(prompt)
+            except Exception as e:
+                # The fallback chain only raises once every backend failed
+                if providers is not None:
+                    providers.mark_failed(provider, e)
+                raise
             text = getattr(resp, "text", str(resp))
 
             # Sanitize generated content using canonical values embedded in prompt
-            def _parse_canonical_from_prompt(p: str):
-                import re
-
-                values = {}
-                # Look for lines like: '* GOLD: $4362.4'
-                for m in re.finditer(r"\*\s*([A-Z]+)\s*:\s*\$?([0-9\.,]+)", p):
-                    asset = m.group(1).upper()
-                    num = float(m.group(2).replace(",", ""))
-                    values[asset] = num
-                return values
-
-            def _sanitize_text(text: str, canonical: dict):
-                import re
-
-                corrected = 0
-                notes = []
-
-                def _replace_price(match, canonical_price):
-                    nonlocal corrected
-                    full = match.group(0)
-                    # Tolerate trailing punctuation (e.g., '98.72.'), strip commas, and sanitize
-                    import re as _re
-
-                    raw = match.group(2).replace(",", "")
-                    clean = _re.sub(r"[^0-9.\-]", "", raw)
-                    try:
-                        num = float(clean)
-                    except Exception:
-                        # If we cannot parse, skip replacement
-                        return full
-
-                    if abs((num - canonical_price) / canonical_price) > 0.05:
-                        corrected += 1
-                        notes.append(f"Replaced {num} with {canonical_price}")
-                        return match.group(1) + str(canonical_price)
-                    return full
-
-                # For each canonical asset, replace nearby mentions (handle plural and different casings)
-
-                for asset, price in canonical.items():
-                    # Build likely token variants so 'YIELD' matches 'Yields' in natural text
-                    variants = {asset, asset.lower(), asset.title(), asset.capitalize()}
-                    if asset.upper() == "YIELD":
-                        variants.update({"Yields", "Yield", "YIELD"})
-
-                    for tok in variants:
-                        # Replace patterns like 'Gold: $1234' or 'gold ... $1234' where the token appears
-                        text = re.sub(
-                            rf"(\b{re.escape(tok)}\b[^\n]{{0,40}}\$)([0-9\.,]+)",
-                            lambda m, p=price: _replace_price(m, p),
-                            text,
-                            flags=re.IGNORECASE,
-                        )
-
-                        # Replace 'Current Gold Price: $1234' pattern for variants too
-                        text = re.sub(
-                            rf"(Current\s+{re.escape(tok)}\s+Price:\s*\$)\s*[0-9\.,]+",
-                            lambda m, p=price: m.group(1) + str(p),
-                            text,
-                            flags=re.IGNORECASE,
-                        )
-
-                return text, corrected, notes
-
-            canonical = _parse_canonical_from_prompt(prompt or "")
-            sanitized_text = text
-            corrections = 0
-            notes = []
-            if canonical:
-                sanitized_text, corrections, notes = _sanitize_text(text, canonical)
+            result = PriceSanitizer(parse_canonical(prompt or "")).sanitize(text)
+            sanitized_text = result.text
+            corrections = result.count
+            notes = result.notes
 
             # Persist audit if corrections occurred
             try:
@@ -204,12 +206,14 @@ def process_task(task: dict, cfg: Config) -> None:
                 with open(doc_path, "r", encoding="utf-8") as f:
                     content = f.read()
 
-                provider = create_llm_provider(cfg, LOG)
-                extractor = InsightsExtractor(cfg, LOG, model=provider)
+                if provider is None:
+                    provider = providers.get() if providers is not None else create_llm_provider(cfg, LOG)
+                model = TaskProvider(provider, task_type) if provider else None
+                extractor = InsightsExtractor(cfg, LOG, model=model)
                 actions = extractor.extract_actions(content, os.path.basename(doc_path))
 
                 if actions:
-                    db.save_action_insights(actions)
+                    AdmissionController(db).enqueue(actions)
 
                 db.update_llm_task_result(
                     task_id, "completed", response=f"insights:{len(actions)}", error=None, attempts=attempts
@@ -261,7 +265,21 @@ def main():
 
     LOG.info("LLM Worker starting (concurrency=%s poll_interval=%s)" % (WORKER_CONCURRENCY, POLL_INTERVAL))
 
-    executor = ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY)
+    shared_provider = build_batched_provider(cfg) if BATCHED_MODE else None
+    # In batched mode every slot needs a thread blocked in generate_content()
+    # so the batcher always has enough sequences to decode together.
+    capacity = max(WORKER_CONCURRENCY, BATCH_SLOTS) if shared_provider else WORKER_CONCURRENCY
+    claim_size = max(TASK_BATCH_SIZE, capacity) if shared_provider else TASK_BATCH_SIZE
+
+    providers = None
+    if shared_provider is None and PROVIDER_REUSE:
+        providers = ProviderManager(Config, factory=create_llm_provider, logger=LOG)
+        providers.warm()
+        _report_provider_metrics(METRICS, providers.get_stats())
+    last_stats_log = time.monotonic()
+
+    executor = ThreadPoolExecutor(max_workers=capacity)
+    in_flight = {}
 
     try:
         while True:
@@ -272,35 +290,54 @@ def main():
                 except Exception:
                     pass
 
-            # Claim a batch of tasks (up to TASK_BATCH_SIZE)
-            tasks = db.claim_llm_tasks(limit=TASK_BATCH_SIZE)
-            if not tasks:
+            # Top up free capacity so new tasks join as soon as a slot frees,
+            # instead of waiting for the whole previous batch to drain.
+            free = capacity - len(in_flight)
+            tasks = db.claim_llm_tasks(limit=min(free, claim_size)) if free > 0 else []
+            for t in tasks:
+                in_flight[executor.submit(process_task, t, cfg, shared_provider, providers)] = t
+
+            if not in_flight:
                 time.sleep(POLL_INTERVAL)
                 continue
 
             # Update processing metric
             if METRICS is not None:
                 try:
-                    METRICS["llm_tasks_processing"].set(len(tasks))
+                    METRICS["llm_tasks_processing"].set(len(in_flight))
                 except Exception:
                     pass
 
-            futures = {executor.submit(process_task, t, cfg): t for t in tasks}
-            # Wait for current batch to finish but do not block polling forever
-            for fut in as_completed(futures):
+            done, _ = wait(list(in_flight), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for fut in done:
+                t = in_flight.pop(fut)
                 try:
-                    fut.result(timeout=GOLD_LLM_TIMEOUT)
+                    fut.result()
                 except Exception as e:
-                    t = futures[fut]
                     LOG.exception("Task %s raised: %s", t.get("id"), e)
 
             # Reset processing metric
-            if METRICS is not None:
+            if METRICS is not None and not in_flight:
                 try:
                     METRICS["llm_tasks_processing"].set(0)
                 except Exception:
                     pass
 
+            if providers is not None:
+                stats = providers.get_stats()
+                _report_provider_metrics(METRICS, stats)
+                if time.monotonic() - last_stats_log >= PROVIDER_STATS_INTERVAL:
+                    last_stats_log = time.monotonic()
+                    LOG.info(
+                        "Provider %s: warmups=%s (%.1fs total) reuses=%s reloads=%s/%s",
+                        stats["provider"],
+                        stats["warmups"],
+                        stats["warmup_seconds"],
+                        stats["reuses"],
+                        stats["config_reloads"],
+                        stats["failure_reloads"],
+                    )
+
     except KeyboardInterrupt:
         LOG.info("LLM Worker stopping (KeyboardInterrupt)")
     finally:
@@ -311,6 +348,11 @@ def main():
             except Exception:
                 pass
         executor.shutdown(wait=True)
+        if shared_provider is not None:
+            shared_provider.close()
+        if providers is not None:
+            LOG.info("Provider stats: %s", providers.get_stats())
+            providers.close()
 
 
 if __name__ == "__main__":
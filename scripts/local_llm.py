@@ -153,6 +153,7 @@ class LLMConfig:
       - N = Offload N layers (balance CPU/GPU)
     - LOCAL_LLM_CONTEXT: Context window size (default: 4096)
     - LOCAL_LLM_THREADS: CPU threads (0 = auto-detect)
+    - LOCAL_LLM_PREFIX_CACHE_MB: Memory cap for cached prompt-prefix KV states (0 = disabled)
     """
 
     model_path: str = ""
@@ -162,6 +163,7 @@ class LLMConfig:
     n_gpu_layers: int = field(default_factory=lambda: get_env_int("LOCAL_LLM_GPU_LAYERS", 0))
     use_mmap: bool = True
     use_mlock: bool = False
+    prefix_cache_mb: int = field(default_factory=lambda: get_env_int("LOCAL_LLM_PREFIX_CACHE_MB", 512))
 
 
 @dataclass
@@ -199,6 +201,7 @@ class LocalLLM:
         """
         self._engine = None
         self._llama = None  # For llama-cpp-python backend
+        self._prefix_cache = None  # Prompt-prefix KV states (llama-cpp-python only)
         self._config = config or LLMConfig()
         self._loaded = False
         self._model_name = ""
@@ -373,6 +376,7 @@ class LocalLLM:
                 )
                 self._loaded = True
                 self._model_name = path.stem
+                self._prefix_cache = self._create_prefix_cache(cfg)
                 print(f"[LLM] Model loaded: {self._model_name}")
                 print(f"[LLM] Context: {cfg.n_ctx} tokens")
                 return True
@@ -391,9 +395,41 @@ class LocalLLM:
         if self._llama:
             del self._llama
             self._llama = None
+        if self._prefix_cache is not None:
+            self._prefix_cache.clear()
+            self._prefix_cache = None
         self._loaded = False
         self._model_name = ""
 
+    @staticmethod
+    def _create_prefix_cache(cfg: LLMConfig):
+        """Create the prompt-prefix KV cache, or None if disabled/unavailable."""
+        if cfg.prefix_cache_mb <= 0:
+            return None
+        try:
+            from src.digest_bot.llm.prefix_cache import PrefixKVCache
+        except ImportError:
+            return None
+        return PrefixKVCache(capacity_bytes=cfg.prefix_cache_mb * 1024 * 1024)
+
+    def _prepare_prefix(self, prompt: str) -> int:
+        """Restore the longest cached KV prefix for `prompt` before generation."""
+        if self._prefix_cache is None:
+            return 0
+        try:
+            from src.digest_bot.llm.prefix_cache import LlamaSeqState
+
+            state = LlamaSeqState(self._llama)
+            return self._prefix_cache.prepare(state, state.tokenize(prompt))
+        except Exception as e:
+            print(f"[LLM] Prefix cache skipped: {e}")
+            return 0
+
+    @property
+    def prefix_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/reuse statistics of the prompt-prefix cache (None if disabled)."""
+        return self._prefix_cache.get_stats() if self._prefix_cache is not None else None
+
     def generate(
         self,
         prompt: str,
@@ -434,6 +470,7 @@ class LocalLLM:
 
         # Backend 2: llama-cpp-python
         elif self._backend == "llama-cpp-python" and self._llama:
+            self._prepare_prefix(prompt)
             output = self._llama(
                 prompt,
                 max_tokens=max_tokens,
@@ -612,6 +649,7 @@ class OllamaLLM:
     Environment Variables:
         OLLAMA_HOST  - Server URL (default: http://localhost:11434)
         OLLAMA_MODEL - Model name (default: llama3.2)
+        OLLAMA_KEEP_ALIVE - How long the server keeps the model loaded (default: 30m)
     """
 
     def __init__(self, model: str = None, host: str = None):
@@ -626,6 +664,8 @@ class OllamaLLM:
         self._model = model or os.environ.get("OLLAMA_MODEL", "llama3.2")
         self._available = False
         self._loaded_model = None
+        self._keep_alive = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+        self._session = None  # Pooled keep-alive connections, created on first request
 
         # Respect explicit disable flag
         if get_env_bool("OLLAMA_DISABLE") or get_env_bool("DISABLE_OLLAMA"):
@@ -659,6 +699,14 @@ class OllamaLLM:
             print(f"[Ollama] Listing models failed: {e}")
             self._available = False
 
+    def _get_session(self):
+        """Reuse one HTTP session so requests share pooled keep-alive connections."""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
     @property
     def is_available(self) -> bool:
         """Check if Ollama server is accessible."""
@@ -727,14 +775,13 @@ class OllamaLLM:
             if not acquired:
                 raise RuntimeError("Ollama overloaded: concurrency limit reached")
 
-            import requests
-
             timeout = int(os.environ.get("OLLAMA_TIMEOUT_S", "600"))
-            resp = requests.post(
+            resp = self._get_session().post(
                 f"{self._host}/api/generate",
                 json={
                     "model": self._model,
                     "prompt": prompt,
+                    "keep_alive": self._keep_alive,
                     "options": {
                         "num_predict": max_tokens,
                         "temperature": temperature,
@@ -781,15 +828,14 @@ class OllamaLLM:
 
             import time
 
-            import requests
-
             start = time.time()
             timeout = int(os.environ.get("OLLAMA_TIMEOUT_S", "600"))
-            resp = requests.post(
+            resp = self._get_session().post(
                 f"{self._host}/api/chat",
                 json={
                     "model": self._model,
                     "messages": messages,
+                    "keep_alive": self._keep_alive,
                     "options": {
                         "num_predict": max_tokens,
                         "temperature": temperature,
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Syndicate Local LLM - Continuous Batching
+
+Decodes several prompts together in a single llama.cpp context using the
+multi-sequence batch API. Each in-flight request owns a sequence slot in the
+KV cache; every decode step advances all active slots at once, and queued
+requests are admitted the moment a slot frees up (continuous batching).
+
+Usage:
+    from scripts.local_llm import LocalLLM
+    from scripts.local_llm_batch import BatchedLocalLLM
+
+    llm = LocalLLM("models/mistral-7b-instruct-v0.3.Q4_K_M.gguf")
+    batched = BatchedLocalLLM(llm, n_slots=4)
+
+    # Safe to call from many threads - calls are decoded together
+    response = batched.generate_content("Analyze gold price action today...")
+    print(response.text)
+
+    batched.close()
+
+Environment Variables:
+    LLM_BATCH_SLOTS    - Concurrent sequences per context (default: 4)
+    LLM_BATCH_N_BATCH  - Max tokens submitted per decode step (default: 512)
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.local_llm import GeminiCompatibleLLM, GenerateContentResponse, LocalLLM, get_env_int
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# Requests and results
+# ============================================================================
+
+
+@dataclass
+class BatchCompletion:
+    """Result of a single batched generation."""
+
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    finish_reason: str = "stop"
+    queue_time_ms: float = 0.0
+    generation_time_ms: float = 0.0
+
+
+@dataclass
+class BatchRequest:
+    """A prompt waiting for (or occupying) a sequence slot."""
+
+    prompt: str
+    max_tokens: int = 1024
+    temperature: float = 0.7
+    top_p: float = 0.9
+    top_k: int = 40
+    stop_sequences: List[str] = field(default_factory=list)
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.time)
+
+
+@dataclass
+class _Slot:
+    """Per-sequence decoding state."""
+
+    seq_id: int
+    request: BatchRequest
+    prompt_tokens: List[int]
+    started_at: float
+    n_past: int = 0
+    next_token: Optional[int] = None
+    generated: int = 0
+    pieces: List[bytes] = field(default_factory=list)
+
+    @property
+    def prefilling(self) -> bool:
+        return self.n_past < len(self.prompt_tokens)
+
+    def text(self) -> str:
+        return b"".join(self.pieces).decode("utf-8", errors="ignore")
+
+
+# ============================================================================
+# llama.cpp engine
+# ============================================================================
+
+
+class LlamaCppBatchEngine:
+    """
+    Thin wrapper around llama.cpp's multi-sequence decode API.
+
+    Reuses the weights of an already-loaded llama_cpp.Llama and creates a
+    second context sized for `n_slots` parallel sequences, so batching does
+    not require loading the model twice.
+    """
+
+    def __init__(
+        self,
+        llama: Any,
+        n_slots: int = 4,
+        n_ctx_per_seq: Optional[int] = None,
+        n_batch: int = 512,
+        n_threads: Optional[int] = None,
+    ):
+        import llama_cpp
+
+        self._lib = llama_cpp
+        self._llama = llama
+        self.n_slots = n_slots
+        self.n_ctx_per_seq = n_ctx_per_seq or llama.n_ctx()
+        self.n_batch = n_batch
+        self.n_vocab = llama.n_vocab()
+        self._eos = llama.token_eos()
+
+        params = llama_cpp.llama_context_default_params()
+        params.n_ctx = self.n_ctx_per_seq * n_slots
+        params.n_batch = n_batch
+        params.n_seq_max = n_slots
+        threads = n_threads or getattr(getattr(llama, "context_params", None), "n_threads", 0)
+        if threads:
+            params.n_threads = threads
+            params.n_threads_batch = threads
+
+        init = getattr(llama_cpp, "llama_init_from_model", None) or llama_cpp.llama_new_context_with_model
+        self._ctx = init(llama.model, params)
+        if not self._ctx:
+            raise RuntimeError("Failed to create batched llama.cpp context")
+
+        self._batch = llama_cpp.llama_batch_init(n_batch, 0, 1)
+
+        self._vocab = None
+        if hasattr(llama_cpp, "llama_model_get_vocab"):
+            self._vocab = llama_cpp.llama_model_get_vocab(llama.model)
+
+    def tokenize(self, text: str) -> List[int]:
+        return self._llama.tokenize(text.encode("utf-8"), add_bos=True, special=True)
+
+    def token_to_piece(self, token: int) -> bytes:
+        return self._llama.detokenize([token])
+
+    def is_eog(self, token: int) -> bool:
+        if self._vocab is not None and hasattr(self._lib, "llama_vocab_is_eog"):
+            return bool(self._lib.llama_vocab_is_eog(self._vocab, token))
+        return token == self._eos
+
+    def decode(self, entries: List[Tuple[int, int, int, bool]]) -> None:
+        """Decode (token, pos, seq_id, want_logits) entries in one llama_decode call."""
+        batch = self._batch
+        for i, (token, pos, seq_id, want_logits) in enumerate(entries):
+            batch.token[i] = token
+            batch.pos[i] = pos
+            batch.n_seq_id[i] = 1
+            batch.seq_id[i][0] = seq_id
+            batch.logits[i] = int(want_logits)
+        batch.n_tokens = len(entries)
+
+        rc = self._lib.llama_decode(self._ctx, batch)
+        if rc != 0:
+            raise RuntimeError(f"llama_decode returned {rc}")
+
+    def logits(self, index: int):
+        import numpy as np
+
+        ptr = self._lib.llama_get_logits_ith(self._ctx, index)
+        return np.ctypeslib.as_array(ptr, shape=(self.n_vocab,)).copy()
+
+    def clear_sequence(self, seq_id: int) -> None:
+        lib = self._lib
+        if hasattr(lib, "llama_get_memory"):
+            lib.llama_memory_seq_rm(lib.llama_get_memory(self._ctx), seq_id, -1, -1)
+        elif hasattr(lib, "llama_kv_self_seq_rm"):
+            lib.llama_kv_self_seq_rm(self._ctx, seq_id, -1, -1)
+        else:
+            lib.llama_kv_cache_seq_rm(self._ctx, seq_id, -1, -1)
+
+    def close(self) -> None:
+        if self._batch is not None:
+            self._lib.llama_batch_free(self._batch)
+            self._batch = None
+        if self._ctx:
+            self._lib.llama_free(self._ctx)
+            self._ctx = None
+
+
+# ============================================================================
+# Scheduler
+# ============================================================================
+
+
+def sample_token(logits, temperature: float, top_k: int, top_p: float, rng) -> int:
+    """Sample a token id from raw logits (greedy when temperature <= 0)."""
+    import numpy as np
+
+    if temperature <= 0:
+        return int(np.argmax(logits))
+
+    scaled = np.asarray(logits, dtype=np.float64) / temperature
+    if 0 < top_k < scaled.shape[0]:
+        candidates = np.argpartition(scaled, -top_k)[-top_k:]
+    else:
+        candidates = np.arange(scaled.shape[0])
+
+    cand_logits = scaled[candidates]
+    order = np.argsort(cand_logits)[::-1]
+    candidates = candidates[order]
+    probs = np.exp(cand_logits[order] - cand_logits[order][0])
+    probs /= probs.sum()
+
+    if top_p < 1.0:
+        keep = int(np.searchsorted(np.cumsum(probs), top_p) + 1)
+        candidates = candidates[:keep]
+        probs = probs[:keep] / probs[:keep].sum()
+
+    return int(rng.choice(candidates, p=probs))
+
+
+class ContinuousBatcher:
+    """
+    Continuous-batching scheduler over a batch engine.
+
+    A single background thread owns the engine. Each step it admits queued
+    requests into free slots, submits one token for every decoding slot plus
+    as many prompt tokens as fit in the remaining `n_batch` budget, decodes
+    them in one call, and samples the next token for every slot that asked
+    for logits. Finished slots are released immediately so the next queued
+    request can join the running batch on the following step.
+    """
+
+    def __init__(self, engine: Any, n_slots: Optional[int] = None, seed: Optional[int] = None):
+        import numpy as np
+
+        self.engine = engine
+        self.n_slots = n_slots or getattr(engine, "n_slots", 4)
+        self._rng = np.random.default_rng(seed)
+        self._queue: "queue.Queue[Optional[BatchRequest]]" = queue.Queue()
+        self._slots: Dict[int, _Slot] = {}
+        self._free = list(range(self.n_slots))
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "requests": 0,
+            "completed": 0,
+            "failed": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "decode_calls": 0,
+            "batched_tokens": 0,
+            "peak_active": 0,
+        }
+        self._thread = threading.Thread(target=self._run, name="llm-batcher", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        top_k: int = 40,
+        stop_sequences: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Future:
+        """Queue a prompt and return a Future resolving to a BatchCompletion."""
+        if self._stop.is_set():
+            raise RuntimeError("Batcher is closed")
+
+        request = BatchRequest(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            top_k=top_k,
+            stop_sequences=list(stop_sequences or []),
+        )
+        with self._stats_lock:
+            self.stats["requests"] += 1
+        self._queue.put(request)
+        return request.future
+
+    def generate(self, prompt: str, timeout: Optional[float] = None, **kwargs) -> str:
+        """Blocking helper: submit a prompt and wait for its text."""
+        return self.submit(prompt, **kwargs).result(timeout=timeout).text
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the scheduler thread and fail anything still queued."""
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None and not request.future.done():
+                request.future.set_exception(RuntimeError("Batcher closed before request was scheduled"))
+
+    @property
+    def active(self) -> int:
+        return len(self._slots)
+
+    # ------------------------------------------------------------------
+    # Scheduler loop
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            # Block while idle so an empty batcher costs no CPU
+            if not self._slots:
+                request = self._queue.get()
+                if request is None:
+                    break
+                self._admit(request)
+
+            self._admit_waiting()
+            if not self._slots:
+                continue
+
+            try:
+                self._step()
+            except Exception as e:
+                logger.exception("Batched decode failed: %s", e)
+                for seq_id in list(self._slots):
+                    self._finish(seq_id, error=e)
+
+        for seq_id in list(self._slots):
+            self._finish(seq_id, error=RuntimeError("Batcher closed during generation"))
+
+    def _admit_waiting(self) -> None:
+        while self._free:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is None:
+                self._stop.set()
+                return
+            self._admit(request)
+
+    def _admit(self, request: BatchRequest) -> None:
+        if request.future.done():
+            return
+
+        try:
+            tokens = self.engine.tokenize(request.prompt)
+        except Exception as e:
+            request.future.set_exception(e)
+            return
+
+        if len(tokens) >= self.engine.n_ctx_per_seq:
+            request.future.set_exception(
+                ValueError(f"Prompt has {len(tokens)} tokens; per-sequence context is {self.engine.n_ctx_per_seq}")
+            )
+            return
+
+        seq_id = self._free.pop(0)
+        self._slots[seq_id] = _Slot(seq_id=seq_id, request=request, prompt_tokens=tokens, started_at=time.time())
+        with self._stats_lock:
+            self.stats["prompt_tokens"] += len(tokens)
+            self.stats["peak_active"] = max(self.stats["peak_active"], len(self._slots))
+
+    def _step(self) -> None:
+        entries: List[Tuple[int, int, int, bool]] = []
+        sample_points: List[Tuple[int, _Slot]] = []
+        budget = self.engine.n_batch
+
+        # One token for every slot already generating
+        for slot in self._slots.values():
+            if not slot.prefilling and slot.next_token is not None:
+                entries.append((slot.next_token, slot.n_past, slot.seq_id, True))
+                sample_points.append((len(entries) - 1, slot))
+                slot.n_past += 1
+                slot.next_token = None
+                budget -= 1
+
+        # Fill the rest of the batch with prompt chunks
+        for slot in self._slots.values():
+            if budget <= 0:
+                break
+            if not slot.prefilling:
+                continue
+            end = min(len(slot.prompt_tokens), slot.n_past + budget)
+            for pos in range(slot.n_past, end):
+                last = pos == len(slot.prompt_tokens) - 1
+                entries.append((slot.prompt_tokens[pos], pos, slot.seq_id, last))
+                if last:
+                    sample_points.append((len(entries) - 1, slot))
+            budget -= end - slot.n_past
+            slot.n_past = end
+
+        if not entries:
+            return
+
+        self.engine.decode(entries)
+        with self._stats_lock:
+            self.stats["decode_calls"] += 1
+            self.stats["batched_tokens"] += len(entries)
+
+        for index, slot in sample_points:
+            req = slot.request
+            token = sample_token(self.engine.logits(index), req.temperature, req.top_k, req.top_p, self._rng)
+            self._accept(slot, token)
+
+    def _accept(self, slot: _Slot, token: int) -> None:
+        req = slot.request
+
+        if self.engine.is_eog(token):
+            self._finish(slot.seq_id, finish_reason="stop")
+            return
+
+        slot.pieces.append(self.engine.token_to_piece(token))
+        slot.generated += 1
+
+        if req.stop_sequences:
+            text = slot.text()
+            for stop in req.stop_sequences:
+                idx = text.find(stop)
+                if idx != -1:
+                    self._finish(slot.seq_id, finish_reason="stop", text=text[:idx])
+                    return
+
+        if slot.generated >= req.max_tokens or slot.n_past >= self.engine.n_ctx_per_seq:
+            self._finish(slot.seq_id, finish_reason="length")
+            return
+
+        slot.next_token = token
+
+    def _finish(
+        self,
+        seq_id: int,
+        finish_reason: str = "stop",
+        text: Optional[str] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        slot = self._slots.pop(seq_id)
+        try:
+            self.engine.clear_sequence(seq_id)
+        except Exception:
+            logger.debug("Failed to clear KV cache for sequence %s", seq_id)
+        self._free.append(seq_id)
+
+        future = slot.request.future
+        if future.done():
+            return
+
+        if error is not None:
+            with self._stats_lock:
+                self.stats["failed"] += 1
+            future.set_exception(error)
+            return
+
+        now = time.time()
+        with self._stats_lock:
+            self.stats["completed"] += 1
+            self.stats["completion_tokens"] += slot.generated
+        future.set_result(
+            BatchCompletion(
+                text=slot.text() if text is None else text,
+                prompt_tokens=len(slot.prompt_tokens),
+                completion_tokens=slot.generated,
+                finish_reason=finish_reason,
+                queue_time_ms=(slot.started_at - slot.request.submitted_at) * 1000,
+                generation_time_ms=(now - slot.started_at) * 1000,
+            )
+        )
+
+
+# ============================================================================
+# Gemini-compatible wrapper
+# ============================================================================
+
+
+class BatchedLocalLLM(GeminiCompatibleLLM):
+    """
+    Gemini-compatible local provider backed by a ContinuousBatcher.
+
+    Thread-safe: concurrent generate_content() calls from worker threads are
+    decoded together instead of serializing on the model.
+    """
+
+    def __init__(self, llm: LocalLLM, n_slots: Optional[int] = None, n_batch: Optional[int] = None):
+        if llm.backend != "llama-cpp-python" or not llm.is_loaded:
+            raise RuntimeError("Batched inference requires a loaded llama-cpp-python model")
+
+        self._llm = llm
+        self.n_slots = n_slots or get_env_int("LLM_BATCH_SLOTS", 4)
+        engine = LlamaCppBatchEngine(
+            llm._llama,
+            n_slots=self.n_slots,
+            n_ctx_per_seq=llm._config.n_ctx,
+            n_batch=n_batch or get_env_int("LLM_BATCH_N_BATCH", 512),
+            n_threads=llm._config.n_threads or None,
+        )
+        self._batcher = ContinuousBatcher(engine, n_slots=self.n_slots)
+        self.name = f"Local-batched ({llm.model_name}, {self.n_slots} slots)"
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return dict(self._batcher.stats)
+
+    def generate_content(self, prompt: str, **kwargs) -> GenerateContentResponse:
+        completion = self._batcher.submit(self._wrap_prompt(prompt), **kwargs).result()
+        return GenerateContentResponse(completion.text)
+
+    def close(self) -> None:
+        self._batcher.close()
+        self._batcher.engine.close()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Fast enumeration of the markdown files in an output tree.
+
+Shared by the Notion sync manifest (scripts/notion_sync.py) and the
+frontmatter status index (scripts/frontmatter.py), which both compare each
+file's stat against what they recorded last time and open only the files
+that changed.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+
+def scan_markdown(
+    root: Union[str, Path], skip_dirs: Tuple[str, ...] = ("archive",)
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yield (path, stat) for every *.md file under `root` in one os.scandir walk.
+
+    Paths are plain strings joined onto `root`; building a Path per file
+    would cost more than the scan itself on large trees.
+
+    Directories named in `skip_dirs` are not entered and symlinked
+    directories are not followed. Files are never opened.
+    """
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""Shared market data service for task handlers.
+
+Task handlers used to call yfinance directly, so ten queued data-fetch
+actions made dozens of identical HTTP requests for GC=F, ^TNX, DX-Y.NYB,
+GLD and SLV within the same minute. Handlers now go through one
+process-wide MarketDataService which:
+
+- caches history, quotes and `.info` with separate TTLs. Intraday fields
+  of `.info` (price, volume) are taken from the fresher quote, so the slow
+  `.info` endpoint is hit at most once per MARKET_DATA_INFO_TTL per symbol;
+- serves shorter periods from a longer cached frame (a 1y frame answers
+  5d and 20d requests);
+- coalesces concurrent requests for the same data into one fetch
+  (single-flight), and fetches several missing symbols with one batched
+  `yf.download` call;
+- reuses the frames QuantEngine downloaded this cycle, which it publishes
+  via `publish_history()`.
+
+Usage:
+    md = get_market_data()
+    hist = md.history("GC=F", period="5d")
+    quotes = md.quotes(["GLD", "SLV"])
+    info = md.info("GLD")
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import yfinance as yf
+except ImportError:
+    yf = None
+
+LOG = logging.getLogger("market_data")
+
+QUOTE_TTL = float(os.getenv("MARKET_DATA_QUOTE_TTL", "60"))
+HISTORY_TTL = float(os.getenv("MARKET_DATA_HISTORY_TTL", "300"))
+INFO_TTL = float(os.getenv("MARKET_DATA_INFO_TTL", "21600"))
+# How long a request waits for another thread's in-flight fetch of the same data
+FETCH_WAIT_SECONDS = 60.0
+
+# `.info` fields that move intraday and are served from the quote instead
+LIVE_INFO_FIELDS = {
+    "regularMarketPrice": "price",
+    "regularMarketPreviousClose": "previous_close",
+    "regularMarketVolume": "volume",
+}
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_ROWS_PER_UNIT = {"d": 1, "wk": 5, "mo": 21, "y": 252}
+
+
+def period_rows(period: str) -> Optional[int]:
+    """Approximate trading rows in a yfinance period ('5d' -> 5, '1y' -> 252); None for 'max'/'ytd'."""
+    m = _PERIOD_RE.match(period or "")
+    if not m:
+        return None
+    return int(m.group(1)) * _ROWS_PER_UNIT[m.group(2)]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float  # time.monotonic()
+    period: str = ""
+    rows: Optional[int] = None
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+@dataclass
+class _Call:
+    """An in-flight fetch other threads can wait on instead of repeating it."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    def resolve(self, value: Any = None, error: Optional[BaseException] = None):
+        self.value, self.error = value, error
+        self.done.set()
+
+
+class MarketDataService:
+    """
+    Thread-safe, TTL-cached access to yfinance history, quotes and info.
+
+    Args:
+        yf_module: yfinance module (default: the installed one)
+        quote_ttl / history_ttl / info_ttl: Cache lifetimes in seconds
+    """
+
+    def __init__(
+        self,
+        yf_module=None,
+        quote_ttl: float = QUOTE_TTL,
+        history_ttl: float = HISTORY_TTL,
+        info_ttl: float = INFO_TTL,
+    ):
+        self._yf = yf_module if yf_module is not None else yf
+        self.quote_ttl = quote_ttl
+        self.history_ttl = history_ttl
+        self.info_ttl = info_ttl
+        self._lock = threading.Lock()
+        self._history: Dict[Tuple[str, str], _Entry] = {}
+        self._info: Dict[str, _Entry] = {}
+        self._inflight: Dict[Tuple, _Call] = {}
+        self.cycle = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "batched_symbols": 0,
+            "published": 0,
+            "errors": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        return self._yf is not None and hasattr(self._yf, "Ticker")
+
+    # ==========================================================================
+    # Cycle integration
+    # ==========================================================================
+
+    def new_cycle(self) -> None:
+        """Start a new analysis cycle: drop price data so this cycle sees fresh prices (info is kept)."""
+        with self._lock:
+            self._history.clear()
+            self.cycle += 1
+
+    def publish_history(self, symbol: str, df: "pd.DataFrame", period: str, interval: str = "1d") -> None:
+        """Offer a frame fetched elsewhere (QuantEngine) to later requests for `symbol`."""
+        if df is None or getattr(df, "empty", True) or isinstance(df.columns, pd.MultiIndex):
+            return
+        frame = df[[c for c in OHLCV_COLUMNS if c in df.columns]].copy()
+        rows = period_rows(period)
+        with self._lock:
+            if self._keeps_longer((symbol, interval), rows, period):
+                return
+            self._history[(symbol, interval)] = _Entry(frame, time.monotonic(), period, rows)
+            self.stats["published"] += 1
+
+    def _keeps_longer(self, key: Tuple[str, str], rows: Optional[int], period: str) -> bool:
+        """Whether the cached frame is fresh and longer than `period` (never replaced by a shorter one)."""
+        current = self._history.get(key)
+        if current is None or current.age() > self.history_ttl or current.period == period:
+            return False
+        return _covers(current, rows, period)
+
+    # ==========================================================================
+    # History
+    # ==========================================================================
+
+    def history(
+        self, symbol: str, period: str = "5d", interval: str = "1d", max_age: Optional[float] = None
+    ) -> "pd.DataFrame":
+        """OHLCV frame for `symbol` (empty if none); raises if the fetch itself failed."""
+        frames, errors = self._histories([symbol], period, interval, max_age)
+        if symbol in errors:
+            raise errors[symbol]
+        return frames.get(symbol, pd.DataFrame())
+
+    def histories(
+        self, symbols: Iterable[str], period: str = "5d", interval: str = "1d", max_age: Optional[float] = None
+    ) -> Dict[str, "pd.DataFrame"]:
+        """Frames for several symbols; cache misses are fetched together in one request."""
+        frames, _ = self._histories(list(dict.fromkeys(symbols)), period, interval, max_age)
+        return frames
+
+    def _histories(self, symbols: List[str], period: str, interval: str, max_age: Optional[float]):
+        max_age = self.history_ttl if max_age is None else max_age
+        rows = period_rows(period)
+        frames: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, BaseException] = {}
+        waiting: Dict[str, _Call] = {}
+        mine: Dict[str, _Call] = {}
+
+        with self._lock:
+            for symbol in symbols:
+                entry = self._history.get((symbol, interval))
+                if entry is not None and entry.age() <= max_age and _covers(entry, rows, period):
+                    frames[symbol] = _tail(entry.value, rows)
+                    self.stats["hits"] += 1
+                    continue
+                key = ("history", symbol, interval, period)
+                call = self._inflight.get(key)
+                if call is not None:
+                    waiting[symbol] = call
+                    self.stats["coalesced"] += 1
+                else:
+                    mine[symbol] = self._inflight[key] = _Call()
+                    self.stats["misses"] += 1
+
+        if mine:
+            fetched, fetch_error = {}, None
+            try:
+                fetched = self._download(list(mine), period, interval)
+            except Exception as e:
+                fetch_error = e
+                self.stats["errors"] += 1
+                LOG.debug("History fetch failed for %s: %s", list(mine), e)
+            with self._lock:
+                for symbol, call in mine.items():
+                    df = fetched.get(symbol)
+                    if df is not None and not df.empty and not self._keeps_longer((symbol, interval), rows, period):
+                        self._history[(symbol, interval)] = _Entry(df, time.monotonic(), period, rows)
+                    self._inflight.pop(("history", symbol, interval, period), None)
+                    call.resolve(df, fetch_error)
+            for symbol, call in mine.items():
+                waiting[symbol] = call
+
+        for symbol, call in waiting.items():
+            if not call.done.wait(FETCH_WAIT_SECONDS):
+                errors[symbol] = TimeoutError(f"Timed out waiting for {symbol} history")
+            elif call.error is not None:
+                errors[symbol] = call.error
+            elif call.value is not None and not call.value.empty:
+                frames[symbol] = _tail(call.value, rows)
+        return frames, errors
+
+    def _download(self, symbols: List[str], period: str, interval: str) -> Dict[str, "pd.DataFrame"]:
+        if not self.available:
+            raise RuntimeError("yfinance not available")
+        if len(symbols) > 1 and callable(getattr(self._yf, "download", None)):
+            try:
+                frames = self._download_batch(symbols, period, interval)
+                self.stats["fetches"] += 1
+                self.stats["batched_symbols"] += len(symbols)
+                return frames
+            except Exception as e:
+                LOG.debug("Batched download failed (%s); fetching symbols one by one", e)
+        frames = {}
+        for symbol in symbols:
+            self.stats["fetches"] += 1
+            frames[symbol] = self._yf.Ticker(symbol).history(period=period, interval=interval)
+        return frames
+
+    def _download_batch(self, symbols: List[str], period: str, interval: str) -> Dict[str, "pd.DataFrame"]:
+        data = self._yf.download(
+            symbols, period=period, interval=interval, group_by="ticker", progress=False, auto_adjust=True
+        )
+        if not isinstance(data.columns, pd.MultiIndex):
+            raise ValueError("batched download did not return per-ticker columns")
+        frames = {}
+        for symbol in symbols:
+            if symbol in data.columns.get_level_values(0):
+                frames[symbol] = data[symbol].dropna(how="all")
+        return frames
+
+    # ==========================================================================
+    # Quotes and info
+    # ==========================================================================
+
+    def quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest close, previous close and volume, at most `quote_ttl` seconds old."""
+        return _quote_from(self.history(symbol, "5d", max_age=self.quote_ttl))
+
+    def quotes(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Quotes for several symbols with a single batched fetch for the misses."""
+        frames = self.histories(symbols, "5d", max_age=self.quote_ttl)
+        return {s: q for s, q in ((s, _quote_from(df)) for s, df in frames.items()) if q}
+
+    def cached_quote(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Quote from the cached daily frame; None if nothing is cached.
+
+        A frame older than `history_ttl` is refetched rather than served (None
+        if that fails), so a long-running process never reports an old price.
+        """
+        with self._lock:
+            entry = self._history.get((symbol, "1d"))
+        if entry is None:
+            return None
+        if entry.age() <= self.history_ttl:
+            return _quote_from(entry.value)
+        try:
+            return _quote_from(self.history(symbol, "5d"))
+        except Exception as e:
+            LOG.warning("Could not refresh the %s quote cached %.0fs ago: %s", symbol, entry.age(), e)
+            return None
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """`Ticker.info` cached for `info_ttl`, with intraday fields refreshed from the quote."""
+        with self._lock:
+            entry = self._info.get(symbol)
+            fresh = entry is not None and entry.age() <= self.info_ttl
+            if fresh:
+                self.stats["hits"] += 1
+            else:
+                call = self._inflight.get(("info", symbol))
+                leader = call is None
+                if leader:
+                    call = self._inflight[("info", symbol)] = _Call()
+                    self.stats["misses"] += 1
+                else:
+                    self.stats["coalesced"] += 1
+
+        if fresh:
+            data = entry.value
+        else:
+            if leader:
+                value, error = None, None
+                try:
+                    if not self.available:
+                        raise RuntimeError("yfinance not available")
+                    self.stats["fetches"] += 1
+                    value = dict(self._yf.Ticker(symbol).info or {})
+                except Exception as e:
+                    error = e
+                    self.stats["errors"] += 1
+                with self._lock:
+                    if error is None:
+                        self._info[symbol] = _Entry(value, time.monotonic())
+                    self._inflight.pop(("info", symbol), None)
+                call.resolve(value, error)
+            if not call.done.wait(FETCH_WAIT_SECONDS):
+                raise TimeoutError(f"Timed out waiting for {symbol} info")
+            if call.error is not None:
+                raise call.error
+            data = call.value
+
+        data = dict(data)
+        try:
+            quote = self.quote(symbol)
+        except Exception:
+            quote = None
+        if quote:
+            for info_field, quote_field in LIVE_INFO_FIELDS.items():
+                if quote.get(quote_field) is not None:
+                    data[info_field] = quote[quote_field]
+        return data
+
+
+def _covers(entry: _Entry, rows: Optional[int], period: str) -> bool:
+    if entry.period == period:
+        return True
+    return rows is not None and entry.rows is not None and entry.rows >= rows
+
+
+def _tail(df: "pd.DataFrame", rows: Optional[int]) -> "pd.DataFrame":
+    return df.tail(rows) if rows is not None else df
+
+
+def _quote_from(df: Optional["pd.DataFrame"]) -> Optional[Dict[str, Any]]:
+    if df is None or df.empty or "Close" not in df.columns:
+        return None
+    close = df["Close"].dropna()
+    if close.empty:
+        return None
+    volume = df["Volume"].dropna() if "Volume" in df.columns else None
+    return {
+        "price": float(close.iloc[-1]),
+        "previous_close": float(close.iloc[-2]) if len(close) > 1 else None,
+        "volume": int(volume.iloc[-1]) if volume is not None and not volume.empty else None,
+        "as_of": str(close.index[-1]),
+    }
+
+
+# ==========================================================================
+# Process-wide instance
+# ==========================================================================
+
+_service: Optional[MarketDataService] = None
+_service_lock = threading.Lock()
+
+
+def get_market_data() -> MarketDataService:
+    """The shared service used by QuantEngine and the task handlers."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = MarketDataService()
+        return _service
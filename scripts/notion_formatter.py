@@ -17,12 +17,22 @@ Notion Formatter for Syndicate
 Transforms markdown reports into visually rich Notion blocks.
 Uses callouts, toggles, colors, columns, and proper formatting
 to create professional-looking pages.
+
+Both block styles (the rich NotionFormatter and the publisher's basic
+markdown_to_blocks) are compiled from one tokenizer: a single pass over the
+lines that classifies each one with a single regex. Compiled block lists
+are memoized by content hash, so a dry-run validation and the publish of
+the same document version convert it once.
 """
 
+import hashlib
 import html as _html
+import os
 import re
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 
 class BlockColor(Enum):
@@ -137,24 +147,26 @@ def rich_text(
     return text_obj
 
 
+# Pattern for **bold**, *italic*, `code`, and combinations
+INLINE_RE = re.compile(r"(\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`|([^*`]+))")
+
+
 def parse_inline_formatting(text: str, default_color: str = "default") -> List[Dict]:
     """Parse markdown inline formatting to rich text objects."""
     result = []
 
-    # Pattern for **bold**, *italic*, `code`, and combinations
-    pattern = r"(\*\*\*(.+?)\*\*\*|\*\*(.+?)\*\*|\*(.+?)\*|`(.+?)`|([^*`]+))"
-
-    for match in re.finditer(pattern, text):
-        if match.group(2):  # ***bold italic***
-            result.append(rich_text(match.group(2), bold=True, italic=True, color=default_color))
-        elif match.group(3):  # **bold**
-            result.append(rich_text(match.group(3), bold=True, color=default_color))
-        elif match.group(4):  # *italic*
-            result.append(rich_text(match.group(4), italic=True, color=default_color))
-        elif match.group(5):  # `code`
-            result.append(rich_text(match.group(5), code=True))
-        elif match.group(6):  # plain text
-            result.append(rich_text(match.group(6), color=default_color))
+    for match in INLINE_RE.finditer(text):
+        _, bold_italic, bold, italic, code, plain = match.groups()
+        if bold_italic:  # ***bold italic***
+            result.append(rich_text(bold_italic, bold=True, italic=True, color=default_color))
+        elif bold:  # **bold**
+            result.append(rich_text(bold, bold=True, color=default_color))
+        elif italic:  # *italic*
+            result.append(rich_text(italic, italic=True, color=default_color))
+        elif code:  # `code`
+            result.append(rich_text(code, code=True))
+        elif plain:  # plain text
+            result.append(rich_text(plain, color=default_color))
 
     if not result:
         result.append(rich_text(text, color=default_color))
@@ -423,6 +435,222 @@ def convert_all_html_tables_to_markdown(content: str) -> str:
     return table_pattern.sub(_repl, content)
 
 
+METRIC_RE = re.compile(r"\b(RSI|ADX|ATR|SMA|EMA|MACD)\b")
+PRICE_RE = re.compile(r"\$[\d,]+")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# MARKDOWN TOKENIZER
+# ══════════════════════════════════════════════════════════════════════════════
+
+# One regex classifies a line; the named group that matched last names its kind
+LINE_RE = re.compile(
+    r"(?P<hashes>#{1,3})\s+(?P<heading>.+)$"
+    r"|(?P<rule>---+|\*\*\*+)$"
+    r"|(?P<fence>```)"
+    r"|(?P<pipe>\|)"
+    r"|(?P<quote>>)"
+    r"|[-*]\s+(?P<bullet>.*)$"
+    r"|\d+\.\s+(?P<number>.+)$"
+)
+QUOTE_PREFIX_RE = re.compile(r"^>\s*")
+
+
+class Dialect(NamedTuple):
+    """How the tokenizer reads lines for one block style."""
+
+    strip: bool  # Classify stripped lines (raw lines otherwise)
+    skip_frontmatter: bool  # Skip a --- block on the first line
+    min_table_lines: int  # Shorter runs of | lines are paragraphs
+    merge_callouts: bool  # A "> **" line starts a callout of all following > lines
+
+
+# NotionFormatter (format_for_notion) and NotionPublisher.markdown_to_blocks
+RICH = Dialect(strip=True, skip_frontmatter=False, min_table_lines=1, merge_callouts=False)
+BASIC = Dialect(strip=False, skip_frontmatter=True, min_table_lines=2, merge_callouts=True)
+
+
+def tokenize(lines: List[str], dialect: Dialect = RICH) -> Iterator[Tuple]:
+    """
+    Read markdown lines in one pass into block tokens.
+
+    Yields ("heading", level, text), ("rule",), ("code", language, code),
+    ("table", lines), ("callout", lines), ("quote", text), ("bullet", text),
+    ("number", text) and ("paragraph", text). Blank lines are skipped.
+    """
+    strip = dialect.strip
+    n = len(lines)
+    i = 0
+    if dialect.skip_frontmatter and n and lines[0].strip() == "---":
+        i = 1
+        while i < n and lines[i].strip() != "---":
+            i += 1
+        i += 1
+
+    while i < n:
+        line = lines[i]
+        stripped = line.strip()
+        if not stripped:
+            i += 1
+            continue
+        text = stripped if strip else line
+        match = LINE_RE.match(text)
+        kind = match.lastgroup if match else None
+
+        if kind == "heading":
+            yield ("heading", len(match.group("hashes")), match.group("heading"))
+        elif kind == "rule":
+            yield ("rule",)
+        elif kind == "fence":
+            language = text[3:].strip() or "plain text"
+            code = []
+            i += 1
+            while i < n and not (lines[i].strip() if strip else lines[i]).startswith("```"):
+                code.append(lines[i])
+                i += 1
+            yield ("code", language, "\n".join(code))
+        elif kind == "pipe":
+            end = i + 1
+            while end < n and (lines[end].strip() if strip else lines[end]).startswith("|"):
+                end += 1
+            if end - i >= dialect.min_table_lines:
+                yield ("table", lines[i:end])
+                i = end
+                continue
+            yield ("paragraph", text)
+        elif kind == "quote":
+            if dialect.merge_callouts and text.startswith("> **"):
+                end = i
+                while end < n and (lines[end].strip() if strip else lines[end]).startswith(">"):
+                    end += 1
+                yield ("callout", [QUOTE_PREFIX_RE.sub("", q, count=1) for q in lines[i:end]])
+                i = end
+                continue
+            yield ("quote", QUOTE_PREFIX_RE.sub("", text, count=1))
+        elif kind == "bullet":
+            yield ("bullet", match.group("bullet"))
+        elif kind == "number":
+            yield ("number", match.group("number"))
+        else:
+            yield ("paragraph", text)
+        i += 1
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# BASIC BLOCKS (NotionPublisher.markdown_to_blocks)
+# ══════════════════════════════════════════════════════════════════════════════
+
+BASIC_INLINE_RE = re.compile(r"(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)")
+TABLE_SEPARATOR_RE = re.compile(r"^\|[-:\s|]+\|$")
+BASIC_CODE_LANGUAGES = ("python", "javascript", "json", "markdown", "sql", "bash")
+
+
+def basic_rich_text(text: str) -> List[Dict]:
+    """Rich text of a line with **bold**, *italic* and `code` spans (no colors)."""
+    rich_texts = []
+    for part in BASIC_INLINE_RE.split(text):
+        if not part:
+            continue
+        if part.startswith("**") and part.endswith("**"):
+            rich_texts.append({"type": "text", "text": {"content": part[2:-2]}, "annotations": {"bold": True}})
+        elif part.startswith("*") and part.endswith("*") and not part.startswith("**"):
+            rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"italic": True}})
+        elif part.startswith("`") and part.endswith("`"):
+            rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"code": True}})
+        else:
+            rich_texts.append({"type": "text", "text": {"content": part}})
+    return rich_texts if rich_texts else [{"type": "text", "text": {"content": text}}]
+
+
+def _basic_block(block_type: str, body: Dict) -> Dict:
+    return {"object": "block", "type": block_type, block_type: body}
+
+
+def basic_blocks(content: str) -> List[Dict]:
+    """Compile markdown to plain Notion blocks: tables as code blocks, "> **" quotes as callouts."""
+    blocks = []
+    for token in tokenize(content.split("\n"), BASIC):
+        kind = token[0]
+        if kind == "heading":
+            blocks.append(_basic_block(f"heading_{token[1]}", {"rich_text": basic_rich_text(token[2])}))
+        elif kind == "table":
+            table_lines = [line for line in token[1] if not TABLE_SEPARATOR_RE.match(line)]
+            if table_lines:
+                text = [{"type": "text", "text": {"content": "\n".join(table_lines)}}]
+                blocks.append(_basic_block("code", {"rich_text": text, "language": "plain text"}))
+        elif kind == "code":
+            language = token[1].lower() if token[1].lower() in BASIC_CODE_LANGUAGES else "plain text"
+            text = [{"type": "text", "text": {"content": token[2]}}]
+            blocks.append(_basic_block("code", {"rich_text": text, "language": language}))
+        elif kind == "callout":
+            rich = basic_rich_text("\n".join(token[1]))
+            blocks.append(
+                _basic_block("callout", {"rich_text": rich, "icon": {"emoji": "📊"}, "color": "gray_background"})
+            )
+        elif kind == "quote":
+            blocks.append(_basic_block("quote", {"rich_text": basic_rich_text(token[1])}))
+        elif kind == "bullet":
+            blocks.append(_basic_block("bulleted_list_item", {"rich_text": basic_rich_text(token[1])}))
+        elif kind == "number":
+            blocks.append(_basic_block("numbered_list_item", {"rich_text": basic_rich_text(token[1])}))
+        elif kind == "rule":
+            blocks.append(_basic_block("divider", {}))
+        else:
+            blocks.append(_basic_block("paragraph", {"rich_text": basic_rich_text(token[1])}))
+    return blocks
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# COMPILED BLOCK CACHE
+# ══════════════════════════════════════════════════════════════════════════════
+
+COMPILE_CACHE_SIZE = int(os.environ.get("NOTION_COMPILE_CACHE", "64"))
+_compiled: "OrderedDict[Tuple, List[Dict]]" = OrderedDict()
+_compiled_lock = threading.Lock()
+_compile_stats = {"hits": 0, "misses": 0}
+
+
+def _memoized(key: Tuple, content: str, compile_fn: Callable[[], List[Dict]]) -> List[Dict]:
+    """
+    Block list compiled for (key, content), from the cache when the content hash was seen.
+
+    Returns a new list each time, but the block dicts are shared with the
+    cache: copy a block before changing it.
+    """
+    key = key + (hashlib.sha256(content.encode("utf-8")).hexdigest(),)
+    with _compiled_lock:
+        blocks = _compiled.get(key)
+        if blocks is not None:
+            _compiled.move_to_end(key)
+            _compile_stats["hits"] += 1
+            return list(blocks)
+        _compile_stats["misses"] += 1
+    blocks = compile_fn()
+    if COMPILE_CACHE_SIZE > 0:
+        with _compiled_lock:
+            _compiled[key] = blocks
+            while len(_compiled) > COMPILE_CACHE_SIZE:
+                _compiled.popitem(last=False)
+    return list(blocks)
+
+
+def compile_markdown(content: str) -> List[Dict]:
+    """Basic Notion blocks of markdown content (see basic_blocks), memoized by content hash."""
+    return _memoized(("basic",), content, lambda: basic_blocks(content))
+
+
+def compile_cache_info() -> Dict[str, Any]:
+    """Hit/miss counts and size of the compiled block cache."""
+    with _compiled_lock:
+        return {**_compile_stats, "size": len(_compiled), "max_size": COMPILE_CACHE_SIZE}
+
+
+def clear_compile_cache() -> None:
+    with _compiled_lock:
+        _compiled.clear()
+        _compile_stats.update(hits=0, misses=0)
+
+
 class NotionFormatter:
     """Transform markdown to enhanced Notion blocks."""
 
@@ -522,23 +750,12 @@ class NotionFormatter:
 
     def _process_lines(self, lines: List[str]):
         """Process markdown lines into blocks."""
-        i = 0
-        _current_section = []  # Reserved for future section grouping
-
-        while i < len(lines):
-            line = lines[i]
-            stripped = line.strip()
-
-            # Skip empty lines between sections
-            if not stripped:
-                i += 1
-                continue
+        for token in tokenize(lines, RICH):
+            kind = token[0]
 
             # Headers
-            header_match = re.match(r"^(#{1,3})\s+(.+)$", stripped)
-            if header_match:
-                level = len(header_match.group(1))
-                text = header_match.group(2)
+            if kind == "heading":
+                level, text = token[1], token[2]
 
                 # Style headers based on content
                 color = "default"
@@ -552,92 +769,71 @@ class NotionFormatter:
                     text = f"{emoji} {text}"
 
                 self.blocks.append(heading_block(level, text, color=color))
-                i += 1
-                continue
 
             # Horizontal rule / divider
-            if re.match(r"^---+$", stripped) or re.match(r"^\*\*\*+$", stripped):
+            elif kind == "rule":
                 self.blocks.append(divider_block())
-                i += 1
-                continue
 
             # Code blocks
-            if stripped.startswith("```"):
-                language = stripped[3:].strip() or "plain text"
-                code_lines = []
-                i += 1
-
-                while i < len(lines) and not lines[i].strip().startswith("```"):
-                    code_lines.append(lines[i])
-                    i += 1
-                i += 1  # Skip closing ```
-
-                self.blocks.append(code_block("\n".join(code_lines), language))
-                continue
+            elif kind == "code":
+                self.blocks.append(code_block(token[2], token[1]))
 
             # Tables
-            if stripped.startswith("|"):
-                rows, i = parse_markdown_table(lines, i)
+            elif kind == "table":
+                rows, _ = parse_markdown_table(token[1], 0)
                 if rows:
                     self.blocks.extend(table_block(rows))
-                continue
 
             # Blockquotes - convert to callouts
-            if stripped.startswith(">"):
-                quote_text = re.sub(r"^>\s*", "", stripped)
+            elif kind == "quote":
+                quote_text = token[1]
+                quote_lower = quote_text.lower()
 
                 # Detect if it's a special callout
-                if any(word in quote_text.lower() for word in ["warning", "caution", "alert"]):
+                if any(word in quote_lower for word in ["warning", "caution", "alert"]):
                     self.blocks.append(callout_block(quote_text, emoji="⚠️", color="yellow_background"))
-                elif any(word in quote_text.lower() for word in ["note", "info", "tip"]):
+                elif any(word in quote_lower for word in ["note", "info", "tip"]):
                     self.blocks.append(callout_block(quote_text, emoji="💡", color="blue_background"))
-                elif any(word in quote_text.lower() for word in ["important", "key"]):
+                elif any(word in quote_lower for word in ["important", "key"]):
                     self.blocks.append(callout_block(quote_text, emoji="🔑", color="orange_background"))
                 else:
                     self.blocks.append(quote_block(quote_text))
 
-                i += 1
-                continue
-
             # Bullet lists with special handling
-            bullet_match = re.match(r"^[-*]\s+(.+)$", stripped)
-            if bullet_match:
-                text = bullet_match.group(1)
+            elif kind == "bullet":
+                text = token[1]
+                text_lower = text.lower()
                 color = "default"
 
                 # Color based on content
-                if any(word in text.lower() for word in ["bullish", "positive", "support", "strength"]):
+                if any(word in text_lower for word in ["bullish", "positive", "support", "strength"]):
                     color = "green"
-                elif any(word in text.lower() for word in ["bearish", "negative", "resistance", "weakness"]):
+                elif any(word in text_lower for word in ["bearish", "negative", "resistance", "weakness"]):
                     color = "red"
-                elif any(word in text.lower() for word in ["neutral", "consolidat"]):
+                elif any(word in text_lower for word in ["neutral", "consolidat"]):
                     color = "yellow"
 
                 self.blocks.append(bulleted_list_item(text, color=color))
-                i += 1
-                continue
 
             # Numbered lists
-            num_match = re.match(r"^\d+\.\s+(.+)$", stripped)
-            if num_match:
-                self.blocks.append(numbered_list_item(num_match.group(1)))
-                i += 1
-                continue
+            elif kind == "number":
+                self.blocks.append(numbered_list_item(token[1]))
 
             # Regular paragraphs - detect and color special content
-            color = "default"
-            bias = detect_bias_in_text(stripped)
-            if bias:
-                color = color_for_bias(bias)
-
-            # Highlight key metrics
-            if re.search(r"\b(RSI|ADX|ATR|SMA|EMA|MACD)\b", stripped):
-                color = "blue"
-            elif re.search(r"\$[\d,]+", stripped):  # Price mentions
-                color = "green"
-
-            self.blocks.append(paragraph_block(stripped, color=color))
-            i += 1
+            else:
+                stripped = token[1]
+                color = "default"
+                bias = detect_bias_in_text(stripped)
+                if bias:
+                    color = color_for_bias(bias)
+
+                # Highlight key metrics
+                if METRIC_RE.search(stripped):
+                    color = "blue"
+                elif PRICE_RE.search(stripped):  # Price mentions
+                    color = "green"
+
+                self.blocks.append(paragraph_block(stripped, color=color))
 
     def create_summary_callout(self, summary_text: str) -> Dict:
         """Create a prominent summary callout."""
@@ -679,10 +875,11 @@ def format_for_notion(
         chart_urls: Dict mapping ticker -> image URL for charts
 
     Returns:
-        List of Notion block objects
+        List of Notion block objects (memoized by content hash; copy a block before changing it)
     """
-    formatter = NotionFormatter(bias=bias)
-    blocks = formatter.format_document(content, doc_type)
+    blocks = _memoized(
+        ("rich", doc_type, bias), content, lambda: NotionFormatter(bias=bias).format_document(content, doc_type)
+    )
 
     # Add Related Charts section if chart URLs provided
     if chart_urls:
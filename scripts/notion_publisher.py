@@ -22,10 +22,12 @@ import os
 import random
 import re
 import sys
+import threading
+import time
 from dataclasses import dataclass
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Add parent to path for imports
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -55,11 +57,32 @@ except Exception:
         pass
 # Global env toggle to disable wet Notion publishes for safe testing
 _DISABLE_NOTION_PUBLISH = str(os.getenv("DISABLE_NOTION_PUBLISH", "0")).lower() in ("1", "true", "yes")
+# API root; point at a proxy or a local stand-in server (see scripts/bench_notion_sync.py)
+NOTION_API_URL = os.getenv("NOTION_BASE_URL", "https://api.notion.com").rstrip("/")
+# Seconds the database schema (used to map frontmatter to properties) is reused between publishes
+NOTION_SCHEMA_TTL = float(os.getenv("NOTION_SCHEMA_TTL", "300"))
 import hashlib
 import html
+import json
 
 from filelock import FileLock
 
+from scripts.markdown_files import scan_markdown
+from scripts.notion_formatter import compile_markdown
+from scripts.notion_sync import (
+    BLOCK_DIFF_ENABLED,
+    BlockDiffError,
+    NotionPacer,
+    PacedClient,
+    SyncManifest,
+    append_children,
+    apply_block_diff,
+    block_entry,
+    list_children,
+    sync_files,
+)
+from scripts.rate_limiter import get_notion_limiter
+
 # Import database manager for sync tracking
 try:
     from db_manager import get_db
@@ -229,16 +252,63 @@ class NotionConfig:
 class NotionPublisher:
     """Publish Syndicate reports to Notion."""
 
+    _schema_lock = threading.RLock()
+
     def __init__(self, config: NotionConfig = None, no_client_ok: bool = False):
         # Allow tests or dry-run to construct without the Notion client.
         if not no_client_ok and not NOTION_AVAILABLE and Client is None:
             raise ImportError("notion-client package not installed")
 
         self.config = config or NotionConfig.from_env()
+        # Every API call is paced by the shared Notion rate limit and retried on 429 (scripts/notion_sync.py)
+        self._pacer = NotionPacer(get_notion_limiter())
         # Initialize the notion client (may be a real client, a monkeypatched fake, or None for dry-run)
-        self.client = Client(auth=self.config.api_key) if (Client is not None and not no_client_ok) else None
+        client = self._create_client() if (Client is not None and not no_client_ok) else None
+        self.client = PacedClient(client, self._pacer) if client is not None else None
+        self._schema_cache = None
+
+    def _create_client(self):
+        options = {"base_url": NOTION_API_URL} if NOTION_API_URL != "https://api.notion.com" else {}
+        try:
+            # The pacer retries 429s with the shared bucket (and logs them); disable the client's own
+            # retries and per-request warnings where supported. Failures still surface as exceptions.
+            return Client(auth=self.config.api_key, retry=False, log_level=logging.ERROR, **options)
+        except TypeError:
+            return Client(auth=self.config.api_key, **options)
+
+    def _api_get(self, path: str) -> Dict[str, Any]:
+        """GET a Notion API path with the 2025-09-03 API version (paced, 429s retried)."""
+        import requests
+
+        def get() -> Dict[str, Any]:
+            r = requests.get(
+                f"{NOTION_API_URL}{path}",
+                headers={
+                    "Authorization": f"Bearer {self.config.api_key}",
+                    "Notion-Version": "2025-09-03",
+                    "Content-Type": "application/json",
+                },
+                timeout=int(os.getenv("NOTION_API_TIMEOUT", "30")),
+            )
+            r.raise_for_status()
+            return r.json() or {}
+
+        pacer = getattr(self, "_pacer", None)
+        return pacer.call(get) if pacer else get()
 
     def _get_database_properties(self) -> Dict[str, Any]:
+        """Database properties, fetched at most once per NOTION_SCHEMA_TTL seconds (see _fetch_database_properties)."""
+        # Sync workers share one publisher: the first one fetches, the others wait for its result
+        with self._schema_lock:
+            cached = getattr(self, "_schema_cache", None)
+            if cached and time.monotonic() - cached[0] < NOTION_SCHEMA_TTL:
+                return cached[1]
+            props = self._fetch_database_properties()
+            if props:
+                self._schema_cache = (time.monotonic(), props)
+            return props
+
+    def _fetch_database_properties(self) -> Dict[str, Any]:
         """Return data-source properties if available, otherwise fall back to database properties.
 
         This method attempts to discover a `data_source_id` for the configured
@@ -256,18 +326,7 @@ class NotionPublisher:
             # Discovery step: fetch data_sources for the database (2025-09-03 behavior)
             if not ds_id:
                 try:
-                    import requests
-
-                    url = f"https://api.notion.com/v1/databases/{self.config.database_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    r = requests.get(url, headers=headers, timeout=timeout)
-                    r.raise_for_status()
-                    payload = r.json() or {}
+                    payload = self._api_get(f"/v1/databases/{self.config.database_id}")
                     data_sources = payload.get("data_sources") or []
                     if data_sources:
                         ds_id = data_sources[0].get("id")
@@ -279,18 +338,7 @@ class NotionPublisher:
             # If we have a data source id, fetch its schema (properties)
             if ds_id:
                 try:
-                    import requests
-
-                    url = f"https://api.notion.com/v1/data_sources/{ds_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    r = requests.get(url, headers=headers, timeout=timeout)
-                    r.raise_for_status()
-                    payload = r.json() or {}
+                    payload = self._api_get(f"/v1/data_sources/{ds_id}")
                     props = payload.get("properties", {}) or {}
                     self._data_source_props = props
                     return props
@@ -304,19 +352,8 @@ class NotionPublisher:
                 try:
                     db = self.client.databases.retrieve(self.config.database_id)
                 except Exception:
-                    # Last resort: try a simple requests call with a larger timeout
-                    timeout = int(os.getenv("NOTION_API_TIMEOUT", "30"))
-                    import requests as _req
-
-                    url = f"https://api.notion.com/v1/databases/{self.config.database_id}"
-                    headers = {
-                        "Authorization": f"Bearer {self.config.api_key}",
-                        "Notion-Version": "2025-09-03",
-                        "Content-Type": "application/json",
-                    }
-                    r = _req.get(url, headers=headers, timeout=timeout)
-                    r.raise_for_status()
-                    db = r.json() or {}
+                    # Last resort: a direct API call
+                    db = self._api_get(f"/v1/databases/{self.config.database_id}")
                 props = db.get("properties", {}) or {}
                 return props
             except Exception as e:
@@ -419,194 +456,12 @@ class NotionPublisher:
         return meta, body
 
     def markdown_to_blocks(self, content: str) -> List[Dict]:
-        """Convert markdown to Notion blocks with rich formatting."""
-        blocks = []
-        lines = content.split("\n")
-        i = 0
-
-        def parse_rich_text(text: str) -> List[Dict]:
-            """Parse inline markdown to rich text annotations."""
-            rich_texts = []
-
-            # Simple approach: split by bold/italic markers
-            # For now, just detect **bold** and *italic*
-            parts = re.split(r"(\*\*[^*]+\*\*|\*[^*]+\*|`[^`]+`)", text)
+        """Convert markdown to Notion blocks with rich formatting.
 
-            for part in parts:
-                if not part:
-                    continue
-
-                if part.startswith("**") and part.endswith("**"):
-                    rich_texts.append({"type": "text", "text": {"content": part[2:-2]}, "annotations": {"bold": True}})
-                elif part.startswith("*") and part.endswith("*") and not part.startswith("**"):
-                    rich_texts.append(
-                        {"type": "text", "text": {"content": part[1:-1]}, "annotations": {"italic": True}}
-                    )
-                elif part.startswith("`") and part.endswith("`"):
-                    rich_texts.append({"type": "text", "text": {"content": part[1:-1]}, "annotations": {"code": True}})
-                else:
-                    rich_texts.append({"type": "text", "text": {"content": part}})
-
-            return rich_texts if rich_texts else [{"type": "text", "text": {"content": text}}]
-
-        while i < len(lines):
-            line = lines[i]
-
-            # Skip frontmatter (YAML between ---)
-            if line.strip() == "---" and i == 0:
-                i += 1
-                while i < len(lines) and lines[i].strip() != "---":
-                    i += 1
-                i += 1  # Skip closing ---
-                continue
-
-            # Skip empty lines
-            if not line.strip():
-                i += 1
-                continue
-
-            # Headers
-            header_match = re.match(r"^(#{1,3})\s+(.+)$", line)
-            if header_match:
-                level = len(header_match.group(1))
-                text = header_match.group(2)
-                block_type = f"heading_{level}"
-
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": block_type,
-                        block_type: {"rich_text": parse_rich_text(text)},
-                    }
-                )
-                i += 1
-                continue
-
-            # Tables (convert to code block for better display)
-            if line.startswith("|") and i + 1 < len(lines) and lines[i + 1].startswith("|"):
-                table_lines = []
-                while i < len(lines) and lines[i].startswith("|"):
-                    # Skip separator rows (|---|---|)
-                    if not re.match(r"^\|[-:\s|]+\|$", lines[i]):
-                        table_lines.append(lines[i])
-                    i += 1
-
-                if table_lines:
-                    # Create a simple formatted table
-                    blocks.append(
-                        {
-                            "object": "block",
-                            "type": "code",
-                            "code": {
-                                "rich_text": [{"type": "text", "text": {"content": "\n".join(table_lines)}}],
-                                "language": "plain text",
-                            },
-                        }
-                    )
-                continue
-
-            # Code blocks
-            if line.startswith("```"):
-                language = line[3:].strip() or "plain text"
-                code_lines = []
-                i += 1
-
-                while i < len(lines) and not lines[i].startswith("```"):
-                    code_lines.append(lines[i])
-                    i += 1
-                i += 1  # Skip closing ```
-
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "code",
-                        "code": {
-                            "rich_text": [{"type": "text", "text": {"content": "\n".join(code_lines)}}],
-                            "language": language.lower()
-                            if language.lower() in ["python", "javascript", "json", "markdown", "sql", "bash"]
-                            else "plain text",
-                        },
-                    }
-                )
-                continue
-
-            # Callout (> **text** format often used for metadata)
-            if line.startswith("> **"):
-                # Collect all blockquote lines
-                quote_lines = []
-                while i < len(lines) and lines[i].startswith(">"):
-                    quote_lines.append(re.sub(r"^>\s*", "", lines[i]))
-                    i += 1
-
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "callout",
-                        "callout": {
-                            "rich_text": parse_rich_text("\n".join(quote_lines)),
-                            "icon": {"emoji": "📊"},
-                            "color": "gray_background",
-                        },
-                    }
-                )
-                continue
-
-            # Regular blockquote
-            if line.startswith(">"):
-                text = re.sub(r"^>\s*", "", line)
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "quote",
-                        "quote": {"rich_text": parse_rich_text(text)},
-                    }
-                )
-                i += 1
-                continue
-
-            # Bullet list
-            if re.match(r"^[-*]\s+", line):
-                text = re.sub(r"^[-*]\s+", "", line)
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "bulleted_list_item",
-                        "bulleted_list_item": {"rich_text": parse_rich_text(text)},
-                    }
-                )
-                i += 1
-                continue
-
-            # Numbered list
-            num_match = re.match(r"^\d+\.\s+(.+)$", line)
-            if num_match:
-                blocks.append(
-                    {
-                        "object": "block",
-                        "type": "numbered_list_item",
-                        "numbered_list_item": {"rich_text": parse_rich_text(num_match.group(1))},
-                    }
-                )
-                i += 1
-                continue
-
-            # Horizontal rule
-            if re.match(r"^---+$", line) or re.match(r"^\*\*\*+$", line):
-                blocks.append({"object": "block", "type": "divider", "divider": {}})
-                i += 1
-                continue
-
-            # Default: paragraph with rich text
-            blocks.append(
-                {
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {"rich_text": parse_rich_text(line)},
-                }
-            )
-            i += 1
-
-        return blocks
+        Compiled by scripts/notion_formatter.compile_markdown and memoized by
+        content hash; the block dicts are shared, so copy one before changing it.
+        """
+        return compile_markdown(content)
 
     def publish(
         self,
@@ -618,8 +473,14 @@ class NotionPublisher:
         filename: str = None,
         use_enhanced_formatting: bool = True,
         dry_run: bool = False,
+        page_id: str = None,
     ) -> Dict[str, str]:
-        """Publish a document to Notion."""
+        """Publish a document to Notion.
+
+        With `page_id` (the page an earlier version was published to), the
+        document is applied to that page as a block diff when its block map
+        is known (see _revise_page); otherwise a new page is created.
+        """
 
         # Parse frontmatter
         meta, body = self.parse_frontmatter(content)
@@ -869,6 +730,19 @@ class NotionPublisher:
             else:
                 return {"dry_run": True, "valid": True, "blocks": len(blocks)}
 
+        # A revision of a page published with a block map only sends the blocks that changed
+        properties_hash = hashlib.sha256(json.dumps(properties, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        superseded = None
+        if page_id and BLOCK_DIFF_ENABLED:
+            try:
+                revision = self._revise_page(page_id, properties, properties_hash, blocks)
+                if revision is not None:
+                    url = f"https://notion.so/{page_id.replace('-', '')}"
+                    return {"page_id": page_id, "url": url, "type": doc_type, "tags": tags, "revision": revision}
+            except BlockDiffError as e:
+                logging.info("Publishing revision of %s as a new page: %s", page_id, e)
+                superseded = page_id
+
         # Create page with robust retry logic, exponential backoff, jitter and structured logging
         attempts = int(os.getenv("NOTION_PUBLISH_ATTEMPTS", "7"))
         base_delay = float(os.getenv("NOTION_PUBLISH_BASE_DELAY", "2"))
@@ -959,6 +833,7 @@ class NotionPublisher:
                                         # Attempt to update the database schema to include the new option
                                         self.client.databases.update(self.config.database_id, **update_payload)
                                         # Refresh db_props
+                                        self._schema_cache = None
                                         db_props = self._get_database_properties()
                                         logging.info("Status option upserted; retrying publish")
                                         response = self.client.pages.create(
@@ -1003,8 +878,6 @@ class NotionPublisher:
                     logging.exception("Minimal create failed")
 
                 # Backoff with jitter
-                import time
-
                 jitter = random.uniform(0, 0.3 * base_delay)
                 sleep_time = base_delay + jitter
                 logging.info("Backing off for %.2fs before retrying", sleep_time)
@@ -1022,19 +895,85 @@ class NotionPublisher:
                 logging.exception("Failed to send failure alert")
             raise Exception(f"Failed to publish to Notion after {attempts} attempts; last error: {last_exc!r}")
 
+        page_id = response["id"]
+
+        # Pages are created with the first 100 blocks; append the rest in 100-block batches
+        block_ids = [None] * min(len(blocks), 100)
+        if len(blocks) > 100:
+            try:
+                block_ids += append_children(self.client, page_id, blocks[100:])
+            except Exception as e:
+                # Don't leave a truncated page behind: archive it so the next sync publishes it whole
+                logging.exception("Appending blocks to %s failed", page_id)
+                try:
+                    self.client.pages.update(page_id=page_id, archived=True)
+                except Exception:
+                    logging.exception("Failed to archive incomplete page %s", page_id)
+                raise Exception(f"Failed to append {len(blocks) - 100} blocks to Notion page {page_id}: {e!r}")
+
+        if DB_AVAILABLE and BLOCK_DIFF_ENABLED:
+            try:
+                entries = [block_entry(block, block_id) for block, block_id in zip(blocks, block_ids)]
+                get_db().save_page_blocks(page_id, entries, properties_hash)
+            except Exception:
+                logging.exception("Failed to store block map of %s", page_id)
+        if superseded:
+            try:
+                self.client.pages.update(page_id=superseded, archived=True)
+            except Exception:
+                logging.warning("Failed to archive superseded page %s", superseded)
+
         # Track usage
         try:
             from scripts.cleanup_manager import CleanupManager
 
-            CleanupManager().record_notion_page(len(blocks[:100]))
+            CleanupManager().record_notion_page(len(blocks))
         except Exception:
             pass
 
-        page_id = response["id"]
         url = response.get("url", f"https://notion.so/{page_id.replace('-', '')}")
 
         return {"page_id": page_id, "url": url, "type": doc_type, "tags": tags}
 
+    def _revise_page(
+        self, page_id: str, properties: Dict[str, Any], properties_hash: str, blocks: List[Dict]
+    ) -> Optional[Dict[str, int]]:
+        """
+        Apply a revision to an already-published page as a block diff.
+
+        Returns the operation counts, or None if no block map is stored for
+        the page (it was published before block maps were kept). Raises
+        BlockDiffError if the diff cannot be applied; the block map is then
+        dropped and the caller publishes a new page.
+        """
+        if not DB_AVAILABLE:
+            return None
+        db = get_db()
+        stored = db.get_page_blocks(page_id)
+        if not stored:
+            return None
+
+        old = stored["blocks"]
+        try:
+            if any(entry.get("id") is None for entry in old):
+                # Block ids of the initial pages.create are not returned; look them up once
+                children = list_children(self.client, page_id)
+                if [c.get("type") for c in children] != [entry["type"] for entry in old]:
+                    raise BlockDiffError("Page blocks no longer match the stored block map")
+                old = [{**entry, "id": child["id"]} for entry, child in zip(old, children)]
+            if properties_hash != stored.get("properties_hash"):
+                self.client.pages.update(page_id=page_id, properties=properties)
+            new, counts = apply_block_diff(self.client, page_id, old, blocks)
+        except Exception as e:
+            db.delete_page_blocks(page_id)
+            if isinstance(e, BlockDiffError):
+                raise
+            raise BlockDiffError(f"Block diff of {page_id} failed: {e!r}") from e
+
+        db.save_page_blocks(page_id, new, properties_hash)
+        logging.info("Revised Notion page %s: %s", page_id, counts)
+        return counts
+
     def sync_file(
         self, filepath: str, doc_type: str = None, tags: List[str] = None, force: bool = False, dry_run: bool = False
     ) -> Dict[str, str]:
@@ -1315,8 +1254,23 @@ class NotionPublisher:
                     return s
 
             title = _sanitize_title(title)
+
+            # Revisions go to the page the file was last published to
+            previous_page_id = existing_page_id
+            if not previous_page_id and DB_AVAILABLE:
+                try:
+                    previous_page_id = (get_db().get_notion_page_for_file(str(path)) or {}).get("notion_page_id")
+                except Exception:
+                    previous_page_id = None
+
             result = self.publish(
-                title=title, content=content, doc_type=doc_type, tags=tags, filename=filename, dry_run=dry_run
+                title=title,
+                content=content,
+                doc_type=doc_type,
+                tags=tags,
+                filename=filename,
+                dry_run=dry_run,
+                page_id=previous_page_id,
             )
 
             # Record the sync in the database, using the strong fingerprint when available
@@ -1336,9 +1290,10 @@ class NotionPublisher:
             if not dry_run and result.get("page_id"):
                 try:
                     from scripts.frontmatter import mark_synced as fm_mark_synced
+                    from scripts.frontmatter import write_document
 
                     updated_content = fm_mark_synced(content, filename, result["page_id"])
-                    path.write_text(updated_content, encoding="utf-8")
+                    write_document(path, updated_content)
                     logging.info("Updated source file %s with notion_page_id=%s", path, result["page_id"])
                 except Exception as e:
                     logging.warning("Failed to update source file with notion_page_id: %s", e)
@@ -1416,13 +1371,23 @@ class NotionPublisher:
         return results
 
 
-def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+def sync_all_outputs(
+    output_dir: str = None, force: bool = False, dry_run: bool = False, workers: int = None
+) -> Dict[str, Any]:
     """
     Sync all Syndicate outputs to Notion with intelligent deduplication.
 
+    Files are published concurrently by `workers` threads (default
+    NOTION_SYNC_WORKERS); API calls stay within the shared Notion rate limit.
+
+    Files whose settled outcome is in the sync manifest and whose stat
+    fingerprint has not moved are skipped without being read (see
+    SyncManifest); `force` bypasses the manifest.
+
     Args:
         output_dir: Directory containing output files (default: PROJECT_ROOT/output)
         force: If True, sync all files even if unchanged
+        workers: Files published concurrently (1 = one after another)
 
     Returns:
         Dict with success, skipped, and failed lists
@@ -1449,18 +1414,27 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
     publisher = NotionPublisher(no_client_ok=dry_run)
     results = {"success": [], "skipped": [], "failed": []}
 
-    # Find all markdown files recursively
-    md_files = list(output_path.glob("**/*.md"))
+    manifest = None
+    if DB_AVAILABLE and not dry_run:
+        try:
+            manifest = SyncManifest(get_db())
+        except Exception as e:
+            logging.debug("Sync manifest unavailable, reading every file: %s", e)
 
-    # Filter out index files and archive
-    md_files = [f for f in md_files if "FILE_INDEX" not in f.name and "/archive/" not in str(f).replace("\\", "/")]
+    # Find all markdown files recursively in one stat-only pass, skipping index files and archive/
+    output_path = output_path.resolve()
+    scanned = sorted(
+        (f, st)
+        for f, st in scan_markdown(output_path)
+        if "FILE_INDEX" not in os.path.basename(f) and "/archive/" not in f.replace("\\", "/")
+    )
 
     # Apply repository-level ignore patterns so certain internal files (digests, executor outputs)
     # never get published even when --force is used.
-    def _is_ignored(fpath: Path) -> bool:
+    def _is_ignored(fpath: str) -> bool:
         try:
-            name = fpath.name.lower()
-            s = str(fpath).lower()
+            name = os.path.basename(fpath).lower()
+            s = fpath.lower()
             for p in IGNORE_PATTERNS:
                 if p.lower() in name or p.lower() in s:
                     return True
@@ -1468,11 +1442,22 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
             return False
         return False
 
-    md_files = [f for f in md_files if not _is_ignored(f)]
+    md_files = []
+    for f, st in scanned:
+        if _is_ignored(f):
+            continue
+        if manifest is not None and not force and manifest.unchanged(f, st):
+            results["skipped"].append({"file": os.path.basename(f), "reason": "unchanged"})
+            continue
+        md_files.append(Path(f))
 
-    for filepath in md_files:
+    for filepath, result, error in sync_files(publisher, md_files, force=force, dry_run=dry_run, workers=workers):
         try:
-            result = publisher.sync_file(str(filepath), force=force, dry_run=dry_run)
+            if error is not None:
+                raise error
+
+            if manifest is not None:
+                manifest.record(filepath, result)
 
             # Support future dry-run flows where sync_file returns dry_run results
             if result.get("dry_run"):
@@ -1495,6 +1480,14 @@ def sync_all_outputs(output_dir: str = None, force: bool = False, dry_run: bool
             results["failed"].append({"file": filepath.name, "error": str(e)})
             print(f"✗ {filepath.name}: {e}")
 
+    if manifest is not None:
+        try:
+            # A forced run does not consult the manifest, so it cannot tell which entries are stale
+            manifest.commit(None if force else output_path)
+            results["manifest"] = dict(manifest.stats)
+        except Exception as e:
+            logging.warning("Failed to update sync manifest: %s", e)
+
     # Mark task as run (only for real runs)
     if DB_AVAILABLE and not dry_run:
         db = get_db()
@@ -1520,6 +1513,7 @@ if __name__ == "__main__":
     parser.add_argument("--dry-run", action="store_true", help="Validate publish without creating pages")
     parser.add_argument("--no-notion", action="store_true", help="Disable wet Notion publishes (safe dry-run)")
     parser.add_argument("--status", action="store_true", help="Show sync status")
+    parser.add_argument("--workers", type=int, default=None, help="Files published concurrently with --sync-all")
     args = parser.parse_args()
 
     # Allow CLI toggle to override environment
@@ -1560,7 +1554,7 @@ if __name__ == "__main__":
                 print(f"✓ Published: {result['url']}")
 
         elif args.sync_all:
-            results = sync_all_outputs(force=args.force, dry_run=args.dry_run)
+            results = sync_all_outputs(force=args.force, dry_run=args.dry_run, workers=args.workers)
             print(f"\n✓ Success: {len(results['success'])}")
             print(f"⏭ Skipped: {len(results.get('skipped', []))}")
             print(f"✗ Failed: {len(results['failed'])}")
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""Rate-limit-aware Notion API access and the concurrent output sync engine.
+
+Notion allows an average of ~3 requests per second per integration and
+answers bursts with HTTP 429. NotionPublisher routes every API call through
+a NotionPacer:
+
+- Pacing: each call first takes a token from the shared "notion" token
+  bucket (scripts/rate_limiter.get_notion_limiter). The bucket lives in
+  SQLite, so the sync workers, the daemon and ad-hoc CLI runs share one
+  budget.
+- 429 handling: the bucket is blocked for every caller for Retry-After
+  seconds. The call is then retried after an exponential backoff with
+  jitter, so waiting workers do not all fire at once when it reopens.
+- Long pages: a request may carry at most 100 child blocks. append_children
+  sends the rest of a page in 100-block batches after it is created.
+
+sync_files runs NotionPublisher.sync_file over many files with a pool of
+worker threads. The pacer keeps the pool at the API limit, so a full
+output sync spends its time at ~3 req/s instead of waiting on one
+request's latency at a time.
+
+Revisions of a page this engine published are applied as a block diff
+(apply_block_diff). The page's block map (id, content hash and type of each
+top-level block) is stored when it is published. A revision then sends
+only the blocks that changed: an update per edited block, a delete per
+removed one, and one append per run of new blocks. The page is not
+rebuilt.
+
+SyncManifest lets sync_all_outputs skip unchanged files without reading
+them. It remembers the (inode, size, mtime_ns) and content hash each file
+had when its sync outcome was last settled. A full-tree scan is then one
+os.scandir walk (scripts/markdown_files.scan_markdown). Only files whose stat fingerprint moved
+are opened, and a touched file with identical bytes is not synced again.
+
+Environment:
+    NOTION_SYNC_WORKERS=4        Files published concurrently by sync_all_outputs
+    NOTION_RPS=3                 Requests per second shared by all processes
+    NOTION_BURST=2               Requests that may be sent back to back
+    NOTION_MAX_ATTEMPTS=6        Attempts per API call on 429 responses
+    NOTION_RATE_LIMITER=1        Set to 0 to disable pacing (429 retries still apply)
+    NOTION_BLOCK_DIFF=1          Set to 0 to publish revisions as new pages
+"""
+
+import difflib
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+LOG = logging.getLogger("notion_sync")
+
+# Notion rejects requests carrying more child blocks than this
+MAX_BLOCKS_PER_REQUEST = 100
+SYNC_WORKERS = int(os.environ.get("NOTION_SYNC_WORKERS", "4"))
+MAX_ATTEMPTS = int(os.environ.get("NOTION_MAX_ATTEMPTS", "6"))
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+BLOCK_DIFF_ENABLED = os.environ.get("NOTION_BLOCK_DIFF", "1").lower() not in ("0", "false", "no")
+
+# Block types whose content can be changed in place with blocks.update (others are replaced)
+UPDATABLE_BLOCK_TYPES = frozenset(
+    {
+        "paragraph",
+        "heading_1",
+        "heading_2",
+        "heading_3",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "quote",
+        "callout",
+        "to_do",
+        "toggle",
+        "code",
+        "equation",
+        "image",
+        "bookmark",
+        "embed",
+        "divider",
+    }
+)
+
+# sync_file skip reasons that depend only on the file's content (or are final until it changes)
+SETTLED_SKIP_REASONS = (
+    "already_synced_frontmatter",
+    "already_published",
+    "File unchanged since last sync",
+    "excluded_pattern",
+    "opted_out_publish",
+    "Document status is",
+)
+
+
+def rate_limit_retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds to wait if `error` is a Notion rate-limit response, else None.
+
+    Understands notion_client.APIResponseError (status/code/headers) and
+    requests.HTTPError (response.status_code/headers). Returns 0.0 for a 429
+    without a Retry-After header.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status", None) or getattr(response, "status_code", None)
+    code = getattr(error, "code", None)
+    if status != 429 and getattr(code, "value", code) != "rate_limited":
+        return None
+    headers = getattr(error, "headers", None) or getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class NotionPacer:
+    """
+    Run Notion API calls under the shared rate limit, retrying 429 responses.
+
+    Args:
+        limiter: TokenBucketLimiter for the Notion quota (None = no pacing)
+        max_attempts: Attempts per call before a 429 is raised to the caller
+        base_delay: First backoff in seconds (doubles per attempt, jittered)
+    """
+
+    def __init__(
+        self,
+        limiter=None,
+        max_attempts: int = MAX_ATTEMPTS,
+        base_delay: float = BASE_BACKOFF_SECONDS,
+        max_delay: float = MAX_BACKOFF_SECONDS,
+    ):
+        self.limiter = limiter
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = {"calls": 0, "throttled": 0, "waited_s": 0.0}
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            waited = 0.0
+            if self.limiter is not None:
+                # Notion calls have no priority classes; every caller may use the whole bucket
+                waited = self.limiter.acquire(priority="interactive")
+            with self._lock:
+                self.stats["calls"] += 1
+                self.stats["waited_s"] += waited
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                retry_after = rate_limit_retry_after(e)
+                if retry_after is None or attempt == self.max_attempts:
+                    raise
+                backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                delay = max(retry_after, random.uniform(backoff / 2, backoff))
+                with self._lock:
+                    self.stats["throttled"] += 1
+                if self.limiter is not None:
+                    self.limiter.report_quota_error(retry_after or backoff / 2)
+                LOG.info("[NOTION] rate limited (attempt %d/%d); retrying in %.1fs", attempt, self.max_attempts, delay)
+                time.sleep(delay)
+
+
+class PacedClient:
+    """
+    Proxy of a notion_client.Client (or any endpoint of it) whose calls go through a NotionPacer.
+
+    client.pages.create(...), client.blocks.children.append(...) and
+    client.request(...) keep their signatures.
+    """
+
+    def __init__(self, target: Any, pacer: NotionPacer):
+        self._target = target
+        self._pacer = pacer
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name.startswith("_") or isinstance(attr, (str, bytes, int, float, bool, dict, list, tuple, type(None))):
+            return attr
+        if callable(attr):
+            return lambda *args, **kwargs: self._pacer.call(attr, *args, **kwargs)
+        return PacedClient(attr, self._pacer)
+
+
+def append_children(client: Any, block_id: str, blocks: List[Dict], after: Optional[str] = None) -> List[Optional[str]]:
+    """
+    Append `blocks` under a page or block in 100-block requests, in order.
+
+    With `after`, the blocks are inserted after that child block instead of
+    at the end. Returns the ids of the created blocks (None where the
+    response did not include them).
+    """
+    ids: List[Optional[str]] = []
+    for start in range(0, len(blocks), MAX_BLOCKS_PER_REQUEST):
+        batch = blocks[start : start + MAX_BLOCKS_PER_REQUEST]
+        kwargs = {"after": after} if after else {}
+        response = client.blocks.children.append(block_id=block_id, children=batch, **kwargs)
+        # With `after`, Notion may also return the blocks that follow the new ones
+        created = [r.get("id") for r in (response or {}).get("results", [])[: len(batch)]]
+        created += [None] * (len(batch) - len(created))
+        ids.extend(created)
+        if after:
+            after = created[-1]
+            if after is None and start + MAX_BLOCKS_PER_REQUEST < len(blocks):
+                raise BlockDiffError(f"Cannot continue inserting into {block_id}: appended block ids unknown")
+    return ids
+
+
+def list_children(client: Any, block_id: str) -> List[Dict]:
+    """All child blocks of a page or block, following pagination."""
+    children: List[Dict] = []
+    cursor = None
+    while True:
+        kwargs = {"start_cursor": cursor} if cursor else {}
+        response = client.blocks.children.list(block_id=block_id, page_size=MAX_BLOCKS_PER_REQUEST, **kwargs)
+        children.extend(response.get("results", []))
+        cursor = response.get("next_cursor")
+        if not response.get("has_more") or not cursor:
+            return children
+
+
+class BlockDiffError(Exception):
+    """A revision cannot be applied to the existing page as a block diff."""
+
+
+def block_entry(block: Dict, block_id: Optional[str] = None) -> Dict[str, Any]:
+    """Block map entry of a Notion block payload: {"id", "hash", "type", "nested"}."""
+    block_type = block.get("type")
+    body = block.get(block_type)
+    nested = bool(block.get("children") or (isinstance(body, dict) and body.get("children")))
+    digest = hashlib.sha256(json.dumps(block, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return {"id": block_id, "hash": digest[:32], "type": block_type, "nested": nested}
+
+
+def _updatable(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    # blocks.update cannot change a block's type or its children
+    return old["type"] == new["type"] in UPDATABLE_BLOCK_TYPES and not old["nested"] and not new["nested"]
+
+
+def plan_block_diff(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> List[Tuple]:
+    """
+    Minimal steps turning the block map `old` into `new`, in page order.
+
+    Steps are ("keep", old_index, new_index), ("update", old_index, new_index),
+    ("delete", old_index) and ("insert", [new_index, ...]). An insert goes
+    right after the block placed by the last keep/update/insert before it,
+    or at the start of the page if there is none.
+    """
+    matcher = difflib.SequenceMatcher(None, [e["hash"] for e in old], [e["hash"] for e in new], autojunk=False)
+    steps: List[Tuple] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            steps.extend(("keep", i, j) for i, j in zip(range(i1, i2), range(j1, j2)))
+            continue
+        inserts: List[int] = []
+        for i, j in zip_longest(range(i1, i2), range(j1, j2)):
+            if i is not None and j is not None and _updatable(old[i], new[j]):
+                if inserts:
+                    steps.append(("insert", inserts))
+                    inserts = []
+                steps.append(("update", i, j))
+                continue
+            if i is not None:
+                steps.append(("delete", i))
+            if j is not None:
+                inserts.append(j)
+        if inserts:
+            steps.append(("insert", inserts))
+    return steps
+
+
+def apply_block_diff(
+    client: Any, page_id: str, old: List[Dict[str, Any]], blocks: List[Dict]
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Turn a page whose children are the block map `old` into `blocks`.
+
+    Every entry of `old` needs its block id. Returns the new block map and
+    operation counts. Raises BlockDiffError before touching the page if
+    blocks would have to go before the first block that stays (the API can
+    only append after an existing block).
+    """
+    new = [block_entry(block) for block in blocks]
+    steps = plan_block_diff(old, new)
+    first_placed = next((step for step in steps if step[0] != "delete"), None)
+    if first_placed and first_placed[0] == "insert" and any(step[0] in ("keep", "update") for step in steps):
+        raise BlockDiffError("Blocks inserted at the start of the page")
+
+    counts = {"kept": 0, "updated": 0, "inserted": 0, "deleted": 0}
+    anchor = None
+    for step in steps:
+        if step[0] in ("keep", "update"):
+            _, i, j = step
+            anchor = new[j]["id"] = old[i]["id"]
+            if step[0] == "update":
+                block_type = blocks[j]["type"]
+                client.blocks.update(block_id=anchor, **{block_type: blocks[j][block_type]})
+            counts["kept" if step[0] == "keep" else "updated"] += 1
+        elif step[0] == "delete":
+            client.blocks.delete(block_id=old[step[1]]["id"])
+            counts["deleted"] += 1
+        else:
+            indexes = step[1]
+            if anchor is None and step is not first_placed:
+                raise BlockDiffError(f"Cannot insert into {page_id}: id of the preceding block unknown")
+            ids = append_children(client, page_id, [blocks[j] for j in indexes], after=anchor)
+            for j, block_id in zip(indexes, ids):
+                new[j]["id"] = block_id
+            anchor = ids[-1]
+            counts["inserted"] += len(indexes)
+    return new, counts
+
+
+def sync_files(
+    publisher: Any,
+    files: Iterable[Path],
+    force: bool = False,
+    dry_run: bool = False,
+    workers: int = None,
+) -> Iterator[Tuple[Path, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Sync files with NotionPublisher.sync_file on a pool of worker threads.
+
+    Yields (path, result, error) in the order of `files`; exactly one of
+    result and error is set.
+    """
+    workers = max(1, workers or SYNC_WORKERS)
+
+    def sync_one(path: Path) -> Tuple[Path, Optional[Dict[str, Any]], Optional[Exception]]:
+        try:
+            return path, publisher.sync_file(str(path), force=force, dry_run=dry_run), None
+        except Exception as e:
+            return path, None, e
+
+    if workers == 1:
+        yield from map(sync_one, files)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notion-sync") as pool:
+        yield from pool.map(sync_one, files)
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fingerprint(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class SyncManifest:
+    """
+    Stat fingerprints of output files whose sync outcome is settled.
+
+    unchanged() answers from the stat alone while a file's (inode, size,
+    mtime_ns) matches; otherwise it hashes the file and only reports a
+    change if the bytes differ. record() stores the outcome of a sync, and
+    commit() writes all updates in one transaction.
+
+    Args:
+        db: DatabaseManager holding the notion_sync_manifest table (None = no manifest)
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+        self.entries: Dict[str, Dict[str, Any]] = db.get_sync_manifest() if db is not None else {}
+        self.updates: List[Dict[str, Any]] = []
+        self.seen: set = set()
+        self.stats = {"unchanged": 0, "touched": 0, "changed": 0}
+
+    def unchanged(self, path: str, stat: os.stat_result) -> bool:
+        key = str(path)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["changed"] += 1
+            return False
+        if (entry["inode"], entry["size"], entry["mtime_ns"]) == _fingerprint(stat):
+            self.stats["unchanged"] += 1
+            return True
+        try:
+            content_hash = file_digest(path)
+        except OSError:
+            content_hash = None
+        if content_hash != entry["content_hash"]:
+            self.stats["changed"] += 1
+            return False
+        # Touched but identical; refreshing the stat lets the next scan skip it unread
+        self.stats["touched"] += 1
+        self.updates.append({**entry, "inode": stat.st_ino, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+        return True
+
+    def record(self, path: Path, result: Dict[str, Any]) -> bool:
+        """Remember a sync_file result if its outcome holds until the file changes. Returns True if recorded."""
+        if result.get("dry_run"):
+            return False
+        if result.get("skipped"):
+            reason = str(result.get("reason") or "")
+            if not reason.startswith(SETTLED_SKIP_REASONS):
+                return False
+            outcome = reason
+        elif result.get("page_id"):
+            outcome = "published"
+        else:
+            return False
+        try:
+            # Stat after the sync: publishing rewrites the file's frontmatter
+            stat = os.stat(path)
+            content_hash = file_digest(path)
+        except OSError:
+            return False
+        self.updates.append(
+            {
+                "path": str(path),
+                "inode": stat.st_ino,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "content_hash": content_hash,
+                "notion_page_id": result.get("page_id") or None,
+                "outcome": outcome,
+            }
+        )
+        return True
+
+    def commit(self, root: Optional[Path] = None) -> int:
+        """
+        Write pending updates. With `root`, also drop entries under it that the scan did not see.
+
+        Returns the number of entries written.
+        """
+        if self.db is None:
+            return 0
+        if root is not None:
+            prefix = os.path.join(str(root), "")
+            gone = [p for p in self.entries if p.startswith(prefix) and p not in self.seen]
+            self.db.delete_sync_manifest(gone)
+        written = self.db.record_sync_manifest(self.updates)
+        self.updates = []
+        return written
@@ -12,6 +12,7 @@ Comprehensive testing and auditing of the entire pipeline:
 Run with: python scripts/pipeline_audit.py
 """
 
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -115,7 +116,7 @@ def audit_frontmatter() -> Dict[str, Any]:
     print_section("FRONTMATTER AUDIT")
 
     from main import Config
-    from scripts.frontmatter import get_document_status, has_frontmatter
+    from scripts.frontmatter import status_index
 
     config = Config()
     output_path = Path(config.OUTPUT_DIR)
@@ -128,25 +129,26 @@ def audit_frontmatter() -> Dict[str, Any]:
         "files_missing_fm": [],
     }
 
-    # Find all markdown files
-    md_files = list(output_path.glob("**/*.md"))
-    results["total_files"] = len(md_files)
+    # Status of every markdown file, from the index (only changed files are read)
+    try:
+        entries = status_index().scan(output_path)
+    except Exception as e:
+        print_result("Error indexing frontmatter", "fail", str(e))
+        entries = []
+    results["total_files"] = len(entries)
 
-    for md_file in md_files:
-        if "FILE_INDEX" in md_file.name or "archive" in str(md_file).lower():
+    for entry in entries:
+        name = os.path.basename(entry["path"])
+        if "FILE_INDEX" in name or "archive" in entry["path"].lower():
             continue
 
-        try:
-            content = md_file.read_text(encoding="utf-8")
-            if has_frontmatter(content):
-                results["has_frontmatter"] += 1
-                status = get_document_status(content)
-                results["by_status"][status] = results["by_status"].get(status, 0) + 1
-            else:
-                results["missing_frontmatter"] += 1
-                results["files_missing_fm"].append(md_file.name)
-        except Exception as e:
-            print_result(f"Error reading {md_file.name}", "fail", str(e))
+        if entry["has_frontmatter"]:
+            results["has_frontmatter"] += 1
+            status = entry["status"] if entry["status"] is not None else "draft"
+            results["by_status"][status] = results["by_status"].get(status, 0) + 1
+        else:
+            results["missing_frontmatter"] += 1
+            results["files_missing_fm"].append(name)
 
     print(f"  Total markdown files: {results['total_files']}")
     print(f"  With frontmatter: {results['has_frontmatter']}")
@@ -311,6 +311,8 @@ def generate_premarket(config: Config, logger, model=None, dry_run: bool = False
                     def sanitize_generated(text: str) -> str:
                         import re
 
+                        from scripts.price_sanitizer import PriceSanitizer, canonical_from_data
+
                         gold_price = data.get("GOLD", {}).get("price")
                         gold_atr = data.get("GOLD", {}).get("atr") or 0
                         # Support zone calculations used in prompt
@@ -319,68 +321,20 @@ def generate_premarket(config: Config, logger, model=None, dry_run: bool = False
                         support_zone_low = gold_price - (atr_stop_width * 1.5) if gold_price else None
                         support_zone_high = gold_price - atr_stop_width if gold_price else None
 
-                        # Replace explicit 'Current Gold Price' mentions
-                        if gold_price is not None:
-                            text = re.sub(
-                                r"(Current Gold Price:\s*\$)\s*[0-9\.,]+", f"\1{gold_price}", text, flags=re.IGNORECASE
-                            )
-
-                            # Replace nearby mentions where gold is referenced with a $<number> if it is off by >5%
-                            def fix_match(m):
-                                full = m.group(0)
-                                num = float(m.group(2).replace(",", "")) if m.group(2) else None
-                                if num and abs((num - gold_price) / gold_price) > 0.05:
-                                    return m.group(1) + str(gold_price)
-                                return full
-
-                            text = re.sub(r"(gold[^\n]{0,40}?\$)([0-9\.,]+)", fix_match, text, flags=re.IGNORECASE)
-
-                        # Replace support/stop placeholders if computed
-                        if support_zone_low is not None and support_zone_high is not None and suggested_sl is not None:
-                            text = re.sub(r"\$X,XXX|\$X,XXX|\$X,XXX", f"${int(support_zone_low)}", text)
-
                         # Enforce canonical prices for all known assets to prevent accidental mis-attribution
                         try:
-
-                            def enforce_canonical(text: str) -> str:
-                                # For each asset in the data dict, replace nearby $numbers with the canonical price
-                                for asset_key, v in data.items():
-                                    if not isinstance(v, dict):
-                                        continue
-                                    asset_price = v.get("price")
-                                    if asset_price is None:
-                                        continue
-
-                                    # Variants to match in natural language (e.g., 'Yields' -> 'YIELD')
-                                    variants = {asset_key, asset_key.lower(), asset_key.title(), asset_key.capitalize()}
-                                    if asset_key.upper() == "YIELD":
-                                        variants.update({"Yields", "Yield", "YIELD"})
-
-                                    for tok in variants:
-                                        # Match constructs like 'DXY ($98.72)' or 'rising Yields ($98.72)'
-                                        pattern = re.compile(
-                                            rf"({re.escape(tok)}[^\n]{{0,40}}\$)\s*[0-9\.,]+", flags=re.IGNORECASE
-                                        )
-
-                                        def _repl(m):
-                                            return m.group(1) + f"{asset_price}"
-
-                                        text = pattern.sub(_repl, text)
-
-                                    # As a fallback, also replace explicit 'Asset: $number' patterns where asset key appears
-                                    fallback = re.compile(
-                                        rf"({re.escape(asset_key)}\s*:\s*\$)\s*[0-9\.,]+", flags=re.IGNORECASE
-                                    )
-
-                                    text = fallback.sub(lambda m: m.group(1) + f"{asset_price}", text)
-
-                                return text
-
-                            text = enforce_canonical(text)
+                            result = PriceSanitizer(canonical_from_data(data)).sanitize(text)
+                            if result.corrections:
+                                logger.info(f"Sanitizer corrected {result.count} price mention(s) in Pre-Market")
+                            text = result.text
                         except Exception:
                             # Non-critical; if enforcement fails, leave text as-is
                             pass
 
+                        # Replace support/stop placeholders if computed
+                        if support_zone_low is not None and support_zone_high is not None and suggested_sl is not None:
+                            text = re.sub(r"\$X,XXX", f"${int(support_zone_low)}", text)
+
                         return text
 
                     sanitized = sanitize_generated(generated)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Single-pass canonical price sanitizer for LLM-generated reports.
+
+LLMs regularly quote stale or mis-attributed prices ("Gold at $2,345" when
+the data says $4,362). Given the canonical price of each asset, the engine
+fixes every price mention in one left-to-right scan:
+
+- one combined regex per asset universe matches asset names (with plural
+  forms, e.g. "Yields"), `$<number>` prices and line breaks
+- each price is attributed to the nearest preceding asset mention on the
+  same line, at most `window` characters before the `$`
+- labelled prices ("Gold: $...", "Current Gold Price: $...") are always set
+  to the canonical value; other attributed prices only when they deviate by
+  more than `tolerance`
+
+Compiled patterns are cached per set of asset names, so sanitizing many
+documents against the same universe compiles nothing after the first call.
+
+Usage:
+    sanitizer = PriceSanitizer({"GOLD": 4362.4, "DXY": 98.7})
+    result = sanitizer.sanitize(text)
+    result.text, result.corrections
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Canonical values embedded in prompts, e.g. '* GOLD: $4362.4'
+CANONICAL_LINE_RE = re.compile(r"\*\s*([A-Z]+)\s*:\s*\$?([0-9\.,]+)")
+
+# A price: '$4,362.40' or '$ 98.7' (trailing sentence punctuation is not part of it)
+_PRICE = r"\$[ \t]?(?P<num>[0-9][0-9,]*(?:\.[0-9]+)?)"
+
+
+@dataclass
+class PriceCorrection:
+    """One replaced price mention (positions refer to the original text)."""
+
+    asset: str
+    found: float
+    canonical: float
+    start: int
+    end: int
+    reason: str  # "label" (always canonical) or "deviation" (outside tolerance)
+
+    @property
+    def note(self) -> str:
+        return f"Replaced {self.found} with {self.canonical}"
+
+
+@dataclass
+class SanitizeResult:
+    text: str
+    corrections: List[PriceCorrection] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.corrections)
+
+    @property
+    def notes(self) -> List[str]:
+        return [c.note for c in self.corrections]
+
+
+def parse_canonical(prompt: str) -> Dict[str, float]:
+    """Extract canonical prices from '* ASSET: $price' lines of a prompt."""
+    values = {}
+    for m in CANONICAL_LINE_RE.finditer(prompt or ""):
+        try:
+            values[m.group(1).upper()] = float(m.group(2).replace(",", "").rstrip("."))
+        except ValueError:
+            continue
+    return values
+
+
+def canonical_from_data(data: Mapping) -> Dict[str, float]:
+    """Canonical prices from a QuantEngine data dict ({'GOLD': {'price': ...}, ...})."""
+    values = {}
+    for asset, v in (data or {}).items():
+        if isinstance(v, dict) and v.get("price") is not None:
+            try:
+                values[str(asset).upper()] = float(v["price"])
+            except (TypeError, ValueError):
+                continue
+    return values
+
+
+@lru_cache(maxsize=64)
+def _compile(names: Tuple[str, ...]) -> "re.Pattern":
+    """Combined pattern for one asset universe (names sorted, upper-case)."""
+    # Longest first so e.g. 'GOLDUSD' wins over 'GOLD'
+    alternation = "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+    return re.compile(
+        rf"(?<![A-Za-z0-9])(?P<asset>(?:{alternation})s?)(?![A-Za-z0-9])"
+        r"(?P<label>(?:[ \t]+price)?[ \t]*:[ \t]*)?"
+        rf"|{_PRICE}"
+        r"|(?P<nl>\n)",
+        re.IGNORECASE,
+    )
+
+
+class PriceSanitizer:
+    """
+    Replace wrong price mentions with canonical values.
+
+    Args:
+        canonical: Asset name -> canonical price
+        tolerance: Relative deviation allowed for unlabelled mentions (0.05 = 5%)
+        window: Max characters between an asset mention and its `$` price
+    """
+
+    def __init__(self, canonical: Mapping[str, float], tolerance: float = 0.05, window: int = 40):
+        self.canonical = {str(k).upper(): float(v) for k, v in canonical.items() if v is not None}
+        self.tolerance = tolerance
+        self.window = window
+        self._pattern = _compile(tuple(sorted(self.canonical))) if self.canonical else None
+
+    def _asset_for(self, token: str) -> Optional[str]:
+        name = token.upper()
+        if name in self.canonical:
+            return name
+        if name.endswith("S") and name[:-1] in self.canonical:
+            return name[:-1]
+        return None
+
+    def sanitize(self, text: str) -> SanitizeResult:
+        """Fix price mentions in `text` in a single pass."""
+        if not text or self._pattern is None:
+            return SanitizeResult(text or "")
+
+        out: List[str] = []
+        corrections: List[PriceCorrection] = []
+        pos = 0
+        # Most recent asset mention on the current line: (asset, end offset, label end offset)
+        mention: Optional[Tuple[str, int, int]] = None
+
+        for m in self._pattern.finditer(text):
+            if m.group("nl") is not None:
+                mention = None
+                continue
+            if m.group("asset") is not None:
+                asset = self._asset_for(m.group("asset"))
+                label_end = m.end("label") if m.group("label") is not None else -1
+                mention = (asset, m.end("asset"), label_end) if asset else mention
+                continue
+
+            if mention is None or m.start() - mention[1] > self.window:
+                continue
+            asset, _, label_end = mention
+            canonical = self.canonical[asset]
+            try:
+                found = float(m.group("num").replace(",", ""))
+            except ValueError:
+                continue
+
+            if label_end == m.start():
+                if found == canonical:
+                    continue
+                reason = "label"
+            elif canonical and abs((found - canonical) / canonical) > self.tolerance:
+                reason = "deviation"
+            else:
+                continue
+
+            out.append(text[pos : m.start("num")])
+            out.append(str(canonical))
+            pos = m.end("num")
+            corrections.append(PriceCorrection(asset, found, canonical, m.start(), m.end(), reason))
+
+        if not corrections:
+            return SanitizeResult(text)
+        out.append(text[pos:])
+        return SanitizeResult("".join(out), corrections)
+
+
+def sanitize_prices(text: str, canonical: Mapping[str, float], **kwargs) -> SanitizeResult:
+    """Convenience wrapper: sanitize `text` against `canonical` prices."""
+    return PriceSanitizer(canonical, **kwargs).sanitize(text)
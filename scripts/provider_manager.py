@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""Long-lived LLM provider set for worker processes.
+
+Building a `FallbackLLMProvider` configures the Gemini client, pings Ollama
+and may load a multi-gigabyte GGUF model. Doing that once per task made the
+set-up cost of every task larger than most generations. `ProviderManager`
+keeps one warm provider chain per process instead:
+
+- `get()` returns the warm chain; the first call (or `warm()`) builds it
+- the chain is rebuilt only when its configuration fingerprint changes or a
+  caller reports that the whole chain failed (`mark_failed`)
+- a background thread re-checks the fingerprint and provider health, and
+  puts the chain back on its primary provider once that recovers, so one
+  transient Gemini error does not pin the worker to the fallback for good
+- calls into providers that are not `concurrent_safe` (an in-process
+  llama.cpp model) are serialized on a per-provider lock (`serialized`), so
+  worker threads sharing the chain never overlap inside one model
+
+Environment:
+    LLM_PROVIDER_REUSE=1             Set to 0 to build a fresh chain per task
+    LLM_PROVIDER_HEALTH_INTERVAL=60  Seconds between background health checks
+    LLM_PROVIDER_REBUILD_BACKOFF=30  Minimum seconds between rebuild attempts
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Optional
+
+LOG = logging.getLogger("provider_manager")
+
+# Settings that change which providers the chain contains or how they are built
+FINGERPRINT_CONFIG_FIELDS = (
+    "GEMINI_API_KEY",
+    "GEMINI_MODEL",
+    "LOCAL_LLM_MODEL",
+    "PREFER_LOCAL_LLM",
+    "LOCAL_LLM_GPU_LAYERS",
+    "LLM_ROUTER",
+    "OLLAMA_HOST",
+    "OLLAMA_MODEL",
+)
+FINGERPRINT_ENV_VARS = (
+    "LLM_PROVIDER",
+    "LLM_STRICT_GEMINI",
+    "OLLAMA_HOST",
+    "OLLAMA_MODEL",
+    "OLLAMA_DISABLE",
+    "OLLAMA_KEEP_ALIVE",
+    "LOCAL_LLM_CONTEXT",
+    "LOCAL_LLM_THREADS",
+    "LOCAL_LLM_PREFIX_CACHE_MB",
+)
+
+
+def config_fingerprint(cfg) -> str:
+    """Hash the settings a provider chain was built from.
+
+    A replaced GGUF file counts as a change too, so a model swapped in place
+    is picked up without restarting the worker.
+    """
+    parts = [f"{name}={getattr(cfg, name, '')}" for name in FINGERPRINT_CONFIG_FIELDS]
+    parts += [f"env:{name}={os.environ.get(name, '')}" for name in FINGERPRINT_ENV_VARS]
+    model_path = os.path.expanduser(str(getattr(cfg, "LOCAL_LLM_MODEL", "") or ""))
+    if model_path:
+        try:
+            stat = os.stat(model_path)
+            parts.append(f"model:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append("model:missing")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# ==========================================================================
+# Call serialization
+# ==========================================================================
+
+_CALL_LOCKS_GUARD = threading.Lock()
+
+
+def provider_lock(provider) -> threading.Lock:
+    """The lock every caller must hold while calling `provider` (one per instance)."""
+    lock = getattr(provider, "_call_lock", None)
+    if lock is None:
+        with _CALL_LOCKS_GUARD:
+            lock = getattr(provider, "_call_lock", None)
+            if lock is None:
+                lock = threading.Lock()
+                provider._call_lock = lock
+    return lock
+
+
+def serialized(provider):
+    """Context manager that holds the provider's call lock unless it is `concurrent_safe`."""
+    if provider is None or getattr(provider, "concurrent_safe", True):
+        return nullcontext()
+    return provider_lock(provider)
+
+
+class TaskProvider:
+    """A shared provider seen by one task.
+
+    Passes the task's `task_type` with every call instead of setting it on the
+    shared instance, and serializes calls when the provider is not
+    `concurrent_safe`. Other attributes are read from the wrapped provider.
+    """
+
+    def __init__(self, provider, task_type: str):
+        self.provider = provider
+        self.task_type = task_type
+
+    def generate_content(self, prompt: str, **kwargs) -> Any:
+        with serialized(self.provider):
+            if hasattr(self.provider, "task_type"):
+                return self.provider.generate_content(prompt, task_type=self.task_type, **kwargs)
+            return self.provider.generate_content(prompt, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.provider, name)
+
+
+class ProviderManager:
+    """
+    One warm provider chain shared by every task in a worker process.
+
+    Args:
+        config_factory: Returns the current Config (re-read for fingerprinting)
+        factory: Builds a provider chain from a Config (default: main.create_llm_provider)
+        logger: Logger passed to the factory
+        health_interval: Seconds between background checks (0 disables the thread)
+        rebuild_backoff: Minimum seconds between rebuild attempts after a failure
+    """
+
+    def __init__(
+        self,
+        config_factory: Callable[[], Any],
+        factory: Optional[Callable[[Any, logging.Logger], Any]] = None,
+        logger: Optional[logging.Logger] = None,
+        health_interval: Optional[float] = None,
+        rebuild_backoff: Optional[float] = None,
+    ):
+        if factory is None:
+            from main import create_llm_provider
+
+            factory = create_llm_provider
+        self.config_factory = config_factory
+        self.factory = factory
+        self.logger = logger or LOG
+        self.health_interval = (
+            float(os.environ.get("LLM_PROVIDER_HEALTH_INTERVAL", "60")) if health_interval is None else health_interval
+        )
+        self.rebuild_backoff = (
+            float(os.environ.get("LLM_PROVIDER_REBUILD_BACKOFF", "30")) if rebuild_backoff is None else rebuild_backoff
+        )
+
+        self._provider = None
+        self._fingerprint: Optional[str] = None
+        self._stale = False
+        self._last_build = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Any] = {
+            "warmups": 0,
+            "warmup_seconds": 0.0,
+            "last_warmup_seconds": 0.0,
+            "reuses": 0,
+            "config_reloads": 0,
+            "failure_reloads": 0,
+            "build_failures": 0,
+            "health_checks": 0,
+            "health_failures": 0,
+            "primary_restores": 0,
+        }
+
+    # ==========================================================================
+    # Provider access
+    # ==========================================================================
+
+    @property
+    def provider(self):
+        """The current chain without building one (None until warmed)."""
+        return self._provider
+
+    def warm(self):
+        """Build the chain now (e.g. at worker start-up) and start health checks."""
+        provider = self.get()
+        self.start()
+        return provider
+
+    def get(self):
+        """Return the warm provider chain, building it when missing or stale."""
+        provider = self._provider
+        if provider is not None and not self._stale:
+            with self._lock:
+                self.stats["reuses"] += 1
+            return provider
+
+        with self._lock:
+            # Another thread may have rebuilt while we waited for the lock
+            if self._provider is not None and not self._stale:
+                self.stats["reuses"] += 1
+                return self._provider
+            if self._last_build and time.monotonic() - self._last_build < self.rebuild_backoff:
+                # Recently failed to build; keep serving what we have rather than thrash
+                return self._provider
+            return self._build()
+
+    def mark_failed(self, provider, error: Optional[Exception] = None) -> None:
+        """Report that `provider` could not serve a call with any of its backends."""
+        with self._lock:
+            if provider is None or provider is not self._provider or self._stale:
+                return
+            self._stale = True
+            self.stats["failure_reloads"] += 1
+        self.logger.warning("[PROVIDERS] Provider chain failed (%s); rebuilding on next use", error)
+
+    def _build(self):
+        """Create a new chain (caller holds the lock)."""
+        cfg = self.config_factory()
+        fingerprint = config_fingerprint(cfg)
+        start = time.perf_counter()
+        self._last_build = time.monotonic()
+        try:
+            provider = self.factory(cfg, self.logger)
+        except Exception as e:
+            self.logger.error("[PROVIDERS] Could not build provider chain: %s", e)
+            provider = None
+        elapsed = time.perf_counter() - start
+
+        if provider is None:
+            self.stats["build_failures"] += 1
+            # Keep the previous chain (it may still partly work) until a build succeeds
+            return self._provider
+
+        self._provider = provider
+        self._fingerprint = fingerprint
+        self._stale = False
+        self._last_build = 0.0
+        self.stats["warmups"] += 1
+        self.stats["warmup_seconds"] += elapsed
+        self.stats["last_warmup_seconds"] = elapsed
+        self.logger.info("[PROVIDERS] %s warm in %.2fs", getattr(provider, "name", "provider"), elapsed)
+        return provider
+
+    # ==========================================================================
+    # Background health checks
+    # ==========================================================================
+
+    def check(self) -> bool:
+        """Run one health check; returns True if the chain can serve calls."""
+        with self._lock:
+            self.stats["health_checks"] += 1
+        provider = self._provider
+        if provider is None:
+            return False
+
+        try:
+            if config_fingerprint(self.config_factory()) != self._fingerprint:
+                with self._lock:
+                    if not self._stale:
+                        self._stale = True
+                        self.stats["config_reloads"] += 1
+                self.logger.info("[PROVIDERS] LLM configuration changed; rebuilding provider chain")
+                # Rebuild here so the next task does not pay for the warm-up
+                with self._lock:
+                    self._last_build = 0.0
+                    self._build()
+                return self._provider is not None
+        except Exception as e:
+            self.logger.debug("[PROVIDERS] Fingerprint check failed: %s", e)
+
+        try:
+            health = getattr(provider, "health_check", None)
+            healthy = bool(health()) if callable(health) else bool(getattr(provider, "is_available", True))
+            restore = getattr(provider, "restore_primary", None)
+            if healthy and callable(restore) and restore():
+                with self._lock:
+                    self.stats["primary_restores"] += 1
+        except Exception as e:
+            self.logger.debug("[PROVIDERS] Health check raised: %s", e)
+            healthy = False
+
+        if not healthy:
+            with self._lock:
+                self.stats["health_failures"] += 1
+            self.mark_failed(provider, RuntimeError("health check failed"))
+        return healthy
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            self.check()
+
+    def start(self) -> None:
+        """Start the background health-check thread (idempotent)."""
+        if self.health_interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="provider-health", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop health checks and release the chain."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        provider, self._provider = self._provider, None
+        close = getattr(provider, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                self.logger.debug("[PROVIDERS] Closing provider failed: %s", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["provider"] = getattr(self._provider, "name", None)
+        stats["fingerprint"] = self._fingerprint
+        return stats
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""Cross-process token-bucket rate limiter for shared API quotas.
+
+The daemon, task executor, LLM worker and Discord bot all draw on one Gemini
+quota. Each caller acquires from two token buckets stored in SQLite
+(`rate_limit_buckets`), so every process on the host sees the same budget:
+
+- requests per minute (RPM): one token per call
+- tokens per minute (TPM): the estimated prompt + completion tokens, settled
+  against the real usage once the response arrives
+
+Priority classes are implemented as reserved headroom: a `batch` caller may
+only draw while 30% of each bucket stays free, `normal` keeps 10% and
+`interactive` may drain the buckets completely. When the quota is tight,
+interactive requests therefore go first and batch research waits.
+
+A 429 from the API (`report_quota_error`) empties and blocks the buckets for
+every process instead of letting each one discover the limit separately.
+
+Environment:
+    GEMINI_RPM=10                Requests per minute shared by all processes
+    GEMINI_TPM=250000            Tokens per minute shared by all processes
+    GEMINI_RATE_LIMITER=1        Set to 0 to disable the shared limiter
+    LLM_PRIORITY=normal          Default priority class of this process
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+LOG = logging.getLogger("rate_limiter")
+
+PRIORITY_RESERVE = {"interactive": 0.0, "normal": 0.1, "batch": 0.3}
+
+# Longest single sleep while waiting, so freed capacity is noticed promptly
+MAX_POLL_SECONDS = 5.0
+
+_default_priority = os.environ.get("LLM_PRIORITY", "normal").lower()
+
+
+def set_default_priority(priority: str) -> None:
+    """Set the priority class used by this process when callers don't pass one."""
+    global _default_priority
+    if priority not in PRIORITY_RESERVE:
+        raise ValueError(f"Unknown priority '{priority}' (expected one of {sorted(PRIORITY_RESERVE)})")
+    _default_priority = priority
+
+
+def get_default_priority() -> str:
+    return _default_priority if _default_priority in PRIORITY_RESERVE else "normal"
+
+
+# Errors that mean the shared quota itself is exhausted (not transient overload)
+QUOTA_EXHAUSTED_PATTERNS = ("429", "quota", "rate limit", "too many requests", "resource exhausted")
+
+
+def is_quota_error(error: Exception) -> bool:
+    text = str(error).lower()
+    return any(p in text for p in QUOTA_EXHAUSTED_PATTERNS)
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int = 1024) -> int:
+    """Rough token estimate (~4 characters per token) plus the expected completion."""
+    return len(prompt or "") // 4 + max_output_tokens
+
+
+class RateLimitTimeout(RuntimeError):
+    """Raised when a caller could not acquire quota within its timeout."""
+
+
+class TokenBucketLimiter:
+    """
+    RPM + TPM token buckets shared through the Syndicate SQLite database.
+
+    Args:
+        name: Bucket prefix (one quota, e.g. "gemini")
+        rpm: Requests per minute
+        tpm: Tokens per minute (0 disables the token bucket)
+        db: DatabaseManager (defaults to get_db())
+        burst: Requests that may be made back to back (default: rpm, a full minute)
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int = 0, db=None, burst: Optional[int] = None):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.burst = burst or rpm
+        self._db = db
+        self.stats = {"acquired": 0, "waited_s": 0.0, "timeouts": 0, "quota_errors": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        if self._db is None:
+            from db_manager import get_db
+
+            return get_db()
+        return self._db
+
+    @property
+    def rpm_bucket(self) -> str:
+        return f"{self.name}:rpm"
+
+    @property
+    def tpm_bucket(self) -> str:
+        return f"{self.name}:tpm"
+
+    def _requests(self, tokens: int) -> dict:
+        requests = {self.rpm_bucket: (float(self.burst), self.rpm / 60.0, 1.0)}
+        if self.tpm > 0:
+            requests[self.tpm_bucket] = (float(self.tpm), self.tpm / 60.0, float(tokens))
+        return requests
+
+    def try_acquire(self, tokens: int = 0, priority: Optional[str] = None) -> float:
+        """Take quota without blocking. Returns 0.0 on success, else seconds to wait."""
+        reserve = PRIORITY_RESERVE.get(priority or get_default_priority(), PRIORITY_RESERVE["normal"])
+        return self.db.acquire_rate_tokens(self._requests(tokens), reserve=reserve)
+
+    def acquire(self, tokens: int = 0, priority: Optional[str] = None, timeout: Optional[float] = None) -> float:
+        """
+        Block until one request and `tokens` tokens are available.
+
+        Args:
+            tokens: Estimated tokens for the call (see estimate_tokens)
+            priority: interactive, normal or batch (default: process default)
+            timeout: Give up after this many seconds (None = wait indefinitely)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If the quota did not free up within `timeout`
+        """
+        priority = priority or get_default_priority()
+        start = time.monotonic()
+        while True:
+            wait = self.try_acquire(tokens, priority)
+            waited = time.monotonic() - start
+            if wait <= 0:
+                with self._lock:
+                    self.stats["acquired"] += 1
+                    self.stats["waited_s"] += waited
+                if waited >= 1.0:
+                    LOG.info("[RATE] %s %s request waited %.1fs for quota", self.name, priority, waited)
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                with self._lock:
+                    self.stats["timeouts"] += 1
+                raise RateLimitTimeout(f"{self.name} quota unavailable for {wait:.1f}s (priority={priority})")
+            time.sleep(min(wait, MAX_POLL_SECONDS))
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the TPM bucket once the real token usage is known."""
+        if self.tpm <= 0 or not actual_tokens or actual_tokens == estimated_tokens:
+            return
+        try:
+            self.db.adjust_rate_tokens(self.tpm_bucket, float(estimated_tokens - actual_tokens))
+        except Exception as e:
+            LOG.debug("Could not settle token usage: %s", e)
+
+    def report_quota_error(self, retry_after: float = 60.0) -> None:
+        """Block the quota for every process after the API rejected a call."""
+        with self._lock:
+            self.stats["quota_errors"] += 1
+        try:
+            self.db.block_rate_bucket(self.rpm_bucket, retry_after)
+            if self.tpm > 0:
+                self.db.block_rate_bucket(self.tpm_bucket, retry_after)
+            LOG.warning("[RATE] %s quota exhausted; all callers paused for %.0fs", self.name, retry_after)
+        except Exception as e:
+            LOG.debug("Could not record quota error: %s", e)
+
+
+# ==========================================
+# GEMINI QUOTA
+# ==========================================
+
+_gemini_limiter: Optional[TokenBucketLimiter] = None
+_gemini_lock = threading.Lock()
+
+
+def get_gemini_limiter() -> Optional[TokenBucketLimiter]:
+    """Process-wide limiter for the shared Gemini quota (None if disabled)."""
+    global _gemini_limiter
+    if os.environ.get("GEMINI_RATE_LIMITER", "1").lower() in ("0", "false", "no"):
+        return None
+    with _gemini_lock:
+        if _gemini_limiter is None:
+            _gemini_limiter = TokenBucketLimiter(
+                "gemini",
+                rpm=int(os.environ.get("GEMINI_RPM", "10")),
+                tpm=int(os.environ.get("GEMINI_TPM", "250000")),
+            )
+        return _gemini_limiter
+
+
+# ==========================================
+# NOTION QUOTA
+# ==========================================
+
+_notion_limiter: Optional[TokenBucketLimiter] = None
+_notion_lock = threading.Lock()
+
+
+def get_notion_limiter() -> Optional[TokenBucketLimiter]:
+    """
+    Process-wide limiter for the Notion API (None if disabled).
+
+    Notion allows ~3 requests/s per integration. The burst is kept below the
+    server's so requests bunched up in transit are not answered with 429.
+    """
+    global _notion_limiter
+    if os.environ.get("NOTION_RATE_LIMITER", "1").lower() in ("0", "false", "no"):
+        return None
+    with _notion_lock:
+        if _notion_limiter is None:
+            rps = float(os.environ.get("NOTION_RPS", "3"))
+            _notion_limiter = TokenBucketLimiter(
+                "notion", rpm=max(1, int(rps * 60)), burst=int(os.environ.get("NOTION_BURST", "2"))
+            )
+        return _notion_limiter
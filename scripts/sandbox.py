@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""Supervised worker subprocesses with hard wall-clock and memory limits.
+
+Task handlers run blocking third-party code (yfinance, local LLM
+generation). A hung call on a thread can never be stopped: it pins the
+thread until the process exits. In sandbox mode each task runs instead in
+a pre-started worker process that the parent supervises:
+
+- wall-clock limit: a worker that has not answered by the deadline is
+  killed and the call raises SandboxTimeout;
+- memory limit: the worker's resident set size is sampled while it runs
+  (Linux /proc) and the worker is killed above the limit
+  (SandboxMemoryExceeded); a worker still above the limit once its task
+  returns is retired instead of being reused;
+- crashes (segfault, OOM killer) raise SandboxCrashed instead of hanging;
+- recycling: healthy workers are retired after `max_tasks` tasks, so slow
+  memory creep in handlers and libraries cannot accumulate across days.
+
+Workers are started with the "spawn" method (safe in a multi-threaded
+parent) and reused. A worker builds its runner once, with `factory()` in
+the child, and then serves calls. Killed or retired workers are replaced
+on demand.
+
+Workers do not build an LLM provider chain of their own: that would load
+the local GGUF model into every worker, several GB each, far above the
+memory limit. The default runner uses `ParentLLMProvider`, which sends each
+prompt over the worker's pipe; the supervising process answers it with the
+pool's `llm` provider (the executor's warm chain) on a helper thread, so the
+model stays loaded once, in the parent. The wall-clock and memory limits
+keep applying while the call runs: a generation that outlives the task's
+deadline gets the worker killed like any other hang.
+
+Usage:
+    pool = SandboxPool(factory=build_task_runner, size=4, timeout=300, llm=model)
+    pool.start()                      # pre-start the workers (non-blocking)
+    result = pool.run(action)         # raises a SandboxError subclass on kill
+    pool.close()
+
+Environment:
+    EXECUTOR_SANDBOX=0               1 = run task handlers in sandbox workers
+    EXECUTOR_TASK_TIMEOUT=300        Wall-clock limit per task (seconds)
+    EXECUTOR_SANDBOX_MEMORY_MB=1024  Resident memory limit per worker
+    EXECUTOR_SANDBOX_MAX_TASKS=50    Tasks per worker before it is recycled
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from scripts.provider_manager import serialized
+
+LOG = logging.getLogger("sandbox")
+
+SANDBOX_ENABLED = os.getenv("EXECUTOR_SANDBOX", "0").lower() in ("1", "true", "yes")
+TASK_TIMEOUT_SECONDS = float(os.getenv("EXECUTOR_TASK_TIMEOUT", "300"))
+MEMORY_LIMIT_MB = float(os.getenv("EXECUTOR_SANDBOX_MEMORY_MB", "1024"))
+MAX_TASKS_PER_WORKER = int(os.getenv("EXECUTOR_SANDBOX_MAX_TASKS", "50"))
+# Seconds a new worker may take to import modules and build its runner
+START_TIMEOUT_SECONDS = 120.0
+# How often a running task's memory is sampled
+SAMPLE_INTERVAL_SECONDS = 0.25
+
+
+class SandboxError(RuntimeError):
+    """A sandboxed call did not complete normally."""
+
+
+class SandboxTimeout(SandboxError):
+    """The worker exceeded its wall-clock limit and was killed."""
+
+
+class SandboxMemoryExceeded(SandboxError):
+    """The worker exceeded its memory limit and was killed."""
+
+
+class SandboxCrashed(SandboxError):
+    """The worker exited without answering."""
+
+
+class SandboxTaskError(SandboxError):
+    """The task raised inside the worker (the worker itself is healthy)."""
+
+
+# The worker's pipe to its supervisor (set in worker processes only)
+_PARENT_CONN = None
+
+
+class ParentLLMProvider:
+    """LLM provider for sandbox workers: each prompt is answered by the supervising process."""
+
+    name = "Sandbox parent"
+    is_available = True
+
+    def generate_content(self, prompt: str) -> Any:
+        if _PARENT_CONN is None:
+            raise RuntimeError("Not running in a sandbox worker; no supervisor to send LLM calls to")
+        _PARENT_CONN.send(("llm", prompt))
+        kind, payload = _PARENT_CONN.recv()
+        if kind != "llm_ok":
+            raise RuntimeError(payload)
+        return SimpleNamespace(text=payload)
+
+
+def build_task_runner() -> Callable[[Any], Any]:
+    """Default factory: a TaskExecutor built in the worker, running one handler attempt per call."""
+    from main import Config
+    from scripts.insights_engine import InsightsExtractor
+    from scripts.task_executor import TaskExecutor
+
+    logger = logging.getLogger("sandbox.worker")
+    config = Config()
+    model = ParentLLMProvider()
+    executor = TaskExecutor(config, logger, model, InsightsExtractor(config, logger, model), sandbox=False)
+    return executor._execute_once
+
+
+def _worker_main(conn, factory: Callable[[], Callable[[Any], Any]]) -> None:
+    """Child process loop: build the runner, then answer ("run", item) requests until told to stop."""
+    global _PARENT_CONN
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C is handled by the supervising process
+    _PARENT_CONN = conn
+    try:
+        runner = factory()
+    except BaseException as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message[0] == "stop":
+            return
+        try:
+            reply = ("ok", runner(message[1]))
+        except BaseException as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        try:
+            conn.send(reply)
+        except Exception as e:  # e.g. an unpicklable result
+            conn.send(("error", f"Could not return result: {e}"))
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    """Resident memory of a process in MB (None where /proc is unavailable)."""
+    try:
+        with open(f"/proc/{pid}/statm", "rb") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.tasks = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+
+class _LLMCall:
+    """A worker's LLM call, answered on a helper thread so the supervision loop keeps running."""
+
+    def __init__(self, answer: Callable[[str], tuple], prompt: str):
+        self.done = threading.Event()
+        self.reply: Optional[tuple] = None
+        self._answer = answer
+        self._prompt = prompt
+        threading.Thread(target=self._run, name="sandbox-llm", daemon=True).start()
+
+    def _run(self) -> None:
+        self.reply = self._answer(self._prompt)
+        self.done.set()
+
+
+class SandboxPool:
+    """
+    Pool of reusable, supervised worker processes.
+
+    Args:
+        factory: Picklable zero-argument callable run in each worker; returns the runner `fn(item)`
+        size: Max concurrent workers (callers beyond this wait for one to free up)
+        timeout: Default wall-clock limit per call in seconds
+        memory_mb: Resident memory limit per worker (0 disables the check)
+        max_tasks: Calls per worker before it is recycled (0 = never)
+        llm: Provider in this process that answers the workers' ParentLLMProvider calls
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Callable[[Any], Any]] = build_task_runner,
+        size: int = 4,
+        timeout: float = TASK_TIMEOUT_SECONDS,
+        memory_mb: float = MEMORY_LIMIT_MB,
+        max_tasks: int = MAX_TASKS_PER_WORKER,
+        llm: Any = None,
+    ):
+        self.factory = factory
+        self.llm = llm
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_tasks = max_tasks
+        self._ctx = multiprocessing.get_context("spawn")
+        self._cond = threading.Condition()
+        self._idle: List[_Worker] = []
+        self._count = 0  # Live workers, idle or busy (including ones being started)
+        self._closed = False
+        self.stats: Dict[str, int] = {
+            "tasks": 0,
+            "spawned": 0,
+            "recycled": 0,
+            "timeouts": 0,
+            "memory_kills": 0,
+            "crashes": 0,
+            "llm_calls": 0,
+        }
+
+    def _bump(self, key: str) -> None:
+        with self._cond:
+            self.stats[key] += 1
+
+    # ==========================================================================
+    # Worker lifecycle
+    # ==========================================================================
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main, args=(child_conn, self.factory), name="sandbox-worker", daemon=True
+        )
+        process.start()
+        child_conn.close()
+        self._bump("spawned")
+        return _Worker(process, parent_conn)
+
+    def start(self) -> None:
+        """Pre-start workers up to `size`; they finish initializing in the background."""
+        with self._cond:
+            missing = self.size - self._count
+            self._count += max(0, missing)
+        for _ in range(max(0, missing)):
+            worker = self._spawn()
+            with self._cond:
+                self._idle.append(worker)
+                self._cond.notify()
+
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise SandboxError("Sandbox pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+        try:
+            return self._spawn()
+        except Exception:
+            self._discard()
+            raise
+
+    def _release(self, worker: _Worker) -> None:
+        rss = _rss_mb(worker.pid) if self.memory_mb else None
+        if (self.max_tasks and worker.tasks >= self.max_tasks) or (rss is not None and rss > self.memory_mb):
+            self._bump("recycled")
+            self._stop(worker)
+            self._discard()
+            return
+        with self._cond:
+            if self._closed:
+                self._stop(worker)
+                self._count -= 1
+            else:
+                self._idle.append(worker)
+            self._cond.notify()
+
+    def _discard(self) -> None:
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
+
+    def _kill(self, worker: _Worker) -> None:
+        try:
+            worker.process.kill()
+            worker.process.join(5)
+        except Exception:
+            pass
+        worker.conn.close()
+        self._discard()
+
+    @staticmethod
+    def _stop(worker: _Worker) -> None:
+        """Ask a worker to exit; kill it if it does not."""
+        try:
+            worker.conn.send(("stop",))
+            worker.process.join(5)
+        except Exception:
+            pass
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(5)
+        worker.conn.close()
+
+    def close(self) -> None:
+        """Stop idle workers; busy ones are stopped when their call returns."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            self._stop(worker)
+
+    # ==========================================================================
+    # Calls
+    # ==========================================================================
+
+    def _wait_ready(self, worker: _Worker) -> None:
+        if worker.ready:
+            return
+        if not worker.conn.poll(START_TIMEOUT_SECONDS):
+            self._kill(worker)
+            raise SandboxCrashed(f"Worker did not start within {START_TIMEOUT_SECONDS:.0f}s")
+        try:
+            kind, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            kind, payload = "failed", f"exit code {worker.process.exitcode}"
+        if kind != "ready":
+            self._kill(worker)
+            self._bump("crashes")
+            raise SandboxCrashed(f"Worker failed to start: {payload}")
+        worker.ready = True
+
+    @staticmethod
+    def _notify(worker: _Worker, message: tuple) -> None:
+        """Best-effort message to a worker that is about to be killed."""
+        try:
+            worker.conn.send(message)
+        except Exception:
+            pass
+
+    def _answer_llm(self, prompt: str) -> tuple:
+        """Run a worker's LLM call on the pool's provider (runs on an _LLMCall thread)."""
+        if self.llm is None:
+            return ("llm_error", "No LLM provider in the supervising process")
+        self._bump("llm_calls")
+        try:
+            with serialized(self.llm):
+                response = self.llm.generate_content(prompt)
+        except Exception as e:
+            return ("llm_error", f"{type(e).__name__}: {e}")
+        return ("llm_ok", getattr(response, "text", str(response)))
+
+    def run(self, item: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Run the worker's runner on `item` and return its result.
+
+        Raises:
+            SandboxTimeout / SandboxMemoryExceeded / SandboxCrashed: the worker was killed or died
+            SandboxTaskError: the runner raised (the worker is kept)
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._acquire()
+        self._wait_ready(worker)
+
+        self._bump("tasks")
+        worker.tasks += 1
+        deadline = time.monotonic() + timeout
+        llm_call = None  # The worker's pending LLM call, if it is waiting for one
+        try:
+            worker.conn.send(("run", item))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._bump("timeouts")
+                    if llm_call is not None:
+                        # The provider call cannot be interrupted; it finishes (or hangs) on its own thread
+                        self._notify(worker, ("llm_error", "LLM call exceeded the task's wall-clock limit"))
+                    self._kill(worker)
+                    raise SandboxTimeout(f"Task exceeded the {timeout:.0f}s wall-clock limit; worker killed")
+                if llm_call is not None:
+                    if llm_call.done.wait(min(remaining, SAMPLE_INTERVAL_SECONDS)):
+                        worker.conn.send(llm_call.reply)
+                        llm_call = None
+                        continue
+                elif worker.conn.poll(min(remaining, SAMPLE_INTERVAL_SECONDS)):
+                    kind, payload = worker.conn.recv()
+                    if kind == "llm":
+                        llm_call = _LLMCall(self._answer_llm, payload)
+                        continue
+                    break
+                if not worker.process.is_alive():
+                    raise EOFError
+                rss = _rss_mb(worker.pid) if self.memory_mb else None
+                if rss is not None and rss > self.memory_mb:
+                    self._bump("memory_kills")
+                    self._kill(worker)
+                    raise SandboxMemoryExceeded(
+                        f"Worker used {rss:.0f} MB (limit {self.memory_mb:.0f} MB); worker killed"
+                    )
+        except (EOFError, OSError, BrokenPipeError):
+            self._bump("crashes")
+            worker.process.join(1)
+            code = worker.process.exitcode
+            self._kill(worker)
+            raise SandboxCrashed(f"Worker exited unexpectedly (exit code {code})") from None
+
+        self._release(worker)
+        if kind == "error":
+            raise SandboxTaskError(payload)
+        return payload
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Event-driven in-memory scheduler (binary heap of due times).
+
+Replaces "check every second" loops: the scheduler thread sleeps until the
+earliest due job and is woken early when a job is added ahead of it (for
+example when db_manager reports a new or rescheduled action through its
+action listener hook). An idle daemon therefore blocks in one condition
+wait instead of polling, and scheduled work is dispatched within
+milliseconds of its due time.
+
+Jobs are keyed: scheduling an existing key replaces it, so a rescheduled
+action simply moves. Replaced and cancelled jobs are dropped lazily when
+they reach the top of the heap.
+
+Usage:
+    sched = Scheduler()
+    sched.every(3600, run_cycle, key="cycle")
+    sched.call_at(due_epoch, poll, key="action:ACT-1")
+    sched.run(should_stop=lambda: shutdown)   # or sched.start() for a thread
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOG = logging.getLogger("scheduler")
+
+
+@dataclass
+class _Job:
+    key: str
+    fn: Callable[[], Any]
+    due: float  # epoch seconds
+    interval: Optional[float]
+    seq: int
+
+
+class Scheduler:
+    """
+    Heap-based scheduler; all methods are thread-safe.
+
+    Jobs run on the thread calling run() / run_pending(), one at a time, in
+    due order. Times are wall-clock epoch seconds (time.time()), matching the
+    ISO `scheduled_for` timestamps stored in the database.
+    """
+
+    def __init__(self):
+        # Re-entrant so stop()/wake() may be called from a signal handler on the waiting thread
+        self._cond = threading.Condition(threading.RLock())
+        self._heap: List[Tuple[float, int, _Job]] = []
+        self._jobs: Dict[str, _Job] = {}
+        self._seq = itertools.count()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self.stats: Dict[str, Any] = {
+            "dispatched": 0,
+            "errors": 0,
+            "wakeups": 0,
+            "last_lateness_ms": 0.0,
+            "max_lateness_ms": 0.0,
+        }
+
+    # ==========================================================================
+    # Scheduling
+    # ==========================================================================
+
+    def call_at(
+        self,
+        when: float,
+        fn: Callable[[], Any],
+        key: Optional[str] = None,
+        interval: Optional[float] = None,
+        keep_earlier: bool = False,
+    ) -> str:
+        """
+        Run `fn` at epoch time `when` (replacing any job with the same key).
+
+        Args:
+            interval: Repeat every `interval` seconds after each run
+            keep_earlier: Leave an existing job with this key alone if it is already due sooner
+        """
+        seq = next(self._seq)
+        key = key or f"job-{seq}"
+        with self._cond:
+            existing = self._jobs.get(key)
+            if keep_earlier and existing is not None and existing.due <= when:
+                return key
+            job = _Job(key, fn, when, interval, seq)
+            self._jobs[key] = job
+            heapq.heappush(self._heap, (when, seq, job))
+            if self._heap[0][2] is job:
+                self._cond.notify_all()  # new earliest job: the runner must shorten its sleep
+        return key
+
+    def call_later(self, delay: float, fn: Callable[[], Any], key: Optional[str] = None, **kwargs) -> str:
+        return self.call_at(time.time() + max(0.0, delay), fn, key, **kwargs)
+
+    def call_soon(self, fn: Callable[[], Any], key: Optional[str] = None) -> str:
+        """Run `fn` as soon as possible; repeated requests with the same key coalesce."""
+        return self.call_at(time.time(), fn, key, keep_earlier=True)
+
+    def every(
+        self, interval: float, fn: Callable[[], Any], key: Optional[str] = None, first_delay: float = None
+    ) -> str:
+        """Run `fn` every `interval` seconds (first run after `first_delay`, default one interval)."""
+        delay = interval if first_delay is None else first_delay
+        return self.call_later(delay, fn, key, interval=interval)
+
+    def cancel(self, key: str) -> bool:
+        with self._cond:
+            return self._jobs.pop(key, None) is not None
+
+    def __contains__(self, key: str) -> bool:
+        with self._cond:
+            return key in self._jobs
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def next_due(self) -> Optional[float]:
+        """Epoch time of the earliest live job (None if nothing is scheduled)."""
+        with self._cond:
+            self._prune()
+            return self._heap[0][0] if self._heap else None
+
+    def _prune(self):
+        while self._heap:
+            _, seq, job = self._heap[0]
+            if self._jobs.get(job.key) is job and job.seq == seq:
+                return
+            heapq.heappop(self._heap)
+
+    # ==========================================================================
+    # Dispatch
+    # ==========================================================================
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Run every job that is due now; returns how many ran."""
+        ran = 0
+        while True:
+            now_ts = time.time() if now is None else now
+            with self._cond:
+                self._prune()
+                if not self._heap or self._heap[0][0] > now_ts or self._stopped:
+                    return ran
+                _, _, job = heapq.heappop(self._heap)
+                if job.interval is None:
+                    del self._jobs[job.key]
+
+            lateness_ms = max(0.0, (time.time() - job.due) * 1000)
+            self.stats["last_lateness_ms"] = round(lateness_ms, 3)
+            self.stats["max_lateness_ms"] = max(self.stats["max_lateness_ms"], round(lateness_ms, 3))
+            try:
+                job.fn()
+            except Exception as e:
+                self.stats["errors"] += 1
+                LOG.error("Scheduled job %s failed: %s", job.key, e)
+            self.stats["dispatched"] += 1
+            ran += 1
+
+            if job.interval is not None:
+                with self._cond:
+                    if self._jobs.get(job.key) is job:
+                        # Skip missed runs rather than bursting to catch up
+                        due = job.due + job.interval
+                        job.due = due if due > time.time() else time.time() + job.interval
+                        job.seq = next(self._seq)
+                        heapq.heappush(self._heap, (job.due, job.seq, job))
+
+    def run(self, should_stop: Optional[Callable[[], bool]] = None) -> None:
+        """Block, dispatching jobs as they come due, until stop() (or `should_stop()` is true)."""
+        while True:
+            with self._cond:
+                while not self._stopped and not (should_stop and should_stop()):
+                    self._prune()
+                    timeout = None if not self._heap else self._heap[0][0] - time.time()
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                    self.stats["wakeups"] += 1
+                if self._stopped or (should_stop and should_stop()):
+                    return
+            self.run_pending()
+
+    def wake(self) -> None:
+        """Make the runner re-check its stop condition and due jobs now."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def start(self, name: str = "scheduler") -> threading.Thread:
+        """Run the scheduler on a daemon thread."""
+        self._thread = threading.Thread(target=self.run, name=name, daemon=True)
+        self._thread.start()
+        return self._thread
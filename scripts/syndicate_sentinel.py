@@ -2,14 +2,22 @@
 """
 Syndicate Sentinel - Autonomous Infrastructure Watchdog
 Protects the Syndicate VM from service failures, stuck tasks, and reboots.
+
+Several sentinels may run against the same database (e.g. a cron copy next
+to the service); only the holder of the `sentinel` lease acts, so services
+are not restarted twice and tasks are not reset concurrently.
 """
 
 import logging
 import os
 import sqlite3
 import subprocess
+import sys
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 # Configuration
 SERVICES = ["syndicate-daemon.service", "syndicate-executor.service", "syndicate-discord.service"]
@@ -17,6 +25,8 @@ SERVICES = ["syndicate-daemon.service", "syndicate-executor.service", "syndicate
 DB_PATH = os.path.expanduser("~/syndicate/data/syndicate.db")
 CHECK_INTERVAL_SEC = 60
 STUCK_TASK_MINUTES = 60
+# Lease survives two missed cycles before a standby sentinel takes over
+LEASE_TTL_SEC = 3 * CHECK_INTERVAL_SEC
 
 # Logging setup
 logging.basicConfig(
@@ -96,15 +106,36 @@ def health_check():
         logger.debug(f"Resource monitor failed: {e}")
 
 
+def _sentinel_lease():
+    """Lease shared by sentinels on this database (None: no database yet, act unconditionally)."""
+    if not os.path.exists(DB_PATH):
+        return None
+    try:
+        from db_manager import DatabaseManager
+        from scripts.leases import Lease
+
+        return Lease("sentinel", ttl=LEASE_TTL_SEC, renew=False, db=DatabaseManager(Path(DB_PATH)))
+    except Exception as e:
+        logger.warning(f"Lease support unavailable, running unguarded: {e}")
+        return None
+
+
 def main():
     logger.info("=== Syndicate Sentinel Activated ===")
     logger.info(f"Monitoring: {', '.join(SERVICES)}")
+    lease = _sentinel_lease()
 
     while True:
         try:
-            health_check()
+            # Re-acquiring a held lease extends it, so the active sentinel keeps it every cycle
+            if lease is not None and not lease.acquire():
+                logger.info("Another sentinel holds the lease; standing by.")
+            else:
+                health_check()
         except KeyboardInterrupt:
             logger.info("Sentinel shutting down.")
+            if lease is not None:
+                lease.release()
             break
         except Exception as e:
             logger.error(f"Sentinel loop error: {e}")
@@ -32,14 +32,21 @@ Original Description:
 Executes action insights extracted from reports before the next analysis cycle.
 Transforms the system from passive "showing" to active "doing".
 
-PERSISTENCE MODE: Tasks are executed until completion. On quota errors,
-the executor waits and retries. All completed research is published to Notion.
+PERSISTENCE MODE: Tasks are executed until completion. On quota errors the
+task is rescheduled (release_action with a backoff delay) instead of sleeping,
+and picked up again once the delay has passed. All completed research is
+published to Notion.
+
+Tasks run on the asyncio ExecutionEngine (scripts/execution_engine.py): each
+handler declares the resources it uses (LLM, network, CPU) and every resource
+class has its own concurrency limit.
 """
 
 import json
 import logging
 import re
 import sys
+import threading
 import time
 import os
 from dataclasses import dataclass
@@ -52,6 +59,10 @@ from time import perf_counter
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from scripts.execution_engine import ExecutionEngine, uses_resources
+from scripts.market_data import get_market_data
+from scripts.sandbox import SANDBOX_ENABLED, SandboxError, SandboxPool, SandboxTaskError
+
 try:
     import yfinance as yf
 except ImportError:
@@ -87,6 +98,8 @@ except Exception:
 MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
 INITIAL_BACKOFF_SECONDS = int(os.getenv("LLM_INITIAL_BACKOFF", "30"))
 MAX_BACKOFF_SECONDS = int(os.getenv("LLM_MAX_BACKOFF", "600"))  # 10 minutes max wait
+# Tasks killed by the sandbox (timeout, memory, crash) are requeued this many times, then failed
+RUNAWAY_MAX_REQUEUES = int(os.getenv("EXECUTOR_RUNAWAY_MAX_REQUEUES", "2"))
 QUOTA_ERROR_PATTERNS = [
     "quota",
     "rate limit",
@@ -114,6 +127,7 @@ class TaskResult:
     error_message: Optional[str] = None
     artifacts: List[str] = None  # File paths created
     retries: int = 0
+    deferred: bool = False  # Rescheduled after a quota error (not a failure)
 
     def __post_init__(self):
         if self.artifacts is None:
@@ -132,7 +146,13 @@ class TaskExecutor:
     Publishes completed research to Notion automatically.
     """
 
-    def __init__(self, config, logger: logging.Logger, model=None, insights_extractor=None):
+    def __init__(self, config, logger: logging.Logger, model=None, insights_extractor=None, sandbox=None):
+        """
+        Args:
+            sandbox: SandboxPool to run handlers in supervised worker processes with
+                     hard time/memory limits; True builds the default pool, False or
+                     None runs handlers on the calling thread (None: EXECUTOR_SANDBOX decides)
+        """
         self.config = config
         self.logger = logger
         self.model = model
@@ -170,6 +190,19 @@ class TaskExecutor:
         except Exception:
             self._metrics = None
 
+        # Per-resource concurrency limits and quota blocks (see scripts/execution_engine.py)
+        self.engine = ExecutionEngine()
+        self._stats_lock = threading.Lock()
+
+        # Optional process sandbox with enforced wall-clock/memory limits (see scripts/sandbox.py)
+        if sandbox is None:
+            sandbox = SANDBOX_ENABLED
+        if sandbox is True:
+            # Workers send their LLM calls back to this process's model (see scripts/sandbox.py)
+            sandbox = SandboxPool(size=int(os.getenv("EXECUTOR_SLOTS", "4")), llm=model)
+            sandbox.start()
+        self.sandbox: Optional[SandboxPool] = sandbox or None
+
         # Notion publisher (lazy loaded)
         self._notion_publisher = None
         # If no model provided, try to initialize the real Ollama provider for local task execution
@@ -208,90 +241,18 @@ class TaskExecutor:
         error_lower = str(error_msg).lower()
         return any(pattern in error_lower for pattern in QUOTA_ERROR_PATTERNS)
 
-    def _wait_for_quota(self, retry_count: int) -> int:
-        """Calculate and wait for quota reset. Returns seconds waited."""
+    def _quota_backoff(self, retry_count: int) -> int:
+        """Backoff for a quota error; also pauses every process sharing the Gemini quota."""
         backoff = min(INITIAL_BACKOFF_SECONDS * (2 ** retry_count), MAX_BACKOFF_SECONDS)
-        self.logger.warning(
-            f"[EXECUTOR] Quota limit hit. Waiting {backoff}s before next retry (retry {retry_count + 1}/{'∞' if MAX_RETRIES < 0 else MAX_RETRIES})..."
-        )
-        print(f"[EXECUTOR] ⏳ Waiting {backoff}s for API quota reset (retry {retry_count + 1}/{'∞' if MAX_RETRIES < 0 else MAX_RETRIES})...")
-        time.sleep(backoff)
-        return backoff
-
-    def _execute_with_retry(self, action, handler: Callable) -> TaskResult:
-        """Execute a task with retry logic for quota errors.
-
-        - Uses env var LLM_MAX_RETRIES to control max retries (default 3)
-        - If LLM_MAX_RETRIES < 0, retries indefinitely for quota errors with exponential backoff
-        - Non-quota errors return failure immediately
-        """
-        last_error = None
-
-        retry = 0
-        while True:
-            try:
-                result = handler(action)
-
-                if result.success:
-                    result.retries = retry
-                    return result
-
-                # Check if failure is due to quota
-                if result.error_message and self._is_quota_error(result.error_message):
-                    if MAX_RETRIES < 0 or retry < MAX_RETRIES:
-                        backoff = self._wait_for_quota(retry)
-                        self.stats["retried"] += 1
-                        retry += 1
-                        # Persist retry and release task to pending with scheduled delay so others don't immediately grab it
-                        try:
-                            from db_manager import get_db
-
-                            db = get_db()
-                            db.increment_retry_count(action.action_id, result.error_message)
-                            db.release_action(action.action_id, reason=f"quota_retry_{retry}", delay_seconds=backoff)
-                        except Exception:
-                            pass
-                        continue
-
-                # Non-quota error, return failure
-                result.retries = retry
-                return result
-
-            except Exception as e:
-                last_error = str(e)
-                if self._is_quota_error(last_error):
-                    if MAX_RETRIES < 0 or retry < MAX_RETRIES:
-                        backoff = self._wait_for_quota(retry)
-                        self.stats["retried"] += 1
-                        retry += 1
-                        try:
-                            from db_manager import get_db
-
-                            db = get_db()
-                            db.increment_retry_count(action.action_id, last_error)
-                            db.release_action(action.action_id, reason=f"quota_exception_{retry}", delay_seconds=backoff)
-                        except Exception:
-                            pass
-                        continue
-
-                return TaskResult(
-                    action_id=action.action_id,
-                    success=False,
-                    result_data=None,
-                    execution_time_ms=0,
-                    error_message=last_error,
-                    retries=retry,
-                )
+        try:
+            from scripts.rate_limiter import get_gemini_limiter
 
-        # All retries exhausted
-        return TaskResult(
-            action_id=action.action_id,
-            success=False,
-            result_data=None,
-            execution_time_ms=0,
-            error_message=f"Max retries ({MAX_RETRIES}) exceeded. Last error: {last_error}",
-            retries=MAX_RETRIES,
-        )
+            limiter = get_gemini_limiter()
+            if limiter is not None:
+                limiter.report_quota_error(retry_after=backoff)
+        except Exception:
+            pass
+        return backoff
 
     def _publish_to_notion(self, filepath: str, doc_type: str = "research") -> bool:
         """Publish a completed research file to Notion.
@@ -317,13 +278,268 @@ class TaskExecutor:
             self.logger.warning(f"[EXECUTOR] Failed to publish to Notion: {e}")
         return False
 
+    # ==========================================
+    # RESOURCE-AWARE EXECUTION
+    # ==========================================
+
+    def _llm_resource(self) -> str:
+        """Resource class of the configured model: one local model, or the shared cloud quota."""
+        name = str(getattr(self.model, "name", "")).lower()
+        if not getattr(self.model, "concurrent_safe", True) or name.startswith(("ollama", "local")):
+            return "local_llm"
+        return "gemini"
+
+    def _resources_for(self, action) -> List[str]:
+        """Resources the action's handler declared (see uses_resources)."""
+        handler = self.handlers.get(action.action_type)
+        declared = getattr(handler, "resources", None) or ("cpu",)
+        return [self._llm_resource() if r == "llm" else r for r in declared]
+
+    def _reschedule(self, action, error_message: str, retry: int) -> TaskResult:
+        """Put a quota-limited action back in the queue with a backoff instead of sleeping."""
+        backoff = self._quota_backoff(retry)
+        self.engine.block(self._llm_resource(), backoff)
+        with self._stats_lock:
+            self.stats["retried"] += 1
+        self.logger.warning(
+            f"[EXECUTOR] Quota limit hit for {action.action_id}; rescheduled in {backoff}s "
+            f"(retry {retry + 1}/{'∞' if MAX_RETRIES < 0 else MAX_RETRIES})"
+        )
+        try:
+            from db_manager import get_db
+
+            db = get_db()
+            db.increment_retry_count(action.action_id, error_message)
+            db.release_action(action.action_id, reason=f"quota_retry_{retry + 1}", delay_seconds=backoff)
+        except Exception:
+            pass
+        action.retry_count = retry + 1
+        action.scheduled_for = datetime.fromtimestamp(time.time() + backoff).isoformat()
+        return TaskResult(
+            action_id=action.action_id,
+            success=False,
+            result_data={"rescheduled_in_s": backoff},
+            execution_time_ms=0,
+            error_message=error_message,
+            retries=retry + 1,
+            deferred=True,
+        )
+
+    def _can_retry(self, action) -> bool:
+        retry = getattr(action, "retry_count", 0) or 0
+        return MAX_RETRIES < 0 or retry < MAX_RETRIES
+
+    def _execute_once(self, action) -> TaskResult:
+        """Run the handler once; quota errors are rescheduled rather than waited out."""
+        handler = self.handlers[action.action_type]
+        retry = getattr(action, "retry_count", 0) or 0
+        try:
+            result = handler(action)
+        except Exception as e:
+            result = TaskResult(
+                action_id=action.action_id, success=False, result_data=None, execution_time_ms=0, error_message=str(e)
+            )
+
+        if not result.success and result.error_message and self._is_quota_error(result.error_message):
+            if self._can_retry(action):
+                return self._reschedule(action, result.error_message, retry)
+            result.error_message = f"Max retries ({MAX_RETRIES}) exceeded. Last error: {result.error_message}"
+        result.retries = retry
+        return result
+
+    def _run_action(self, action, timeout: Optional[float] = None) -> TaskResult:
+        """One handler attempt: in a sandbox worker when configured, else on this thread."""
+        if self.sandbox is None:
+            return self._execute_once(action)
+        return self._execute_sandboxed(action, timeout)
+
+    def _execute_sandboxed(self, action, timeout: Optional[float] = None) -> TaskResult:
+        """Run the handler in a supervised worker; runaway tasks are killed and requeued."""
+        start = perf_counter()
+        try:
+            result = self.sandbox.run(action, timeout)
+        except SandboxTaskError as e:
+            result = TaskResult(
+                action_id=action.action_id, success=False, result_data=None, execution_time_ms=0, error_message=str(e)
+            )
+        except SandboxError as e:
+            return self._requeue_runaway(action, str(e), (perf_counter() - start) * 1000)
+
+        if result.deferred and self._is_quota_error(result.error_message or ""):
+            # The worker reported the quota error to the shared limiter; also stop this engine's LLM slots
+            delay = (result.result_data or {}).get("rescheduled_in_s", INITIAL_BACKOFF_SECONDS)
+            self.engine.block(self._llm_resource(), delay)
+        return result
+
+    def _requeue_runaway(self, action, reason: str, elapsed_ms: float) -> TaskResult:
+        """Put a killed task back in the queue with the reason, or fail it after repeated kills."""
+        retry = getattr(action, "retry_count", 0) or 0
+        self.logger.warning(f"[EXECUTOR] {action.action_id} killed: {reason}")
+        if retry >= RUNAWAY_MAX_REQUEUES:
+            return TaskResult(
+                action_id=action.action_id,
+                success=False,
+                result_data=None,
+                execution_time_ms=elapsed_ms,
+                error_message=f"Killed {retry + 1} times; giving up. Last: {reason}",
+                retries=retry,
+            )
+
+        delay = min(INITIAL_BACKOFF_SECONDS * (2**retry), MAX_BACKOFF_SECONDS)
+        try:
+            from db_manager import get_db
+
+            db = get_db()
+            db.increment_retry_count(action.action_id, reason)
+            db.release_action(action.action_id, reason=f"sandbox_killed: {reason}", delay_seconds=delay)
+        except Exception as e:
+            # Not requeued: report a failure so the lease expiry / retry path picks the action up again
+            self.logger.error(f"[EXECUTOR] Could not requeue killed task {action.action_id}: {e}", exc_info=True)
+            return TaskResult(
+                action_id=action.action_id,
+                success=False,
+                result_data=None,
+                execution_time_ms=elapsed_ms,
+                error_message=f"{reason}; requeue failed: {e}",
+                retries=retry,
+            )
+        with self._stats_lock:
+            self.stats["retried"] += 1
+        action.retry_count = retry + 1
+        action.scheduled_for = datetime.fromtimestamp(time.time() + delay).isoformat()
+        return TaskResult(
+            action_id=action.action_id,
+            success=False,
+            result_data={"rescheduled_in_s": delay},
+            execution_time_ms=elapsed_ms,
+            error_message=reason,
+            retries=retry + 1,
+            deferred=True,
+        )
+
+    def _defer_blocked(self, action, wait_seconds: float) -> TaskResult:
+        """Called by the engine when the action's resource is blocked by an earlier quota error."""
+        retry = getattr(action, "retry_count", 0) or 0
+        delay = max(1, int(wait_seconds + 0.5))
+        try:
+            from db_manager import get_db
+
+            get_db().release_action(action.action_id, reason="quota_blocked", delay_seconds=delay)
+        except Exception:
+            pass
+        action.scheduled_for = datetime.fromtimestamp(time.time() + delay).isoformat()
+        return TaskResult(
+            action_id=action.action_id,
+            success=False,
+            result_data={"rescheduled_in_s": delay},
+            execution_time_ms=0,
+            error_message="Resource quota blocked",
+            retries=retry,
+            deferred=True,
+        )
+
+    def _finalize_result(self, action, result: TaskResult) -> None:
+        """Record a finished action: stats, extractor state, Notion artifacts and DB status."""
+        if result.deferred:
+            # Back to pending; the DB row was already released with its delay
+            action.status = "pending"
+            return
+
+        with self._stats_lock:
+            self.stats["total_executed"] += 1
+            self.stats["total_time_ms"] += result.execution_time_ms
+            self.stats["successful" if result.success else "failed"] += 1
+        if self._metrics:
+            try:
+                self._metrics.executor_tasks_total.inc()
+                self._metrics.executor_task_duration_seconds.observe(result.execution_time_ms / 1000.0)
+                if result.success:
+                    self._metrics.executor_tasks_succeeded.inc()
+                else:
+                    self._metrics.executor_tasks_failed.inc()
+            except Exception:
+                pass
+
+        if result.success:
+            try:
+                self.insights_extractor.mark_action_complete(
+                    action.action_id,
+                    json.dumps(result.result_data) if isinstance(result.result_data, dict) else str(result.result_data),
+                )
+            except Exception:
+                pass
+
+            # Publish artifacts (best-effort)
+            for artifact_path in result.artifacts or []:
+                try:
+                    if artifact_path.endswith(".md"):
+                        self._publish_to_notion(artifact_path, doc_type="research")
+                    elif artifact_path.endswith(".json"):
+                        self._convert_and_publish_json(artifact_path)
+                except Exception:
+                    self.logger.debug(f"Failed to publish artifact: {artifact_path}")
+        else:
+            try:
+                self.insights_extractor.mark_action_failed(action.action_id, result.error_message)
+            except Exception:
+                pass
+
+        # Persist status and execution log to DB if available
+        try:
+            from db_manager import get_db
+
+            db = get_db()
+            status = "completed" if result.success else "failed"
+            db.update_action_status(
+                action.action_id, status, str(result.result_data) if result.result_data else result.error_message
+            )
+            db.log_task_execution(
+                action.action_id,
+                success=result.success,
+                result_data=str(result.result_data) if result.result_data else None,
+                execution_time_ms=result.execution_time_ms,
+                error_message=result.error_message,
+                artifacts=";".join(result.artifacts) if result.artifacts else None,
+            )
+        except Exception:
+            pass
+
+    def execute_action(self, action) -> TaskResult:
+        """
+        Execute one already-claimed action on the calling thread.
+
+        Used by callers that manage their own workers (the executor daemon's
+        slots). Resource limits are shared with concurrent execute_all_pending
+        batches of the same executor.
+        """
+        if action.action_type not in self.handlers:
+            result = TaskResult(
+                action_id=action.action_id,
+                success=False,
+                result_data=None,
+                execution_time_ms=0,
+                error_message=f"Unknown action type: {action.action_type}",
+            )
+        else:
+            action.status = "in_progress"
+            result = self.engine.execute(
+                action, self._run_action, self._resources_for(action), defer=self._defer_blocked
+            )
+        self._finalize_result(action, result)
+        return result
+
     def execute_all_pending(self, max_tasks: int = None, timeout_per_task: int = 300) -> List[TaskResult]:
         """
         Execute ALL pending actions until completion.
 
+        Actions run concurrently on the ExecutionEngine, bounded per resource
+        class. Actions hitting a quota are rescheduled (result.deferred) and
+        skipped by later calls until their backoff has passed.
+
         Args:
             max_tasks: Optional limit (None = process ALL tasks)
-            timeout_per_task: Timeout per task in seconds (default 5 min)
+            timeout_per_task: Wall-clock limit per task in seconds (default 5 min); enforced
+                by killing the worker when the executor runs in sandbox mode
 
         Returns list of TaskResults.
         """
@@ -331,11 +547,14 @@ class TaskExecutor:
             self.logger.warning("[EXECUTOR] No insights extractor configured")
             return []
 
-        pending = self.insights_extractor.get_pending_actions()
+        now = datetime.now().isoformat()
+        pending = [
+            a for a in self.insights_extractor.get_pending_actions() if (getattr(a, "scheduled_for", None) or "") <= now
+        ]
         self.logger.info(f"[EXECUTOR] Found {len(pending)} pending tasks")
         console = None
         try:
-            from scripts.console_ui import get_console, progress_context
+            from scripts.console_ui import get_console
 
             console = get_console()
         except Exception:
@@ -343,118 +562,41 @@ class TaskExecutor:
 
         if not pending:
             if console:
-                console.print(f"[cyan]📋 Processing 0 pending tasks[/cyan]")
+                console.print("[cyan]📋 Processing 0 pending tasks[/cyan]")
             else:
-                print(f"[EXECUTOR] 📋 Processing 0 pending tasks...")
+                print("[EXECUTOR] 📋 Processing 0 pending tasks...")
             return []
 
         # Process all tasks unless max_tasks specified
         tasks_to_execute = pending if max_tasks is None else pending[:max_tasks]
         results: List[TaskResult] = []
 
-        # Execute tasks in parallel to improve throughput while respecting retry logic
-        max_workers = min(8, max(2, (len(tasks_to_execute) or 1)))
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
-        # Prepare actions (mark in-progress locally)
+        runnable = []
         for action in tasks_to_execute:
-            action.status = "in_progress"
-
-        with ThreadPoolExecutor(max_workers=max_workers) as ex:
-            future_to_action = {}
-            for action in tasks_to_execute:
-                handler = self.handlers.get(action.action_type)
-                if not handler:
-                    # Create immediate failed result for unknown handlers
-                    res = TaskResult(
+            if action.action_type not in self.handlers:
+                # Immediate failed result for unknown handlers
+                results.append(
+                    TaskResult(
                         action_id=action.action_id,
                         success=False,
                         result_data=None,
                         execution_time_ms=0,
                         error_message=f"Unknown action type: {action.action_type}",
                     )
-                    results.append(res)
-                    continue
-
-                # Submit execution with retry wrapping
-                future = ex.submit(self._execute_with_retry, action, handler)
-                future_to_action[future] = action
-
-            # Collect completed futures
-            for fut in as_completed(future_to_action):
-                action = future_to_action[fut]
-                try:
-                    result: TaskResult = fut.result()
-                except Exception as e:
-                    self.logger.error(f"[EXECUTOR] Exception in worker for {action.action_id}: {e}")
-                    result = TaskResult(action_id=action.action_id, success=False, result_data=None, execution_time_ms=0, error_message=str(e))
-
-                # Update stats and local extractor state
-                results.append(result)
-                self.stats["total_executed"] += 1
-                self.stats["total_time_ms"] += result.execution_time_ms
-                if self._metrics:
-                    try:
-                        self._metrics.executor_tasks_total.inc()
-                        self._metrics.executor_task_duration_seconds.observe(result.execution_time_ms / 1000.0)
-                    except Exception:
-                        pass
-
-                if result.success:
-                    self.stats["successful"] += 1
-                    if self._metrics:
-                        try:
-                            self._metrics.executor_tasks_succeeded.inc()
-                        except Exception:
-                            pass
-                    try:
-                        self.insights_extractor.mark_action_complete(
-                            action.action_id,
-                            json.dumps(result.result_data) if isinstance(result.result_data, dict) else str(result.result_data),
-                        )
-                    except Exception:
-                        pass
-
-                    # Publish artifacts (best-effort)
-                    if result.artifacts:
-                        for artifact_path in result.artifacts:
-                            try:
-                                if artifact_path.endswith(".md"):
-                                    self._publish_to_notion(artifact_path, doc_type="research")
-                                elif artifact_path.endswith(".json"):
-                                    self._convert_and_publish_json(artifact_path)
-                            except Exception:
-                                self.logger.debug(f"Failed to publish artifact: {artifact_path}")
-                else:
-                    self.stats["failed"] += 1
-                    if self._metrics:
-                        try:
-                            self._metrics.executor_tasks_failed.inc()
-                        except Exception:
-                            pass
-                    try:
-                        self.insights_extractor.mark_action_failed(action.action_id, result.error_message)
-                    except Exception:
-                        pass
-
-                # Persist status and execution log to DB if available
-                try:
-                    from db_manager import get_db
-
-                    db = get_db()
-                    # Map success/failure to DB status
-                    status = "completed" if result.success else "failed"
-                    db.update_action_status(action.action_id, status, str(result.result_data) if result.result_data else result.error_message)
-                    db.log_task_execution(
-                        action.action_id,
-                        success=result.success,
-                        result_data=str(result.result_data) if result.result_data else None,
-                        execution_time_ms=result.execution_time_ms,
-                        error_message=result.error_message,
-                        artifacts=";".join(result.artifacts) if result.artifacts else None,
-                    )
-                except Exception:
-                    pass
+                )
+                continue
+            action.status = "in_progress"
+            runnable.append(action)
+
+        results.extend(
+            self.engine.run(
+                runnable,
+                lambda action: self._run_action(action, timeout_per_task),
+                self._resources_for,
+                defer=self._defer_blocked,
+                on_result=self._finalize_result,
+            )
+        )
 
         self._log_summary(results)
         return results
@@ -493,10 +635,8 @@ class TaskExecutor:
             return False
 
     def _execute_single(self, action, timeout: int) -> TaskResult:
-        """Execute a single action (legacy method, use _execute_with_retry instead)."""
-        handler = self.handlers.get(action.action_type)
-
-        if not handler:
+        """Execute a single action (legacy method); quota errors are rescheduled, as in _execute_once."""
+        if action.action_type not in self.handlers:
             return TaskResult(
                 action_id=action.action_id,
                 success=False,
@@ -505,12 +645,13 @@ class TaskExecutor:
                 error_message=f"Unknown action type: {action.action_type}",
             )
 
-        return self._execute_with_retry(action, handler)
+        return self._execute_once(action)
 
     # ==========================================
     # TASK HANDLERS
     # ==========================================
 
+    @uses_resources("llm")
     def _handle_research(self, action) -> TaskResult:
         """Handle research tasks using AI."""
         self.logger.info(f"[EXECUTOR] Researching: {action.title}")
@@ -614,6 +755,7 @@ Be specific and data-driven. Target 300-500 words."""
                 action_id=action.action_id, success=False, result_data=None, execution_time_ms=0, error_message=str(e)
             )
 
+    @uses_resources("network")
     def _handle_data_fetch(self, action) -> TaskResult:
         """Handle data fetching tasks."""
         self.logger.info(f"[EXECUTOR] Fetching data: {action.title}")
@@ -630,41 +772,55 @@ Be specific and data-driven. Target 300-500 words."""
                 "Recommend checking: https://www.cftc.gov/MarketReports/CommitmentsofTraders/index.htm"
             )
 
-        # Check for ETF flow data
-        if "etf" in combined or "flow" in combined or "gld" in combined or "slv" in combined:
-            if yf:
+        wants_etf = any(k in combined for k in ("etf", "flow", "gld", "slv"))
+        wants_yield = any(k in combined for k in ("yield", "treasury", "10y", "10-year"))
+        wants_dxy = "dxy" in combined or "dollar" in combined
+        wants_gold = any(k in combined for k in ("gold", "gc=f", "spot gold"))
+
+        market = get_market_data()
+        if market.available:
+            # One batched, cached lookup for every symbol this action needs
+            symbols = [
+                sym
+                for sym, wanted in (
+                    ("GLD", wants_etf),
+                    ("SLV", wants_etf),
+                    ("^TNX", wants_yield),
+                    ("DX-Y.NYB", wants_dxy),
+                    ("GC=F", wants_gold),
+                )
+                if wanted
+            ]
+            # _histories keeps per-symbol fetch errors, recorded below as *_error fields
+            frames, errors = market._histories(symbols, "5d", "1d", None) if symbols else ({}, {})
+
+            def fetched(symbol: str):
+                """The symbol's frame (None if it came back empty); raises its fetch error."""
+                if symbol in errors:
+                    raise errors[symbol]
+                return frames.get(symbol)
+
+            # Check for ETF flow data
+            if wants_etf:
                 try:
-                    # Get GLD and SLV data
-                    gld = yf.Ticker("GLD")
-                    slv = yf.Ticker("SLV")
-
-                    gld_info = gld.info
-                    slv_info = slv.info
-
-                    result_data["etf_data"] = {
-                        "GLD": {
-                            "price": gld_info.get("regularMarketPrice"),
-                            "volume": gld_info.get("regularMarketVolume"),
-                            "avg_volume": gld_info.get("averageVolume"),
-                            "total_assets": gld_info.get("totalAssets"),
-                        },
-                        "SLV": {
-                            "price": slv_info.get("regularMarketPrice"),
-                            "volume": slv_info.get("regularMarketVolume"),
-                            "avg_volume": slv_info.get("averageVolume"),
-                            "total_assets": slv_info.get("totalAssets"),
-                        },
-                    }
+                    etf_data = {}
+                    for symbol in ("GLD", "SLV"):
+                        info = market.info(symbol)
+                        etf_data[symbol] = {
+                            "price": info.get("regularMarketPrice"),
+                            "volume": info.get("regularMarketVolume"),
+                            "avg_volume": info.get("averageVolume"),
+                            "total_assets": info.get("totalAssets"),
+                        }
+                    result_data["etf_data"] = etf_data
                 except Exception as e:
                     result_data["etf_error"] = str(e)
 
-        # Check for yield/treasury data
-        if "yield" in combined or "treasury" in combined or "10y" in combined or "10-year" in combined:
-            if yf:
+            # Check for yield/treasury data
+            if wants_yield:
                 try:
-                    tnx = yf.Ticker("^TNX")
-                    hist = tnx.history(period="5d")
-                    if not hist.empty:
+                    hist = fetched("^TNX")
+                    if hist is not None:
                         result_data["yield_10y"] = {
                             "current": float(hist["Close"].iloc[-1]),
                             "previous": float(hist["Close"].iloc[-2]) if len(hist) > 1 else None,
@@ -673,13 +829,11 @@ Be specific and data-driven. Target 300-500 words."""
                 except Exception as e:
                     result_data["yield_error"] = str(e)
 
-        # Check for DXY data
-        if "dxy" in combined or "dollar" in combined:
-            if yf:
+            # Check for DXY data
+            if wants_dxy:
                 try:
-                    dxy = yf.Ticker("DX-Y.NYB")
-                    hist = dxy.history(period="5d")
-                    if not hist.empty:
+                    hist = fetched("DX-Y.NYB")
+                    if hist is not None:
                         result_data["dxy"] = {
                             "current": float(hist["Close"].iloc[-1]),
                             "previous": float(hist["Close"].iloc[-2]) if len(hist) > 1 else None,
@@ -687,13 +841,11 @@ Be specific and data-driven. Target 300-500 words."""
                 except Exception as e:
                     result_data["dxy_error"] = str(e)
 
-        # Check for gold price requests explicitly
-        if "gold" in combined or "gold price" in combined or "gc=f" in combined or "spot gold" in combined:
-            if yf:
+            # Check for gold price requests explicitly
+            if wants_gold:
                 try:
-                    gc = yf.Ticker("GC=F")
-                    hist = gc.history(period="5d")
-                    if not hist.empty:
+                    hist = fetched("GC=F")
+                    if hist is not None:
                         result_data.setdefault("gold", {})
                         result_data["gold"]["current"] = float(hist["Close"].iloc[-1])
                         result_data["gold"]["previous"] = float(hist["Close"].iloc[-2]) if len(hist) > 1 else None
@@ -728,6 +880,7 @@ Be specific and data-driven. Target 300-500 words."""
             error_message="Could not determine what data to fetch",
         )
 
+    @uses_resources("network", "llm")
     def _handle_news_scan(self, action) -> TaskResult:
         """Handle news scanning tasks."""
         self.logger.info(f"[EXECUTOR] Scanning news: {action.title}")
@@ -846,6 +999,7 @@ Provide structured analysis:
             execution_time_ms=0,
         )
 
+    @uses_resources("network", "cpu")
     def _handle_calculation(self, action) -> TaskResult:
         """Handle calculation tasks."""
         self.logger.info(f"[EXECUTOR] Calculating: {action.title}")
@@ -856,9 +1010,9 @@ Provide structured analysis:
         # Position sizing calculation
         if "position" in combined and "size" in combined or "sizing" in combined:
             # Get current ATR from gold
-            if yf:
+            if get_market_data().available:
                 try:
-                    gc = yf.download("GC=F", period="20d", progress=False)
+                    gc = get_market_data().history("GC=F", period="20d")
                     if not gc.empty:
                         # Calculate ATR
                         high = gc["High"]
@@ -935,10 +1089,9 @@ Provide structured analysis:
         # Baseline / scenario recalculation fallback
         if "baseline" in combined or "recalculat" in combined or "scenario" in combined:
             # Attempt a simple baseline correction using recent gold closes
-            if yf:
+            if get_market_data().available:
                 try:
-                    gc = yf.Ticker("GC=F")
-                    hist = gc.history(period="5d")
+                    hist = get_market_data().history("GC=F", period="5d")
                     if not hist.empty:
                         current = float(hist["Close"].iloc[-1])
                         previous = float(hist["Close"].iloc[-2]) if len(hist) > 1 else None
@@ -981,6 +1134,7 @@ Provide structured analysis:
             error_message="Could not determine calculation type",
         )
 
+    @uses_resources("network")
     def _handle_monitoring(self, action) -> TaskResult:
         """Handle monitoring tasks - set up alerts/tracking."""
         self.logger.info(f"[EXECUTOR] Setting up monitoring: {action.title}")
@@ -1006,6 +1160,13 @@ Provide structured analysis:
             except ValueError:
                 continue
 
+        # Annotate levels with the latest gold price (this cycle's cached data, refetched once stale)
+        quote = get_market_data().cached_quote("GC=F")
+        if quote:
+            monitoring_config["current_price"] = quote["price"]
+            for level in monitoring_config["levels_to_watch"]:
+                level["distance_pct"] = round((level["price"] - quote["price"]) / quote["price"] * 100, 2)
+
         # Extract condition keywords
         combined = f"{action.title} {action.description}".lower()
 
@@ -1033,6 +1194,7 @@ Provide structured analysis:
             artifacts=[str(filepath)],
         )
 
+    @uses_resources("llm")
     def _handle_code_task(self, action) -> TaskResult:
         """Handle code generation/analysis tasks."""
         self.logger.info(f"[EXECUTOR] Code task: {action.title}")
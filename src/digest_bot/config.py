@@ -100,15 +100,20 @@ class LLMConfig:
     local_gpu_layers: int = field(default_factory=lambda: _env_int("LOCAL_LLM_GPU_LAYERS", 0))
     local_context: int = field(default_factory=lambda: _env_int("LOCAL_LLM_CONTEXT", 4096))
     local_threads: int = field(default_factory=lambda: _env_int("LOCAL_LLM_THREADS", 0))
+    # KV-state cache for shared prompt prefixes (0 disables)
+    local_prefix_cache_mb: int = field(default_factory=lambda: _env_int("LOCAL_LLM_PREFIX_CACHE_MB", 512))
 
     # Ollama settings
     ollama_host: str = field(default_factory=lambda: _env("OLLAMA_HOST", "http://localhost:11434"))
     ollama_model: str = field(default_factory=lambda: _env("OLLAMA_MODEL", "mistral"))
     ollama_timeout: float = field(default_factory=lambda: _env_float("OLLAMA_TIMEOUT", 20.0))
+    ollama_keep_alive: str = field(default_factory=lambda: _env("OLLAMA_KEEP_ALIVE", "30m"))
+    ollama_max_concurrency: int = field(default_factory=lambda: _env_int("OLLAMA_MAX_CONCURRENCY", 2))
 
     # Gemini settings (cloud primary provider)
     gemini_model: str = field(default_factory=lambda: _env("GEMINI_MODEL", "models/gemini-pro-latest"))
-    gemini_rate_limit_sec: int = field(default_factory=lambda: _env_int("GEMINI_RATE_LIMIT_SEC", 60))
+    # Extra per-instance interval on top of the shared GEMINI_RPM/GEMINI_TPM buckets (0 = none)
+    gemini_rate_limit_sec: int = field(default_factory=lambda: _env_int("GEMINI_RATE_LIMIT_SEC", 0))
 
     # Generation settings
     max_tokens: int = field(default_factory=lambda: _env_int("LLM_MAX_TOKENS", 768))
@@ -181,6 +186,9 @@ class GateConfig:
     # Enable fuzzy file matching
     fuzzy_matching: bool = field(default_factory=lambda: _env_bool("FUZZY_MATCHING", True))
 
+    # Characters of related history (full-text search over past journals/reports) added to the digest prompt; 0 = off
+    history_context_chars: int = field(default_factory=lambda: _env_int("DIGEST_HISTORY_CONTEXT_CHARS", 0))
+
 
 @dataclass
 class DiscordConfig:
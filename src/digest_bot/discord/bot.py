@@ -968,6 +968,15 @@ def run_discord_bot(config: Optional[Config] = None) -> None:
         print("ERROR: DISCORD_BOT_TOKEN environment variable not set.")
         sys.exit(1)
 
+    # User-facing requests go ahead of batch work on the shared Gemini quota
+    if "LLM_PRIORITY" not in os.environ:
+        try:
+            from scripts.rate_limiter import set_default_priority
+
+            set_default_priority("interactive")
+        except Exception:
+            pass
+
     bot = DigestDiscordBot(config)
     bot.run_forever()
 
@@ -109,10 +109,23 @@ TOPICS YOU DECLINE:
 When asked about system status, refer to the Sentinel for live data.
 When asked about documents, summarize from available context."""
 
+    # Characters of indexed journal/report excerpts included with each question
+    NOTES_MAX_CHARS = 1200
+
     def __init__(self):
         self._llm = None
         self._llm_lock = asyncio.Lock()
 
+    def _retrieve_notes(self, message: str) -> str:
+        """Excerpts of journals, reports and research relevant to the message (full-text index)."""
+        try:
+            from db_manager import get_db
+
+            return get_db().get_document_context(message, max_chars=self.NOTES_MAX_CHARS)
+        except Exception as e:
+            logger.debug(f"Document search unavailable: {e}")
+            return ""
+
     async def _get_llm(self):
         """Lazy-load the LLM provider."""
         if self._llm is None:
@@ -141,6 +154,10 @@ When asked about documents, summarize from available context."""
         if llm is None:
             return "⚠️ Intelligence offline. Try again later."
 
+        # The search (and the first get_db()'s index backfill) is blocking I/O: keep it off the event loop
+        notes = await asyncio.to_thread(self._retrieve_notes, message)
+        notes_block = f"RELEVANT NOTES (excerpts from Syndicate journals and reports):\n{notes}\n" if notes else ""
+
         # Build prompt
         prompt = f"""{self.SYSTEM_PROMPT}
 
@@ -149,16 +166,22 @@ CURRENT CONTEXT:
 - Channel: #{channel_name}
 - Time: {datetime.now().strftime('%Y-%m-%d %H:%M')} UTC+5
 {f'- Additional Context: {context}' if context else ''}
-
+{notes_block}
 USER MESSAGE:
 {message}
 
 YOUR RESPONSE (compact, direct, truthful):"""
 
         try:
-            # Run LLM inference in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, lambda: llm.generate(prompt, max_tokens=500))
+            if hasattr(llm, "agenerate"):
+                # Native async provider (Ollama): pooled connections, no thread hop
+                from src.digest_bot.llm import GenerationConfig
+
+                response = (await llm.agenerate(prompt, GenerationConfig(max_tokens=500))).text
+            else:
+                # Run LLM inference in thread pool to avoid blocking
+                loop = asyncio.get_event_loop()
+                response = await loop.run_in_executor(None, lambda: llm.generate(prompt, max_tokens=500))
 
             # Clean up response
             response = response.strip()
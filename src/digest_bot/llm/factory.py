@@ -53,6 +53,7 @@ def create_provider(provider_type: str = "local", **kwargs) -> LLMProvider:
             n_ctx=kwargs.get("n_ctx", 4096),
             n_threads=kwargs.get("n_threads", 0),
             verbose=kwargs.get("verbose", False),
+            prefix_cache_mb=kwargs.get("prefix_cache_mb", 512),
         )
 
     elif provider_type == "ollama":
@@ -60,13 +61,15 @@ def create_provider(provider_type: str = "local", **kwargs) -> LLMProvider:
             host=kwargs.get("host", "http://localhost:11434"),
             model=kwargs.get("model", "mistral"),
             timeout=kwargs.get("timeout", 120.0),
+            keep_alive=kwargs.get("keep_alive", "30m"),
+            max_concurrency=kwargs.get("max_concurrency", 2),
         )
 
     elif provider_type == "gemini":
         # Gemini is a cloud-first high-quality provider; apply rate limit
         return GeminiProvider(
             model=kwargs.get("model", "models/gemini-pro-latest"),
-            rate_limit_sec=kwargs.get("rate_limit_sec", 60),
+            rate_limit_sec=kwargs.get("rate_limit_sec", 0),
             timeout=kwargs.get("timeout", 20.0),
         )
 
@@ -97,6 +100,7 @@ def create_provider_from_config(config, provider_override: Optional[str] = None)
             n_ctx=llm_config.local_context,
             n_threads=llm_config.local_threads,
             verbose=config.debug,
+            prefix_cache_mb=llm_config.local_prefix_cache_mb,
         )
 
     elif provider_type == "ollama":
@@ -104,6 +108,8 @@ def create_provider_from_config(config, provider_override: Optional[str] = None)
             host=llm_config.ollama_host,
             model=llm_config.ollama_model,
             timeout=llm_config.ollama_timeout,
+            keep_alive=llm_config.ollama_keep_alive,
+            max_concurrency=llm_config.ollama_max_concurrency,
         )
 
     elif provider_type == "gemini":
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
-"""Gemini LLM provider with simple rate-limiting.
+"""Gemini LLM provider with shared rate-limiting.
 
 This provider tries to use the `google.generativeai` (or compat shim)
-GenerativeModel API when available. It enforces a minimum interval
-between requests (rate_limit_sec) to avoid hitting API quotas.
+GenerativeModel API when available. Every request acquires from the
+cross-process Gemini token buckets (scripts/rate_limiter.py, GEMINI_RPM /
+GEMINI_TPM); an optional per-instance minimum interval (rate_limit_sec)
+can be layered on top.
 """
 
 import logging
@@ -22,10 +24,17 @@ class GeminiProvider(LLMProvider):
 
     name = "gemini"
 
-    def __init__(self, model: str = "models/gemini-pro-latest", rate_limit_sec: float = 60.0, timeout: float = 20.0):
+    def __init__(
+        self,
+        model: str = "models/gemini-pro-latest",
+        rate_limit_sec: float = 0.0,
+        timeout: float = 20.0,
+        priority: Optional[str] = None,
+    ):
         super().__init__()
         self._model_name = model
         self.rate_limit = float(rate_limit_sec)
+        self.priority = priority
         self.timeout = float(timeout)
         self._last_call = 0.0
         self._lock = threading.Lock()
@@ -71,8 +80,11 @@ class GeminiProvider(LLMProvider):
         except Exception:
             return False
 
-    def _enforce_rate_limit(self) -> None:
-        """Block until rate-limit window has passed (simple global throttle)."""
+    def _enforce_rate_limit(self, prompt: str = "") -> int:
+        """Block until the shared quota (and optional per-instance interval) allows a call.
+
+        Returns the token estimate charged to the shared TPM bucket.
+        """
         with self._lock:
             now = time.time()
             elapsed = now - self._last_call
@@ -83,6 +95,39 @@ class GeminiProvider(LLMProvider):
             # update last_call timestamp to now (we'll call shortly)
             self._last_call = time.time()
 
+        limiter = self._shared_limiter()
+        if limiter is None:
+            return 0
+        from scripts.rate_limiter import estimate_tokens
+
+        estimate = estimate_tokens(prompt)
+        limiter.acquire(estimate, priority=self.priority)
+        return estimate
+
+    @staticmethod
+    def _shared_limiter():
+        try:
+            from scripts.rate_limiter import get_gemini_limiter
+
+            return get_gemini_limiter()
+        except Exception as e:
+            logger.debug(f"Shared Gemini limiter unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _usage_tokens(resp) -> int:
+        """Total tokens the response reports using (0 when the SDK reports none)."""
+        usage = getattr(resp, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", None)
+        if total:
+            return int(total)
+        try:
+            from scripts.llm_adapters import parse_gemini_usage
+
+            return parse_gemini_usage(resp)[0]
+        except Exception:
+            return 0
+
     def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> LLMResponse:
         if not self._loaded:
             self.load()
@@ -91,7 +136,7 @@ class GeminiProvider(LLMProvider):
             raise ProviderError("Gemini client not initialized", provider=self.name, retryable=True)
 
         # Enforce rate limiting before making call
-        self._enforce_rate_limit()
+        estimate = self._enforce_rate_limit(prompt)
 
         try:
             start = time.time()
@@ -128,9 +173,15 @@ class GeminiProvider(LLMProvider):
 
             elapsed = time.time() - start
 
+            # Return the unused part of the estimate (or charge the overrun) to the shared TPM bucket
+            tokens_used = self._usage_tokens(resp)
+            limiter = self._shared_limiter() if estimate else None
+            if limiter is not None:
+                limiter.settle(estimate, tokens_used)
+
             return LLMResponse(
                 text=text.strip(),
-                tokens_used=0,
+                tokens_used=tokens_used,
                 generation_time=elapsed,
                 model=self._model_name,
                 provider=self.name,
@@ -141,6 +192,12 @@ class GeminiProvider(LLMProvider):
         except Exception as e:
             # If it's a timeout or connectivity issue, surface as retryable inference error
             msg = str(e)
+            limiter = self._shared_limiter()
+            if limiter is not None:
+                from scripts.rate_limiter import is_quota_error
+
+                if is_quota_error(e):
+                    limiter.report_quota_error()
             if "timeout" in msg.lower():
                 raise InferenceError(f"Gemini request timed out: {e}", provider=self.name, retryable=True)
             raise InferenceError(f"Gemini generation failed: {e}", provider=self.name, retryable=True)
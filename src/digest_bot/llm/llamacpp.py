@@ -22,6 +22,7 @@ from .base import (
     ModelNotFoundError,
     ProviderError,
 )
+from .prefix_cache import LlamaSeqState, PrefixKVCache
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,7 @@ class LlamaCppProvider(LLMProvider):
         n_ctx: int = 4096,
         n_threads: int = 0,
         verbose: bool = False,
+        prefix_cache_mb: int = 512,
     ):
         """
         Initialize llama.cpp provider.
@@ -53,6 +55,7 @@ class LlamaCppProvider(LLMProvider):
             n_ctx: Context window size
             n_threads: CPU threads (0=auto)
             verbose: Enable verbose llama.cpp output
+            prefix_cache_mb: Memory cap for cached prompt-prefix KV states (0=disabled)
         """
         super().__init__()
         self.model_path = Path(model_path).expanduser().resolve()
@@ -61,6 +64,7 @@ class LlamaCppProvider(LLMProvider):
         self.n_threads = n_threads
         self.verbose = verbose
         self._llm = None
+        self.prefix_cache = PrefixKVCache(capacity_bytes=prefix_cache_mb * 1024 * 1024) if prefix_cache_mb > 0 else None
 
     def load(self) -> None:
         """Load the GGUF model into memory."""
@@ -137,6 +141,8 @@ class LlamaCppProvider(LLMProvider):
         if self._llm is not None:
             del self._llm
             self._llm = None
+        if self.prefix_cache is not None:
+            self.prefix_cache.clear()
         self._loaded = False
         self._model_name = ""
         logger.info("Model unloaded")
@@ -167,6 +173,8 @@ class LlamaCppProvider(LLMProvider):
 
             logger.debug(f"Generating with max_tokens={config.max_tokens}, temp={config.temperature}")
 
+            reused = self._prepare_prefix(prompt)
+
             response = self._llm(
                 prompt,
                 max_tokens=config.max_tokens,
@@ -193,7 +201,7 @@ class LlamaCppProvider(LLMProvider):
             logger.debug(
                 f"Generation complete: prompt_tokens={prompt_tokens}, "
                 f"completion_tokens={tokens_used}, finish_reason={finish_reason}, "
-                f"text_len={len(text)}"
+                f"text_len={len(text)}, prefix_tokens_reused={reused}"
             )
 
             # Log warning if response seems truncated or empty
@@ -215,6 +223,17 @@ class LlamaCppProvider(LLMProvider):
         except Exception as e:
             raise InferenceError(f"Generation failed: {e}", provider=self.name, retryable=True)
 
+    def _prepare_prefix(self, prompt: str) -> int:
+        """Restore the longest cached KV prefix for `prompt`; returns tokens reused."""
+        if self.prefix_cache is None:
+            return 0
+        try:
+            state = LlamaSeqState(self._llm)
+            return self.prefix_cache.prepare(state, state.tokenize(prompt))
+        except Exception as e:
+            logger.debug(f"Prefix cache unavailable: {e}")
+            return 0
+
     def health_check(self) -> bool:
         """Check if llama.cpp is ready."""
         if not self._loaded:
@@ -239,4 +258,5 @@ class LlamaCppProvider(LLMProvider):
             "context_size": self.n_ctx,
             "gpu_layers": self.n_gpu_layers,
             "threads": self.n_threads,
+            "prefix_cache": self.prefix_cache.get_stats() if self.prefix_cache is not None else None,
         }
@@ -41,6 +41,8 @@ class OllamaProvider(LLMProvider):
         host: str = "http://localhost:11434",
         model: str = "mistral",
         timeout: float = 120.0,
+        keep_alive: str = "30m",
+        max_concurrency: int = 2,
     ):
         """
         Initialize Ollama provider.
@@ -49,12 +51,17 @@ class OllamaProvider(LLMProvider):
             host: Ollama server URL
             model: Model name (must be pulled first)
             timeout: Request timeout in seconds
+            keep_alive: How long Ollama keeps the model loaded between requests
+            max_concurrency: In-flight request limit for the async client
         """
         super().__init__()
         self.host = host.rstrip("/")
         self.model = model
         self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.max_concurrency = max_concurrency
         self._session = None
+        self._async_client = None
 
     def _get_session(self):
         """Get or create HTTP session."""
@@ -160,6 +167,7 @@ class OllamaProvider(LLMProvider):
             "model": self.model,
             "prompt": prompt,
             "stream": False,
+            "keep_alive": self.keep_alive,
             "options": {
                 "num_predict": config.max_tokens,
                 "temperature": config.temperature,
@@ -213,6 +221,34 @@ class OllamaProvider(LLMProvider):
                 )
             raise InferenceError(f"Ollama generation failed: {e}", provider=self.name, retryable=True)
 
+    def _get_async_client(self):
+        """Get or create the pooled async client (shares host/model/keep-alive settings)."""
+        if self._async_client is None:
+            from .ollama_async import AsyncOllamaClient
+
+            self._async_client = AsyncOllamaClient(
+                host=self.host,
+                model=self.model,
+                timeout=self.timeout,
+                keep_alive=self.keep_alive,
+                max_concurrency=self.max_concurrency,
+            )
+        return self._async_client
+
+    async def agenerate(self, prompt: str, config: Optional[GenerationConfig] = None) -> LLMResponse:
+        """Generate without blocking the event loop, over pooled keep-alive connections."""
+        return await self._get_async_client().generate(prompt, config)
+
+    def astream(self, prompt: str, config: Optional[GenerationConfig] = None):
+        """Async iterator of response text chunks."""
+        return self._get_async_client().stream(prompt, config)
+
+    async def aclose(self) -> None:
+        """Close the async client's connection pool."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
     def health_check(self) -> bool:
         """Check if Ollama server is healthy."""
         try:
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  Digest Bot - Async Ollama Client
+#  Copyright (c) 2025 SIRIUS Alpha
+# ══════════════════════════════════════════════════════════════════════════════
+"""
+Asyncio-native Ollama client with a keep-alive connection pool.
+
+- One aiohttp session per client; TCP connections are reused across calls
+- In-flight requests are bounded by `max_concurrency`, which should match the
+  server's OLLAMA_NUM_PARALLEL so extra requests queue here, not in Ollama
+- Every request carries Ollama's `keep_alive`, so the model stays resident
+  between our minute-cycles instead of being unloaded and reloaded cold
+- `stream()` yields text chunks as Ollama produces them
+
+Usage:
+    async with AsyncOllamaClient(model="llama3.2") as client:
+        response = await client.generate("Gold outlook?")
+        async for chunk in client.stream("Explain the DXY"):
+            print(chunk, end="")
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from .base import ConnectionError, GenerationConfig, InferenceError, LLMResponse, ProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """Pooled async HTTP client for the Ollama API."""
+
+    name = "ollama"
+
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        model: str = "mistral",
+        timeout: float = 120.0,
+        keep_alive: str = "30m",
+        max_concurrency: int = 2,
+    ):
+        """
+        Initialize the client (no connection is made until the first request).
+
+        Args:
+            host: Ollama server URL
+            model: Model name (must be pulled first)
+            timeout: Per-request timeout in seconds
+            keep_alive: How long Ollama keeps the model loaded after a request
+                ("30m", "-1" = forever, "0" = unload immediately)
+            max_concurrency: Maximum in-flight requests (match OLLAMA_NUM_PARALLEL)
+        """
+        self.host = host.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.max_concurrency = max(1, max_concurrency)
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    # ==========================================================================
+    # Session management
+    # ==========================================================================
+
+    def _get_session(self):
+        """Get or create the pooled aiohttp session (must be called inside a running loop)."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ProviderError(
+                    "aiohttp library not installed. Install with:\n  pip install aiohttp",
+                    provider=self.name,
+                    retryable=False,
+                )
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Content-Type": "application/json"},
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _payload(self, prompt: str, config: Optional[GenerationConfig], stream: bool) -> Dict:
+        config = config or GenerationConfig()
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {
+                "num_predict": config.max_tokens,
+                "temperature": config.temperature,
+                "top_p": config.top_p,
+                "top_k": config.top_k,
+                "repeat_penalty": config.repeat_penalty,
+            },
+        }
+        if config.stop_sequences:
+            payload["options"]["stop"] = config.stop_sequences
+        return payload
+
+    async def _post(self, endpoint: str, payload: Dict):
+        """POST with the concurrency bound held; returns the open response."""
+        session = self._get_session()
+        await self._semaphore.acquire()
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+        try:
+            response = await session.post(f"{self.host}{endpoint}", data=json.dumps(payload))
+            if response.status >= 400:
+                response.release()
+                response.raise_for_status()
+            return response
+        except Exception:
+            self._release()
+            self.stats["errors"] += 1
+            raise
+
+    def _release(self) -> None:
+        self.stats["in_flight"] -= 1
+        self._semaphore.release()
+
+    # ==========================================================================
+    # API
+    # ==========================================================================
+
+    async def generate(self, prompt: str, config: Optional[GenerationConfig] = None) -> LLMResponse:
+        """Generate a complete response (non-streaming)."""
+        start = time.time()
+        try:
+            response = await self._post("/api/generate", self._payload(prompt, config, stream=False))
+            try:
+                data = await response.json(content_type=None)
+            finally:
+                response.release()
+                self._release()
+        except asyncio.TimeoutError:
+            raise InferenceError(f"Ollama request timed out after {self.timeout}s", provider=self.name, retryable=True)
+        except ProviderError:
+            raise
+        except Exception as e:
+            raise InferenceError(f"Ollama generation failed: {e}", provider=self.name, retryable=True)
+
+        return LLMResponse(
+            text=data.get("response", "").strip(),
+            tokens_used=data.get("eval_count", 0),
+            generation_time=time.time() - start,
+            model=self.model,
+            provider=self.name,
+            finish_reason=data.get("done_reason") or "stop",
+            raw_response=data,
+        )
+
+    async def stream(self, prompt: str, config: Optional[GenerationConfig] = None) -> AsyncIterator[str]:
+        """Yield response text chunks as they are generated."""
+        try:
+            response = await self._post("/api/generate", self._payload(prompt, config, stream=True))
+        except Exception as e:
+            raise InferenceError(f"Ollama stream failed: {e}", provider=self.name, retryable=True)
+        try:
+            # Ollama streams newline-delimited JSON objects
+            async for line in response.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+        finally:
+            response.release()
+            self._release()
+
+    async def generate_many(self, prompts: List[str], config: Optional[GenerationConfig] = None) -> List[LLMResponse]:
+        """Generate several prompts concurrently (bounded by max_concurrency)."""
+        return await asyncio.gather(*(self.generate(p, config) for p in prompts))
+
+    async def chat(self, messages: List[Dict[str, str]], config: Optional[GenerationConfig] = None) -> LLMResponse:
+        """Chat completion with message history."""
+        payload = self._payload("", config, stream=False)
+        payload.pop("prompt")
+        payload["messages"] = messages
+        start = time.time()
+        try:
+            response = await self._post("/api/chat", payload)
+            try:
+                data = await response.json(content_type=None)
+            finally:
+                response.release()
+                self._release()
+        except Exception as e:
+            raise InferenceError(f"Ollama chat failed: {e}", provider=self.name, retryable=True)
+
+        return LLMResponse(
+            text=data.get("message", {}).get("content", "").strip(),
+            tokens_used=data.get("eval_count", 0),
+            generation_time=time.time() - start,
+            model=self.model,
+            provider=self.name,
+            finish_reason=data.get("done_reason") or "stop",
+            raw_response=data,
+        )
+
+    async def warm(self) -> None:
+        """Load the model (an empty prompt loads it without generating) and pin it for keep_alive."""
+        try:
+            response = await self._post("/api/generate", {"model": self.model, "keep_alive": self.keep_alive})
+            response.release()
+            self._release()
+        except Exception as e:
+            raise ConnectionError(f"Cannot warm Ollama model {self.model}: {e}", provider=self.name, retryable=True)
+
+    async def list_models(self) -> List[str]:
+        """List models installed on the server."""
+        session = self._get_session()
+        async with session.get(f"{self.host}/api/tags") as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        return [m.get("name", "") for m in data.get("models", [])]
+
+    async def health_check(self) -> bool:
+        """Check if the Ollama server is reachable."""
+        try:
+            await self.list_models()
+            return True
+        except Exception:
+            return False
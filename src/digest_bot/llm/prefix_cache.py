@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# ══════════════════════════════════════════════════════════════════════════════
+#  Digest Bot - Prompt Prefix KV Cache
+#  Copyright (c) 2025 SIRIUS Alpha
+# ══════════════════════════════════════════════════════════════════════════════
+"""
+Prompt-prefix KV-state cache for llama.cpp.
+
+Most prompts start with a large constant preamble (system prompt, analyst
+instructions, summarizer template). Re-evaluating those tokens dominates
+CPU latency. This cache stores the evaluated KV state of shared prefixes,
+keyed by a hash of the prefix tokens at fixed block boundaries, restores the
+longest cached prefix before generation and lets llama.cpp evaluate only
+the remaining suffix.
+
+Shared prefixes are discovered automatically: when a prompt shares at least
+`min_prefix_tokens` with a recent prompt, the common (block-aligned) prefix is
+snapshotted. Known preambles can also be registered up-front with `warm()`.
+"""
+
+import ctypes
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefixEntry:
+    """A cached KV snapshot for the first `n_tokens` tokens of a prompt."""
+
+    n_tokens: int
+    tokens: Tuple[int, ...]
+    state: bytes
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.state) + 4 * len(self.tokens)
+
+
+class LlamaSeqState:
+    """
+    Adapter exposing the KV operations the cache needs on a llama_cpp.Llama.
+
+    Uses the per-sequence state API (llama_state_seq_*) so snapshots contain
+    only the KV cells of the prefix rather than the whole context.
+    """
+
+    def __init__(self, llama: Any):
+        import llama_cpp
+
+        self._lib = llama_cpp
+        self.llama = llama
+
+    def tokenize(self, text: str) -> List[int]:
+        return self.llama.tokenize(text.encode("utf-8"), special=True)
+
+    def context_tokens(self) -> Sequence[int]:
+        return self.llama.input_ids[: self.llama.n_tokens]
+
+    def _seq_rm(self, p0: int) -> None:
+        lib, ctx = self._lib, self.llama.ctx
+        if hasattr(lib, "llama_get_memory"):
+            lib.llama_memory_seq_rm(lib.llama_get_memory(ctx), 0, p0, -1)
+        elif hasattr(lib, "llama_kv_self_seq_rm"):
+            lib.llama_kv_self_seq_rm(ctx, 0, p0, -1)
+        else:
+            lib.llama_kv_cache_seq_rm(ctx, 0, p0, -1)
+
+    def truncate(self, n_tokens: int) -> None:
+        self._seq_rm(n_tokens)
+        self.llama.n_tokens = n_tokens
+
+    def eval(self, tokens: Sequence[int]) -> None:
+        self.llama.eval(list(tokens))
+
+    def snapshot(self) -> bytes:
+        lib, ctx = self._lib, self.llama.ctx
+        size = lib.llama_state_seq_get_size(ctx, 0)
+        buf = (ctypes.c_uint8 * int(size))()
+        written = lib.llama_state_seq_get_data(ctx, buf, size, 0)
+        return bytes(buf[: int(written)])
+
+    def restore(self, entry: PrefixEntry) -> None:
+        lib, ctx = self._lib, self.llama.ctx
+        self._seq_rm(0)
+        buf = (ctypes.c_uint8 * len(entry.state)).from_buffer_copy(entry.state)
+        if lib.llama_state_seq_set_data(ctx, buf, len(entry.state), 0) == 0:
+            self.llama.n_tokens = 0
+            raise RuntimeError("llama_state_seq_set_data failed")
+        self.llama.input_ids[: entry.n_tokens] = entry.tokens
+        self.llama.n_tokens = entry.n_tokens
+
+
+def _common_prefix(a: Sequence[int], b: Sequence[int]) -> int:
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+class PrefixKVCache:
+    """
+    LRU cache of evaluated prompt prefixes with a memory cap.
+
+    Keys are hashes of the first N tokens, where N is a multiple of
+    `block_size`, so a lookup hashes the prompt once and probes at most
+    len(tokens) / block_size keys, longest first.
+    """
+
+    def __init__(
+        self,
+        capacity_bytes: int = 512 * 1024 * 1024,
+        block_size: int = 32,
+        min_prefix_tokens: int = 64,
+        history: int = 8,
+    ):
+        self.capacity_bytes = capacity_bytes
+        self.block_size = block_size
+        self.min_prefix_tokens = min_prefix_tokens
+        self._entries: "OrderedDict[str, PrefixEntry]" = OrderedDict()
+        self._recent: deque = deque(maxlen=history)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "lookups": 0,
+            "hits": 0,
+            "tokens_reused": 0,
+            "tokens_total": 0,
+            "inserts": 0,
+            "evictions": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Keys and storage
+    # ------------------------------------------------------------------
+
+    def _block_keys(self, tokens: Sequence[int]) -> List[Tuple[int, str]]:
+        """Return (length, key) for every block boundary, shortest first."""
+        h = hashlib.blake2b(digest_size=16)
+        keys = []
+        for end in range(self.block_size, len(tokens) + 1, self.block_size):
+            block = tokens[end - self.block_size : end]
+            h.update(b"".join(int(t).to_bytes(4, "little", signed=True) for t in block))
+            keys.append((end, h.copy().hexdigest()))
+        return keys
+
+    def _key(self, tokens: Sequence[int]) -> Optional[str]:
+        keys = self._block_keys(tokens)
+        return keys[-1][1] if keys and keys[-1][0] == len(tokens) else None
+
+    def lookup(self, tokens: Sequence[int]) -> Optional[PrefixEntry]:
+        """Return the longest cached prefix of `tokens` (and mark it recently used)."""
+        with self._lock:
+            for end, key in reversed(self._block_keys(tokens)):
+                entry = self._entries.get(key)
+                if entry is not None and entry.tokens == tuple(tokens[:end]):
+                    self._entries.move_to_end(key)
+                    return entry
+        return None
+
+    def put(self, tokens: Sequence[int], state: bytes) -> bool:
+        """Store a KV snapshot for a block-aligned token prefix, evicting LRU entries."""
+        key = self._key(tokens)
+        if key is None:
+            return False
+
+        entry = PrefixEntry(n_tokens=len(tokens), tokens=tuple(int(t) for t in tokens), state=state)
+        if entry.size_bytes > self.capacity_bytes:
+            return False
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size_bytes
+            while self._entries and self._bytes + entry.size_bytes > self.capacity_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size_bytes
+                self.stats["evictions"] += 1
+            self._entries[key] = entry
+            self._bytes += entry.size_bytes
+            self.stats["inserts"] += 1
+        return True
+
+    def __contains__(self, tokens: Sequence[int]) -> bool:
+        key = self._key(tokens)
+        return key is not None and key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._recent.clear()
+            self._bytes = 0
+
+    # ------------------------------------------------------------------
+    # Integration with a model context
+    # ------------------------------------------------------------------
+
+    def _shared_boundary(self, tokens: Sequence[int]) -> int:
+        """Longest block-aligned prefix `tokens` shares with a recent prompt."""
+        best = 0
+        for recent in self._recent:
+            best = max(best, _common_prefix(recent, tokens))
+        # Never snapshot the whole prompt - generation needs at least one token to evaluate
+        best = min(best, len(tokens) - 1)
+        return (best // self.block_size) * self.block_size
+
+    def _snapshot_prefix(self, model: Any, tokens: Sequence[int], n_tokens: int, live: int) -> int:
+        """Bring the context to exactly tokens[:n_tokens], snapshot it and return n_tokens."""
+        if live > n_tokens:
+            model.truncate(n_tokens)
+        elif live < n_tokens:
+            model.truncate(live)
+            model.eval(tokens[live:n_tokens])
+        self.put(tokens[:n_tokens], model.snapshot())
+        return n_tokens
+
+    def prepare(self, model: Any, tokens: Sequence[int]) -> int:
+        """
+        Load the best available prefix state into `model` before generation.
+
+        Args:
+            model: Adapter with context_tokens/truncate/eval/snapshot/restore
+            tokens: Full prompt tokens about to be generated from
+
+        Returns:
+            Number of prompt tokens that will not need to be re-evaluated
+        """
+        tokens = list(tokens)
+        self.stats["lookups"] += 1
+        self.stats["tokens_total"] += len(tokens)
+
+        live = _common_prefix(model.context_tokens(), tokens[:-1])
+        entry = self.lookup(tokens[:-1])
+        if entry is not None and entry.n_tokens > live:
+            try:
+                model.restore(entry)
+                live = entry.n_tokens
+                self.stats["hits"] += 1
+            except Exception as e:
+                logger.warning(f"Prefix cache restore failed, evaluating from scratch: {e}")
+                model.truncate(0)
+                live = 0
+
+        boundary = self._shared_boundary(tokens)
+        if boundary >= self.min_prefix_tokens and tokens[:boundary] not in self:
+            try:
+                live = self._snapshot_prefix(model, tokens, boundary, live)
+            except Exception as e:
+                logger.warning(f"Prefix cache snapshot failed: {e}")
+
+        self._recent.append(tuple(tokens))
+        self.stats["tokens_reused"] += live
+        return live
+
+    def warm(self, model: Any, prefix_tokens: Sequence[int]) -> bool:
+        """Evaluate and cache a known preamble ahead of time (block-aligned)."""
+        n = (len(prefix_tokens) // self.block_size) * self.block_size
+        if n < self.min_prefix_tokens or prefix_tokens[:n] in self:
+            return False
+        live = _common_prefix(model.context_tokens(), prefix_tokens[:n])
+        self._snapshot_prefix(model, list(prefix_tokens), n, live)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats.update(entries=len(self._entries), bytes=self._bytes, capacity_bytes=self.capacity_bytes)
+        total = stats["tokens_total"]
+        stats["reuse_ratio"] = round(stats["tokens_reused"] / total, 3) if total else 0.0
+        return stats
@@ -61,7 +61,7 @@ You have access to three documents from the Syndicate analysis system:
 {weekly_content}
 
 ---
-
+{history_section}
 ## Your Task
 
 Synthesize these documents into a **Daily Digest** with the following structure:
@@ -90,6 +90,13 @@ Synthesize these documents into a **Daily Digest** with the following structure:
 Begin your digest now:"""
 
 
+HISTORY_SECTION_TEMPLATE = """## Related History (excerpts from earlier journals and reports)
+{history_content}
+
+---
+"""
+
+
 FALLBACK_PROMPT_TEMPLATE = """Summarize the following market analysis documents into a brief digest.
 
 Pre-Market Analysis:
@@ -221,6 +228,23 @@ def clean_content(content: str) -> str:
     return content.strip()
 
 
+def _search_terms(*docs: Optional[Document], max_chars: int = 400) -> str:
+    """
+    Search text describing today's documents: their headings and bold phrases.
+
+    Used to look up related history; falls back to the opening text when a
+    document has no markup.
+    """
+    parts: List[str] = []
+    for doc in docs:
+        if doc is None or not doc.content:
+            continue
+        content = clean_content(doc.content)
+        marked = re.findall(r"^#+\s+(.+)$", content, flags=re.MULTILINE) + re.findall(r"\*\*(.+?)\*\*", content)
+        parts.append(" ".join(marked) if marked else content[:200])
+    return " ".join(parts)[:max_chars]
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # QUALITY SCORING
 # ══════════════════════════════════════════════════════════════════════════════
@@ -348,6 +372,8 @@ class Summarizer:
         self.config = config or get_config()
         self._provider = provider
         self._provider_loaded = False
+        # Loaded fallback providers, kept warm across generate() calls
+        self._fallback_providers: Dict[str, LLMProvider] = {}
         self.scorer = QualityScorer()
 
     @property
@@ -359,6 +385,24 @@ class Summarizer:
             self._provider_loaded = True  # Already loaded by fallback function
         return self._provider
 
+    def _get_fallback_provider(self, provider_type: str) -> LLMProvider:
+        """Get a loaded fallback provider, creating it on first use only."""
+        provider = self._fallback_providers.get(provider_type)
+        if provider is None or not provider.is_loaded:
+            provider = create_provider_from_config(self.config, provider_override=provider_type)
+            provider.load()
+            self._fallback_providers[provider_type] = provider
+        return provider
+
+    def _drop_fallback_provider(self, provider_type: str) -> None:
+        """Forget a failed fallback provider so the next attempt rebuilds it."""
+        provider = self._fallback_providers.pop(provider_type, None)
+        if provider is not None:
+            try:
+                provider.unload()
+            except Exception as e:
+                logger.debug("Unloading %s failed: %s", provider_type, e)
+
     def _ensure_provider_loaded(self) -> None:
         """Ensure LLM provider is loaded."""
         if not self._provider_loaded:
@@ -389,6 +433,22 @@ class Summarizer:
 
         return content
 
+    def related_context(self, query: str, max_chars: int = 1500, exclude_keys: tuple = ()) -> str:
+        """
+        Excerpts of past journals, reports and research relevant to a query.
+
+        Served by the database's full-text index (BM25 ranked), so it costs
+        milliseconds instead of reading the archive. Returns "" when nothing
+        matches or the database is unavailable.
+        """
+        try:
+            from db_manager import get_db
+
+            return get_db().get_document_context(query, max_chars=max_chars, exclude_keys=exclude_keys)
+        except Exception as e:
+            logger.debug(f"Document search unavailable: {e}")
+            return ""
+
     def build_prompt(
         self,
         status: GateStatus,
@@ -412,12 +472,23 @@ class Summarizer:
         journal_content = self._prepare_document(status.journal_doc, max_tokens=1200)
         weekly_content = self._prepare_document(status.weekly_doc, max_tokens=800)
 
+        history_section = ""
+        if self.config.gate.history_context_chars > 0:
+            history = self.related_context(
+                _search_terms(status.premarket_doc, status.journal_doc),
+                max_chars=self.config.gate.history_context_chars,
+                exclude_keys=(f"journal:{target.isoformat()}",),
+            )
+            if history:
+                history_section = HISTORY_SECTION_TEMPLATE.format(history_content=history)
+
         # Build prompt
         prompt = DIGEST_PROMPT_TEMPLATE.format(
             date=target.isoformat(),
             premarket_content=premarket_content,
             journal_content=journal_content,
             weekly_content=weekly_content,
+            history_section=history_section,
         )
 
         # Prepend system prompt for models that support it
@@ -473,9 +544,7 @@ class Summarizer:
                     if provider_type == primary_type:
                         provider = self.provider
                     else:
-                        # For fallback, create a fresh provider
-                        provider = create_provider_from_config(self.config, provider_override=provider_type)
-                        provider.load()
+                        provider = self._get_fallback_provider(provider_type)
 
                     # Build prompt
                     prompt = self.build_prompt(status, target)
@@ -529,6 +598,8 @@ class Summarizer:
                 except Exception as e:
                     logger.warning("Provider %s failed: %s", provider_type, e)
                     last_error = str(e)
+                    if provider_type != primary_type:
+                        self._drop_fallback_provider(provider_type)
                     continue
 
             # If we reach here, all providers failed or were low quality
@@ -610,10 +681,12 @@ class Summarizer:
             )
 
     def close(self) -> None:
-        """Unload LLM provider."""
+        """Unload LLM providers."""
         if self._provider is not None and self._provider_loaded:
             self._provider.unload()
             self._provider_loaded = False
+        for provider_type in list(self._fallback_providers):
+            self._drop_fallback_provider(provider_type)
 
     def __enter__(self):
         return self
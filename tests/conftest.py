@@ -3,6 +3,8 @@ import types
 import os
 from pathlib import Path
 
+import pytest
+
 # Make test environment hermetic by stubbing heavy optional dependencies
 sys.modules.setdefault('yfinance', types.ModuleType('yfinance'))
 
@@ -102,3 +104,12 @@ try:
 except Exception:
     pass
 
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    """A DatabaseManager on a fresh database file, also returned by get_db() during the test."""
+    from db_manager import get_db
+
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "test.db"))
+    return get_db()
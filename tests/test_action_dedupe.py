@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import db_manager
+from db_manager import action_fingerprint
+
+
+def _pending_ids(db):
+    return sorted(a["action_id"] for a in db.get_pending_actions())
+
+
+def _row(db, action_id):
+    with db._get_connection() as conn:
+        return dict(conn.execute("SELECT * FROM action_insights WHERE action_id = ?", (action_id,)).fetchone())
+
+
+def test_fingerprint_ignores_formatting_but_not_type_or_target():
+    base = action_fingerprint("monitoring", "Monitor: Gold $2,650.00 resistance")
+    assert action_fingerprint("monitoring", "monitor: resistance at gold 2650") == base
+    assert action_fingerprint("research", "Monitor: Gold $2,650.00 resistance") != base
+    assert action_fingerprint("monitoring", "Monitor: Gold $2,700 resistance") != base
+
+
+def test_repeated_extraction_merges_into_open_action(db):
+    db.save_action_insight("ACT-1", "research", "Research: Fed rate path", priority="medium")
+    db.save_action_insight("ACT-2", "research", "research: the Fed rate path", priority="high")
+    db.save_action_insight("ACT-3", "research", "Research: ECB balance sheet")
+
+    assert _pending_ids(db) == ["ACT-1", "ACT-3"]
+    kept = _row(db, "ACT-1")
+    assert kept["priority"] == "high" and kept["dedupe_hits"] == 1
+    stats = db.get_action_stats()
+    assert stats["duplicates_merged"] == 1 and stats["pending"] == 2
+
+    # Re-saving an existing action updates it rather than being treated as a duplicate
+    db.save_action_insight("ACT-1", "research", "Research: Fed rate path", description="updated")
+    assert _row(db, "ACT-1")["description"] == "updated"
+
+
+def test_completed_action_absorbs_duplicates_only_within_window(db):
+    db.save_action_insight("ACT-1", "data_fetch", "Fetch Data: DXY")
+    db.update_action_status("ACT-1", "completed", result="done")
+
+    db.save_action_insight("ACT-2", "data_fetch", "Fetch Data: DXY")
+    assert _pending_ids(db) == []
+
+    tomorrow = (datetime.now() + timedelta(hours=db_manager.ACTION_DEDUPE_WINDOW_HOURS + 1)).isoformat()
+    db.save_action_insight("ACT-3", "data_fetch", "Fetch Data: DXY", created_at=tomorrow)
+    assert _pending_ids(db) == ["ACT-3"]
+
+
+def test_dedupe_window_slides_across_bucket_boundaries(db):
+    window = db_manager.ACTION_DEDUPE_WINDOW_HOURS * 3600
+    boundary = (datetime.now().timestamp() // window + 1) * window
+    before, after = datetime.fromtimestamp(boundary - 3600), datetime.fromtimestamp(boundary + 3600)
+
+    db.save_action_insight("ACT-1", "data_fetch", "Fetch Data: DXY", created_at=before.isoformat())
+    db.update_action_status("ACT-1", "completed", result="done")
+    # Two hours apart but in different fixed buckets: still one action
+    db.save_action_insight("ACT-2", "data_fetch", "Fetch Data: DXY", created_at=after.isoformat())
+    assert _pending_ids(db) == [] and _row(db, "ACT-1")["dedupe_hits"] == 1
+
+    later = before + timedelta(seconds=window, hours=2)
+    db.save_action_insight("ACT-3", "data_fetch", "Fetch Data: DXY", created_at=later.isoformat())
+    assert _pending_ids(db) == ["ACT-3"]
+
+
+def test_concurrent_inserts_of_the_same_action_queue_once(db):
+    barrier = threading.Barrier(6)
+
+    def insert(i):
+        barrier.wait()
+        db.save_action_insight(f"ACT-{i}", "monitoring", "Monitor: silver breakout 32")
+
+    threads = [threading.Thread(target=insert, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(_pending_ids(db)) == 1
+    assert db.get_action_stats()["duplicates_merged"] == 5
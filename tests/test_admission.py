@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.admission import AdmissionController
+
+
+def _action(i, action_type="research", priority="medium"):
+    return {"action_id": f"A-{i}", "action_type": action_type, "title": f"Research: topic {i}", "priority": priority}
+
+
+def _pending(db):
+    return {a["action_id"] for a in db.get_pending_actions()}
+
+
+def test_over_capacity_sheds_low_work_and_urgent_work_evicts(db):
+    ctl = AdmissionController(db, type_limits={"research": 3}, priority_limits={"low": 2}, max_pending=10)
+    result = ctl.enqueue([_action(i, priority="low") for i in range(4)])
+    assert result == {"admitted": 2, "shed": 2, "evicted": 0, "merged": 0}
+
+    ctl.enqueue([_action(10), _action(11)])  # one medium fits the research limit, one is shed
+    assert len(_pending(db)) == 3
+
+    result = ctl.enqueue([_action(20, priority="critical")])
+    assert result["admitted"] == 1 and result["evicted"] == 1
+    assert "A-20" in _pending(db) and len(_pending(db)) == 3
+
+    gauges = ctl.pressure()
+    assert gauges["by_type"]["research"] == {"pending": 3, "limit": 3, "utilization": 1.0}
+    assert gauges["stats"]["shed"] == 3
+
+
+def test_budget_holds_back_llm_work_under_quota_pressure_but_not_urgent(db):
+    for i in range(3):
+        db.save_action_insight(f"R-{i}", "research", f"Research: item {i}")
+        db.save_action_insight(f"F-{i}", "data_fetch", f"Fetch Data: item {i}")
+    db.save_action_insight("R-hot", "research", "Research: urgent", priority="high")
+    ctl = AdmissionController(db)
+
+    ready = db.get_ready_actions(limit=4, budget=ctl.dispatch_budget(4))
+    assert [a["action_id"] for a in ready] == ["R-hot", "R-0", "F-0", "R-1"]
+
+    db.acquire_rate_tokens({"gemini:rpm": (10.0, 10 / 60.0, 1.0)})
+    db.block_rate_bucket("gemini:rpm", 60)
+    assert ctl.llm_pressure()
+    ready = db.get_ready_actions(limit=4, budget=ctl.dispatch_budget(4))
+    assert [a["action_id"] for a in ready] == ["R-hot", "F-0", "F-1"]
+
+
+def test_waiting_actions_age_up_but_never_past_high(db):
+    old = (datetime.now() - timedelta(hours=13)).isoformat()
+    db.save_action_insight("OLD-LOW", "monitoring", "Monitor: old level", priority="low", created_at=old)
+    db.save_action_insight("NEW-MED", "monitoring", "Monitor: new level", priority="medium")
+    db.save_action_insight("NEW-CRIT", "monitoring", "Monitor: breakout", priority="critical")
+
+    ready = db.get_ready_actions(aging_hours=6)
+    assert [a["action_id"] for a in ready] == ["NEW-CRIT", "OLD-LOW", "NEW-MED"]
+    assert ready[1]["dispatch_rank"] == 2
+
+    # An aged action moves up the order but is still held back by a zero budget
+    ready = db.get_ready_actions(budget={"monitoring": 0}, aging_hours=6)
+    assert [a["action_id"] for a in ready] == ["NEW-CRIT"]
+
+
+def test_identical_llm_tasks_are_merged_and_high_priority_claimed_first(db):
+    first = db.add_llm_task("/r/a.md", "", task_type="insights")
+    assert db.add_llm_task("/r/a.md", "", task_type="insights") == first
+    time.sleep(0.01)
+    urgent = db.add_llm_task("/r/b.md", "", priority="high", task_type="insights")
+
+    assert db.get_llm_queue_length() == 2
+    assert db.claim_llm_tasks(limit=1)[0]["id"] == urgent
+
+
+def test_duplicates_merge_at_capacity_without_shedding_or_evicting(db):
+    ctl = AdmissionController(db, type_limits={"research": 2}, max_pending=10)
+    ctl.enqueue([_action(1), _action(2)])
+
+    # The queue is full, but a duplicate takes no room: it is merged, not shed
+    result = ctl.enqueue([{**_action(1), "action_id": "A-1-again", "title": "research: TOPIC 1"}])
+    assert result == {"admitted": 0, "shed": 0, "evicted": 0, "merged": 1}
+
+    # An urgent duplicate escalates the queued row instead of evicting another action
+    result = ctl.enqueue([{**_action(2), "action_id": "A-2-urgent", "priority": "critical"}])
+    assert result == {"admitted": 0, "shed": 0, "evicted": 0, "merged": 1}
+    pending = {a["action_id"]: a["priority"] for a in db.get_pending_actions()}
+    assert pending == {"A-1": "medium", "A-2": "critical"}
+
+    # Duplicates within one call count once against capacity
+    result = ctl.enqueue([_action(3, priority="high"), {**_action(3), "action_id": "A-3-copy"}])
+    assert result == {"admitted": 1, "shed": 0, "evicted": 1, "merged": 1}
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db_manager import DatabaseManager, JournalEntry, Report, fts_query
+from src.digest_bot.config import Config
+from src.digest_bot.file_gate import Document, GateStatus
+from src.digest_bot.summarizer import Summarizer
+
+
+@pytest.fixture
+def db(db):
+    if not db.fts_enabled:
+        pytest.skip("SQLite built without FTS5")
+    return db
+
+
+def _keys(hits):
+    return [h["doc_key"] for h in hits]
+
+
+def test_saved_documents_are_searchable_with_ranking_filters_and_snippets(db, tmp_path):
+    db.save_journal(JournalEntry(date="2026-10-01", content="Gold rallied after the Fed held rates. Silver lagged."))
+    db.save_journal(JournalEntry(date="2026-10-02", content="Quiet session. Copper firm, dollar soft."))
+    db.save_report(Report(report_type="weekly", period="2026-W40", content="Gold holds support as Fed cuts loom."))
+    research = tmp_path / "research_2026-10-03.md"
+    research.write_text("---\nstatus: draft\n---\n# Silver squeeze\nLBMA vault stocks of silver are falling.\n")
+    db.register_document(str(research), "research")
+
+    hits = db.search_documents("What did the Fed do to gold?")
+    assert set(_keys(hits)) == {"journal:2026-10-01", "report:weekly:2026-W40"}
+    assert "**Fed**" in hits[0]["snippet"] and hits[0]["score"] >= hits[1]["score"]
+    assert _keys(db.search_documents("silver", doc_type="research")) == [f"file:{research.resolve()}"]
+    assert db.search_documents("silver", doc_type="research")[0]["title"] == "Silver squeeze"
+    assert _keys(db.search_documents("silver", since="2026-10-02")) == [f"file:{research.resolve()}"]
+    assert db.search_documents("weekly", since="2026-09-28")[0]["doc_date"] == "2026-09-28"
+
+    # Rewrites replace the indexed text, unchanged content is skipped, deletes drop it
+    db.save_journal(JournalEntry(date="2026-10-02", content="Platinum squeezed higher."))
+    assert _keys(db.search_documents("copper")) == []
+    assert _keys(db.search_documents("platinum")) == ["journal:2026-10-02"]
+    assert not db.index_document("journal:2026-10-02", "journal", "Journal 2026-10-02", "Platinum squeezed higher.")
+    db.delete_journal("2026-10-01")
+    assert _keys(db.search_documents("rallied")) == []
+
+
+def test_free_text_queries_are_sanitized():
+    assert fts_query('Is "gold" NEAR(2650) OR the Fed?') == '"gold" OR "near" OR "2650" OR "fed"'
+    assert fts_query("what is the") == ""
+
+
+def test_context_is_prompt_ready_and_existing_rows_are_indexed_on_upgrade(db, tmp_path):
+    db.save_journal(JournalEntry(date="2026-10-01", content="Gold broke resistance at 2650 on heavy volume."))
+    with db._get_connection() as conn:
+        conn.execute("DROP TABLE document_fts")
+        conn.execute("DELETE FROM document_index")
+    with pytest.raises(sqlite3.OperationalError):
+        db.search_documents("gold")
+
+    upgraded = DatabaseManager(db.db_path)
+    assert upgraded.get_document_context("gold resistance?", max_chars=200) == (
+        "[journal 2026-10-01] Journal 2026-10-01: Gold broke resistance at 2650 on heavy volume."
+    )
+    assert upgraded.get_document_context("gold", exclude_keys=("journal:2026-10-01",)) == ""
+    assert upgraded.get_document_context("nothing here") == ""
+
+
+def test_digest_prompt_includes_related_history_when_enabled(db, monkeypatch):
+    db.save_journal(JournalEntry(date="2026-09-15", content="Central bank gold buying accelerated in September."))
+    status = GateStatus(
+        journal_doc=Document(content="# Central bank demand\nGold bid on **central bank buying**.", source="file"),
+    )
+
+    summarizer = Summarizer(Config())
+    assert "Related History" not in summarizer.build_prompt(status, date(2026, 10, 1))
+
+    monkeypatch.setenv("DIGEST_HISTORY_CONTEXT_CHARS", "500")
+    prompt = Summarizer(Config()).build_prompt(status, date(2026, 10, 1))
+    assert "## Related History" in prompt and "Central bank gold buying accelerated" in prompt
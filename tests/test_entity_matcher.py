@@ -0,0 +1,66 @@
+import logging
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.entity_matcher import EntityMatcher
+from scripts.insights_engine import InsightsExtractor
+
+
+def test_whole_words_case_insensitive_with_overlapping_phrases():
+    matcher = EntityMatcher(["Fed", "Federal Reserve", "Reserve", "S&P 500", "Gold"])
+    scan = matcher.scan("The federal reserve met. FED speakers! Fedwire is not the Fed. S&P 500s and s&p 500 rose")
+
+    assert scan.get("Federal Reserve").sentences == [0]
+    assert scan.get("Reserve").sentences == [0]
+    assert scan.get("Fed").sentences == [1, 2] and scan.get("Fed").mentions == 2
+    assert scan.get("S&P 500").mentions == 1 and scan.sentence(scan.get("S&P 500").sentences[0]).endswith("rose")
+    assert scan.get("Gold") is None
+
+
+def test_header_and_bold_context_follow_the_line():
+    matcher = EntityMatcher(["CPI", "GLD"])
+    scan = matcher.scan("## Inflation\nCPI is due ##\nGLD flows **strong**\n**GLD** and more")
+
+    assert scan.get("CPI").in_header and not scan.get("CPI").in_bold
+    assert scan.get("GLD").in_bold and not scan.get("GLD").in_header
+
+
+def _legacy_scan(phrase, text):
+    sentences = re.split(r"[.!?]\s+", text)
+    escaped = re.escape(phrase)
+    return (
+        [i for i, s in enumerate(sentences) if re.search(rf"\b{escaped}\b", s, re.IGNORECASE)],
+        len(re.findall(rf"\b{escaped}\b", text, re.IGNORECASE)),
+        bool(re.search(rf"(?:##.*{escaped}|{escaped}.*##)", text, re.IGNORECASE)),
+        bool(re.search(rf"\*\*.*{escaped}.*\*\*", text, re.IGNORECASE)),
+    )
+
+
+def test_random_documents_match_the_regex_semantics():
+    phrases = ["Fed", "Fed Funds", "ECB", "Gold", "Gold Price", "Old", "S&P 500", "P 5"]
+    tokens = phrases + ["the", "golden", "fed.", "##", "**", "!", "? ", ". ", "\n", "500", "_Gold", "x"]
+    matcher = EntityMatcher(phrases)
+    rng = random.Random(7)
+    for _ in range(300):
+        text = " ".join(rng.choice(tokens) for _ in range(rng.randrange(1, 40)))
+        scan = matcher.scan(text)
+        for phrase in phrases:
+            stats = scan.get(phrase)
+            got = (stats.sentences, stats.mentions, stats.in_header, stats.in_bold) if stats else ([], 0, False, False)
+            assert got == _legacy_scan(phrase, text), (phrase, text)
+
+
+def test_extract_entities_keeps_context_relevance_and_mentions():
+    report = "## Fed Watch\nThe Fed is key. Powell spoke. The FED may cut. **Gold** bid."
+    extractor = InsightsExtractor(None, logging.getLogger("test"))
+    entities = {e.entity_name: e for e in extractor.extract_entities(report, "r")}
+
+    fed = entities["Fed"]
+    assert fed.context == "## Fed Watch\nThe Fed is key"
+    assert fed.metadata["mentions"] == 2
+    assert fed.relevance_score == 0.5 + 0.2 + 0.15 + 0.15
+    assert entities["Gold"].relevance_score == 0.5 + 0.1 + 0.05
@@ -0,0 +1,117 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.execution_engine import ExecutionEngine, uses_resources
+from scripts.insights_engine import ActionInsight
+from scripts.task_executor import TaskExecutor, TaskResult
+
+
+class Tracker:
+    def __init__(self):
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def run(self, kind, seconds):
+        with self.lock:
+            self.active[kind] = self.active.get(kind, 0) + 1
+            self.peak[kind] = max(self.peak.get(kind, 0), self.active[kind])
+        time.sleep(seconds)
+        with self.lock:
+            self.active[kind] -= 1
+
+
+def test_each_resource_has_its_own_limit():
+    engine = ExecutionEngine(limits={"local_llm": 1, "network": 4})
+    tracker = Tracker()
+    items = [("local_llm", 0.05)] * 4 + [("network", 0.05)] * 8
+
+    start = time.perf_counter()
+    results = engine.run(items, lambda it: tracker.run(*it) or it[0], lambda it: [it[0]])
+    elapsed = time.perf_counter() - start
+
+    assert results == [it[0] for it in items]
+    assert tracker.peak == {"local_llm": 1, "network": 4}
+    # LLM work is serialized (4 x 50ms) while network work overlaps it
+    assert elapsed < 0.35
+
+
+def test_blocked_resource_defers_instead_of_running():
+    engine = ExecutionEngine(limits={"gemini": 2})
+    engine.block("gemini", 30)
+    ran, deferred = [], []
+
+    results = engine.run(
+        ["a", "b", "c"],
+        lambda it: ran.append(it) or "ran",
+        lambda it: ["gemini"] if it != "c" else ["cpu"],
+        defer=lambda it, wait: deferred.append((it, round(wait))) or "deferred",
+    )
+
+    assert results == ["deferred", "deferred", "ran"]
+    assert ran == ["c"] and {d[1] for d in deferred} == {30}
+    assert engine.stats["deferred"] == 2
+
+
+@pytest.mark.asyncio
+async def test_run_from_inside_a_running_loop():
+    engine = ExecutionEngine()
+    assert engine.run([1, 2], lambda x: x * 2, lambda x: ["cpu"]) == [2, 4]
+
+
+class Extractor:
+    def __init__(self, actions):
+        self.action_queue = actions
+        self.completed, self.failed = [], []
+
+    def get_pending_actions(self):
+        return [a for a in self.action_queue if a.status == "pending"]
+
+    def mark_action_complete(self, action_id, result=None):
+        self.completed.append(action_id)
+
+    def mark_action_failed(self, action_id, reason=None):
+        self.failed.append(action_id)
+
+
+def test_quota_error_reschedules_without_sleeping(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "exec.db"))
+    monkeypatch.setenv("GEMINI_RATE_LIMITER", "0")
+
+    class Cfg:
+        OUTPUT_DIR = str(tmp_path)
+        OLLAMA_MODEL = "none"
+
+    actions = [ActionInsight(f"Q-{i}", "research", f"Research {i}", "", "high") for i in range(3)]
+    extractor = Extractor(actions)
+    executor = TaskExecutor(Cfg(), logging.getLogger("test"), model=object(), insights_extractor=extractor)
+
+    calls = []
+
+    @uses_resources("llm")
+    def research(action):
+        calls.append(action.action_id)
+        return TaskResult(action.action_id, False, None, 0, error_message="429 Resource exhausted")
+
+    executor.handlers["research"] = research
+    executor.engine.limits["gemini"] = 1
+
+    start = time.perf_counter()
+    results = executor.execute_all_pending()
+    assert time.perf_counter() - start < 5
+
+    # The first call hit the quota; the rest were deferred without calling the API
+    assert len(calls) == 1
+    assert all(r.deferred for r in results)
+    assert extractor.failed == [] and all(a.status == "pending" and a.scheduled_for for a in actions)
+    assert executor.stats["retried"] == 1 and executor.stats["failed"] == 0
+
+    # Rescheduled actions are not picked up again until their backoff has passed
+    assert executor.execute_all_pending() == []
@@ -0,0 +1,110 @@
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db_manager import get_db
+from scripts.executor_daemon import ExecutorDaemon
+from scripts.task_executor import TaskResult
+
+
+def _row(db, action_id):
+    conn = sqlite3.connect(db.db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return dict(conn.execute("SELECT * FROM action_insights WHERE action_id = ?", (action_id,)).fetchone())
+    finally:
+        conn.close()
+
+
+def _expire(db, action_id):
+    conn = sqlite3.connect(db.db_path)
+    past = (datetime.now() - timedelta(seconds=1)).isoformat()
+    conn.execute("UPDATE action_insights SET lease_expires_at = ? WHERE action_id = ?", (past, action_id))
+    conn.commit()
+    conn.close()
+
+
+def test_lease_claim_renew_and_expiry(db):
+    db.save_action_insight("L-1", "research", "Lease me")
+    assert db.claim_action("L-1", worker_id="w1", lease_seconds=30)
+    assert not db.claim_action("L-1", worker_id="w2", lease_seconds=30)
+    row = _row(db, "L-1")
+    assert row["status"] == "in_progress" and row["claimed_by"] == "w1"
+
+    # Only the holder can renew
+    assert db.renew_action_leases("w2", ["L-1"], 30) == 0
+    assert db.renew_action_leases("w1", ["L-1"], 120) == 1
+    assert _row(db, "L-1")["lease_expires_at"] > row["lease_expires_at"]
+    assert db.recover_expired_leases() == []
+
+    # A crashed holder stops renewing: the task is re-queued for other workers
+    _expire(db, "L-1")
+    assert db.recover_expired_leases() == ["L-1"]
+    row = _row(db, "L-1")
+    assert row["status"] == "pending" and row["claimed_by"] is None and row["lease_expires_at"] is None
+    assert db.renew_action_leases("w1", ["L-1"], 30) == 0
+    assert db.claim_action("L-1", worker_id="w2", lease_seconds=30)
+
+
+def test_leased_claims_are_not_reset_by_age(db):
+    db.save_action_insight("L-2", "research", "Long task", created_at="2020-01-01T00:00:00")
+    db.claim_action("L-2", worker_id="w1", lease_seconds=300)
+    assert db.reset_stuck_actions(max_age_hours=1) == 0
+    db.update_action_status("L-2", "completed", "done")
+    assert _row(db, "L-2")["lease_expires_at"] is None
+
+
+class FakeExecutor:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def execute_action(self, action):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.active -= 1
+        get_db().update_action_status(action.action_id, "completed", "ok")
+        return TaskResult(action.action_id, True, "ok", self.seconds * 1000)
+
+
+def test_daemon_runs_tasks_in_concurrent_slots(db, monkeypatch):
+    monkeypatch.setattr("signal.signal", lambda *a: None)
+    for i in range(6):
+        db.save_action_insight(f"S-{i}", "research", f"Task {i}")
+
+    daemon = ExecutorDaemon(logging.getLogger("test"), worker_id="w1", slots=3, lease_seconds=30)
+    fake = FakeExecutor(0.2)
+    daemon._task_executor = fake
+
+    start = time.perf_counter()
+    assert daemon.run_once() == 6
+    elapsed = time.perf_counter() - start
+
+    assert fake.peak == 3
+    assert elapsed < 1.0  # 2 rounds of 3 x 200ms, not 6 x 200ms
+    assert daemon.stats["tasks_succeeded"] == 6 and daemon._active_task_ids() == []
+    assert all(_row(db, f"S-{i}")["status"] == "completed" for i in range(6))
+
+
+def test_poll_recovers_expired_leases_of_dead_worker(db, monkeypatch):
+    monkeypatch.setattr("signal.signal", lambda *a: None)
+    db.save_action_insight("D-1", "research", "Orphaned by crash")
+    db.claim_action("D-1", worker_id="dead-worker", lease_seconds=30)
+    _expire(db, "D-1")
+
+    daemon = ExecutorDaemon(logging.getLogger("test"), worker_id="w2", slots=2)
+    daemon._task_executor = FakeExecutor(0)
+    assert daemon.poll_and_execute() == 1
+    assert daemon.stats["leases_expired"] == 1
+    assert _row(db, "D-1")["status"] == "completed"
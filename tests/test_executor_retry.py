@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 
 # Ensure project root is importable
@@ -12,16 +13,15 @@ from scripts.task_executor import TaskExecutor, TaskResult
 class MockAction:
     def __init__(self, aid: str):
         self.action_id = aid
+        self.action_type = "research"
         self.title = "Test Action"
 
 
-def test_execute_with_unlimited_retries(monkeypatch):
+def test_execute_with_unlimited_retries(monkeypatch, db):
+    monkeypatch.setenv("GEMINI_RATE_LIMITER", "0")
     logger = logging.getLogger("test")
     executor = TaskExecutor(config=None, logger=logger)
 
-    # Avoid sleeping during tests
-    monkeypatch.setattr(executor, "_wait_for_quota", lambda r: 0)
-
     attempts = {"count": 0}
 
     def handler(action):
@@ -30,9 +30,16 @@ def test_execute_with_unlimited_retries(monkeypatch):
             return TaskResult(action_id=action.action_id, success=False, result_data=None, execution_time_ms=0, error_message="Quota exceeded")
         return TaskResult(action_id=action.action_id, success=True, result_data={"ok": True}, execution_time_ms=10)
 
+    executor.handlers["research"] = handler
     # Force unlimited retries for test
     monkeypatch.setattr("scripts.task_executor.MAX_RETRIES", -1)
 
-    res = executor._execute_with_retry(MockAction("A-1"), handler)
-    assert res.success
+    # Quota errors are rescheduled with a backoff instead of sleeping the worker thread
+    action = MockAction("A-1")
+    start = time.perf_counter()
+    results = [executor._execute_single(action, timeout=30) for _ in range(4)]
+    assert time.perf_counter() - start < 5
+    assert [r.deferred for r in results] == [True, True, True, False]
+    res = results[-1]
+    assert res.success and res.retries == 3
     assert attempts["count"] == 4
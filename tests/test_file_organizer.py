@@ -16,6 +16,7 @@ Tests for the Syndicate File Organizer.
 """
 
 import shutil
+import sqlite3
 import sys
 import tempfile
 from datetime import date, timedelta
@@ -41,10 +42,12 @@ class TestFileOrganizer:
         shutil.rmtree(temp, ignore_errors=True)
 
     @pytest.fixture
-    def organizer(self, temp_dir):
+    def organizer(self, temp_dir, monkeypatch):
         """Create a FileOrganizer with temp directory."""
         import logging
 
+        monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(temp_dir / "catalog.db"))
+
         logger = logging.getLogger("test")
 
         class MockConfig:
@@ -122,13 +125,13 @@ class TestFileOrganizer:
         test_file.write_text("Test content")
 
         # Initial state
-        initial_count = len(organizer.file_index["files"])
+        initial_count = organizer.get_statistics()["total_files"]
 
         # Organize
         organizer.organize_file(test_file)
 
         # Index should be updated
-        assert len(organizer.file_index["files"]) > initial_count
+        assert organizer.get_statistics()["total_files"] > initial_count
 
     def test_get_recent_files(self, organizer, temp_dir):
         """Test retrieving recent files."""
@@ -166,6 +169,89 @@ class TestFileOrganizer:
         assert "Statistics" in report
         assert "Files by Category" in report
 
+    def test_catalog_range_and_category_queries(self, organizer, temp_dir):
+        """Test date-range and category queries over the catalog."""
+        today = date.today()
+        for name in [f"Journal_{today}.md", f"premarket_{today}.md", f"Journal_{today - timedelta(days=30)}.md"]:
+            (temp_dir / name).write_text(f"# {name}")
+        organizer.organize_all()
+
+        recent = organizer.get_recent_files(days=7)
+        assert sorted(f["category"] for f in recent) == ["journals", "premarket"]
+        assert [f["date"] for f in organizer.get_recent_files(category="journals", days=60)] == [
+            today.isoformat(),
+            (today - timedelta(days=30)).isoformat(),
+        ]
+        month_ago = organizer.find_files(since=today - timedelta(days=31), until=today - timedelta(days=29))
+        assert len(month_ago) == 1 and len(month_ago[0]["hash"]) == 64
+
+        # Archived files leave the live queries but stay counted
+        assert organizer.archive_old_files(days_threshold=7) == 1
+        assert organizer.find_files(category="journals") == [organizer.get_recent_files(category="journals")[0]]
+        assert organizer.find_files(include_archived=True, until=today - timedelta(days=8))[0]["archived"]
+        stats = organizer.get_statistics()
+        assert stats == {"total_files": 3, "total_archived": 1, "by_category": {"journals": 2, "premarket": 1}}
+
+        # A new file organized at the archived file's old path does not overwrite its archived row
+        (temp_dir / f"Journal_{today - timedelta(days=30)}.md").write_text("# rewritten")
+        organizer.organize_all()
+        assert len(organizer.get_recent_files(category="journals", days=60)) == 2
+        assert organizer.get_statistics()["total_archived"] == 1
+        assert organizer.get_statistics()["total_files"] == 4
+
+    def test_json_index_is_migrated_once(self, temp_dir, monkeypatch):
+        """Test that a file_index.json from earlier versions is imported into the catalog."""
+        import json
+        import logging
+
+        monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(temp_dir / "catalog.db"))
+        journal = temp_dir / "reports" / "journals" / f"Journal_{date.today()}.md"
+        journal.parent.mkdir(parents=True)
+        journal.write_text("# Journal")
+        files = {
+            str(journal): {"original_name": "j.md", "category": "journals", "date": date.today().isoformat()},
+            str(temp_dir / "old.md"): {"category": "weekly", "date": "2025-01-01", "archived": True},
+        }
+        (temp_dir / "file_index.json").write_text(json.dumps({"files": files, "categories": {}}))
+
+        class MockConfig:
+            OUTPUT_DIR = str(temp_dir)
+
+        organizer = FileOrganizer(MockConfig(), logging.getLogger("test"))
+        assert not (temp_dir / "file_index.json").exists() and (temp_dir / "file_index.json.migrated").exists()
+        assert [f["path"] for f in organizer.get_recent_files()] == [str(journal)]
+        assert organizer.get_statistics()["total_archived"] == 1
+
+        # A second organizer does not import it again
+        assert FileOrganizer(MockConfig(), logging.getLogger("test")).get_statistics()["total_files"] == 2
+
+    def test_failed_json_migration_keeps_the_file_for_a_retry(self, temp_dir, monkeypatch, caplog):
+        """Test that a database error during migration leaves file_index.json in place."""
+        import json
+        import logging
+
+        from db_manager import DatabaseManager
+
+        monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(temp_dir / "catalog.db"))
+        files = {str(temp_dir / "a.md"): {"category": "weekly", "date": date.today().isoformat()}}
+        (temp_dir / "file_index.json").write_text(json.dumps({"files": files}))
+
+        class MockConfig:
+            OUTPUT_DIR = str(temp_dir)
+
+        def locked(self, root, entries):
+            raise sqlite3.OperationalError("database is locked")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(DatabaseManager, "upsert_organizer_files", locked)
+            with caplog.at_level(logging.ERROR, logger="test"):
+                organizer = FileOrganizer(MockConfig(), logging.getLogger("test"))
+        assert (temp_dir / "file_index.json").exists() and "will retry" in caplog.text
+        assert organizer.get_statistics()["total_files"] == 0
+
+        assert FileOrganizer(MockConfig(), logging.getLogger("test")).get_statistics()["total_files"] == 1
+        assert not (temp_dir / "file_index.json").exists()
+
 
 class TestFileArchiving:
     """Tests for file archiving functionality."""
@@ -178,10 +264,12 @@ class TestFileArchiving:
         shutil.rmtree(temp, ignore_errors=True)
 
     @pytest.fixture
-    def organizer(self, temp_dir):
+    def organizer(self, temp_dir, monkeypatch):
         """Create a FileOrganizer with temp directory."""
         import logging
 
+        monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(temp_dir / "catalog.db"))
+
         logger = logging.getLogger("test")
 
         class MockConfig:
@@ -0,0 +1,84 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from scripts import frontmatter
+from scripts.frontmatter import (
+    get_pending_documents,
+    is_ready_for_sync,
+    mark_synced,
+    needs_sync,
+    parse_frontmatter,
+    read_frontmatter,
+    set_document_status,
+    status_index,
+    write_document,
+)
+
+
+def test_header_reads_stop_at_the_closing_delimiter(tmp_path, monkeypatch):
+    monkeypatch.setattr(frontmatter, "FRONTMATTER_READ_CHUNK", 8)
+    doc = tmp_path / "doc.md"
+    doc.write_bytes(
+        b'\n---\nstatus: published\nai_processed: true\ntags: [gold, fed]\ntitle: "A b"\n---\n# Body\n'
+        + b"x" * 65536
+        + b"\xff"
+    )
+
+    # The invalid byte far into the body is never decoded
+    with pytest.raises(UnicodeDecodeError):
+        doc.read_text(encoding="utf-8")
+    assert read_frontmatter(doc) == {
+        "status": "published",
+        "ai_processed": True,
+        "tags": ["gold", "fed"],
+        "title": "A b",
+    }
+
+    for content in ["# No frontmatter\n---\n", "---\nstatus: draft\nnever closed", "--- status: review --- body"]:
+        doc.write_text(content)
+        assert read_frontmatter(doc) == parse_frontmatter(content)[0]
+
+
+def test_status_queries_are_answered_from_the_index(db, tmp_path):
+    out = tmp_path / "output"
+    (out / "reports").mkdir(parents=True)
+    draft, ready = out / "reports" / "draft.md", out / "ready.md"
+    draft.write_text("---\nstatus: draft\nai_processed: false\n---\n# Draft\n")
+    ready.write_text("---\nstatus: published\n---\n# Ready\n")
+    (out / "plain.md").write_text("# No frontmatter\n")
+
+    assert [Path(p["path"]).name for p in get_pending_documents(str(out))] == ["plain.md", "draft.md"]
+    assert sorted(Path(p).name for p in db.get_frontmatter_index(str(out))) == ["draft.md", "plain.md", "ready.md"]
+    assert not db.get_frontmatter_entry(os.path.abspath(out / "plain.md"))["has_frontmatter"]
+    assert is_ready_for_sync(ready) and needs_sync(ready) and not is_ready_for_sync(draft)
+
+    # Writes through the helpers update the entry without a re-read
+    write_document(ready, mark_synced(ready.read_text(), ready.name, "page-1"))
+    entry = db.get_frontmatter_entry(os.path.abspath(ready))
+    assert (entry["sync_status"], entry["notion_page_id"]) == ("synced", "page-1") and not needs_sync(ready)
+    assert entry["mtime_ns"] == ready.stat().st_mtime_ns
+
+    # Edits made elsewhere are seen from the file's stat; deleted files leave the index
+    draft.write_text(set_document_status(draft.read_text(), "published") + "\nEdited.\n")
+    (out / "plain.md").unlink()
+    assert get_pending_documents(str(out)) == [] and is_ready_for_sync(draft)
+    assert sorted(Path(p).name for p in db.get_frontmatter_index(str(out))) == ["draft.md", "ready.md"]
+    assert status_index().lookup(draft)["status"] == "published"
+
+
+def test_index_write_errors_are_logged(db, tmp_path, monkeypatch, caplog):
+    doc = tmp_path / "doc.md"
+    doc.write_text("---\nstatus: draft\n---\n# Draft\n")
+
+    def fail(entries):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db, "record_frontmatter_index", fail)
+    with caplog.at_level("WARNING", logger="frontmatter"):
+        assert status_index().lookup(doc)["status"] == "draft"
+    assert "database is locked" in caplog.text
@@ -0,0 +1,115 @@
+import os
+import sys
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.insights_backfill import Backfill, find_documents
+
+REPORT = """# Daily Analysis {day}
+
+## Macro
+
+The Fed meeting is critical. Monitor CPI closely and watch for {topic}.
+
+## Levels
+
+Support at ${level} is critical.
+"""
+
+
+@pytest.fixture
+def archive(tmp_path):
+    root = tmp_path / "output"
+    start = date(2025, 1, 1)
+    for i in range(12):
+        day = start + timedelta(days=30 * i)
+        folder = root / ("reports" if i % 2 else "archive/reports")
+        folder.mkdir(parents=True, exist_ok=True)
+        topic = "a break in silver" if i % 3 else "the ECB decision"
+        (folder / f"daily_{day.isoformat()}.md").write_text(REPORT.format(day=day, topic=topic, level=4000 + i))
+    (root / "reports" / "daily_2025-03-01.backup.md").write_text("ignored")
+    (root / "charts").mkdir()
+    (root / "charts" / "notes_2025-03-01.md").write_text("ignored")
+    return root
+
+
+def _count(db, table, where="1=1"):
+    with db._get_connection() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}").fetchone()[0]
+
+
+def test_backfill_saves_in_batches_and_resumes_from_checkpoints(db, archive):
+    documents = list(find_documents(archive))
+    assert len(documents) == 12 and documents[0].name == "daily_2025-01-01.md"
+    assert len(list(find_documents(archive, since=date(2025, 6, 1)))) == 6
+
+    stats = Backfill(db, run_id="t", workers=2).run(documents, batch_size=5)
+    assert stats["documents"] == 12 and stats["failed"] == 0
+    assert _count(db, "entity_insights", "source_report = 'daily_2025-01-01' AND entity_name = 'Fed'") == 1
+    actions = _count(db, "action_insights")
+    assert actions > 0 and _count(db, "action_insights", "status = 'skipped'") == actions
+    assert _count(db, "action_insights", "created_at LIKE '2025-01-01%'") > 0
+    assert len(db.get_processed_documents("backfill:t")) == 12
+
+    # Resume: nothing left; a changed document is picked up again
+    stats = Backfill(db, run_id="t", workers=2).run(documents)
+    assert stats["documents"] == 0 and stats["skipped"] == 12
+    documents[0].write_text(REPORT.format(day="x", topic="the BOJ meeting", level=1) + "\nMore text.\n")
+    assert Backfill(db, run_id="t", workers=2).run(documents)["documents"] == 1
+
+    # Re-running from scratch updates the same action rows
+    before = _count(db, "action_insights")
+    assert Backfill(db, run_id="t", workers=2).run(documents, restart=True)["documents"] == 12
+    assert _count(db, "action_insights") == before
+
+
+def test_queued_backfill_actions_are_dated_now(db, archive):
+    documents = list(find_documents(archive))[:1]
+    assert Backfill(db, run_id="q", workers=1, queue_actions=True).run(documents)["actions"] > 0
+
+    pending = db.get_pending_actions()
+    assert pending and all(a["created_at"].startswith(date.today().isoformat()) for a in pending)
+    assert all("'report_date': '2025-01-01'" in a["metadata"] for a in pending)
+
+
+def test_failed_write_inside_transaction_only_undoes_itself(db):
+    with db.transaction():
+        db.save_entity_insight("Fed", "institution", "ctx", 0.5, "r1")
+        with pytest.raises(Exception):
+            with db._get_connection() as conn:
+                conn.execute("INSERT INTO entity_insights (entity_name) VALUES ('broken')")
+                conn.execute("INSERT INTO no_such_table VALUES (1)")
+        db.save_entity_insight("CPI", "indicator", "ctx", 0.5, "r1")
+
+    assert _count(db, "entity_insights") == 2
+
+
+def test_action_listeners_hear_only_committed_transactions(db):
+    from db_manager import add_action_listener, remove_action_listener
+
+    heard = []
+
+    def listener(action_id, scheduled_for):
+        # Listeners query the DB, so the row must be committed when they run
+        heard.append((action_id, _count(db, "action_insights", f"action_id = '{action_id}'")))
+
+    add_action_listener(listener)
+    try:
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.save_action_insight("rolled-back", "research", "Research: Fed")
+                raise RuntimeError("abort the batch")
+        assert heard == [] and _count(db, "action_insights") == 0
+
+        with db.transaction():
+            db.save_action_insight("committed", "research", "Research: CPI")
+            assert heard == []
+        assert heard == [("committed", 1)]
+
+        db.save_action_insight("direct", "research", "Research: ECB")
+        assert heard[-1] == ("direct", 1)
+    finally:
+        remove_action_listener(listener)
@@ -0,0 +1,79 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts import executor_daemon
+from scripts.executor_daemon import ExecutorDaemon
+from scripts.leases import Lease
+
+
+def test_only_one_concurrent_acquirer_wins(db):
+    barrier = threading.Barrier(8)
+    tokens = {}
+
+    def contend(i):
+        barrier.wait()
+        tokens[i] = db.acquire_lease("job", f"holder-{i}", ttl_seconds=30)
+
+    threads = [threading.Thread(target=contend, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    winners = [i for i, token in tokens.items() if token is not None]
+    assert len(winners) == 1 and tokens[winners[0]] == 1
+    assert db.get_lease("job")["holder"] == f"holder-{winners[0]}"
+
+
+def test_fencing_token_advances_on_takeover(db):
+    assert db.acquire_lease("job", "a", ttl_seconds=0.05) == 1
+    assert db.acquire_lease("job", "a", ttl_seconds=0.05) == 1  # re-acquire keeps the token
+    assert db.acquire_lease("job", "b", ttl_seconds=30) is None
+    time.sleep(0.1)
+
+    assert db.acquire_lease("job", "b", ttl_seconds=30) == 2
+    # The stale holder can neither renew nor pass the fencing check
+    assert not db.renew_lease("job", "a", 1, 30)
+    assert not db.check_lease_token("job", 1) and db.check_lease_token("job", 2)
+
+    # Releasing hands the lease over immediately, with a new token
+    assert db.release_lease("job", "b", 2)
+    assert db.acquire_lease("job", "a", ttl_seconds=30) == 3
+
+
+def test_lease_context_manager_renews_and_releases(db):
+    with Lease("long_job", ttl=1.2, holder="me", db=db) as lease:
+        assert lease.held and Lease("long_job", holder="other", db=db).acquire() is False
+        time.sleep(1.6)  # longer than the TTL: kept alive by the renewal thread
+        assert lease.still_held()
+    assert db.acquire_lease("long_job", "other", ttl_seconds=30) == 2
+
+
+def test_single_executor_leader_and_liveness_leases(db, monkeypatch):
+    monkeypatch.setattr("signal.signal", lambda *a: None)
+    first = ExecutorDaemon(logging.getLogger("test"), worker_id="exec-1")
+    second = ExecutorDaemon(logging.getLogger("test"), worker_id="exec-2")
+
+    assert first._attempt_leader_election()
+    assert not second._attempt_leader_election()
+    assert not executor_daemon.is_executor_running()
+
+    first._register_member()
+    second._register_member()
+    first._is_leader = True
+    first._renew_named_leases()
+    assert executor_daemon.is_executor_running()
+
+    health = second.health_check()
+    assert health["leader"] == "exec-1" and health["executors"] == ["exec-1", "exec-2"]
+    assert '"slots"' in db.get_lease("executor:exec-1")["metadata"]
+
+    # Leadership moves as soon as the leader shuts down
+    first._cleanup()
+    assert second._attempt_leader_election()
+    assert second.health_check()["executors"] == ["exec-2"]
@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.local_llm_batch import ContinuousBatcher, sample_token
+
+VOCAB = 16
+EOS = 0
+
+
+class FakeEngine:
+    """Deterministic engine: each sequence counts upward from its prompt length."""
+
+    def __init__(self, n_ctx_per_seq=256, n_batch=64, gate=None):
+        self.n_ctx_per_seq = n_ctx_per_seq
+        self.n_batch = n_batch
+        self.calls = []
+        self.cleared = []
+        self._logits = {}
+        self._gate = gate
+
+    def tokenize(self, text):
+        return [1] * len(text.split())
+
+    def token_to_piece(self, token):
+        return f"t{token} ".encode()
+
+    def is_eog(self, token):
+        return token == EOS
+
+    def decode(self, entries):
+        if self._gate is not None:
+            self._gate.wait()
+        self.calls.append(list(entries))
+        self._logits = {}
+        for i, (_tok, pos, _seq, want) in enumerate(entries):
+            if want:
+                logits = np.zeros(VOCAB)
+                logits[(pos + 1) % VOCAB] = 10.0
+                self._logits[i] = logits
+
+    def logits(self, index):
+        return self._logits[index]
+
+    def clear_sequence(self, seq_id):
+        self.cleared.append(seq_id)
+
+
+def test_sequences_decode_together():
+    gate = threading.Event()
+    engine = FakeEngine(gate=gate)
+    batcher = ContinuousBatcher(engine, n_slots=4)
+    try:
+        futures = [batcher.submit("a b c", max_tokens=5, temperature=0) for _ in range(4)]
+        gate.set()
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.close()
+
+    assert all(r.completion_tokens == 5 and r.finish_reason == "length" for r in results)
+    # Generation steps carry one token from each of the four sequences
+    assert max(len({e[2] for e in call}) for call in engine.calls) == 4
+    assert batcher.stats["peak_active"] == 4
+    assert sorted(engine.cleared) == [0, 1, 2, 3]
+
+
+def test_queued_requests_join_when_slot_frees():
+    gate = threading.Event()
+    engine = FakeEngine(gate=gate)
+    batcher = ContinuousBatcher(engine, n_slots=2)
+    try:
+        futures = [batcher.submit("a", max_tokens=n, temperature=0) for n in (2, 12, 3)]
+        gate.set()
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.close()
+
+    assert [r.completion_tokens for r in results] == [2, 12, 3]
+    # The third request ran alongside the long second one, not after it
+    third_prefill = next(
+        i for i, call in enumerate(engine.calls) if i > 0 and any(e[1] == 0 and e[2] == 0 for e in call)
+    )
+    assert any(e[2] == 1 for e in engine.calls[third_prefill])
+
+
+def test_eos_and_stop_sequences():
+    engine = FakeEngine(n_ctx_per_seq=64)
+    batcher = ContinuousBatcher(engine, n_slots=2)
+    try:
+        # 15 prompt tokens -> one generated token, then EOS
+        eos = batcher.submit(" ".join(["w"] * 15), max_tokens=50, temperature=0).result(timeout=5)
+        stopped = batcher.submit("a", max_tokens=50, stop_sequences=["t4"], temperature=0).result(timeout=5)
+    finally:
+        batcher.close()
+
+    assert eos.finish_reason == "stop" and eos.completion_tokens == 1
+    assert stopped.finish_reason == "stop"
+    assert stopped.text == "t1 t2 t3 "
+
+
+def test_prompt_longer_than_context_fails_fast():
+    engine = FakeEngine(n_ctx_per_seq=4)
+    batcher = ContinuousBatcher(engine, n_slots=1)
+    try:
+        fut = batcher.submit("a b c d e", max_tokens=2)
+        try:
+            fut.result(timeout=5)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        assert batcher.generate("a", max_tokens=1, temperature=0, timeout=5) == "t1 "
+    finally:
+        batcher.close()
+
+
+def test_sample_token_respects_top_k():
+    rng = np.random.default_rng(0)
+    logits = np.array([0.0, 5.0, 4.9, -1.0])
+    assert sample_token(logits, 0.0, 40, 0.9, rng) == 1
+    picks = {sample_token(logits, 1.0, 2, 1.0, rng) for _ in range(50)}
+    assert picks <= {1, 2}
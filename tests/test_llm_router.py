@@ -0,0 +1,155 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.llm_router import AdaptiveLLMRouter
+
+
+class Resp:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeProvider:
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.is_available = True
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return Resp(f"{self.name}:{prompt}")
+
+
+def test_cold_router_keeps_configured_order():
+    router = AdaptiveLLMRouter(persist=False)
+    a, b = FakeProvider("Gemini"), FakeProvider("Ollama (llama3.2)")
+    result, winner = router.call([a, b], "hi")
+    assert winner is a and result.text == "Gemini:hi"
+    assert b.calls == 0
+
+
+def test_routes_to_faster_provider_per_task_type():
+    router = AdaptiveLLMRouter(persist=False)
+    a, b = FakeProvider("Gemini"), FakeProvider("Ollama")
+    for _ in range(5):
+        router.observe("Gemini", "insights", 9.0, True)
+        router.observe("Ollama", "insights", 2.0, True)
+        router.observe("Gemini", "generate", 1.0, True)
+        router.observe("Ollama", "generate", 6.0, True)
+
+    assert router.rank([a, b], "insights")[0] is b
+    assert router.rank([a, b], "generate")[0] is a
+
+
+def test_cost_and_errors_shift_ranking():
+    router = AdaptiveLLMRouter(persist=False, cost_weight=100.0)
+    a, b = FakeProvider("Gemini"), FakeProvider("Local")
+    for _ in range(5):
+        router.observe("Gemini", "default", 1.0, True, cost=0.05)  # 1s + $0.05 * 100 = 6
+        router.observe("Local", "default", 4.0, True)
+    assert router.rank([a, b])[0] is b
+
+    for _ in range(10):
+        router.observe("Local", "default", 0.1, False)
+    assert router.rank([a, b])[0] is a
+
+
+def test_failover_and_circuit_breaker():
+    router = AdaptiveLLMRouter(persist=False, failure_threshold=2, reset_timeout=60)
+    bad, good = FakeProvider("Gemini", error="boom"), FakeProvider("Ollama")
+
+    for _ in range(2):
+        _, winner = router.call([bad, good], "p")
+        assert winner is good
+    assert router.breaker("Gemini").state == "OPEN"
+
+    # Open circuit: the failing provider is no longer tried at all
+    router.call([bad, good], "p")
+    assert bad.calls == 2
+
+
+def test_quota_error_opens_circuit_immediately():
+    router = AdaptiveLLMRouter(persist=False, failure_threshold=5)
+    quota, good = FakeProvider("Gemini", error="429 quota exceeded"), FakeProvider("Local")
+    router.call([quota, good], "p", is_quota_error=lambda e: "quota" in str(e))
+    assert router.breaker("Gemini").state == "OPEN"
+
+
+def test_all_failed_raises():
+    router = AdaptiveLLMRouter(persist=False)
+    with pytest.raises(RuntimeError, match="All LLM providers failed"):
+        router.call([FakeProvider("A", error="x"), FakeProvider("B", error="y")], "p")
+
+
+def test_hedge_fires_after_p95_and_backup_wins():
+    router = AdaptiveLLMRouter(persist=False, hedge=True, hedge_min_samples=5)
+    for _ in range(10):
+        router.observe("Gemini", "default", 0.05, True)
+        router.observe("Ollama", "default", 0.5, True)
+    slow, backup = FakeProvider("Gemini", delay=1.0), FakeProvider("Ollama")
+
+    start = time.perf_counter()
+    result, winner = router.call([slow, backup], "p")
+    elapsed = time.perf_counter() - start
+
+    assert winner is backup and result.text == "Ollama:p"
+    assert elapsed < 0.8
+    assert router.counters["hedges"] == 1 and router.counters["hedge_wins"] == 1
+
+
+def test_non_concurrent_provider_is_serialized():
+    router = AdaptiveLLMRouter(persist=False)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class Local(FakeProvider):
+        concurrent_safe = False
+
+        def generate_content(self, prompt):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return Resp("ok")
+
+    provider = Local("Local")
+    threads = [threading.Thread(target=router.call, args=([provider], "p")) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 1
+
+
+def test_outcomes_logged_and_history_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "router.db"))
+    from db_manager import get_db
+
+    router = AdaptiveLLMRouter()
+    router.call([FakeProvider("Gemini", error="down"), FakeProvider("Ollama")], "p", task_type="insights")
+
+    rows = get_db().get_llm_outcomes(hours=1)
+    assert [(r["provider"], r["outcome"], r["task_type"]) for r in rows] == [
+        ("Gemini", "error", "insights"),
+        ("Ollama", "ok", "insights"),
+    ]
+    summary = get_db().get_llm_latency_summary(days=1)
+    assert {s["provider"] for s in summary} == {"Gemini", "Ollama"}
+
+    fresh = AdaptiveLLMRouter(persist=False)
+    assert fresh.load_history(rows) == 2
+    assert fresh.stats_for("Ollama", "insights").samples == 1
@@ -0,0 +1,147 @@
+import logging
+import os
+import sys
+import threading
+import time
+import types
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts import task_executor
+from scripts.market_data import MarketDataService
+
+
+def _frame(rows, start=100.0):
+    index = pd.date_range("2026-01-01", periods=rows, freq="D")
+    close = [start + i for i in range(rows)]
+    return pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": [1000 + i for i in range(rows)]},
+        index=index,
+    )
+
+
+class FakeYF(types.SimpleNamespace):
+    """Counts calls; optionally slow so concurrent requests overlap."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(history_calls=[], download_calls=[], info_calls=[], delay=delay)
+
+    def Ticker(self, symbol):
+        fake = self
+
+        class _Ticker:
+            def history(self, period="5d", interval="1d"):
+                fake.history_calls.append(symbol)
+                time.sleep(fake.delay)
+                return _frame(int(period.rstrip("d")))
+
+            @property
+            def info(self):
+                fake.info_calls.append(symbol)
+                return {"regularMarketPrice": 1.0, "totalAssets": 5e10, "averageVolume": 42}
+
+        return _Ticker()
+
+    def download(self, symbols, period="5d", **kwargs):
+        self.download_calls.append(list(symbols))
+        rows = int(period.rstrip("d"))
+        return pd.concat({s: _frame(rows, start=10.0 * (i + 1)) for i, s in enumerate(symbols)}, axis=1)
+
+
+def test_concurrent_requests_share_one_fetch():
+    fake = FakeYF(delay=0.2)
+    md = MarketDataService(yf_module=fake)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(md.history("GC=F", "5d"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert fake.history_calls == ["GC=F"]
+    assert len(results) == 8 and all(len(df) == 5 for df in results)
+    assert md.stats["coalesced"] == 7
+
+    md.history("GC=F", "5d")  # cached
+    assert fake.history_calls == ["GC=F"]
+
+
+def test_misses_are_batched_and_quotes_reuse_history():
+    fake = FakeYF()
+    md = MarketDataService(yf_module=fake)
+    quotes = md.quotes(["GLD", "SLV", "^TNX"])
+
+    assert fake.download_calls == [["GLD", "SLV", "^TNX"]] and not fake.history_calls
+    assert quotes["SLV"]["price"] == 24.0 and quotes["SLV"]["previous_close"] == 23.0
+
+    md.histories(["GLD", "DX-Y.NYB"])  # only the miss is fetched
+    assert fake.history_calls == ["DX-Y.NYB"]
+
+
+def test_info_is_cached_but_intraday_fields_follow_the_quote(monkeypatch):
+    fake = FakeYF()
+    md = MarketDataService(yf_module=fake, quote_ttl=0.05)
+    first = md.info("GLD")
+    assert first["totalAssets"] == 5e10 and first["regularMarketPrice"] == 104.0  # from the quote, not .info
+
+    time.sleep(0.1)
+    md.info("GLD")
+    assert fake.info_calls == ["GLD"]  # slow endpoint hit once
+    assert fake.history_calls == ["GLD", "GLD"]  # price refreshed after the quote TTL
+
+
+def test_published_cycle_frames_serve_shorter_periods():
+    fake = FakeYF()
+    md = MarketDataService(yf_module=fake)
+    md.publish_history("GC=F", _frame(252, start=2000.0), period="1y")
+
+    assert len(md.history("GC=F", "20d")) == 20
+    assert md.quote("GC=F")["price"] == 2251.0
+    assert md.cached_quote("GC=F")["price"] == 2251.0
+    assert not fake.history_calls and not fake.download_calls
+
+    md.new_cycle()
+    assert md.cached_quote("GC=F") is None
+
+
+def test_short_fetch_does_not_replace_a_longer_cached_frame():
+    fake = FakeYF()
+    md = MarketDataService(yf_module=fake)
+    md.publish_history("GC=F", _frame(252, start=2000.0), period="1y")
+
+    assert len(md.history("GC=F", "5d", max_age=0)) == 5  # forced refetch of the short period
+    assert fake.history_calls == ["GC=F"]
+    assert len(md.history("GC=F", "20d")) == 20 and fake.history_calls == ["GC=F"]
+
+
+def test_stale_cached_quote_is_refetched():
+    fake = FakeYF()
+    md = MarketDataService(yf_module=fake, history_ttl=0.05)
+    md.publish_history("GC=F", _frame(252, start=2000.0), period="1y")
+    assert md.cached_quote("GC=F")["price"] == 2251.0 and not fake.history_calls
+
+    time.sleep(0.1)
+    assert md.cached_quote("GC=F")["price"] == 104.0
+    assert fake.history_calls == ["GC=F"]
+
+    time.sleep(0.1)
+    md._yf = None  # The refresh fails: no quote rather than the stale one
+    assert md.cached_quote("GC=F") is None
+
+
+def test_data_fetch_records_per_symbol_fetch_errors(monkeypatch, tmp_path):
+    class DownYF(FakeYF):
+        def Ticker(self, symbol):
+            if symbol == "^TNX":
+                raise ConnectionError("yield feed down")
+            return super().Ticker(symbol)
+
+    monkeypatch.setattr(task_executor, "get_market_data", lambda: MarketDataService(yf_module=DownYF()))
+    config = types.SimpleNamespace(OUTPUT_DIR=str(tmp_path))
+    executor = task_executor.TaskExecutor(config, logging.getLogger("test"))
+    action = types.SimpleNamespace(action_id="F-1", title="Fetch Data: 10-year yield", description="")
+
+    result = executor._handle_data_fetch(action)
+    assert result.success and result.result_data["yield_error"] == "yield feed down"
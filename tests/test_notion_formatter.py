@@ -0,0 +1,94 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from scripts.notion_formatter import (
+    BASIC,
+    RICH,
+    clear_compile_cache,
+    compile_cache_info,
+    compile_markdown,
+    format_for_notion,
+    tokenize,
+)
+from scripts.notion_publisher import NotionPublisher
+
+REPORT = """---
+status: published
+---
+# Weekly Gold Report
+Bias: **BULLISH** with `4000` in view.
+
+> **Note:** support held
+> on volume
+
+| Level | Price |
+|-------|-------|
+| Support | $3,950 |
+
+```python
+print("gold")
+```
+- first
+1. second
+---
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_compile_cache()
+    yield
+    clear_compile_cache()
+
+
+def test_tokenizer_dialects_share_one_pass():
+    lines = REPORT.split("\n")
+    rich = [token[0] for token in tokenize(lines, RICH)]
+    basic = [token[0] for token in tokenize(lines, BASIC)]
+
+    assert rich[:3] == ["rule", "paragraph", "rule"] and "table" in rich and "quote" in rich
+    assert basic[:2] == ["heading", "paragraph"] and "callout" in basic and "quote" not in basic
+    assert ("code", "python", 'print("gold")') in tokenize(lines, RICH)
+    assert list(tokenize(["| only one row |"], BASIC)) == [("paragraph", "| only one row |")]
+
+
+def test_basic_blocks_match_the_publisher_contract():
+    blocks = NotionPublisher.markdown_to_blocks(None, REPORT)
+    types = [b["type"] for b in blocks]
+
+    assert types == [
+        "heading_1",
+        "paragraph",
+        "callout",
+        "code",
+        "code",
+        "bulleted_list_item",
+        "numbered_list_item",
+        "divider",
+    ]
+    callout = [t["text"]["content"] for t in blocks[2]["callout"]["rich_text"]]
+    assert callout == ["Note:", " support held\non volume"]
+    assert blocks[3]["code"]["language"] == "plain text" and blocks[4]["code"]["language"] == "python"
+    annotations = [t.get("annotations") for t in blocks[1]["paragraph"]["rich_text"]]
+    assert annotations == [None, {"bold": True}, None, {"code": True}, None]
+
+
+def test_compiled_blocks_are_memoized_by_content():
+    first = format_for_notion(REPORT, "report")
+    second = format_for_notion(REPORT, "report")
+    assert first == second and first is not second and first[0] is second[0]
+    assert compile_cache_info()["hits"] == 1
+
+    # Another style, document type or edit is compiled separately
+    compile_markdown(REPORT)
+    format_for_notion(REPORT, "journal")
+    format_for_notion(REPORT + "\nmore", "report")
+    assert compile_cache_info()["misses"] == 4 and compile_cache_info()["size"] == 4
+
+    # Callers own the returned list
+    second.append({"type": "divider"})
+    assert format_for_notion(REPORT, "report") == first
@@ -0,0 +1,270 @@
+import os
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from db_manager import DatabaseManager, get_db
+from scripts import notion_publisher
+from scripts.notion_publisher import NotionConfig, NotionPublisher
+from scripts.notion_sync import (
+    NotionPacer,
+    PacedClient,
+    block_entry,
+    plan_block_diff,
+    rate_limit_retry_after,
+    sync_files,
+)
+from scripts.rate_limiter import TokenBucketLimiter
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after="0"):
+        super().__init__("rate limited")
+        self.status = 429
+        self.headers = {"retry-after": retry_after}
+
+
+def test_pacer_retries_rate_limits_through_the_shared_bucket(tmp_path):
+    limiter = TokenBucketLimiter("notion", rpm=600, burst=2, db=DatabaseManager(db_path=tmp_path / "q.db"))
+    pacer = NotionPacer(limiter, max_attempts=3, base_delay=0.01)
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise RateLimited()
+        return "ok"
+
+    assert PacedClient(types.SimpleNamespace(pages=types.SimpleNamespace(create=flaky)), pacer).pages.create() == "ok"
+    assert len(calls) == 3 and pacer.stats["throttled"] == 2
+    assert limiter.stats["quota_errors"] == 2
+
+    # Other errors are not retried; a 429 on the last attempt is raised
+    with pytest.raises(ValueError):
+        pacer.call(lambda: (_ for _ in ()).throw(ValueError("bad request")))
+    with pytest.raises(RateLimited):
+        NotionPacer(None, max_attempts=2, base_delay=0.01).call(lambda: (_ for _ in ()).throw(RateLimited()))
+
+    assert rate_limit_retry_after(RateLimited("1.5")) == 1.5
+    assert rate_limit_retry_after(types.SimpleNamespace(status=400, code="validation_error")) is None
+
+
+def test_burst_caps_back_to_back_requests(tmp_path):
+    limiter = TokenBucketLimiter("notion", rpm=180, burst=2, db=DatabaseManager(db_path=tmp_path / "q.db"))
+    assert limiter.try_acquire(priority="interactive") == 0.0
+    assert limiter.try_acquire(priority="interactive") == 0.0
+    assert 0 < limiter.try_acquire(priority="interactive") <= 1 / 3
+
+
+def test_publish_appends_blocks_beyond_the_first_hundred(monkeypatch):
+    calls = []
+
+    class FakeClient:
+        def __init__(self, auth=None):
+            self.pages = types.SimpleNamespace(create=self.create)
+            self.blocks = types.SimpleNamespace(children=types.SimpleNamespace(append=self.append))
+
+        def create(self, parent=None, properties=None, children=None):
+            calls.append(("create", len(children)))
+            return {"id": "page-1", "url": "https://notion.so/page1"}
+
+        def append(self, block_id=None, children=None):
+            calls.append(("append", block_id, len(children)))
+
+    monkeypatch.setenv("NOTION_RATE_LIMITER", "0")
+    monkeypatch.setattr("scripts.notion_publisher.Client", FakeClient)
+    publisher = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(publisher, "_get_database_properties", lambda: {})
+
+    content = "\n\n".join(f"Paragraph {i}" for i in range(250))
+    result = publisher.publish(title="Long", content=content, use_enhanced_formatting=False)
+
+    assert result["page_id"] == "page-1"
+    assert calls == [("create", 100), ("append", "page-1", 100), ("append", "page-1", 50)]
+
+
+def test_sync_files_runs_concurrently_and_keeps_order():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    class FakePublisher:
+        def sync_file(self, path, force=False, dry_run=False):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            if path.endswith("bad.md"):
+                raise RuntimeError("boom")
+            return {"page_id": path}
+
+    files = [f"{i}.md" for i in range(6)] + ["bad.md"]
+    results = list(sync_files(FakePublisher(), files, workers=4))
+
+    assert [r[0] for r in results] == files
+    assert results[0][1] == {"page_id": "0.md"} and isinstance(results[-1][2], RuntimeError)
+    assert peak[0] > 1
+
+
+def test_sync_all_outputs_skips_unchanged_files_from_the_manifest(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "sync.db"))
+    monkeypatch.setenv("NOTION_API_KEY", "x")
+    monkeypatch.setenv("NOTION_DATABASE_ID", "db-x")
+    monkeypatch.setenv("NOTION_RATE_LIMITER", "0")
+    monkeypatch.setattr(notion_publisher, "_DISABLE_NOTION_PUBLISH", False)
+    monkeypatch.setattr(notion_publisher, "Client", lambda auth=None, **options: types.SimpleNamespace())
+    db = get_db()
+    monkeypatch.setattr(db, "should_run_task", lambda name: True)
+    opened = []
+
+    def sync_file(self, filepath, force=False, dry_run=False):
+        path = Path(filepath)
+        opened.append(path.name)
+        content = path.read_text()
+        if "status: draft" in content:
+            return {"page_id": "", "skipped": True, "reason": "Document status is 'draft'"}
+        if "corrections" in content:
+            return {"page_id": "", "skipped": True, "reason": "sanitizer_corrections"}
+        path.write_text(content.replace("sync_status: pending", "sync_status: synced"))
+        return {"page_id": f"page-{path.stem}", "url": "", "type": "notes", "skipped": False}
+
+    monkeypatch.setattr(NotionPublisher, "sync_file", sync_file)
+    out = tmp_path / "output"
+    for rel, status in [("a.md", "published"), ("c.md", "corrections"), ("sub/b.md", "draft"), ("archive/x.md", "")]:
+        (out / rel).parent.mkdir(parents=True, exist_ok=True)
+        (out / rel).write_text(f"---\nstatus: {status}\nsync_status: pending\n---\n# {rel}\n")
+    (out / "FILE_INDEX.md").write_text("# index\n")
+
+    results = notion_publisher.sync_all_outputs(str(out), workers=1)
+    assert opened == ["a.md", "c.md", "b.md"] and len(results["success"]) == 1
+    assert db.get_sync_manifest()[str((out / "a.md").resolve())]["notion_page_id"] == "page-a"
+
+    # Settled files are skipped from their stat; a touched file is hashed but not synced
+    opened.clear()
+    os.utime(out / "a.md", ns=(1, 1))
+    results = notion_publisher.sync_all_outputs(str(out), workers=1)
+    assert opened == ["c.md"] and results["manifest"] == {"unchanged": 1, "touched": 1, "changed": 1}
+    opened.clear()
+    notion_publisher.sync_all_outputs(str(out), workers=1)
+    assert opened == ["c.md"]
+
+    # Edited files are synced again, deleted ones leave the manifest, force bypasses it
+    opened.clear()
+    (out / "sub" / "b.md").write_text("---\nstatus: published\n---\n# b\n")
+    (out / "a.md").unlink()
+    notion_publisher.sync_all_outputs(str(out), workers=1)
+    assert opened == ["c.md", "b.md"]
+    assert sorted(Path(p).name for p in db.get_sync_manifest()) == ["b.md"]
+    opened.clear()
+    notion_publisher.sync_all_outputs(str(out), force=True, workers=1)
+    assert opened == ["c.md", "b.md"]
+
+
+class FakeNotion:
+    """In-memory pages of top-level blocks, counting API calls."""
+
+    def __init__(self, auth=None, **options):
+        self.pages_blocks, self.archived, self.calls = {}, set(), []
+        self.pages = types.SimpleNamespace(create=self.create, update=self.update_page)
+        self.blocks = types.SimpleNamespace(
+            update=self.update_block,
+            delete=self.delete_block,
+            children=types.SimpleNamespace(append=self.append, list=self.list),
+        )
+
+    def _new(self, blocks):
+        return [[f"b{len(self.calls)}-{n}", block] for n, block in enumerate(blocks)]
+
+    def create(self, parent=None, properties=None, children=None):
+        self.calls.append("create")
+        page_id = f"page-{len(self.pages_blocks)}"
+        self.pages_blocks[page_id] = self._new(children)
+        return {"id": page_id, "url": f"https://notion.so/{page_id}"}
+
+    def update_page(self, page_id=None, archived=None, properties=None):
+        self.calls.append("update_page")
+        if archived:
+            self.archived.add(page_id)
+
+    def append(self, block_id=None, children=None, after=None):
+        self.calls.append("append")
+        page, new = self.pages_blocks[block_id], self._new(children)
+        at = [b[0] for b in page].index(after) + 1 if after else len(page)
+        page[at:at] = new
+        return {"results": [{"id": i, "type": b["type"]} for i, b in page[at:]]}
+
+    def list(self, block_id=None, page_size=100, start_cursor=None):
+        self.calls.append("list")
+        start = int(start_cursor or 0)
+        page = self.pages_blocks[block_id]
+        results = [{"id": i, "type": b["type"]} for i, b in page[start : start + page_size]]
+        more = start + page_size < len(page)
+        return {"results": results, "has_more": more, "next_cursor": str(start + page_size) if more else None}
+
+    def _find(self, block_id):
+        for page in self.pages_blocks.values():
+            for n, (i, _) in enumerate(page):
+                if i == block_id:
+                    return page, n
+
+    def update_block(self, block_id=None, **content):
+        self.calls.append("update")
+        page, n = self._find(block_id)
+        page[n][1] = {"object": "block", "type": page[n][1]["type"], **content}
+
+    def delete_block(self, block_id=None):
+        self.calls.append("delete")
+        page, n = self._find(block_id)
+        del page[n]
+
+
+def test_revisions_are_applied_as_block_diffs(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "diff.db"))
+    monkeypatch.setenv("NOTION_RATE_LIMITER", "0")
+    notion = FakeNotion()
+    monkeypatch.setattr("scripts.notion_publisher.Client", lambda auth=None, **options: notion)
+    publisher = NotionPublisher(NotionConfig(api_key="x", database_id="db-x"))
+    monkeypatch.setattr(publisher, "_get_database_properties", lambda: {})
+
+    def publish(paragraphs, page_id=None):
+        notion.calls.clear()
+        content = "\n\n".join(paragraphs)
+        result = publisher.publish(title="Doc", content=content, use_enhanced_formatting=False, page_id=page_id)
+        blocks = publisher.markdown_to_blocks(content)
+        assert [b for _, b in notion.pages_blocks[result["page_id"]]] == blocks
+        return result
+
+    paragraphs = [f"Paragraph {i}" for i in range(120)]
+    page_id = publish(paragraphs)["page_id"]
+    assert notion.calls == ["create", "append"]
+
+    # One edit, one insert, one removal: ids are looked up once, then only the changes are sent
+    paragraphs[5] = "Paragraph 5, revised"
+    paragraphs.insert(60, "A new paragraph")
+    del paragraphs[110]
+    result = publish(paragraphs, page_id)
+    assert result["page_id"] == page_id and notion.calls == ["list", "list", "update", "append", "delete"]
+    assert result["revision"] == {"kept": 118, "updated": 1, "inserted": 1, "deleted": 1}
+
+    paragraphs[-1] = "The last paragraph, revised"
+    assert publish(paragraphs, page_id)["revision"]["updated"] == 1 and notion.calls == ["update"]
+
+    # Blocks before the first unchanged one cannot be inserted in place: the page is republished
+    result = publish(["# A new heading"] + paragraphs, page_id)
+    assert result["page_id"] != page_id and page_id in notion.archived
+
+
+def test_block_diff_replaces_blocks_that_cannot_be_updated():
+    paragraph = {"type": "paragraph", "paragraph": {"rich_text": []}}
+    heading = {"type": "heading_2", "heading_2": {"rich_text": []}}
+    table = {"type": "table", "table": {"table_width": 1, "children": []}}
+    old = [block_entry(b) for b in (paragraph, heading, table)]
+    new = [block_entry(b) for b in (paragraph, {**paragraph, "paragraph": {"rich_text": [1]}}, dict(table, x=1))]
+    assert plan_block_diff(old, new) == [("keep", 0, 0), ("delete", 1), ("delete", 2), ("insert", [1, 2])]
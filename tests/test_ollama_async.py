@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from aiohttp import web
+
+from src.digest_bot.llm.base import GenerationConfig, InferenceError
+from src.digest_bot.llm.ollama import OllamaProvider
+from src.digest_bot.llm.ollama_async import AsyncOllamaClient
+
+
+class MockOllama:
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.bodies = []
+        self.active = 0
+        self.peak = 0
+        self.transports = set()
+
+    async def generate(self, request):
+        body = await request.json()
+        self.bodies.append(body)
+        self.transports.add(id(request.transport))
+        if self.status != 200:
+            return web.json_response({"error": "boom"}, status=self.status)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if body.get("stream"):
+            resp = web.StreamResponse()
+            await resp.prepare(request)
+            for word in ("gold ", "is ", "up"):
+                await resp.write((json.dumps({"response": word, "done": False}) + "\n").encode())
+            await resp.write((json.dumps({"response": "", "done": True}) + "\n").encode())
+            await resp.write_eof()
+            return resp
+        return web.json_response({"response": f" echo {body['prompt']} ", "done": True, "eval_count": 3})
+
+
+async def start_server(mock):
+    app = web.Application()
+    app.router.add_post("/api/generate", mock.generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio
+async def test_generate_sends_keep_alive_and_reuses_connection():
+    mock = MockOllama()
+    runner, host = await start_server(mock)
+    try:
+        async with AsyncOllamaClient(host=host, model="m", keep_alive="1h", max_concurrency=1) as client:
+            first = await client.generate("a", GenerationConfig(max_tokens=16))
+            await client.generate("b")
+    finally:
+        await runner.cleanup()
+
+    assert first.text == "echo a" and first.tokens_used == 3
+    assert all(b["keep_alive"] == "1h" for b in mock.bodies)
+    assert mock.bodies[0]["options"]["num_predict"] == 16
+    assert len(mock.transports) == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_are_bounded():
+    mock = MockOllama(delay=0.05)
+    runner, host = await start_server(mock)
+    try:
+        async with AsyncOllamaClient(host=host, model="m", max_concurrency=3) as client:
+            results = await client.generate_many([f"p{i}" for i in range(9)])
+    finally:
+        await runner.cleanup()
+
+    assert [r.text for r in results] == [f"echo p{i}" for i in range(9)]
+    assert mock.peak == 3
+    assert client.stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_chunks():
+    mock = MockOllama()
+    runner, host = await start_server(mock)
+    try:
+        async with AsyncOllamaClient(host=host, model="m") as client:
+            chunks = [c async for c in client.stream("q")]
+    finally:
+        await runner.cleanup()
+
+    assert chunks == ["gold ", "is ", "up"]
+    assert mock.bodies[0]["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_http_error_raises_inference_error_and_releases_slot():
+    mock = MockOllama(status=500)
+    runner, host = await start_server(mock)
+    try:
+        async with AsyncOllamaClient(host=host, model="m", max_concurrency=1) as client:
+            for _ in range(2):
+                with pytest.raises(InferenceError):
+                    await client.generate("x")
+    finally:
+        await runner.cleanup()
+
+    assert client.stats["errors"] == 2 and client.stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_provider_agenerate_uses_pooled_client():
+    mock = MockOllama()
+    runner, host = await start_server(mock)
+    provider = OllamaProvider(host=host, model="m", keep_alive="-1")
+    try:
+        response = await provider.agenerate("hello")
+    finally:
+        await provider.aclose()
+        await runner.cleanup()
+
+    assert response.text == "echo hello"
+    assert mock.bodies[0]["keep_alive"] == "-1"
@@ -0,0 +1,100 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.digest_bot.llm.prefix_cache import PrefixKVCache
+
+
+class FakeContext:
+    """Tracks the evaluated tokens like a llama context; state is the token list itself."""
+
+    def __init__(self):
+        self.tokens = []
+        self.evaluated = 0
+        self.restores = 0
+
+    def context_tokens(self):
+        return self.tokens
+
+    def truncate(self, n_tokens):
+        self.tokens = self.tokens[:n_tokens]
+
+    def eval(self, tokens):
+        self.evaluated += len(tokens)
+        self.tokens = self.tokens + list(tokens)
+
+    def snapshot(self):
+        return bytes(len(self.tokens))
+
+    def restore(self, entry):
+        self.restores += 1
+        self.tokens = list(entry.tokens)
+
+    def generate(self, cache, prompt):
+        """Mimic Llama.generate(): reuse the live prefix, evaluate the rest."""
+        live = cache.prepare(self, prompt)
+        self.truncate(live)
+        self.eval(prompt[live:])
+
+
+SYSTEM = list(range(1000, 1200))  # 200-token preamble
+
+
+def test_shared_preamble_is_discovered_and_restored():
+    cache = PrefixKVCache(block_size=32, min_prefix_tokens=64)
+    ctx = FakeContext()
+
+    ctx.generate(cache, SYSTEM + [1, 2, 3])
+    assert len(cache) == 0
+
+    # Second prompt shares the preamble -> block-aligned prefix (192 tokens) is cached
+    ctx.generate(cache, SYSTEM + [4, 5, 6])
+    assert SYSTEM[:192] in cache
+
+    # An unrelated prompt evicts the live context; the next one restores from the cache
+    ctx.generate(cache, list(range(5000, 5100)))
+    before = ctx.evaluated
+    ctx.generate(cache, SYSTEM + [7, 8])
+    assert ctx.restores == 1
+    assert ctx.evaluated - before == len(SYSTEM) + 2 - 192
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_lookup_returns_longest_prefix():
+    cache = PrefixKVCache(block_size=32, min_prefix_tokens=32)
+    cache.put(SYSTEM[:64], b"a")
+    cache.put(SYSTEM[:128], b"b")
+    entry = cache.lookup(SYSTEM + [1])
+    assert entry.n_tokens == 128
+    assert cache.lookup([1, 2, 3] * 40) is None
+    # Non block-aligned prefixes are not stored
+    assert cache.put(SYSTEM[:50], b"c") is False
+
+
+def test_lru_eviction_respects_memory_cap():
+    block = 32
+    entry_bytes = 1000 + 4 * block
+    cache = PrefixKVCache(capacity_bytes=2 * entry_bytes, block_size=block, min_prefix_tokens=block)
+    a, b, c = ([n] * block for n in (1, 2, 3))
+
+    cache.put(a, bytes(1000))
+    cache.put(b, bytes(1000))
+    assert cache.lookup(a + [9]) is not None  # touch a so b is least recently used
+    cache.put(c, bytes(1000))
+
+    assert a in cache and c in cache and b not in cache
+    assert cache.size_bytes <= cache.capacity_bytes
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_warm_caches_known_preamble():
+    cache = PrefixKVCache(block_size=32, min_prefix_tokens=64)
+    ctx = FakeContext()
+    assert cache.warm(ctx, SYSTEM) is True
+    assert cache.warm(ctx, SYSTEM) is False
+
+    ctx.truncate(0)
+    ctx.generate(cache, SYSTEM + [42])
+    assert ctx.restores == 1
+    assert cache.get_stats()["tokens_reused"] == 192
@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.price_sanitizer import PriceSanitizer, canonical_from_data, parse_canonical
+
+
+def test_parse_canonical_from_prompt():
+    prompt = "CANONICAL VALUES\n* GOLD: $4,362.4\n* DXY: 98.72\nnot a value: $5"
+    assert parse_canonical(prompt) == {"GOLD": 4362.4, "DXY": 98.72}
+
+
+def test_price_is_attributed_to_nearest_preceding_asset():
+    sanitizer = PriceSanitizer({"DXY": 98.72, "YIELD": 4.15})
+    result = sanitizer.sanitize("Gold is strong despite a firming DXY ($98.72) and rising Yields ($98.72).")
+
+    assert result.text == "Gold is strong despite a firming DXY ($98.72) and rising Yields ($4.15)."
+    assert [(c.asset, c.found, c.reason) for c in result.corrections] == [("YIELD", 98.72, "deviation")]
+    assert result.notes == ["Replaced 98.72 with 4.15"]
+
+
+def test_labelled_prices_are_always_canonical():
+    sanitizer = PriceSanitizer({"GOLD": 4300})
+    result = sanitizer.sanitize("Current Gold Price: $4,310\nGold: $ 4299.5, near $4,310 resistance.")
+
+    # Both labelled prices are pinned; the unlabelled one is within tolerance
+    assert result.text == "Current Gold Price: $4300.0\nGold: $ 4300.0, near $4,310 resistance."
+    assert [c.reason for c in result.corrections] == ["label", "label"]
+
+
+def test_mentions_do_not_carry_across_lines_or_beyond_window():
+    sanitizer = PriceSanitizer({"GOLD": 4300})
+    text = "Gold outlook\nTarget $2,000.\nGold " + "x" * 50 + " $2,000"
+    assert sanitizer.sanitize(text).text == text
+
+
+def test_word_boundaries_and_trailing_punctuation():
+    sanitizer = PriceSanitizer({"GOLD": 4300, "OIL": 80})
+    result = sanitizer.sanitize("Goldman sees $100. Oil slid to $60.\nSpoil $5")
+    assert result.text == "Goldman sees $100. Oil slid to $80.0.\nSpoil $5"
+
+
+def test_canonical_from_data_skips_non_price_entries():
+    data = {"GOLD": {"price": 4387.3}, "NEWS": ["x"], "VIX": {"price": None}}
+    assert canonical_from_data(data) == {"GOLD": 4387.3}
+    assert PriceSanitizer({}).sanitize("Gold $1").text == "Gold $1"
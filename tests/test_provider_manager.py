@@ -0,0 +1,211 @@
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.provider_manager import ProviderManager, config_fingerprint
+
+
+class FakeChain:
+    def __init__(self, n):
+        self.name = f"chain-{n}"
+        self.healthy = True
+        self.restored = False
+        self.closed = False
+
+    def health_check(self):
+        return self.healthy
+
+    def restore_primary(self):
+        return self.restored
+
+    def close(self):
+        self.closed = True
+
+
+class Factory:
+    def __init__(self, fail=False):
+        self.built = []
+        self.fail = fail
+
+    def __call__(self, cfg, logger):
+        if self.fail:
+            return None
+        chain = FakeChain(len(self.built))
+        self.built.append(chain)
+        return chain
+
+
+def make_cfg(**overrides):
+    values = {"GEMINI_MODEL": "g", "LOCAL_LLM_MODEL": "", "OLLAMA_MODEL": "llama3.2"}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_provider_is_built_once_and_reused_across_threads():
+    factory = Factory()
+    manager = ProviderManager(make_cfg, factory=factory, health_interval=0)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(manager.get())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(factory.built) == 1
+    assert all(p is factory.built[0] for p in seen)
+    stats = manager.get_stats()
+    assert stats["warmups"] == 1 and stats["reuses"] == 7
+
+
+def test_failure_triggers_rebuild_on_next_get():
+    factory = Factory()
+    manager = ProviderManager(make_cfg, factory=factory, health_interval=0, rebuild_backoff=0)
+    first = manager.get()
+    manager.mark_failed(first, RuntimeError("All LLM providers failed"))
+    manager.mark_failed(first, RuntimeError("again"))  # reported by a second task: one rebuild only
+    second = manager.get()
+
+    assert second is not first and len(factory.built) == 2
+    assert manager.get_stats()["failure_reloads"] == 1
+    # A stale reference reported after the rebuild does not discard the new chain
+    manager.mark_failed(first)
+    assert manager.get() is second
+
+
+def test_config_change_rebuilds_in_background_check():
+    cfg = {"model": "a"}
+    factory = Factory()
+    manager = ProviderManager(lambda: make_cfg(OLLAMA_MODEL=cfg["model"]), factory=factory, health_interval=0)
+    first = manager.get()
+    assert manager.check() is True
+    assert len(factory.built) == 1
+
+    cfg["model"] = "b"
+    manager.check()
+    assert len(factory.built) == 2
+    assert manager.get() is not first
+    assert manager.get_stats()["config_reloads"] == 1
+
+
+def test_unhealthy_chain_is_replaced_and_primary_restored():
+    factory = Factory()
+    manager = ProviderManager(make_cfg, factory=factory, health_interval=0, rebuild_backoff=0)
+    chain = manager.get()
+
+    chain.restored = True
+    assert manager.check() is True
+    assert manager.get_stats()["primary_restores"] == 1
+
+    chain.healthy = False
+    assert manager.check() is False
+    assert manager.get() is not chain
+    assert manager.get_stats()["health_failures"] == 1
+
+
+def test_failed_build_backs_off_and_keeps_previous_chain():
+    factory = Factory()
+    manager = ProviderManager(make_cfg, factory=factory, health_interval=0, rebuild_backoff=60)
+    first = manager.get()
+    manager.mark_failed(first)
+    factory.fail = True
+
+    assert manager.get() is first  # build failed, old chain still served
+    assert manager.get() is first  # within backoff: no second build attempt
+    assert manager.get_stats()["build_failures"] == 1
+
+
+def test_fingerprint_tracks_model_file(tmp_path):
+    model = tmp_path / "m.gguf"
+    model.write_bytes(b"x")
+    before = config_fingerprint(make_cfg(LOCAL_LLM_MODEL=str(model)))
+    model.write_bytes(b"xy")
+    assert config_fingerprint(make_cfg(LOCAL_LLM_MODEL=str(model))) != before
+
+
+def test_worker_uses_manager_and_passes_task_type(monkeypatch, tmp_path):
+    import scripts.llm_worker as lw
+
+    calls = []
+
+    class Chain:
+        task_type = "default"
+
+        def generate_content(self, prompt, task_type=None):
+            calls.append(task_type)
+            return SimpleNamespace(text="Gold held steady.")
+
+    class DB:
+        def __init__(self):
+            self.results = []
+
+        def update_llm_task_result(self, task_id, status, **kwargs):
+            self.results.append(status)
+
+    db = DB()
+    monkeypatch.setattr(lw, "get_db", lambda: db)
+    monkeypatch.setattr(lw, "NOTION_AVAILABLE", False)
+    monkeypatch.setattr(lw, "create_llm_provider", lambda *a: (_ for _ in ()).throw(AssertionError("per-task build")))
+    manager = ProviderManager(make_cfg, factory=lambda cfg, log: Chain(), health_interval=0)
+
+    for i in range(3):
+        task = {"id": i, "document_path": str(tmp_path / f"r{i}.md"), "prompt": "", "task_type": "generate"}
+        lw.process_task(task, None, providers=manager)
+
+    assert db.results == ["completed"] * 3
+    assert calls == ["generate"] * 3
+    assert manager.get_stats()["warmups"] == 1
+
+
+def test_worker_threads_serialize_a_non_concurrent_provider(monkeypatch, tmp_path):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import scripts.llm_worker as lw
+
+    active, peak, calls = [0], [0], []
+    guard = threading.Lock()
+
+    class LocalChain:
+        concurrent_safe = False
+        task_type = "default"
+
+        def generate_content(self, prompt, task_type=None):
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                calls.append(task_type)
+            time.sleep(0.02)
+            with guard:
+                active[0] -= 1
+            return SimpleNamespace(text="[]")
+
+    class DB:
+        def __init__(self):
+            self.results = []
+
+        def update_llm_task_result(self, task_id, status, **kwargs):
+            self.results.append(status)
+
+    db = DB()
+    monkeypatch.setattr(lw, "get_db", lambda: db)
+    monkeypatch.setattr(lw, "NOTION_AVAILABLE", False)
+    chain = LocalChain()
+    manager = ProviderManager(make_cfg, factory=lambda cfg, log: chain, health_interval=0)
+
+    tasks = []
+    for i in range(8):
+        doc = tmp_path / f"r{i}.md"
+        doc.write_text("# Notes\n")
+        task_type = "insights" if i % 2 else "generate"
+        tasks.append({"id": i, "document_path": str(doc), "prompt": "p", "task_type": task_type})
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda t: lw.process_task(t, None, providers=manager), tasks))
+
+    assert db.results == ["completed"] * 8
+    assert peak[0] == 1
+    assert sorted(calls) == ["generate"] * 4 + ["insights"] * 4
+    # The shared chain's own task_type is never rewritten by a task
+    assert chain.task_type == "default"
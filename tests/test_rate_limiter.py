@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db_manager import DatabaseManager
+from scripts import rate_limiter
+from scripts.rate_limiter import RateLimitTimeout, TokenBucketLimiter
+from src.digest_bot.llm.gemini import GeminiProvider
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(db_path=tmp_path / "quota.db")
+
+
+def test_rpm_bucket_blocks_after_capacity(db):
+    limiter = TokenBucketLimiter("gemini", rpm=3, db=db)
+    for _ in range(3):
+        assert limiter.try_acquire(priority="interactive") == 0.0
+    wait = limiter.try_acquire(priority="interactive")
+    assert 0 < wait <= 20.0  # one request refills every 60/3 s
+
+
+def test_tpm_bucket_and_settle(db):
+    limiter = TokenBucketLimiter("gemini", rpm=100, tpm=1000, db=db)
+    assert limiter.try_acquire(tokens=800, priority="interactive") == 0.0
+    assert limiter.try_acquire(tokens=800, priority="interactive") > 0
+
+    # The first call actually used far fewer tokens than estimated
+    limiter.settle(estimated_tokens=800, actual_tokens=100)
+    assert limiter.try_acquire(tokens=800, priority="interactive") == 0.0
+
+
+def test_batch_priority_leaves_headroom_for_interactive(db):
+    limiter = TokenBucketLimiter("gemini", rpm=10, db=db)
+    taken = 0
+    while limiter.try_acquire(priority="batch") == 0.0:
+        taken += 1
+    assert taken == 7  # 30% of the bucket is reserved
+
+    assert limiter.try_acquire(priority="normal") == 0.0
+    assert limiter.try_acquire(priority="normal") == 0.0
+    assert limiter.try_acquire(priority="normal") > 0
+    assert limiter.try_acquire(priority="interactive") == 0.0
+
+
+def test_request_larger_than_the_headroom_waits_for_a_full_bucket(db):
+    limiter = TokenBucketLimiter("gemini", rpm=600, tpm=6000, db=db)
+
+    # A cost that leaves less than the batch reserve free is admitted from a full bucket
+    assert limiter.acquire(tokens=5800, priority="batch", timeout=None) < 1.0
+    wait = limiter.try_acquire(tokens=5800, priority="batch")
+    assert 0 < wait <= 60.0  # bounded by one refill of the whole bucket (100 tokens/s)
+    assert limiter.try_acquire(tokens=50000, priority="normal") <= 60.0
+
+
+def test_quota_error_blocks_all_callers(db):
+    limiter = TokenBucketLimiter("gemini", rpm=60, db=db)
+    other_process = TokenBucketLimiter("gemini", rpm=60, db=DatabaseManager(db_path=db.db_path))
+    assert limiter.try_acquire() == 0.0
+
+    limiter.report_quota_error(retry_after=30)
+    assert other_process.try_acquire(priority="interactive") > 25
+
+
+def test_acquire_timeout(db):
+    limiter = TokenBucketLimiter("gemini", rpm=1, db=db)
+    limiter.acquire(priority="interactive")
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(priority="interactive", timeout=0.1)
+
+
+def _worker(db_path, results):
+    limiter = TokenBucketLimiter("gemini", rpm=20, db=DatabaseManager(db_path=db_path))
+    granted = 0
+    for _ in range(10):
+        if limiter.try_acquire(priority="interactive") == 0.0:
+            granted += 1
+    results.put(granted)
+
+
+def test_buckets_are_shared_across_processes(tmp_path):
+    db_path = tmp_path / "shared.db"
+    DatabaseManager(db_path=db_path)
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_worker, args=(db_path, results)) for _ in range(4)]
+    start = time.time()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+    granted = sum(results.get(timeout=5) for _ in procs)
+    elapsed = time.time() - start
+    # 20 RPM capacity plus whatever refilled while the processes ran
+    assert 20 <= granted <= 20 + int(elapsed / 3) + 1
+
+
+def test_digest_bot_gemini_settles_its_estimate(db, monkeypatch):
+    limiter = TokenBucketLimiter("gemini", rpm=100, tpm=10000, db=db)
+    monkeypatch.setattr(rate_limiter, "get_gemini_limiter", lambda: limiter)
+    response = SimpleNamespace(content="Gold held support.", usage_metadata=SimpleNamespace(total_token_count=300))
+    model = SimpleNamespace(generate_content=lambda prompt: response)
+
+    provider = GeminiProvider(priority="interactive")
+    provider._client, provider._loaded = SimpleNamespace(GenerativeModel=lambda name: model), True
+    assert provider.generate("x" * 4000).tokens_used == 300
+
+    # The 2024-token estimate was charged, then settled to the 300 tokens reported
+    with db._get_connection() as conn:
+        tokens = conn.execute("SELECT tokens FROM rate_limit_buckets WHERE name = 'gemini:tpm'").fetchone()[0]
+    assert 9690 <= tokens <= 9710
@@ -0,0 +1,110 @@
+import logging
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.insights_engine import InsightsExtractor
+
+REPORT = """# Daily Analysis
+
+## Macro
+
+The Fed meeting is critical. Monitor CPI closely.
+
+## Levels
+
+Support at $4,200 is critical.
+"""
+
+
+@pytest.fixture
+def db(db, monkeypatch):
+    monkeypatch.delenv("LLM_ASYNC_QUEUE", raising=False)
+    return db
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = tmp_path / "reports" / f"daily_{date.today().isoformat()}.md"
+    path.parent.mkdir()
+    path.write_text(REPORT, encoding="utf-8")
+    return path
+
+
+def _run(path):
+    extractor = InsightsExtractor(None, logging.getLogger("test"))
+    entities, actions = extractor.process_all_reports(path.parent)
+    written = extractor.commit_report_ledger()
+    return extractor, {e.entity_name for e in entities}, actions, written
+
+
+def test_unchanged_report_is_skipped_without_db_writes(db, report):
+    _, entities, actions, written = _run(report)
+    assert {"Fed", "CPI"} <= entities and actions and written == 1
+
+    extractor, entities, actions, written = _run(report)
+    assert not entities and not actions and written == 0
+    assert extractor.report_stats == {"processed": 0, "partial": 0, "unchanged": 1, "deferred": 0}
+
+    # Rewritten with identical content: skipped, and the new mtime is recorded
+    report.write_text(REPORT, encoding="utf-8")
+    os.utime(report, ns=(report.stat().st_atime_ns, report.stat().st_mtime_ns + 10**9))
+    extractor, entities, _, written = _run(report)
+    assert not entities and written == 1 and extractor.report_stats["unchanged"] == 1
+
+
+def test_changed_report_extracts_actions_only_from_new_sections(db, report):
+    _run(report)
+    report.write_text(REPORT + "\n## Institutions\n\nGoldman Sachs raised its target. The Fed\n", encoding="utf-8")
+
+    extractor = InsightsExtractor(None, logging.getLogger("test"))
+    incremental, actions = extractor.process_all_reports(report.parent)
+    assert extractor.report_stats["partial"] == 1 and extractor.commit_report_ledger() == 1
+    assert not any("4,200" in a.title for a in actions)
+
+    # Entities still cover the whole report, so the stored counts are not cut down to the new section
+    extractor = InsightsExtractor(None, logging.getLogger("test"))
+    full, _ = extractor.process_all_reports(report.parent, incremental=False)
+
+    def counts(entities):
+        return {e.entity_name: (e.metadata["mentions"], e.relevance_score) for e in entities}
+
+    assert counts(incremental) == counts(full)
+    assert {"Fed", "CPI", "Goldman Sachs"} <= set(counts(full)) and counts(full)["Fed"][0] == 2
+
+
+def test_full_llm_queue_defers_reports_instead_of_extracting_inline(db, report, monkeypatch):
+    from scripts import admission
+
+    monkeypatch.setenv("LLM_ASYNC_QUEUE", "1")
+    monkeypatch.setattr(admission, "LLM_TASK_MAX_PENDING", 0)
+    monkeypatch.setattr(InsightsExtractor, "extract_actions", lambda *a: pytest.fail("inline LLM extraction"))
+
+    extractor, entities, actions, written = _run(report)
+    assert not entities and not actions and written == 0
+    assert extractor.report_stats["deferred"] == 1 and db.get_llm_queue_length() == 0
+
+    # Once the queue drains, the deferred report is processed and its extraction queued
+    monkeypatch.setattr(admission, "LLM_TASK_MAX_PENDING", 100)
+    extractor, entities, actions, written = _run(report)
+    assert {"Fed", "CPI"} <= entities and not actions and written == 1
+    assert extractor.report_stats["processed"] == 1 and db.get_llm_queue_length() == 1
+
+
+def test_failed_extraction_is_retried_next_cycle(db, report, monkeypatch):
+    extract_actions = InsightsExtractor.extract_actions
+
+    def fail(*args):
+        raise RuntimeError("extraction crashed")
+
+    monkeypatch.setattr(InsightsExtractor, "extract_actions", fail)
+    _, entities, actions, written = _run(report)
+    assert not entities and not actions and written == 0
+
+    monkeypatch.setattr(InsightsExtractor, "extract_actions", extract_actions)
+    _, entities, actions, written = _run(report)
+    assert {"Fed", "CPI"} <= entities and actions and written == 1
@@ -0,0 +1,180 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from db_manager import get_db
+from scripts.sandbox import (
+    ParentLLMProvider,
+    SandboxMemoryExceeded,
+    SandboxPool,
+    SandboxTaskError,
+    SandboxTimeout,
+)
+from scripts.task_executor import TaskExecutor
+
+
+# Factories run in the spawned worker, so they must be importable module-level functions
+def _runner(item):
+    item = getattr(item, "action_id", item)
+    if item == "hang":
+        time.sleep(60)
+    if item == "hog":
+        hog = b"x" * (300 * 1024 * 1024)  # noqa: F841
+        time.sleep(60)
+    if item == "raise":
+        raise ValueError("bad input")
+    return (os.getpid(), item)
+
+
+def build_runner():
+    return _runner
+
+
+_RETAINED = []
+
+
+def _llm_runner(item):
+    if item == "retain":
+        _RETAINED.append(b"x" * (200 * 1024 * 1024))
+        return os.getpid()
+    return ParentLLMProvider().generate_content(item).text
+
+
+def build_llm_runner():
+    return _llm_runner
+
+
+@pytest.fixture
+def pool():
+    pool = SandboxPool(factory=build_runner, size=1, timeout=10, memory_mb=0, max_tasks=3)
+    yield pool
+    pool.close()
+
+
+def test_workers_are_reused_then_recycled(pool):
+    pids = [pool.run(i)[0] for i in range(4)]
+    assert pids[0] == pids[1] == pids[2] != pids[3]
+    assert pool.stats["spawned"] == 2 and pool.stats["recycled"] == 1
+
+    with pytest.raises(SandboxTaskError, match="bad input"):
+        pool.run("raise")
+    assert pool.run("after")[0] == pids[3]  # a raising handler does not cost the worker
+
+
+def test_hung_task_is_killed_at_the_deadline(pool):
+    first = pool.run("warm")[0]
+    start = time.monotonic()
+    with pytest.raises(SandboxTimeout):
+        pool.run("hang", timeout=1)
+    assert time.monotonic() - start < 5
+    assert pool.run("next")[0] != first
+    assert pool.stats["timeouts"] == 1
+
+
+def test_worker_over_memory_limit_is_killed():
+    pool = SandboxPool(factory=build_runner, size=1, timeout=20, memory_mb=150)
+    try:
+        with pytest.raises(SandboxMemoryExceeded):
+            pool.run("hog")
+        assert pool.run("ok")[1] == "ok"
+    finally:
+        pool.close()
+
+
+def test_worker_llm_calls_are_answered_by_the_parent():
+    class LocalModel:
+        concurrent_safe = False
+
+        def generate_content(self, prompt):
+            if prompt == "quota":
+                raise RuntimeError("429 quota exceeded")
+            return SimpleNamespace(text=f"{os.getpid()}:{prompt}")
+
+    pool = SandboxPool(factory=build_llm_runner, size=1, timeout=20, memory_mb=0, llm=LocalModel())
+    try:
+        assert pool.run("gold outlook") == f"{os.getpid()}:gold outlook"
+        with pytest.raises(SandboxTaskError, match="429 quota exceeded"):
+            pool.run("quota")
+        assert pool.stats["llm_calls"] == 2 and pool.stats["spawned"] == 1
+    finally:
+        pool.close()
+
+
+def test_hung_parent_llm_call_is_bounded_by_the_task_deadline():
+    release = threading.Event()
+
+    class HungModel:
+        def generate_content(self, prompt):
+            release.wait(30)
+            return SimpleNamespace(text=prompt)
+
+    pool = SandboxPool(factory=build_llm_runner, size=1, timeout=20, memory_mb=0, llm=HungModel())
+    try:
+        start = time.monotonic()
+        with pytest.raises(SandboxTimeout):
+            pool.run("stuck generation", timeout=1)
+        assert time.monotonic() - start < 5
+        assert pool.stats["timeouts"] == 1 and pool.stats["llm_calls"] == 1
+    finally:
+        release.set()
+        pool.close()
+
+
+def test_worker_left_over_the_memory_limit_is_retired():
+    pool = SandboxPool(factory=build_llm_runner, size=1, timeout=20, memory_mb=150)
+    try:
+        first = pool.run("retain")
+        assert pool.stats["recycled"] == 1 and pool.stats["memory_kills"] == 0
+        assert pool.run("retain") != first
+    finally:
+        pool.close()
+
+
+class _Action:
+    def __init__(self, action_id):
+        self.action_id = action_id
+        self.action_type = "research"
+        self.title = "Research: stuck handler"
+        self.retry_count = 0
+
+
+def test_executor_requeues_killed_task_with_reason(monkeypatch, tmp_path, pool):
+    monkeypatch.setenv("GOLD_STANDARD_TEST_DB", str(tmp_path / "sandbox.db"))
+    db = get_db()
+    db.save_action_insight("hang", "research", "Research: stuck handler")
+    executor = TaskExecutor(config=None, logger=logging.getLogger("test"), sandbox=pool)
+
+    result = executor._execute_sandboxed(_Action("hang"), timeout=1)
+    assert result.deferred and "wall-clock" in result.error_message
+
+    with db._get_connection() as conn:
+        row = dict(conn.execute("SELECT * FROM action_insights WHERE action_id = 'hang'").fetchone())
+    assert row["status"] == "pending" and row["retry_count"] == 1
+    assert json.loads(row["metadata"])["release_reason"].startswith("sandbox_killed")
+
+
+def test_failed_requeue_is_reported_as_a_failure(monkeypatch, caplog):
+    import db_manager
+
+    class LockedDB:
+        def increment_retry_count(self, action_id, reason):
+            raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(db_manager, "get_db", lambda: LockedDB())
+    executor = TaskExecutor(config=None, logger=logging.getLogger("test"), sandbox=False)
+    action = _Action("hang")
+
+    with caplog.at_level(logging.ERROR, logger="test"):
+        result = executor._requeue_runaway(action, "Task exceeded the 1s wall-clock limit", 1000.0)
+    assert not result.success and not result.deferred
+    assert "requeue failed: database is locked" in result.error_message
+    assert action.retry_count == 0 and executor.stats["retried"] == 0
+    assert "Could not requeue killed task hang" in caplog.text